@@ -0,0 +1,80 @@
+"""
+Measures how many events per second `sse_client.Client` parses from a synthetic `bundles/events` stream, compared with
+the previous implementation which read the stream one character at a time.
+
+Run from the project root with:
+
+    python -m benchmarks.sse_client_benchmark [number-of-events]
+"""
+from conductr_cli import sse_client
+from unittest.mock import MagicMock, patch
+import re
+import sys
+import time
+
+
+DEFAULT_NUMBER_OF_EVENTS = 100000
+
+SSE_END_OF_FIELD = re.compile(r'\r\n\r\n|\r\r|\n\n')
+
+
+def synthetic_stream(number_of_events):
+    events = []
+    for i in range(number_of_events):
+        if i % 4 == 0:
+            events.append('data:\n\n')
+        else:
+            events.append('event:bundleExecutionAdded\n'
+                          'data:{{"bundleId":"bundle-{}","host":"10.0.0.{}"}}\n\n'.format(i, i % 255))
+    return ''.join(events)
+
+
+def per_character_events(raw_sse):
+    """The parsing loop of `sse_client.Client.__next__` prior to the incremental parser."""
+    response_iter = iter(raw_sse)
+    while True:
+        buf = ''
+        try:
+            while re.search(SSE_END_OF_FIELD, buf) is None:
+                buf += next(response_iter)
+        except StopIteration:
+            return
+
+        event, data = None, None
+        for line in re.split(SSE_END_OF_FIELD, buf)[0].split('\n'):
+            if line.rstrip():
+                key, value = line.split(':', 1)
+                if key == 'event':
+                    event = value
+                elif key == 'data':
+                    data = value
+        yield sse_client.Event(event, data)
+
+
+def incremental_events(raw_sse):
+    raw_bytes = raw_sse.encode('utf-8')
+    chunks = [raw_bytes[i:i + sse_client.SSE_CHUNK_SIZE] for i in range(0, len(raw_bytes), sse_client.SSE_CHUNK_SIZE)]
+    response = MagicMock()
+    response.iter_content.return_value = iter(chunks)
+
+    with patch('conductr_cli.conduct_request.get', MagicMock(return_value=response)):
+        # The synthetic stream ends once all of it has been parsed, which must not be timed as a dropped stream
+        return sse_client.get_events(False, '127.0.0.1', 'http://127.0.0.1:9005/bundles/events',
+                                     max_reconnect_attempts=0)
+
+
+def measure(name, events):
+    start = time.perf_counter()
+    count = sum(1 for _ in events)
+    elapsed = time.perf_counter() - start
+    print('{:<12} {:>8} events in {:>7.3f}s {:>12.0f} events/s'.format(name, count, elapsed, count / elapsed))
+
+
+def run(number_of_events):
+    raw_sse = synthetic_stream(number_of_events)
+    measure('before', per_character_events(raw_sse))
+    measure('after', incremental_events(raw_sse))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NUMBER_OF_EVENTS)
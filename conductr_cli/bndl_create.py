@@ -113,6 +113,9 @@ def bndl_create(args):
                 log.error('bndl: Not an OCI Image')
                 return 2
 
+            if not args.name:
+                args.name = bndl_oci.oci_image_title(component_dir, args.image_tag)
+
             if not args.with_defaults:
                 args.with_defaults = ApplicationType.GENERIC
 
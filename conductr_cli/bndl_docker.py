@@ -1,3 +1,4 @@
+from conductr_cli.bndl_oci import OCI_IMAGE_TITLE_ANNOTATION
 from conductr_cli.bndl_utils import DigestReaderWriter, file_write_bytes
 import gzip
 import hashlib
@@ -96,7 +97,7 @@ def docker_parse_cmd(line):
     return args
 
 
-def docker_config_to_oci_image(manifest, config, sizes, layers_to_digests):
+def docker_config_to_oci_image(manifest, config, sizes, layers_to_digests, image_name=None):
     oci_config = {
         'created': config['created'],
         'architecture': config['architecture'],
@@ -162,6 +163,9 @@ def docker_config_to_oci_image(manifest, config, sizes, layers_to_digests):
         'size': len(oci_manifest_data)
     }
 
+    if image_name is not None:
+        refs['annotations'] = {OCI_IMAGE_TITLE_ANNOTATION: image_name}
+
     refs_data = json.dumps(refs, sort_keys=True).encode('UTF-8')
 
     digest = hashlib.sha256()
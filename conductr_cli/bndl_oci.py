@@ -1,5 +1,5 @@
 from pyhocon import HOCONConverter, ConfigFactory, ConfigTree
-from conductr_cli.bndl_utils import create_check_hocon
+from conductr_cli.bndl_utils import create_check_hocon, link_or_copy
 from conductr_cli.constants import BNDL_DEFAULT_CHECK_RETRY_COUNT, BNDL_DEFAULT_CHECK_RETRY_DELAY
 import json
 import os
@@ -8,6 +8,10 @@ import shutil
 import tempfile
 
 
+# Annotation of a ref holding the name of its image, e.g. an image converted by `docker_resolver`
+OCI_IMAGE_TITLE_ANNOTATION = 'org.opencontainers.image.title'
+
+
 def oci_image_bundle_conf(args, component_name, oci_manifest, oci_config):
     annotations_tree = ConfigTree()
 
@@ -99,12 +103,32 @@ def oci_image_extract_manifest_config(dir, tag):
     return {}, {}
 
 
+def oci_image_title(dir, tag=None):
+    """
+    :param tag: the ref to read, or None for the first ref of the image
+    :return: the image name annotated on the ref, or None
+    """
+    refs_dir = os.path.join(dir, 'refs')
+
+    if tag is None and os.path.isdir(refs_dir):
+        tag = next(iter(os.listdir(refs_dir)), None)
+
+    refs_path = os.path.join(refs_dir, tag) if tag else None
+
+    if refs_path and os.path.isfile(refs_path):
+        with open(refs_path, 'r') as refs_file:
+            return json.load(refs_file).get('annotations', {}).get(OCI_IMAGE_TITLE_ANNOTATION)
+
+    return None
+
+
 def oci_image_unpack(destination, data, is_dir):
     temp_dir = tempfile.mkdtemp()
 
     try:
         if is_dir:
-            shutil.copytree(data, os.path.join(temp_dir, 'image'))
+            # Blobs are never modified, so they are linked rather than copied
+            shutil.copytree(data, os.path.join(temp_dir, 'image'), copy_function=link_or_copy)
         else:
             data.extractall(temp_dir)
 
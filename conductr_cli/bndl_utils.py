@@ -4,6 +4,7 @@ from pyhocon import ConfigFactory, ConfigTree
 import hashlib
 import os
 import re
+import shutil
 import time
 import zipfile
 
@@ -400,6 +401,19 @@ def file_write_bytes(path, bs):
         file.write(bs)
 
 
+def link_or_copy(src, dst):
+    """
+    Hard links `src` to `dst`, copying it instead where the file system does not support it or `dst` is on another
+    device. The files must not be modified afterwards, as they may share their contents.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+    return dst
+
+
 def file_write_string(file_path, data):
     with open(file_path, 'w', encoding='utf-8') as f:
         f.writelines(data)
@@ -0,0 +1,147 @@
+from conductr_cli import bundle_event_bus, bundle_utils, control_protocol, screen_utils
+from conductr_cli.conduct_info_common import DISPLAY_PADDING
+from conductr_cli.constants import BATCH_WORKERS
+from conductr_cli.exceptions import BundleScaleError, WaitTimeoutError
+from concurrent.futures import ThreadPoolExecutor
+from requests.exceptions import ConnectionError, HTTPError
+import copy
+import logging
+
+
+class BatchResult:
+    """
+    The outcome of an operation on one of the bundles of a batch.
+    """
+    def __init__(self, bundle):
+        self.bundle = bundle
+        self.bundle_id = None
+        self.error = None
+
+
+def is_batch(args):
+    """
+    Returns `True` if the command operates on several bundles, i.e. more than one bundle is given, or the bundles are
+    selected by role or system.
+    """
+    return not args.bundle or \
+        bool(vars(args).get('additional_bundles')) or \
+        bool(vars(args).get('role')) or \
+        bool(vars(args).get('system'))
+
+
+def select_bundles(args, bundles=None):
+    """
+    :param bundles: the optional `/bundles` snapshot to select from, e.g. one already fetched by the caller
+    :return: the bundle ids or names given, followed by the ids of the bundles matching the role or system selector
+    """
+    selected_bundles = ([args.bundle] if args.bundle else []) + (vars(args).get('additional_bundles') or [])
+
+    role = vars(args).get('role')
+    system = vars(args).get('system')
+    if role or system:
+        if bundles is None:
+            bundles = control_protocol.get_bundles(args)
+
+        for bundle in bundles:
+            attributes = bundle['attributes']
+            if role and role not in attributes.get('roles', []):
+                continue
+            if system and system != attributes.get('system'):
+                continue
+            if bundle['bundleId'] not in selected_bundles:
+                selected_bundles.append(bundle['bundleId'])
+
+    return selected_bundles
+
+
+def bundle_args(args, bundle):
+    """
+    :return: a copy of the args operating on the given bundle alone
+    """
+    result = copy.copy(args)
+    result.bundle = bundle
+    result.additional_bundles = []
+    result.role = None
+    result.system = None
+    return result
+
+
+def run_batch(args, operation, request, create_waiter, completed_status):
+    """
+    Sends the request of the operation for every selected bundle through a bounded pool of workers, then waits for
+    all the bundles over a single `bundles/events` stream.
+    :param operation: the name of the operation, e.g. `run`
+    :param request: the control protocol request, e.g. `control_protocol.run_bundle`
+    :param create_waiter: creates the `bundle_event_bus` waiter of a bundle given its full id and its args
+    :param completed_status: the status displayed for a bundle once the operation is completed
+    :return: `True` if the operation has succeeded for every bundle
+    """
+    log = logging.getLogger(__name__)
+
+    results = [BatchResult(bundle) for bundle in select_bundles(args)]
+    if not results:
+        log.error('No bundles to {}. Specify the bundles, or select them with --role or --system'.format(operation))
+        return False
+
+    with ThreadPoolExecutor(max_workers=min(BATCH_WORKERS, len(results))) as executor:
+        futures = [executor.submit(request, bundle_args(args, result.bundle)) for result in results]
+
+    for result, future in zip(results, futures):
+        # Whatever fails the request of one bundle, e.g. a timeout or a malformed response, is that bundle's error,
+        # so the other bundles are still waited for and reported
+        try:
+            result.bundle_id = future.result()['bundleId']
+        except Exception as e:
+            result.error = e
+
+    requested_results = [result for result in results if not result.error]
+    log.info('Bundle {} requests sent: {} of {}.'.format(operation, len(requested_results), len(results)))
+
+    if not args.no_wait and requested_results:
+        waiters = [create_waiter(result.bundle_id, bundle_args(args, result.bundle_id))
+                   for result in requested_results]
+        bundle_event_bus.wait_for_all(waiters, args)
+
+        for result, waiter in zip(requested_results, waiters):
+            result.error = waiter.error
+
+    display_results(args, results, completed_status if not args.no_wait else 'Requested')
+
+    return all(not result.error for result in results)
+
+
+def display_results(args, results, completed_status):
+    log = logging.getLogger(__name__)
+
+    data = [
+        {
+            'bundle': result.bundle,
+            'id': display_bundle_id(args, result.bundle_id) if result.bundle_id else '',
+            'status': display_error(result.error) if result.error else completed_status
+        } for result in results
+    ]
+    data.insert(0, {'bundle': 'BUNDLE', 'id': 'ID', 'status': 'STATUS'})
+
+    column_widths = dict(screen_utils.calc_column_widths(data), **{'padding': ' ' * DISPLAY_PADDING})
+    for row in data:
+        log.screen('''\
+{bundle: <{bundle_width}}{padding}\
+{id: <{id_width}}{padding}\
+{status: <{status_width}}'''.format(**dict(row, **column_widths)).rstrip())
+
+
+def display_bundle_id(args, bundle_id):
+    return bundle_id if args.long_ids else bundle_utils.short_id(bundle_id)
+
+
+def display_error(error):
+    if isinstance(error, HTTPError):
+        return 'Failed: {} {}'.format(error.response.status_code, error.response.reason)
+    elif isinstance(error, ConnectionError):
+        return 'Failed: unable to connect'
+    elif isinstance(error, WaitTimeoutError):
+        return 'Timed out'
+    elif isinstance(error, BundleScaleError):
+        return 'Bundle has error'
+    else:
+        return 'Failed: {}'.format(error)
@@ -0,0 +1,396 @@
+from conductr_cli import bundle_utils
+from conductr_cli.constants import BUNDLE_CACHE_MAX_SIZE_MB, IO_CHUNK_SIZE
+from contextlib import contextmanager
+from pyhocon import ConfigFactory
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+
+
+INDEX_FILE_NAME = 'index.json'
+INDEX_VERSION = 1
+LOCK_FILE_NAME = 'index.lock'
+
+# The holder of a lock refreshes it every few seconds. A lock which has not been refreshed for a minute has been left
+# by a command which has exited without releasing it, and is broken.
+LOCK_REFRESH_SECONDS = 5
+LOCK_STALE_SECONDS = 60
+
+# Directory of the cache holding the metadata of the resolvers, e.g. the versions resolved from Bintray
+METADATA_DIR_NAME = 'metadata'
+
+# Directory of the cache holding the manifests and blobs fetched from Docker registries, see `docker_blob_cache`
+DOCKER_CACHE_DIR_NAME = 'docker'
+
+# A bundle file name ends with the SHA-256 digest of the bundle, e.g. `visualizer-v2-<digest>.zip`
+DIGEST_LENGTH = 64
+DIGEST_DIR_RE = re.compile('^[0-9a-f]{{{}}}$'.format(DIGEST_LENGTH))
+
+# Earlier releases cached bundles and bundle configurations as flat files of the cache directory, named after their
+# digest, e.g. `visualizer-v2-<digest>.zip`
+LEGACY_FILE_RE = re.compile('^.+-[0-9a-f]{{{}}}\\.zip$'.format(DIGEST_LENGTH))
+
+# The temporary file of a download, and its resume state, are considered abandoned after this time, in seconds
+DOWNLOAD_SUFFIXES = ('.tmp', '.tmp.json')
+DOWNLOAD_STALE_SECONDS = 60 * 60
+
+
+class BundleCache:
+    """
+    Cache of resolved bundles or bundle configurations, addressed by the SHA-256 digest of their contents.
+
+    A file is stored as `<cache_dir>/<digest>/<file name>`, so the same contents resolved from different URIs are
+    stored once. The index `<cache_dir>/index.json` holds an entry for every digest, i.e. the file name, size, bundle
+    name and tag, source URIs and time of last use, and maps every source URI and bundle name to its digest. Looking a
+    file up therefore costs a read of the index, however many files are cached.
+
+    The least recently used files are evicted when a file is added and the total size of the cache exceeds
+    `max_size`.
+
+    Commands share the cache: the index is only updated while holding `index.lock`, having read it again, so the files
+    added by concurrent commands are kept.
+    """
+    def __init__(self, cache_dir, max_size=BUNDLE_CACHE_MAX_SIZE_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.index = read_index(cache_dir)
+
+    def add(self, file_path, file_name, uri):
+        """
+        Moves a resolved file into the cache.
+        :param file_path: the resolved file, e.g. downloaded in the cache directory
+        :param file_name: the name of the file as resolved
+        :param uri: the URI the file has been resolved from
+        :return: the path of the cached file
+        """
+        digest = file_digest(file_path)
+
+        with self.locked():
+            entry = self.index['entries'].get(digest)
+            if entry and os.path.exists(self.path(entry)):
+                if not is_same_path(file_path, self.path(entry)):
+                    os.remove(file_path)
+            else:
+                os.makedirs(os.path.join(self.cache_dir, digest), mode=0o700, exist_ok=True)
+                name, tags = read_bundle_name(file_path, file_name)
+                entry = {
+                    'digest': digest,
+                    'file_name': file_name,
+                    'size': os.path.getsize(file_path),
+                    'name': name,
+                    'tags': tags,
+                    'uris': [],
+                    'added': time.time()
+                }
+                shutil.move(file_path, self.path(entry))
+
+            if uri not in entry['uris']:
+                entry['uris'].append(uri)
+            entry['last_used'] = time.time()
+
+            self.index['entries'][digest] = entry
+            self.index['uris'][uri] = digest
+            for name in entry_names(entry):
+                self.index['names'][name] = digest
+
+            self.evict(excluded=[digest])
+
+            return self.path(entry)
+
+    def find_uri(self, uri):
+        """
+        :return: the file name and path of the file cached for the URI, or `None` if there is none
+        """
+        return self.use(self.index['uris'].get(uri))
+
+    def find_name(self, name):
+        """
+        Finds the latest file cached for a bundle name, e.g. `visualizer`, or bundle name and tag, e.g.
+        `visualizer:2.0.0`. Failing that, the latest file whose file name starts with `name` is found, in the index
+        then amongst the flat files of the cache directory, i.e. cached by earlier releases or by the S3 resolver.
+        :return: the file name and path of the file, or `None` if there is none
+        """
+        digest = self.index['names'].get(name)
+        if not digest:
+            matching_entries = [entry for entry in self.index['entries'].values()
+                                if entry['file_name'].startswith(name)]
+            if matching_entries:
+                digest = max(matching_entries, key=lambda entry: entry['added'])['digest']
+
+        return self.use(digest) or self.find_flat_file(name)
+
+    def find_flat_file(self, name):
+        """
+        :return: the file name and path of the latest flat file of the cache directory whose file name starts with
+                 `name`, or `None` if there is none
+        """
+        if not os.path.isdir(self.cache_dir):
+            return None
+
+        matching_paths = [os.path.join(self.cache_dir, file_name) for file_name in os.listdir(self.cache_dir)
+                          if file_name.startswith(name) and not file_name.startswith('.') and
+                          not file_name.endswith(DOWNLOAD_SUFFIXES) and
+                          file_name not in (INDEX_FILE_NAME, LOCK_FILE_NAME)]
+        matching_paths = [path for path in matching_paths if os.path.isfile(path)]
+        if not matching_paths:
+            return None
+
+        latest_path = max(matching_paths, key=os.path.getctime)
+        return os.path.basename(latest_path), latest_path
+
+    def use(self, digest):
+        if not digest or digest not in self.index['entries']:
+            return None
+
+        with self.locked():
+            entry = self.index['entries'].get(digest)
+            if not entry:
+                return None
+
+            if not os.path.exists(self.path(entry)):
+                self.remove(digest)
+                return None
+
+            entry['last_used'] = time.time()
+
+            return entry['file_name'], self.path(entry)
+
+    def path(self, entry):
+        return os.path.join(self.cache_dir, entry['digest'], entry['file_name'])
+
+    def entries(self):
+        """
+        :return: the entries of the cache, most recently used first
+        """
+        return sorted(self.index['entries'].values(), key=lambda entry: entry['last_used'], reverse=True)
+
+    def total_size(self):
+        return sum(entry['size'] for entry in self.index['entries'].values())
+
+    def remove(self, digest):
+        entry = self.index['entries'].pop(digest, None)
+        if entry:
+            shutil.rmtree(os.path.join(self.cache_dir, digest), ignore_errors=True)
+            for uri in entry['uris']:
+                if self.index['uris'].get(uri) == digest:
+                    del self.index['uris'][uri]
+            for name in entry_names(entry):
+                if self.index['names'].get(name) == digest:
+                    del self.index['names'][name]
+
+        return entry
+
+    def evict(self, max_size=None, excluded=None):
+        """
+        Removes the least recently used files until the total size of the cache is within `max_size`.
+        :param max_size: the size to evict down to, defaults to the maximum size of the cache
+        :param excluded: the digests of the files which must be kept, e.g. the file being loaded
+        :return: the entries removed
+        """
+        max_size = self.max_size if max_size is None else max_size
+        excluded = excluded if excluded else []
+
+        removed_entries = []
+        total_size = self.total_size()
+        for entry in reversed(self.entries()):
+            if total_size <= max_size:
+                break
+
+            if entry['digest'] not in excluded:
+                removed_entries.append(self.remove(entry['digest']))
+                total_size -= entry['size']
+
+        return removed_entries
+
+    def remove_orphans(self):
+        """
+        Removes the digest directories of the cache which are not in the index, e.g. left by a command interrupted
+        while adding a file, the files cached by earlier releases, and the temporary files of the downloads abandoned
+        for `DOWNLOAD_STALE_SECONDS`. The downloads in progress are kept, as are the files which other resolvers cache
+        in the same directory.
+        :return: the paths removed, and their total size
+        """
+        removed_paths = []
+        removed_size = 0
+
+        if os.path.isdir(self.cache_dir):
+            now = time.time()
+            for file_name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, file_name)
+
+                if DIGEST_DIR_RE.match(file_name) and os.path.isdir(path):
+                    if file_name in self.index['entries']:
+                        continue
+
+                    removed_size += sum(os.path.getsize(os.path.join(dir_path, name))
+                                        for dir_path, _, names in os.walk(path) for name in names)
+                    shutil.rmtree(path, ignore_errors=True)
+                elif file_name.endswith(DOWNLOAD_SUFFIXES) and os.path.isfile(path) and \
+                        now - os.path.getmtime(path) >= DOWNLOAD_STALE_SECONDS:
+                    removed_size += os.path.getsize(path)
+                    os.remove(path)
+                elif LEGACY_FILE_RE.match(file_name) and os.path.isfile(path):
+                    removed_size += os.path.getsize(path)
+                    os.remove(path)
+                else:
+                    continue
+
+                removed_paths.append(path)
+
+        return removed_paths, removed_size
+
+    def verify(self):
+        """
+        Checks the contents of every cached file against its digest, removing the files which are missing or corrupted.
+        :return: the entries removed
+        """
+        removed_entries = []
+        for entry in list(self.index['entries'].values()):
+            path = self.path(entry)
+            if not os.path.exists(path) or file_digest(path) != entry['digest']:
+                removed_entries.append(self.remove(entry['digest']))
+
+        return removed_entries
+
+    @contextmanager
+    def locked(self):
+        """
+        Holds the lock of the cache, having read the index again. The index is saved once the lock is released.
+        """
+        with lock_file(os.path.join(self.cache_dir, LOCK_FILE_NAME)):
+            self.index = read_index(self.cache_dir)
+            yield self.index
+            write_index(self.cache_dir, self.index)
+
+
+def entry_names(entry):
+    if not entry['name']:
+        return []
+
+    return [entry['name']] + ['{}:{}'.format(entry['name'], tag) for tag in entry['tags']]
+
+
+def read_bundle_name(file_path, file_name):
+    """
+    :return: the name and tags of the bundle from its bundle.conf. Failing that, e.g. for a bundle configuration, the
+             name is the file name without its digest and extension.
+    """
+    try:
+        bundle_conf = ConfigFactory.parse_string(bundle_utils.conf(file_path) or '')
+        name = bundle_conf.get('name', None)
+        if name:
+            tags = [str(tag) for tag in bundle_conf.get('tags', [])]
+            if 'compatibilityVersion' in bundle_conf:
+                tags.append('v{}'.format(bundle_conf.get('compatibilityVersion')))
+            return name, tags
+    except Exception:
+        pass
+
+    base_name = os.path.splitext(file_name)[0]
+    name, separator, digest = base_name.rpartition('-')
+    return (name if separator and len(digest) == DIGEST_LENGTH else base_name), []
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(IO_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_index(cache_dir):
+    index = read_json(os.path.join(cache_dir, INDEX_FILE_NAME), None)
+    if isinstance(index, dict) and index.get('version') == INDEX_VERSION:
+        return index
+    else:
+        return {'version': INDEX_VERSION, 'entries': {}, 'uris': {}, 'names': {}}
+
+
+def write_index(cache_dir, index):
+    write_json(os.path.join(cache_dir, INDEX_FILE_NAME), index)
+
+
+def metadata_path(cache_dir, file_name):
+    return os.path.join(cache_dir, METADATA_DIR_NAME, file_name)
+
+
+def read_json(path, default):
+    """
+    :return: the value of the JSON file, or `default` if the file is missing or invalid
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path, value):
+    """
+    Replaces the JSON file atomically, so a concurrent command reads either the previous value or this one.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.{}.'.format(os.path.basename(path)))
+    with os.fdopen(fd, 'w', encoding='utf-8') as tmp_file:
+        json.dump(value, tmp_file, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def lock_file(path):
+    """
+    Holds the lock file `path`, created exclusively, waiting for a concurrent holder to release it. While held, the
+    lock is refreshed every `LOCK_REFRESH_SECONDS`, so however long the holder takes, the lock is only broken once it
+    has been left for `LOCK_STALE_SECONDS` by a command which has exited.
+    """
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+
+    while True:
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > LOCK_STALE_SECONDS:
+                    os.remove(path)
+            except OSError:
+                pass
+            time.sleep(0.05)
+
+    released = threading.Event()
+
+    def refresh():
+        while not released.wait(LOCK_REFRESH_SECONDS):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+    refresher = threading.Thread(target=refresh, daemon=True)
+    refresher.start()
+
+    try:
+        yield
+    finally:
+        released.set()
+        refresher.join()
+        os.remove(path)
+
+
+def is_same_path(a, b):
+    return os.path.abspath(a) == os.path.abspath(b)
+
+
+def log_removed(removed_entries):
+    log = logging.getLogger(__name__)
+    for entry in removed_entries:
+        log.verbose('Removed {} from the cache'.format(entry['file_name']))
@@ -64,52 +64,10 @@ def wait_for_deployment_complete(deployment_batch_id, args):
         else:
             return None
 
-    def get_deployment_event_sequence(deployment_event):
-        return deployment_event['deploymentSequence']
-
-    def get_deployment_event_timestamp(deployment_event):
-        return deployment_event['timestamp']
-
     def log_message_deployment(args, deployment_events):
         latest_events_to_display = [display_deploy_event(args, event) for event in deployment_events]
         return '\n'.join(latest_events_to_display)
 
-    def find_latest_deployment_events(deployments):
-        latest_events = []
-        if deployments:
-            for deployment in deployments:
-                latest_event = sorted(deployment['events'], key=get_deployment_event_sequence)[-1]
-                latest_events.append(latest_event)
-
-            latest_events = sorted(latest_events, key=get_deployment_event_timestamp)
-        return latest_events
-
-    def find_deployment_events_to_display(events_new, events_existing):
-        return [event for event in events_new if event not in events_existing]
-
-    def is_completed(deployment_events):
-        deployment_count = len(deployment_events)
-
-        completed_count = 0
-        all_successful = True
-        for entry in deployment_events:
-            for event in entry['events']:
-                if event['eventType'] == 'deploymentSuccess':
-                    completed_count += 1
-                elif event['eventType'] == 'deploymentFailure':
-                    completed_count += 1
-                    all_successful = False
-
-        return completed_count == deployment_count, all_successful
-
-    def is_completed_with_success(deployment_events):
-        all_completed, all_successful = is_completed(deployment_events)
-        return all_completed and all_successful
-
-    def has_deployment_failure(deployment_events):
-        all_completed, all_successful = is_completed(deployment_events)
-        return not all_successful
-
     log.info('Deployment batch id: {}'.format(deployment_batch_id))
 
     batch_events = get_batch_events(deployment_batch_id, args)
@@ -119,6 +77,7 @@ def wait_for_deployment_complete(deployment_batch_id, args):
     else:
         latest_state = None
         scheduled_deployments = []
+        deployment_event_store = DeploymentEventStore()
         wait_timeout = args.wait_timeout
         sse_heartbeat_count_after_event = 0
 
@@ -185,30 +144,22 @@ def wait_for_deployment_complete(deployment_batch_id, args):
                 else:
                     deployments = get_deployment_events(deployment_batch_id, args)
                     if deployments:
-                        if is_completed_with_success(deployments):
+                        deployment_events_to_display = deployment_event_store.ingest(deployments)
+
+                        if deployment_event_store.is_completed_with_success():
                             # Reprint previous message with flush to go to next line
                             log.progress('Success',
                                          flush=True,
                                          next_line=(latest_state is not None))
                             return
 
-                        elif has_deployment_failure(deployments):
-                            deployment_events_current = find_latest_deployment_events(deployments)
-                            deployment_events_previous = find_latest_deployment_events(latest_state)
-
-                            deployment_events_to_display = find_deployment_events_to_display(deployment_events_current,
-                                                                                             deployment_events_previous)
+                        elif deployment_event_store.has_deployment_failure():
                             log.progress('\n', flush=False, line_end='')
 
                             error_message = log_message_deployment(args, deployment_events_to_display)
                             raise ContinuousDeliveryError(error_message)
 
-                        elif deployments != latest_state:
-                            deployment_events_current = find_latest_deployment_events(deployments)
-                            deployment_events_previous = find_latest_deployment_events(latest_state)
-
-                            deployment_events_to_display = find_deployment_events_to_display(deployment_events_current,
-                                                                                             deployment_events_previous)
+                        elif deployment_events_to_display:
                             log.progress(log_message_deployment(args, deployment_events_to_display),
                                          flush=False,
                                          line_end='',
@@ -220,6 +171,74 @@ def wait_for_deployment_complete(deployment_batch_id, args):
     raise WaitTimeoutError('Deployment for {} is still waiting to be completed')
 
 
+class DeploymentEventStore:
+    """
+    Deployment events of a batch, indexed by deployment id and `deploymentSequence`.
+
+    The deployments endpoint returns every event of the batch each time it is polled. Only the events not seen before
+    are ingested, and the completion, failure and latest event of each deployment are maintained as they are ingested,
+    so a poll costs as much as the number of new events rather than the number of events of the batch.
+    """
+    def __init__(self):
+        self.events_by_deployment = {}
+        self.latest_events = {}
+        self.completed_deployments = set()
+        self.failed_deployments = set()
+        self.deployment_count = 0
+
+    def ingest(self, deployments):
+        """
+        Ingests the deployments as returned by `get_deployment_events`.
+        :return: the latest event of each deployment whose latest event has changed, ordered by timestamp
+        """
+        self.deployment_count = len(deployments)
+
+        latest_events_changed = {}
+        for deployment in deployments:
+            deployment_events = deployment['events']
+            if not deployment_events:
+                continue
+
+            deployment_id = get_deployment_id(deployment_events[0])
+            events_by_sequence = self.events_by_deployment.setdefault(deployment_id, {})
+            if len(events_by_sequence) == len(deployment_events):
+                continue
+
+            for event in deployment_events:
+                sequence = event['deploymentSequence']
+                if sequence in events_by_sequence:
+                    continue
+
+                events_by_sequence[sequence] = event
+
+                event_type = event['eventType']
+                if event_type == 'deploymentSuccess':
+                    self.completed_deployments.add(deployment_id)
+                elif event_type == 'deploymentFailure':
+                    self.completed_deployments.add(deployment_id)
+                    self.failed_deployments.add(deployment_id)
+
+                latest_event = self.latest_events.get(deployment_id)
+                if latest_event is None or latest_event['deploymentSequence'] < sequence:
+                    self.latest_events[deployment_id] = event
+                    latest_events_changed[deployment_id] = event
+
+        return sorted(latest_events_changed.values(), key=lambda event: event['timestamp'])
+
+    def is_completed(self):
+        return len(self.completed_deployments) == self.deployment_count
+
+    def is_completed_with_success(self):
+        return self.is_completed() and not self.failed_deployments
+
+    def has_deployment_failure(self):
+        return len(self.failed_deployments) > 0
+
+
+def get_deployment_id(deployment_event):
+    return deployment_event['deploymentKey']['deploymentId']
+
+
 def display_batch_event(batch_event):
     event_type = batch_event['eventType']
     if event_type == 'requestAccepted':
@@ -0,0 +1,88 @@
+from conductr_cli import conduct_url, sse_client
+from conductr_cli.bundle_state import BundleState
+
+
+class BundleEventBus:
+    """
+    Shares a single `bundles/events` stream between any number of waiters, so several bundles can be waited on at
+    the same time over one connection.
+
+    A waiter is an object providing the following:
+    - `start()`: checks the condition before the stream is opened, returning `True` if it is already met.
+    - `on_event(event)`: called for every event received from the stream, returning `True` once the condition is met.
+    - `timeout_error()`: the error to record if the stream ends before the condition is met.
+    - `shared`: set to `True` by the bus when the waiter is not the only one registered.
+    - `bundle_state`: set by the bus to the `bundle_state.BundleState` shared by all its waiters.
+    - `error`: set by the bus to the error raised by the waiter, if any.
+
+    A waiter that raises an error is removed from the bus, and the remaining waiters carry on.
+    """
+    def __init__(self, args, bundle_state=None):
+        self.args = args
+        self.bundle_state = bundle_state
+        self.waiters = []
+
+    def register(self, waiter):
+        self.waiters.append(waiter)
+        return waiter
+
+    def wait(self):
+        shared = len(self.waiters) > 1
+        bundle_state = self.bundle_state if self.bundle_state else BundleState(self.args)
+        for waiter in self.waiters:
+            waiter.shared = shared
+            waiter.bundle_state = bundle_state
+            waiter.error = None
+
+        pending = [waiter for waiter in self.waiters if not self.notify(waiter, waiter.start)]
+        if not pending:
+            return
+
+        bundle_events_url = conduct_url.url('bundles/events', self.args)
+        sse_events = sse_client.get_events(self.args.dcos_mode, conduct_url.conductr_host(self.args),
+                                           bundle_events_url,
+                                           auth=self.args.conductr_auth,
+                                           verify=self.args.server_verification_file)
+        for event in sse_events:
+            bundle_state.apply(event)
+            pending = [waiter for waiter in pending if not self.notify(waiter, waiter.on_event, event)]
+            if not pending:
+                return
+
+        for waiter in pending:
+            waiter.error = waiter.timeout_error()
+
+    @staticmethod
+    def notify(waiter, callback, *callback_args):
+        try:
+            return callback(*callback_args)
+        except Exception as e:
+            waiter.error = e
+            return True
+
+
+def wait_for(waiter, args):
+    """
+    Waits for a single waiter, raising its error if the condition is not met.
+    """
+    bus = BundleEventBus(args)
+    bus.register(waiter)
+    bus.wait()
+
+    if waiter.error:
+        raise waiter.error
+
+
+def wait_for_all(waiters, args, bundle_state=None):
+    """
+    Waits for all the waiters over a single stream. The total wait is as long as the longest of the waits.
+    :param bundle_state: the optional `bundle_state.BundleState` to share between the waiters, e.g. one already
+                         seeded by the caller
+    :return: the waiters which have failed to meet their condition, with the error recorded in `error`
+    """
+    bus = BundleEventBus(args, bundle_state)
+    for waiter in waiters:
+        bus.register(waiter)
+    bus.wait()
+
+    return [waiter for waiter in waiters if waiter.error]
@@ -3,15 +3,18 @@ from __future__ import unicode_literals
 import logging
 from datetime import datetime
 
-from conductr_cli import conduct_url, sse_client, control_protocol
+from conductr_cli import bundle_event_bus, control_protocol
 from conductr_cli.exceptions import WaitTimeoutError
 
 
-def count_installations(bundle_id, args):
-    bundles = control_protocol.get_bundles(args)
-    matching_bundles = [bundle for bundle in bundles if bundle['bundleId'] == bundle_id]
-    if matching_bundles:
-        matching_bundle = matching_bundles[0]
+def count_installations(bundle_id, args, bundle_state=None):
+    if bundle_state:
+        matching_bundle = bundle_state.get(bundle_id)
+    else:
+        bundles = control_protocol.get_bundles(args)
+        matching_bundle = next((bundle for bundle in bundles if bundle['bundleId'] == bundle_id), None)
+
+    if matching_bundle:
         if 'bundleInstallations' in matching_bundle:
             return len(matching_bundle['bundleInstallations'])
 
@@ -27,50 +30,77 @@ def wait_for_installation(bundle_id, args):
 
 
 def wait_for_condition(bundle_id, condition, condition_name, args):
-    log = logging.getLogger(__name__)
-    start_time = datetime.now()
-
-    installed_bundles = count_installations(bundle_id, args)
-    last_log_message = None
-    if condition(installed_bundles):
-        log.info('Bundle {} is {}'.format(bundle_id, condition_name))
-        return
-    else:
-        sse_heartbeat_count_after_event = 0
-
-        log.info('Bundle {} waiting to be {}'.format(bundle_id, condition_name))
-        bundle_events_url = conduct_url.url('bundles/events', args)
-        sse_events = sse_client.get_events(args.dcos_mode, conduct_url.conductr_host(args), bundle_events_url,
-                                           auth=args.conductr_auth, verify=args.server_verification_file)
-        for event in sse_events:
-            sse_heartbeat_count_after_event += 1
-
-            elapsed = (datetime.now() - start_time).total_seconds()
-            if elapsed > args.wait_timeout:
-                raise WaitTimeoutError('Bundle {} waiting to be {}'.format(bundle_id, condition_name))
-
-            # Check for installed bundles every 3 heartbeats from the last received event.
-            if event.event or (sse_heartbeat_count_after_event % 3 == 0):
-                if event.event:
-                    sse_heartbeat_count_after_event = 0
-
-                installed_bundles = count_installations(bundle_id, args)
-                if condition(installed_bundles):
-                    # Reprint previous message with flush to go to next line
-                    if last_log_message:
-                        log.progress(last_log_message, flush=True)
-
-                    log.info('Bundle {} {}'.format(bundle_id, condition_name))
-                    return
+    bundle_event_bus.wait_for(InstallationWaiter(bundle_id, condition, condition_name, args), args)
+
+
+class InstallationWaiter:
+    """
+    Waits on the `bundle_event_bus.BundleEventBus` for the installations of a bundle to meet the given condition.
+    """
+    def __init__(self, bundle_id, condition, condition_name, args):
+        self.bundle_id = bundle_id
+        self.condition = condition
+        self.condition_name = condition_name
+        self.args = args
+        self.shared = False
+        self.bundle_state = None
+        self.error = None
+        self.start_time = None
+        self.sse_heartbeat_count_after_event = 0
+        self.last_log_message = None
+
+    def start(self):
+        log = logging.getLogger(__name__)
+        self.start_time = datetime.now()
+
+        installed_bundles = count_installations(self.bundle_id, self.args, bundle_state=self.bundle_state)
+        if self.condition(installed_bundles):
+            log.info('Bundle {} is {}'.format(self.bundle_id, self.condition_name))
+            return True
+        else:
+            log.info('Bundle {} waiting to be {}'.format(self.bundle_id, self.condition_name))
+            return False
+
+    def on_event(self, event):
+        log = logging.getLogger(__name__)
+        self.sse_heartbeat_count_after_event += 1
+
+        elapsed = (datetime.now() - self.start_time).total_seconds()
+        if elapsed > self.args.wait_timeout:
+            raise self.timeout_error()
+
+        # Check for installed bundles every 3 heartbeats from the last received event.
+        if event.event or (self.sse_heartbeat_count_after_event % 3 == 0):
+            if event.event:
+                self.sse_heartbeat_count_after_event = 0
+
+            installed_bundles = count_installations(self.bundle_id, self.args, bundle_state=self.bundle_state)
+            if self.condition(installed_bundles):
+                # Reprint previous message with flush to go to next line
+                if self.last_log_message:
+                    self.progress(self.last_log_message, flush=True)
+
+                log.info('Bundle {} {}'.format(self.bundle_id, self.condition_name))
+                return True
+            else:
+                if self.last_log_message:
+                    self.last_log_message = '{}.'.format(self.last_log_message)
                 else:
-                    if last_log_message:
-                        last_log_message = '{}.'.format(last_log_message)
-                    else:
-                        last_log_message = 'Bundle {} still waiting to be {}'.format(bundle_id, condition_name)
+                    self.last_log_message = 'Bundle {} still waiting to be {}'.format(self.bundle_id,
+                                                                                      self.condition_name)
+
+                self.progress(self.last_log_message, flush=False)
+
+        return False
 
-                    log.progress(last_log_message, flush=False)
+    def progress(self, message, flush):
+        # Progress lines are rewritten in place, which only works if no other waiter is writing to the terminal.
+        if not self.shared:
+            log = logging.getLogger(__name__)
+            log.progress(message, flush=flush)
 
-        raise WaitTimeoutError('Bundle {} waiting to be {}'.format(bundle_id, condition_name))
+    def timeout_error(self):
+        return WaitTimeoutError('Bundle {} waiting to be {}'.format(self.bundle_id, self.condition_name))
 
 
 def is_installed(number_of_installations):
@@ -1,19 +1,23 @@
 from __future__ import unicode_literals
-from conductr_cli import conduct_events, conduct_logs, conduct_url, sse_client, control_protocol
+from conductr_cli import bundle_event_bus, conduct_events, conduct_logs, control_protocol
 from conductr_cli.exceptions import BundleScaleError, WaitTimeoutError
 from datetime import datetime
 from requests import HTTPError
+import copy
 import logging
 
 
 IGNORE_ERROR_FIRST_SECONDS = 10  # The number of seconds where bundle error will be ignored
 
 
-def get_scale(bundle_id, wait_for_is_active, args):
-    bundles = control_protocol.get_bundles(args)
-    matching_bundles = [bundle for bundle in bundles if bundle['bundleId'] == bundle_id]
-    if matching_bundles:
-        matching_bundle = matching_bundles[0]
+def get_scale(bundle_id, wait_for_is_active, args, bundle_state=None):
+    if bundle_state:
+        matching_bundle = bundle_state.get(bundle_id)
+    else:
+        bundles = control_protocol.get_bundles(args)
+        matching_bundle = next((bundle for bundle in bundles if bundle['bundleId'] == bundle_id), None)
+
+    if matching_bundle:
         has_error = matching_bundle['hasError']
         if 'bundleExecutions' in matching_bundle:
             started_executions = [bundle_execution
@@ -25,71 +29,102 @@ def get_scale(bundle_id, wait_for_is_active, args):
 
 
 def wait_for_scale(bundle_id, expected_scale, wait_for_is_active, args):
-    log = logging.getLogger(__name__)
-    start_time = datetime.now()
+    bundle_event_bus.wait_for(ScaleWaiter(bundle_id, expected_scale, wait_for_is_active, args), args)
+
+
+class ScaleWaiter:
+    """
+    Waits on the `bundle_event_bus.BundleEventBus` for a bundle to reach its expected scale.
+    """
+    def __init__(self, bundle_id, expected_scale, wait_for_is_active, args):
+        self.bundle_id = bundle_id
+        self.expected_scale = expected_scale
+        self.wait_for_is_active = wait_for_is_active
+        self.args = args
+        self.shared = False
+        self.bundle_state = None
+        self.error = None
+        self.start_time = None
+        self.sse_heartbeat_count_after_event = 0
+        self.last_scale = -1
+        self.last_log_message = None
+
+    def start(self):
+        log = logging.getLogger(__name__)
+        self.start_time = datetime.now()
+
+        (bundle_scale, has_error) = get_scale(self.bundle_id, self.wait_for_is_active, self.args, bundle_state=self.bundle_state)
+        # Ignore initial error to wait for the bundle to start and correct itself.
+        if bundle_scale == self.expected_scale:
+            log.info('Bundle {} expected scale {} is met'.format(self.bundle_id, self.expected_scale))
+            return True
+        else:
+            log.info('Bundle {} waiting to reach expected scale {}'.format(self.bundle_id, self.expected_scale))
+            return False
 
-    (bundle_scale, has_error) = get_scale(bundle_id, wait_for_is_active, args)
-    # Ignore initial error to wait for the bundle to start and correct itself.
-    if bundle_scale == expected_scale:
-        log.info('Bundle {} expected scale {} is met'.format(bundle_id, expected_scale))
-        return
-    else:
-        sse_heartbeat_count_after_event = 0
+    def on_event(self, event):
+        log = logging.getLogger(__name__)
+        self.sse_heartbeat_count_after_event += 1
 
-        log.info('Bundle {} waiting to reach expected scale {}'.format(bundle_id, expected_scale))
-        bundle_events_url = conduct_url.url('bundles/events', args)
-        sse_events = sse_client.get_events(args.dcos_mode, conduct_url.conductr_host(args), bundle_events_url,
-                                           auth=args.conductr_auth, verify=args.server_verification_file)
-        last_scale = -1
-        last_log_message = None
-        for event in sse_events:
-            sse_heartbeat_count_after_event += 1
+        elapsed = (datetime.now() - self.start_time).total_seconds()
+        if elapsed > self.args.wait_timeout:
+            raise self.timeout_error()
 
-            elapsed = (datetime.now() - start_time).total_seconds()
-            if elapsed > args.wait_timeout:
-                raise WaitTimeoutError('Bundle {} waiting to reach expected scale {}'.format(bundle_id, expected_scale))
+        # Check for bundle scale every 3 heartbeats from the last received event.
+        if event.event or (self.sse_heartbeat_count_after_event % 3 == 0):
+            if event.event:
+                self.sse_heartbeat_count_after_event = 0
 
-            # Check for bundle scale every 3 heartbeats from the last received event.
-            if event.event or (sse_heartbeat_count_after_event % 3 == 0):
-                if event.event:
-                    sse_heartbeat_count_after_event = 0
+            (bundle_scale, has_error) = get_scale(self.bundle_id, self.wait_for_is_active, self.args, bundle_state=self.bundle_state)
 
-                (bundle_scale, has_error) = get_scale(bundle_id, wait_for_is_active, args)
+            # Ignore error as long as the time elapsed is below threshold specified by IGNORE_ERROR_FIRST_SECONDS.
+            # This is done to allow the CLI to wait for the bundle to start and correct its error.
+            ignore_error = elapsed <= IGNORE_ERROR_FIRST_SECONDS
 
-                # Ignore error as long as the time elapsed is below threshold specified by IGNORE_ERROR_FIRST_SECONDS.
-                # This is done to allow the CLI to wait for the bundle to start and correct its error.
-                ignore_error = elapsed <= IGNORE_ERROR_FIRST_SECONDS
+            if has_error and not ignore_error:
+                # Reprint previous message with flush to go to next line
+                if self.last_log_message:
+                    self.progress(self.last_log_message, flush=True)
 
-                if has_error and not ignore_error:
-                    # Reprint previous message with flush to go to next line
-                    if last_log_message:
-                        log.progress(last_log_message, flush=True)
+                display_bundle_scale_error_message(self.bundle_id, self.args)
 
-                    display_bundle_scale_error_message(bundle_id, args)
+                raise BundleScaleError(self.bundle_id)
+            elif bundle_scale == self.expected_scale:
+                # Reprint previous message with flush to go to next line
+                if self.last_log_message:
+                    self.progress(self.last_log_message, flush=True)
 
-                    raise BundleScaleError(bundle_id)
-                elif bundle_scale == expected_scale:
-                    # Reprint previous message with flush to go to next line
-                    if last_log_message:
-                        log.progress(last_log_message, flush=True)
+                log.info('Bundle {} expected scale {} is met'.format(self.bundle_id, self.expected_scale))
+                return True
+            else:
+                if bundle_scale > self.last_scale:
+                    self.last_scale = bundle_scale
 
-                    log.info('Bundle {} expected scale {} is met'.format(bundle_id, expected_scale))
-                    return
+                    # Reprint previous message with flush to go to next line
+                    if self.last_log_message:
+                        self.progress(self.last_log_message, flush=True)
+
+                    self.last_log_message = 'Bundle {} has scale {}, expected {}'.format(
+                        self.bundle_id, bundle_scale, self.expected_scale)
+                    if self.shared:
+                        # Each change of scale gets its own line when other waiters are writing to the terminal.
+                        log.info(self.last_log_message)
+                    else:
+                        self.progress(self.last_log_message, flush=False)
                 else:
-                    if bundle_scale > last_scale:
-                        last_scale = bundle_scale
+                    self.last_log_message = '{}.'.format(self.last_log_message)
+                    self.progress(self.last_log_message, flush=False)
 
-                        # Reprint previous message with flush to go to next line
-                        if last_log_message:
-                            log.progress(last_log_message, flush=True)
+        return False
 
-                        last_log_message = 'Bundle {} has scale {}, expected {}'.format(bundle_id, bundle_scale, expected_scale)
-                        log.progress(last_log_message, flush=False)
-                    else:
-                        last_log_message = '{}.'.format(last_log_message)
-                        log.progress(last_log_message, flush=False)
+    def progress(self, message, flush):
+        # Progress lines are rewritten in place, which only works if no other waiter is writing to the terminal.
+        if not self.shared:
+            log = logging.getLogger(__name__)
+            log.progress(message, flush=flush)
 
-        raise WaitTimeoutError('Bundle {} waiting to reach expected scale {}'.format(bundle_id, expected_scale))
+    def timeout_error(self):
+        return WaitTimeoutError('Bundle {} waiting to reach expected scale {}'.format(self.bundle_id, self.expected_scale))
 
 
 def display_bundle_scale_error_message(bundle_id, args):
@@ -103,8 +138,13 @@ def display_bundle_scale_error_message(bundle_id, args):
         # handlers (i.e. @validation.handle_bndl_create_error) raised within unit test.
         log.info('Check latest bundle events with:')
         log.info('  conduct events {}'.format(bundle_id))
+        # `run`, `stop` and `wait` accept `--follow` to follow the bundle logs. The current events are shown once,
+        # as following them would never end and the logs would not be shown.
+        events_args = copy.copy(args)
+        events_args.follow = False
+
         log.info('Current bundle events:')
-        conduct_events.events(args)
+        conduct_events.events(events_args)
         log.info('')
 
         log.info('Check latest bundle logs with:')
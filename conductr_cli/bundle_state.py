@@ -0,0 +1,49 @@
+from conductr_cli import control_protocol
+from conductr_cli.constants import BUNDLE_STATE_RECONCILE_INTERVAL_SECONDS
+from datetime import datetime
+
+
+class BundleState:
+    """
+    Local copy of the bundles of a cluster, indexed by bundle id.
+
+    The copy is seeded by a single `/bundles` request when first queried. The `bundles/events` stream is applied to it
+    with `apply()`: the events of this stream carry no payload, so an event only marks the copy as outdated, and the
+    next query fetches `/bundles` once on behalf of every waiter sharing this state. Heartbeats leave the copy as it
+    is, although it is reconciled with the cluster at least once every `reconcile_interval` seconds in case an event
+    has been missed.
+    """
+    def __init__(self, args, reconcile_interval=BUNDLE_STATE_RECONCILE_INTERVAL_SECONDS):
+        self.args = args
+        self.reconcile_interval = reconcile_interval
+        self.bundles = {}
+        self.is_outdated = True
+        self.last_reconciled = None
+
+    def get(self, bundle_id):
+        """
+        :param bundle_id: the full bundle id
+        :return: the bundle as returned by `/bundles`, or `None` if the cluster does not have the bundle
+        """
+        if self.is_outdated or self.is_reconcile_due():
+            self.reconcile()
+
+        return self.bundles.get(bundle_id)
+
+    def apply(self, event):
+        if event.event:
+            self.is_outdated = True
+
+    def reconcile(self):
+        self.update(control_protocol.get_bundles(self.args))
+
+    def update(self, bundles):
+        """
+        Replaces the local copy with the given `/bundles` snapshot, e.g. one already fetched by the caller.
+        """
+        self.bundles = {bundle['bundleId']: bundle for bundle in bundles}
+        self.is_outdated = False
+        self.last_reconciled = datetime.now()
+
+    def is_reconcile_due(self):
+        return (datetime.now() - self.last_reconciled).total_seconds() >= self.reconcile_interval
@@ -0,0 +1,103 @@
+from conductr_cli import bundle_cache, bundle_utils, docker_blob_cache, screen_utils
+from conductr_cli.bytes_util import natural_size
+from conductr_cli.conduct_info_common import DISPLAY_PADDING
+import arrow
+import logging
+
+
+def caches(args):
+    """
+    :return: the name and `bundle_cache.BundleCache` of the bundle and configuration caches
+    """
+    return [
+        ('bundle', bundle_cache.BundleCache(args.bundle_resolve_cache_dir)),
+        ('configuration', bundle_cache.BundleCache(args.configuration_resolve_cache_dir))
+    ]
+
+
+def cache_ls(args):
+    """`conduct cache ls` command"""
+
+    log = logging.getLogger(__name__)
+
+    data = [
+        {
+            'cache': cache_name,
+            'name': entry['name'],
+            'tags': ', '.join(entry['tags']),
+            'digest': entry['digest'] if args.long_ids else bundle_utils.short_id(entry['digest']),
+            'size': natural_size(entry['size']),
+            'last_used': arrow.get(entry['last_used']).humanize()
+        } for cache_name, cache in caches(args) for entry in cache.entries()
+    ]
+    data.insert(0, {'cache': 'CACHE', 'name': 'NAME', 'tags': 'TAGS', 'digest': 'DIGEST', 'size': 'SIZE',
+                    'last_used': 'LAST USED'})
+
+    column_widths = dict(screen_utils.calc_column_widths(data), **{'padding': ' ' * DISPLAY_PADDING})
+    for row in data:
+        log.screen('''\
+{cache: <{cache_width}}{padding}\
+{name: <{name_width}}{padding}\
+{tags: <{tags_width}}{padding}\
+{digest: <{digest_width}}{padding}\
+{size: >{size_width}}{padding}\
+{last_used: <{last_used_width}}'''.format(**dict(row, **column_widths)).rstrip())
+
+    return True
+
+
+def cache_prune(args):
+    """`conduct cache prune` command"""
+
+    log = logging.getLogger(__name__)
+
+    max_size = 0 if args.all else args.max_size * 1024 * 1024
+    for cache_name, cache in caches(args):
+        with cache.locked():
+            removed_paths, removed_size = cache.remove_orphans()
+            removed_entries = cache.evict(max_size)
+
+        for path in removed_paths:
+            log.verbose('Removed {} from the {} cache'.format(path, cache_name))
+        bundle_cache.log_removed(removed_entries)
+
+        removed_count = len(removed_paths) + len(removed_entries)
+        removed_size += sum(entry['size'] for entry in removed_entries)
+        log.info('Removed {} files of the {} cache, freeing {}'.format(removed_count, cache_name,
+                                                                       natural_size(removed_size)))
+
+    return True
+
+
+def cache_verify(args):
+    """`conduct cache verify` command"""
+
+    log = logging.getLogger(__name__)
+
+    is_valid = True
+    for cache_name, cache in caches(args):
+        with cache.locked():
+            removed_entries = cache.verify()
+
+        for entry in removed_entries:
+            log.warning('Removed {} from the {} cache: its file is missing or does not match its digest {}'.format(
+                entry['file_name'], cache_name, entry['digest']))
+
+        if removed_entries:
+            is_valid = False
+        else:
+            log.info('Verified {} files of the {} cache'.format(len(cache.index['entries']), cache_name))
+
+    return is_valid
+
+
+def cache_gc(args):
+    """`conduct cache gc` command"""
+
+    log = logging.getLogger(__name__)
+
+    blob_cache = docker_blob_cache.DockerBlobCache(args.bundle_resolve_cache_dir, max_size=args.max_size * 1024 * 1024)
+    removed_count, removed_size = blob_cache.gc()
+    log.info('Removed {} files of the Docker cache, freeing {}'.format(removed_count, natural_size(removed_size)))
+
+    return True
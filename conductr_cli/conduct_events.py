@@ -1,6 +1,11 @@
 import logging
 
-from conductr_cli import validation, screen_utils, control_protocol
+from conductr_cli import conduct_logs, conduct_url, validation, screen_utils, control_protocol, record_stream, \
+    sse_client
+from conductr_cli.conduct_url import conductr_host
+
+
+EVENT_FIELDS = ['timestamp', 'event', 'description']
 
 
 @validation.handle_connection_error
@@ -9,14 +14,19 @@ def events(args):
     """`conduct events` command"""
 
     log = logging.getLogger(__name__)
+
+    if vars(args).get('follow'):
+        return follow_events(args)
+
+    if vars(args).get('output_format'):
+        with record_stream.open_writer(args, EVENT_FIELDS) as writer:
+            for event in control_protocol.stream_bundle_events(args, args.lines):
+                writer.write({field: event.get(field) for field in EVENT_FIELDS})
+
+        return True
+
     bundle_events = control_protocol.get_bundle_events(args, args.lines)
-    data = [
-        {
-            'time': validation.format_timestamp(event['timestamp'], args),
-            'event': event['event'],
-            'description': event['description']
-        } for event in bundle_events
-    ]
+    data = [event_row(event, args) for event in bundle_events]
     data.insert(0, {'time': 'TIME', 'event': 'EVENT', 'description': 'DESC'})
 
     padding = 2
@@ -29,3 +39,59 @@ def events(args):
 {description: <{description_width}}{padding}'''.format(**dict(row, **column_widths)).rstrip())
 
     return True
+
+
+def follow_events(args):
+    """
+    Shows the latest events of the bundle, then the new events as they occur.
+
+    The `bundles/events` stream signals that the bundles have changed without telling which bundle or how, so every
+    event of the stream is followed by a request for the latest events of the bundle, of which only the new ones are
+    shown. The number of events requested adapts to the rate at which they occur, as when following logs. Heartbeats
+    are ignored, so a quiet bundle costs nothing but the stream's connection.
+    """
+    follower = conduct_logs.LogFollower(args.lines, 0, key=event_key, kind='events')
+
+    writer = record_stream.open_writer(args, EVENT_FIELDS) if vars(args).get('output_format') else None
+    try:
+        display_new_events(args, follower, writer)
+
+        bundle_events_url = conduct_url.url('bundles/events', args)
+        sse_events = sse_client.get_events(args.dcos_mode, conductr_host(args), bundle_events_url,
+                                           auth=args.conductr_auth,
+                                           verify=args.server_verification_file)
+        for sse_event in sse_events:
+            if sse_event.event:
+                display_new_events(args, follower, writer)
+    finally:
+        if writer:
+            writer.close()
+
+    return True
+
+
+def display_new_events(args, follower, writer):
+    log = logging.getLogger(__name__)
+
+    bundle_events = control_protocol.get_bundle_events(args, follower.count)
+    for row in follower.new_lines([event_row(event, args) for event in bundle_events]):
+        if writer:
+            writer.write({field: row[field] for field in EVENT_FIELDS})
+        else:
+            log.screen('{time} {event} {description}'.format(**row))
+
+    if writer:
+        writer.flush()
+
+
+def event_row(event, args):
+    return {
+        'timestamp': event['timestamp'],
+        'time': validation.format_timestamp(event['timestamp'], args),
+        'event': event['event'],
+        'description': event['description']
+    }
+
+
+def event_key(row):
+    return row['timestamp'], row['event'], row['description']
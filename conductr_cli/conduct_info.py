@@ -1,4 +1,5 @@
-from conductr_cli import conduct_info_inspect, conduct_info_list, validation, control_protocol
+from conductr_cli import conduct_info_inspect, conduct_info_list, validation, control_protocol, \
+    control_protocol_async
 
 
 @validation.handle_connection_error
@@ -6,8 +7,16 @@ from conductr_cli import conduct_info_inspect, conduct_info_list, validation, co
 def info(args):
     """`conduct info command"""
 
-    bundles = control_protocol.get_bundles(args)
     if args.bundle:
+        bundles = control_protocol.get_bundles(args)
         return conduct_info_inspect.display_bundle(args, bundles, args.bundle)
-    else:
+    elif args.quiet:
+        bundles = control_protocol.get_bundles(args)
         return conduct_info_list.display_bundles(args, bundles)
+    else:
+        # The license is independent of the bundles, so both are requested at the same time.
+        bundles, (is_license_success, conductr_license) = control_protocol_async.fan_out(
+            lambda client: client.get_bundles(args),
+            lambda client: client.get_license(args))
+        conduct_info_list.display_bundles_default(args, is_license_success, conductr_license, bundles)
+        return True
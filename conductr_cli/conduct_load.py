@@ -9,7 +9,6 @@ from conductr_cli.bndl_utils import BndlFormat
 from functools import partial
 from requests_toolbelt.multipart.encoder import MultipartEncoder, MultipartEncoderMonitor
 
-import glob
 import io
 import os
 import stat
@@ -48,9 +47,6 @@ BNDL_ARGS = {
 # it cannot be detected from the configuration
 BNDL_ARGS_WITH_COMPONENT = ['endpoint_dicts', 'start_command_dicts', 'volume_dicts']
 
-# The number of old bundle versions to keep when performing housekeeping, apart from the recently loaded bundle.
-KEEP_BUNDLE_VERSIONS = 1
-
 
 @validation.handle_connection_error
 @validation.handle_http_error
@@ -123,8 +119,6 @@ def load_v1(args):
     if not args.no_wait:
         bundle_installation.wait_for_installation(response_json['bundleId'], args)
 
-    cleanup_old_bundles(bundle_resolve_cache_dir, bundle_file_name, excluded=bundle_file)
-
     log.info('Bundle loaded.')
     if not args.disable_instructions:
         log.info('Start bundle with:        {} run{} {}'.format(args.command, args.cli_parameters, bundle_id))
@@ -291,8 +285,6 @@ def load_v2(args):
     if not args.no_wait:
         bundle_installation.wait_for_installation(response_json['bundleId'], args)
 
-    cleanup_old_bundles(bundle_resolve_cache_dir, bundle_file_name, excluded=bundle_file)
-
     log.info('Bundle loaded.')
     if not args.disable_instructions:
         log.info('Start bundle with:        {} run{} {}'.format(args.command, args.cli_parameters, bundle_id))
@@ -359,28 +351,3 @@ def conduct_load_progress_monitor(log):
 
 def string_io(input_text):
     return io.StringIO(input_text)
-
-
-def cleanup_old_bundles(cache_dir, bundle_file_name, excluded):
-    bundle_name_parts = bundle_file_name.split('-')
-    # Remove digest, keeping only bundle name and tag
-    bundle_name = '-'.join(bundle_name_parts[:-1])
-
-    # List of bundle files having the same name and tag, sorted from oldest to latest.
-    # This list excludes the file specified as `excluded`, and normally the `excluded` file is the recently loaded
-    # bundle.
-    older_bundle_files = sorted([
-        file
-        for file in glob.glob('{}/*.zip'.format(cache_dir))
-        if os.path.isfile(file) and
-        os.path.basename(file).startswith(bundle_name) and
-        not is_same_path(file, excluded)
-    ], key=lambda f: os.path.getmtime(f))
-
-    bundle_files_to_delete = older_bundle_files[:(-1 * KEEP_BUNDLE_VERSIONS)]
-    for file in bundle_files_to_delete:
-        os.remove(file)
-
-
-def is_same_path(a, b):
-    return os.path.abspath(a) == os.path.abspath(b)
@@ -1,14 +1,23 @@
-from conductr_cli import validation, conduct_request, conduct_url, screen_utils
+from conductr_cli import bundle_batch, bundle_utils, conduct_info_inspect, control_protocol, \
+    control_protocol_async, record_stream, validation, conduct_request, conduct_url, screen_utils
 from conductr_cli.conduct_url import conductr_host
-from conductr_cli.constants import LOGS_FOLLOW_ERROR_SLEEP_SECONDS, LOGS_POLL_PERIOD_SECONDS
+from conductr_cli.constants import BATCH_WORKERS, LOGS_FOLLOW_ERROR_SLEEP_SECONDS, LOGS_FOLLOW_MAX_LINES, \
+    LOGS_FOLLOW_MIN_POLL_PERIOD_SECONDS, LOGS_POLL_PERIOD_SECONDS
 from conductr_cli.http import DEFAULT_HTTP_TIMEOUT
+from collections import deque
 from urllib.parse import quote_plus
+import functools
+import heapq
 import itertools
 import json
 import logging
 import time
 
 
+LOG_FIELDS = ['timestamp', 'host', 'message']
+MERGED_LOG_FIELDS = ['timestamp', 'bundle', 'host', 'message']
+
+
 @validation.handle_connection_error
 @validation.handle_http_error
 def logs(args):
@@ -19,30 +28,30 @@ def logs(args):
     if args.lines == 0:
         args.lines = 50 if args.follow else 10
 
+    if bundle_batch.is_batch(args):
+        return logs_merged(args)
+
     if args.follow:
-        old_data = []
         poll_period = args.follow_poll_period if 'follow_poll_period' in vars(args) else LOGS_POLL_PERIOD_SECONDS
+        follower = LogFollower(args.lines, poll_period)
 
-        # we infinite-loop which will run the program until we receive a signal (e.g. CTRL-C)
-        # by using itertools.count(), we can control the number of executions for testing via mocks
-        for _ in itertools.count():
-            data = fetch_log_data_ignore_errors(args)
-
-            if data is False:
-                time.sleep(LOGS_FOLLOW_ERROR_SLEEP_SECONDS)
-            else:
-                new_data, truncated = new_lines(old_data, data)
-
-                if truncated:
-                    log.warning('Unable to reconcile logs; some lines may not be shown')
+        with LineWriter(args, LOG_FIELDS) as writer:
+            # we infinite-loop which will run the program until we receive a signal (e.g. CTRL-C)
+            # by using itertools.count(), we can control the number of executions for testing via mocks
+            for _ in itertools.count():
+                data = fetch_log_data_ignore_errors(args, follower.count)
 
-                for row in new_data:
-                    log.screen('{0} {1} {2}'.format(row['time'], row['host'], row['log'].rstrip()))
+                if data is False:
+                    time.sleep(LOGS_FOLLOW_ERROR_SLEEP_SECONDS)
+                else:
+                    writer.write(follower.new_lines(data))
 
-                if len(new_data) > 0:
-                    old_data = data
-
-                time.sleep(poll_period)
+                    time.sleep(follower.poll_period)
+    elif vars(args).get('output_format'):
+        # The lines are written as they are decoded, without holding the response in memory.
+        with record_stream.open_writer(args, LOG_FIELDS) as writer:
+            for event in control_protocol.stream_bundle_logs(args, args.lines):
+                writer.write({'timestamp': event['timestamp'], 'host': event['host'], 'message': event['message']})
     else:
         data = fetch_log_data(args)
         data.insert(0, {'time': 'TIME', 'host': 'HOST', 'log': 'LOG'})
@@ -59,10 +68,11 @@ def logs(args):
     return True
 
 
-def fetch_log_data(args):
+def fetch_log_data(args, count=None):
     log = logging.getLogger(__name__)
 
-    request_url = conduct_url.url('bundles/{}/logs?count={}'.format(quote_plus(args.bundle), args.lines), args)
+    count = count if count else args.lines
+    request_url = conduct_url.url('bundles/{}/logs?count={}'.format(quote_plus(args.bundle), count), args)
 
     response = conduct_request.get(args.dcos_mode, conductr_host(args), request_url, auth=args.conductr_auth,
                                    verify=args.server_verification_file, timeout=DEFAULT_HTTP_TIMEOUT)
@@ -74,6 +84,7 @@ def fetch_log_data(args):
 
     return [
         {
+            'timestamp': event['timestamp'],
             'time': validation.format_timestamp(event['timestamp'], args),
             'host': event['host'],
             'log': event['message']
@@ -83,28 +94,241 @@ def fetch_log_data(args):
 
 @validation.handle_connection_error
 @validation.handle_http_error
-def fetch_log_data_ignore_errors(args):
-    return fetch_log_data(args)
+def fetch_log_data_ignore_errors(args, count=None):
+    return fetch_log_data(args, count)
+
+
+def logs_merged(args):
+    """
+    Shows the logs of several bundles, fetched concurrently and merged by time, with the bundle of every line.
+    """
+    log = logging.getLogger(__name__)
+
+    bundles = control_protocol.get_bundles(args)
+    selected_bundles = bundle_batch.select_bundles(args, bundles)
+    if not selected_bundles:
+        log.error('No bundles to show the logs of. Specify the bundles, or select them with --role or --system')
+        return False
+
+    names = bundle_names(bundles, selected_bundles)
+    sources_args = [bundle_batch.bundle_args(args, bundle) for bundle in selected_bundles]
+
+    if args.follow:
+        poll_period = args.follow_poll_period if 'follow_poll_period' in vars(args) else LOGS_POLL_PERIOD_SECONDS
+        followers = [LogFollower(args.lines, poll_period) for _ in selected_bundles]
+
+        with LineWriter(args, MERGED_LOG_FIELDS) as writer:
+            for _ in itertools.count():
+                sources_data = fetch_all_log_data(fetch_log_data_ignore_errors, sources_args,
+                                                  [follower.count for follower in followers])
+
+                if all(data is False for data in sources_data):
+                    time.sleep(LOGS_FOLLOW_ERROR_SLEEP_SECONDS)
+                else:
+                    new_lines = [
+                        follower.new_lines(data) if data is not False else []
+                        for follower, data in zip(followers, sources_data)
+                    ]
+                    writer.write(merge_log_data(names, new_lines))
+
+                    time.sleep(min(follower.poll_period for follower in followers))
+    else:
+        sources_data = fetch_all_log_data(fetch_log_data, sources_args, [args.lines] * len(sources_args))
+
+        if vars(args).get('output_format'):
+            with record_stream.open_writer(args, MERGED_LOG_FIELDS) as writer:
+                for row in merge_log_data(names, sources_data):
+                    writer.write(log_record(row))
+
+            return True
+
+        data = merge_log_data(names, sources_data)
+        data.insert(0, {'time': 'TIME', 'bundle': 'BUNDLE', 'host': 'HOST', 'log': 'LOG'})
+
+        padding = 2
+        column_widths = dict(screen_utils.calc_column_widths(data), **{'padding': ' ' * padding})
+
+        for row in data:
+            log.screen('''\
+{time: <{time_width}}{padding}\
+{bundle: <{bundle_width}}{padding}\
+{host: <{host_width}}{padding}\
+{log: <{log_width}}{padding}'''.format(**dict(row, **column_widths)).rstrip())
+
+    return True
+
+
+def bundle_names(bundles, selected_bundles):
+    """
+    :return: the name displayed for each of the selected bundles, i.e. its bundle name, qualified by its short id if
+             several of the selected bundles share that name
+    """
+    matching_bundles = [
+        conduct_info_inspect.filter_bundles_by_id_or_name(bundles, bundle_id_or_name)
+        for bundle_id_or_name in selected_bundles
+    ]
+    names = [
+        matches[0]['attributes']['bundleName'] if len(matches) == 1 else bundle_id_or_name
+        for bundle_id_or_name, matches in zip(selected_bundles, matching_bundles)
+    ]
+    return [
+        '{}:{}'.format(name, bundle_utils.short_id(matches[0]['bundleId']))
+        if len(matches) == 1 and names.count(name) > 1 else name
+        for name, matches in zip(names, matching_bundles)
+    ]
+
+
+def fetch_all_log_data(fetch, sources_args, counts):
+    """
+    Fetches the logs of every bundle concurrently through a bounded pool of workers.
+    :param fetch: either `fetch_log_data` or `fetch_log_data_ignore_errors`
+    :return: the result of `fetch` for every bundle, in the order of the bundles
+    """
+    return control_protocol_async.fan_out(
+        *[functools.partial(request_log_data, fetch, source_args, count)
+          for source_args, count in zip(sources_args, counts)],
+        max_workers=min(BATCH_WORKERS, len(sources_args)))
+
+
+def request_log_data(fetch, args, count, client):
+    return client.request(fetch, args, count)
+
+
+def merge_log_data(names, sources_data):
+    """
+    Merges the rows of several bundles by timestamp, each being oldest first already, in a single pass.
+    :param names: the name of every bundle, added to its rows as `bundle`
+    :param sources_data: the rows of every bundle, as returned by `fetch_log_data`
+    :return: the rows of all the bundles, oldest first
+    """
+    # The position of a row breaks ties between rows with the same timestamp, so that the rows are never compared.
+    decorated_sources = [
+        [(row['timestamp'], index, position, row) for position, row in enumerate(data)]
+        for index, data in enumerate(sources_data)
+    ]
+    return [
+        dict(row, bundle=names[index])
+        for _, index, _, row in heapq.merge(*decorated_sources)
+    ]
+
+
+def log_line_key(row):
+    return row['timestamp'], row['host'], row['log']
 
 
-def new_lines(old, new):
+def log_record(row):
     """
-    Given a list of lines that were last printed and the latest fetched, returns the unique lines
-    and whether we may have lost any lines.
+    :return: the record written by `--output` for a row returned by `fetch_log_data`
+    """
+    record = {'timestamp': row['timestamp'], 'host': row['host'], 'message': row['log']}
+    if 'bundle' in row:
+        record['bundle'] = row['bundle']
+    return record
+
+
+class LineWriter:
+    """
+    Writes the lines followed as they arrive, either on the screen or as records in the format of `--output`.
+    """
+    def __init__(self, args, fields):
+        self.fields = fields
+        self.records = record_stream.open_writer(args, fields) if vars(args).get('output_format') else None
 
-    :param old: list of old lines
-    :param new: list of new lines
-    :return: (new lines, True if logs may have been lost, False if not)
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.records:
+            self.records.close()
+
+    def write(self, rows):
+        if self.records:
+            for row in rows:
+                self.records.write(log_record(row))
+            self.records.flush()
+        else:
+            log = logging.getLogger(__name__)
+            line_format = '{time} {bundle} {host} {log}' if 'bundle' in self.fields else '{time} {host} {log}'
+            for row in rows:
+                log.screen(line_format.format(**dict(row, log=row['log'].rstrip())))
+
+
+class LogFollower:
     """
-    i = len(old) - 1
-    answer = new, len(old) > 0 and len(new) > 0
+    Follows the logs of a bundle from the latest lines returned by successive requests.
+
+    The lines already shown are recognised by a cursor: the hashes of the lines shown most recently, bounded to twice
+    the largest number of lines requested at a time, and the timestamp of the oldest of these lines. A line is new if
+    its hash is unknown, unless it is older than anything the cursor remembers. Each request therefore costs as much as
+    the number of lines returned, however many lines have been shown before.
+
+    The number of lines requested and the poll period adapt to the rate at which lines arrive. If none of the lines
+    returned has been shown before, the lines between the requests may have been missed: more lines are requested,
+    and more often. The poll period returns to the one requested once the logs are quiet again.
+
+    A line is identified by `key`, which defaults to its timestamp, host and message, along with the number of
+    identical lines preceding it in the same response, so that a line logged repeatedly is shown each time. Other rows
+    with a timestamp, e.g. bundle events, can be followed by supplying their own key and `kind`.
+    """
+    def __init__(self, lines, poll_period, key=None, kind='logs'):
+        self.lines = lines
+        self.key = key if key else log_line_key
+        self.kind = kind
+        self.count = lines
+        self.base_poll_period = poll_period
+        self.min_poll_period = min(poll_period, LOGS_FOLLOW_MIN_POLL_PERIOD_SECONDS)
+        self.poll_period = poll_period
+        self.max_seen = 2 * max(lines, LOGS_FOLLOW_MAX_LINES)
+        self.seen = set()
+        self.seen_order = deque()
+        self.oldest_timestamp = None
+
+    def new_lines(self, rows):
+        """
+        :param rows: the rows returned by `fetch_log_data`, or other rows with a `timestamp`, oldest first
+        :return: the rows not shown before
+        """
+        is_first_request = not self.seen_order
+
+        result = []
+        occurrences = {}
+        for row in rows:
+            row_key = self.key(row)
+            occurrence = occurrences.get(row_key, 0)
+            occurrences[row_key] = occurrence + 1
+
+            key = hash((row_key, occurrence))
+            if key in self.seen or \
+                    (self.oldest_timestamp is not None and row['timestamp'] < self.oldest_timestamp):
+                continue
+
+            result.append(row)
+            self.remember(key, row['timestamp'])
+
+        if not is_first_request:
+            self.adapt(len(rows), len(result))
+
+        return result
 
-    while i >= 0:
-        new_index = len(old) - i
+    def remember(self, key, timestamp):
+        self.seen.add(key)
+        self.seen_order.append((key, timestamp))
 
-        if old[i:] == new[0:new_index]:
-            answer = (new[new_index:], False)
+        if len(self.seen_order) > self.max_seen:
+            oldest_key, _ = self.seen_order.popleft()
+            self.seen.discard(oldest_key)
 
-        i -= 1
+        self.oldest_timestamp = self.seen_order[0][1]
 
-    return answer
+    def adapt(self, lines_returned, new_lines):
+        if new_lines > 0 and new_lines == lines_returned and lines_returned >= self.count:
+            log = logging.getLogger(__name__)
+            log.warning('Unable to reconcile {}; some lines may not be shown'.format(self.kind))
+            log.verbose('Requesting more lines more often')
+            self.count = min(self.count * 2, max(self.lines, LOGS_FOLLOW_MAX_LINES))
+            self.poll_period = max(self.poll_period / 2, self.min_poll_period)
+        elif new_lines * 2 > self.count:
+            self.poll_period = max(self.poll_period / 2, self.min_poll_period)
+        elif new_lines == 0:
+            self.count = max(self.count // 2, self.lines)
+            self.poll_period = min(self.poll_period * 2, self.base_poll_period)
@@ -4,13 +4,13 @@ from conductr_cli import \
     bndl_main, conduct_agents, conduct_deploy, conduct_info, conduct_load, conduct_members, conduct_run, \
     conduct_service_names, conduct_stop, conduct_unload, version, conduct_logs, conduct_events, conduct_acls, \
     conduct_dcos, conduct_load_license, host, logging_setup, conduct_url, custom_settings, conductr_backup, \
-    conductr_restore
+    conductr_restore, conduct_wait, record_stream, conduct_cache
 from conductr_cli.constants import \
     DEFAULT_SCHEME, DEFAULT_PORT, DEFAULT_BASE_PATH, \
     DEFAULT_API_VERSION, DEFAULT_DCOS_SERVICE, DEFAULT_CLI_SETTINGS_DIR, \
     DEFAULT_CUSTOM_SETTINGS_FILE, DEFAULT_CUSTOM_PLUGINS_DIR, DEFAULT_BUNDLE_RESOLVE_CACHE_DIR, \
     DEFAULT_CONFIGURATION_RESOLVE_CACHE_DIR, DEFAULT_WAIT_TIMEOUT, DEFAULT_OFFLINE_MODE, DEFAULT_LICENSE_DOWNLOAD_URL, \
-    LOGS_POLL_PERIOD_SECONDS
+    LOGS_POLL_PERIOD_SECONDS, BUNDLE_CACHE_MAX_SIZE_MB, DOCKER_BLOB_CACHE_MAX_SIZE_MB
 
 from dcos import config, constants
 
@@ -168,6 +168,25 @@ def add_no_wait(sub_parser):
                             action='store_true')
 
 
+def add_bundles_args(sub_parser, operation,
+                     batch_help='Several bundles are requested concurrently and waited for together'):
+    sub_parser.add_argument('bundle',
+                            nargs='?',
+                            default=None,
+                            help='The ID or name of the bundle')
+    sub_parser.add_argument('additional_bundles',
+                            nargs='*',
+                            default=[],
+                            metavar='bundle',
+                            help='The IDs or names of further bundles to {}.\n{}'.format(operation, batch_help))
+    sub_parser.add_argument('--role',
+                            default=None,
+                            help='{} all the bundles with the supplied role'.format(operation.capitalize()))
+    sub_parser.add_argument('--system',
+                            default=None,
+                            help='{} all the bundles of the supplied system'.format(operation.capitalize()))
+
+
 def add_dcos_mode_args(sub_parser, dcos_mode):
     if not dcos_mode:
         add_scheme_host_ip_port_and_base_path(sub_parser)
@@ -189,15 +208,28 @@ def add_lines_args(subparser, show_help=True, default=10):
                                 'Defaults to 10' if show_help else argparse.SUPPRESS)
 
 
-def add_follow_args(subparser, show_help=True):
+def add_follow_args(subparser, show_help=True,
+                    help_text='Outputs log events as they occur. Analogous to UNIX\'s `tail -F`'):
     subparser.add_argument('-f', '--follow',
-                           help='Outputs log events as they occur. Analogous to UNIX\'s `tail -F`' if show_help
-                           else argparse.SUPPRESS,
+                           help=help_text if show_help else argparse.SUPPRESS,
                            default=False,
                            dest='follow',
                            action='store_true')
 
 
+def add_output_format_args(sub_parser):
+    sub_parser.add_argument('--output',
+                            choices=record_stream.OUTPUT_FORMATS,
+                            default=None,
+                            dest='output_format',
+                            help='Writes the records to stdout as they are received instead of displaying a table,\n'
+                                 'either as newline delimited JSON, a JSON array or tab separated values')
+    sub_parser.add_argument('--gzip',
+                            default=False,
+                            action='store_true',
+                            help='Compresses the records written with --output using gzip')
+
+
 def add_offline_mode(sub_parser):
     sub_parser.add_argument('--offline',
                             default=DEFAULT_OFFLINE_MODE,
@@ -222,6 +254,12 @@ def add_default_arguments(sub_parser, dcos_mode):
     add_custom_plugins_dir(sub_parser)
 
 
+def add_cache_arguments(sub_parser):
+    add_verbose(sub_parser)
+    add_bundle_resolve_cache_dir(sub_parser)
+    add_configuration_resolve_cache_dir(sub_parser)
+
+
 def build_parser(dcos_mode):
     # Main argument parser
     parser = argparse.ArgumentParser('conduct', formatter_class=argparse.RawTextHelpFormatter)
@@ -305,8 +343,7 @@ def build_parser(dcos_mode):
     run_parser.add_argument('--affinity',
                             default=None,
                             help='The optional ID of the bundle to run alongside with (v2.0 onwards)')
-    run_parser.add_argument('bundle',
-                            help='The ID of the bundle')
+    add_bundles_args(run_parser, 'run')
     add_default_arguments(run_parser, dcos_mode)
     add_wait_timeout(run_parser)
     add_no_wait(run_parser)
@@ -323,8 +360,7 @@ def build_parser(dcos_mode):
     stop_parser = subparsers.add_parser('stop',
                                         help='Stop a bundle',
                                         formatter_class=argparse.RawTextHelpFormatter)
-    stop_parser.add_argument('bundle',
-                             help='The ID of the bundle')
+    add_bundles_args(stop_parser, 'stop')
     add_default_arguments(stop_parser, dcos_mode)
     add_wait_timeout(stop_parser)
     add_no_wait(stop_parser)
@@ -341,20 +377,45 @@ def build_parser(dcos_mode):
     unload_parser = subparsers.add_parser('unload',
                                           help='Unload a bundle',
                                           formatter_class=argparse.RawTextHelpFormatter)
-    unload_parser.add_argument('bundle',
-                               help='The ID of the bundle')
+    add_bundles_args(unload_parser, 'unload')
     add_default_arguments(unload_parser, dcos_mode)
     add_wait_timeout(unload_parser)
     add_no_wait(unload_parser)
     unload_parser.set_defaults(func=conduct_unload.unload)
 
+    # Sub-parser for `wait` sub-command
+    wait_parser = subparsers.add_parser('wait',
+                                        help='Wait for bundles to reach their expected scale or installation',
+                                        formatter_class=argparse.RawTextHelpFormatter)
+    wait_parser.add_argument('conditions',
+                             nargs='+',
+                             type=conduct_wait.wait_condition,
+                             metavar='condition',
+                             help='The conditions to wait for, in the form of:\n'
+                                  '<bundle>:<scale> to wait for the bundle to have <scale> running executions\n'
+                                  '<bundle>:installed to wait for the bundle to be installed\n'
+                                  '<bundle>:uninstalled to wait for the bundle to be uninstalled\n'
+                                  'The bundle is specified by its ID or name')
+    add_default_arguments(wait_parser, dcos_mode)
+    add_wait_timeout(wait_parser)
+
+    # These are the arguments to display the bundle events and logs when error occurs during waiting for bundle scale.
+    # As such, the help text for these arguments are not displayed.
+    add_date_args(wait_parser, show_help=False)
+    add_lines_args(wait_parser, show_help=False)
+    add_follow_args(wait_parser, show_help=False)
+
+    wait_parser.set_defaults(func=conduct_wait.wait)
+
     # Sub-parser for `events` sub-command
     events_parser = subparsers.add_parser('events',
                                           help='Show bundle events',
                                           formatter_class=argparse.RawTextHelpFormatter)
     add_default_arguments(events_parser, dcos_mode)
     add_lines_args(events_parser)
+    add_follow_args(events_parser, help_text='Outputs bundle events as they occur')
     add_date_args(events_parser)
+    add_output_format_args(events_parser)
     events_parser.add_argument('bundle',
                                help='The ID or name of the bundle')
     events_parser.set_defaults(func=conduct_events.events)
@@ -373,8 +434,9 @@ def build_parser(dcos_mode):
                              help='The frequency of log polling when --follow is specified\n'
                                   'Defaults to {}'.format(LOGS_POLL_PERIOD_SECONDS))
     add_date_args(logs_parser)
-    logs_parser.add_argument('bundle',
-                             help='The ID or name of the bundle')
+    add_output_format_args(logs_parser)
+    add_bundles_args(logs_parser, 'show the logs of',
+                     batch_help='The logs of several bundles are requested concurrently and merged by time')
     logs_parser.set_defaults(func=conduct_logs.logs)
 
     # Sub-parser for `setup-dcos` sub-command
@@ -517,6 +579,61 @@ def build_parser(dcos_mode):
 
     add_default_arguments(restore_parser, dcos_mode)
     restore_parser.set_defaults(func=conductr_restore.restore)
+
+    # Sub-parser for `cache` sub-command
+    cache_parser = subparsers.add_parser('cache',
+                                         help='Manage the caches of resolved bundles and bundle configurations',
+                                         formatter_class=argparse.RawTextHelpFormatter)
+    cache_subparsers = cache_parser.add_subparsers(title='commands',
+                                                   help='Use one of the following sub commands:')
+
+    cache_ls_parser = cache_subparsers.add_parser('ls',
+                                                  help='List the cached bundles and bundle configurations,\n'
+                                                       'most recently used first',
+                                                  formatter_class=argparse.RawTextHelpFormatter)
+    add_long_ids(cache_ls_parser)
+    add_cache_arguments(cache_ls_parser)
+    cache_ls_parser.set_defaults(func=conduct_cache.cache_ls)
+
+    cache_prune_parser = cache_subparsers.add_parser('prune',
+                                                     help='Remove the least recently used files from the caches,\n'
+                                                          'along with any file which is not indexed',
+                                                     formatter_class=argparse.RawTextHelpFormatter)
+    cache_prune_parser.add_argument('--max-size',
+                                    type=int,
+                                    default=BUNDLE_CACHE_MAX_SIZE_MB,
+                                    dest='max_size',
+                                    help='The size in megabytes to reduce each cache to\n'
+                                         'Defaults to {}'.format(BUNDLE_CACHE_MAX_SIZE_MB))
+    cache_prune_parser.add_argument('--all',
+                                    default=False,
+                                    dest='all',
+                                    action='store_true',
+                                    help='Remove every file from the caches')
+    add_cache_arguments(cache_prune_parser)
+    cache_prune_parser.set_defaults(func=conduct_cache.cache_prune)
+
+    cache_verify_parser = cache_subparsers.add_parser('verify',
+                                                      help='Check the cached files against their digests,\n'
+                                                           'removing the files which are missing or corrupted',
+                                                      formatter_class=argparse.RawTextHelpFormatter)
+    add_cache_arguments(cache_verify_parser)
+    cache_verify_parser.set_defaults(func=conduct_cache.cache_verify)
+
+    cache_gc_parser = cache_subparsers.add_parser('gc',
+                                                  help='Remove the Docker image blobs which no cached image refers to,\n'
+                                                       'then the least recently used images beyond the maximum size.\n'
+                                                       'Safe to run while bundles are being loaded',
+                                                  formatter_class=argparse.RawTextHelpFormatter)
+    cache_gc_parser.add_argument('--max-size',
+                                 type=int,
+                                 default=DOCKER_BLOB_CACHE_MAX_SIZE_MB,
+                                 dest='max_size',
+                                 help='The size in megabytes to reduce the Docker image blobs to\n'
+                                      'Defaults to {}'.format(DOCKER_BLOB_CACHE_MAX_SIZE_MB))
+    add_cache_arguments(cache_gc_parser)
+    cache_gc_parser.set_defaults(func=conduct_cache.cache_gc)
+
     return parser
 
 
@@ -587,9 +704,9 @@ def run(_args=[], configure_logging=True):
         else:
             parser.print_help()
     else:
-        # Offline functions are the functions which do not require network to run, e.g. `conduct version` or
-        # `conduct setup-dcos`.
-        offline_functions = ['version', 'setup']
+        # Offline functions are the functions which do not require network to run, e.g. `conduct version`,
+        # `conduct setup-dcos` or `conduct cache`.
+        offline_functions = ['version', 'setup', 'cache_ls', 'cache_prune', 'cache_verify', 'cache_gc']
 
         # Only setup network related args (i.e. host, bundle resolvers, basic auth, etc) for functions which requires
         # connectivity to ConductR.
@@ -1,37 +1,129 @@
-from dcos import http
+from conductr_cli.constants import HTTP_KEEP_ALIVE, HTTP_POOL_SIZE
+from dcos import config as dcos_config, errors as dcos_errors, http
+from requests.adapters import HTTPAdapter
 import requests
+import threading
+
+
+# Pooled sessions keyed by ConductR host, so repeated control protocol calls against the same cluster reuse
+# already established (and, when TLS is enabled, already negotiated) connections.
+_sessions = {}
+_sessions_lock = threading.Lock()
 
 
 def delete(dcos_mode, host, url, **kwargs):
     kwargs = enrich_args(host, **kwargs)
     if dcos_mode:
-        return http.delete(url, **kwargs)
+        return dcos_request('delete', host, url, **kwargs)
     else:
-        return requests.delete(url, **kwargs)
+        return session(host).delete(url, **kwargs)
 
 
 def get(dcos_mode, host, url, **kwargs):
     kwargs = enrich_args(host, **kwargs)
     if dcos_mode:
-        return http.get(url, **kwargs)
+        return dcos_request('get', host, url, **kwargs)
     else:
-        return requests.get(url, **kwargs)
+        return session(host).get(url, **kwargs)
 
 
 def post(dcos_mode, host, url, **kwargs):
     kwargs = enrich_args(host, **kwargs)
     if dcos_mode:
-        return http.post(url, **kwargs)
+        return dcos_request('post', host, url, **kwargs)
     else:
-        return requests.post(url, **kwargs)
+        return session(host).post(url, **kwargs)
 
 
 def put(dcos_mode, host, url, **kwargs):
     kwargs = enrich_args(host, **kwargs)
     if dcos_mode:
-        return http.put(url, **kwargs)
+        return dcos_request('put', host, url, **kwargs)
+    else:
+        return session(host).put(url, **kwargs)
+
+
+def session(host, pool_size=HTTP_POOL_SIZE, keep_alive=HTTP_KEEP_ALIVE):
+    """
+    Returns the pooled session for the given host, creating it on first use.
+    :param host: the ConductR host the session is used for
+    :param pool_size: maximum number of connections kept open per scheme, host and port
+    :param keep_alive: if False, every request asks the server to close the connection after responding
+    :return: the `requests.Session` for the host
+    """
+    with _sessions_lock:
+        if host not in _sessions:
+            _sessions[host] = create_session(pool_size, keep_alive)
+
+        return _sessions[host]
+
+
+def create_session(pool_size, keep_alive):
+    pooled_session = requests.Session()
+
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    pooled_session.mount('http://', adapter)
+    pooled_session.mount('https://', adapter)
+
+    if not keep_alive:
+        pooled_session.headers.update({'Connection': 'close'})
+
+    return pooled_session
+
+
+def close_sessions():
+    with _sessions_lock:
+        for pooled_session in _sessions.values():
+            pooled_session.close()
+
+        _sessions.clear()
+
+
+def dcos_request(method, host, url, **kwargs):
+    """
+    Sends the request through the pooled session of the given host, authenticating the same way as `dcos.http.request`.
+    The DC/OS CLI is still responsible for prompting for credentials, so any 401 response is handed over to it.
+    """
+    toml_config = dcos_config.get_config()
+
+    auth_token = dcos_config.get_config_val('core.dcos_acs_token', toml_config)
+    is_request_to_dcos = http._is_request_to_dcos(url, toml_config)
+    auth = http.DCOSAcsAuth(auth_token) if auth_token and is_request_to_dcos else None
+
+    request_kwargs = {key: value for key, value in kwargs.items() if key != 'auth'}
+    request_kwargs['verify'] = http._verify_ssl(url, kwargs.get('verify'), toml_config)
+    if request_kwargs['verify'] is not None:
+        http.silence_requests_warnings()
+
+    # Failures are reported as `dcos.http` reports them
+    try:
+        response = session(host).request(method, url, auth=auth, **request_kwargs)
+    except requests.exceptions.SSLError:
+        message = 'An SSL error occurred. To configure your SSL settings, please run: ' \
+                  '`dcos config set core.ssl_verify <value>`'
+        description = dcos_config.get_property_description('core', 'ssl_verify')
+        if description is not None:
+            message += '\n<value>: {}'.format(description)
+        raise dcos_errors.DCOSException(message)
+    except requests.exceptions.ConnectionError:
+        raise dcos_errors.DCOSConnectionError(url)
+    except requests.exceptions.Timeout:
+        raise dcos_errors.DCOSException('Request to URL [{0}] timed out.'.format(url))
+    except requests.exceptions.RequestException as e:
+        raise dcos_errors.DCOSException('HTTP Exception: {}'.format(e))
+
+    if 200 <= response.status_code < 300:
+        return response
+    elif response.status_code == 401:
+        return http.request(method, url, **kwargs)
+    elif response.status_code == 422:
+        raise dcos_errors.DCOSUnprocessableException(response)
+    elif response.status_code == 403:
+        raise dcos_errors.DCOSAuthorizationException(response)
+    elif response.status_code == 400:
+        raise dcos_errors.DCOSBadRequest(response)
     else:
-        return requests.put(url, **kwargs)
+        raise dcos_errors.DCOSHTTPException(response)
 
 
 def enrich_args(host, **kwargs):
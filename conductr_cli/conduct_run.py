@@ -1,4 +1,4 @@
-from conductr_cli import bundle_utils, bundle_scale, validation, control_protocol
+from conductr_cli import bundle_batch, bundle_utils, bundle_scale, validation, control_protocol
 import logging
 
 
@@ -15,6 +15,12 @@ def run(args):
         log.error('Affinity feature is only available for v1.1 onwards of ConductR')
         return
 
+    if bundle_batch.is_batch(args):
+        return bundle_batch.run_batch(args, 'run', control_protocol.run_bundle,
+                                      lambda bundle_id, bundle_args: bundle_scale.ScaleWaiter(
+                                          bundle_id, args.scale, True, bundle_args),
+                                      'Running')
+
     response_json = control_protocol.run_bundle(args)
 
     bundle_id = response_json['bundleId'] if args.long_ids else bundle_utils.short_id(response_json['bundleId'])
@@ -1,4 +1,4 @@
-from conductr_cli import bundle_utils, validation, bundle_scale
+from conductr_cli import bundle_batch, bundle_utils, validation, bundle_scale
 import logging
 
 from conductr_cli.control_protocol import stop_bundle
@@ -11,6 +11,13 @@ def stop(args):
     """`conduct stop` command"""
 
     log = logging.getLogger(__name__)
+
+    if bundle_batch.is_batch(args):
+        return bundle_batch.run_batch(args, 'stop', stop_bundle,
+                                      lambda bundle_id, bundle_args: bundle_scale.ScaleWaiter(
+                                          bundle_id, 0, False, bundle_args),
+                                      'Stopped')
+
     response_json = stop_bundle(args)
 
     bundle_id = response_json['bundleId'] if args.long_ids else bundle_utils.short_id(response_json['bundleId'])
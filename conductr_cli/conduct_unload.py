@@ -1,4 +1,4 @@
-from conductr_cli import validation, bundle_installation, control_protocol
+from conductr_cli import bundle_batch, validation, bundle_installation, control_protocol
 import logging
 
 
@@ -9,6 +9,12 @@ def unload(args):
 
     log = logging.getLogger(__name__)
 
+    if bundle_batch.is_batch(args):
+        return bundle_batch.run_batch(args, 'unload', control_protocol.unload_bundle,
+                                      lambda bundle_id, bundle_args: bundle_installation.InstallationWaiter(
+                                          bundle_id, bundle_installation.is_uninstalled, 'uninstalled', bundle_args),
+                                      'Unloaded')
+
     response_json = control_protocol.unload_bundle(args)
     log.info('Bundle unload request sent.')
 
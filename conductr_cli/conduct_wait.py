@@ -0,0 +1,134 @@
+from conductr_cli import bundle_batch, bundle_event_bus, bundle_installation, bundle_scale, conduct_info_inspect, \
+    control_protocol, screen_utils, validation
+from conductr_cli.bundle_state import BundleState
+from conductr_cli.conduct_info_common import DISPLAY_PADDING
+import argparse
+import copy
+import logging
+
+
+CONDITION_INSTALLED = 'installed'
+CONDITION_UNINSTALLED = 'uninstalled'
+
+
+class WaitCondition:
+    """
+    A condition of `conduct wait`, either `<bundle>:<scale>` or `<bundle>:installed` or `<bundle>:uninstalled`.
+    """
+    def __init__(self, bundle, condition):
+        self.bundle = bundle
+        self.condition = condition
+
+    def is_scale(self):
+        return self.condition not in [CONDITION_INSTALLED, CONDITION_UNINSTALLED]
+
+    def __str__(self):
+        return '{}:{}'.format(self.bundle, self.condition)
+
+
+def wait_condition(value):
+    """
+    Parses a `conduct wait` condition, raising `argparse.ArgumentTypeError` if it is invalid.
+    """
+    bundle, separator, condition = value.rpartition(':')
+    if not bundle or not separator:
+        raise argparse.ArgumentTypeError('Expected <bundle>:<scale>, <bundle>:{} or <bundle>:{}, got {}'.format(
+            CONDITION_INSTALLED, CONDITION_UNINSTALLED, value))
+
+    if condition in [CONDITION_INSTALLED, CONDITION_UNINSTALLED]:
+        return WaitCondition(bundle, condition)
+
+    try:
+        scale = int(condition)
+    except ValueError:
+        scale = -1
+
+    if scale < 0:
+        raise argparse.ArgumentTypeError('Invalid scale {} in {}'.format(condition, value))
+
+    return WaitCondition(bundle, scale)
+
+
+@validation.handle_connection_error
+@validation.handle_http_error
+def wait(args):
+    """`conduct wait` command"""
+
+    log = logging.getLogger(__name__)
+
+    bundles = control_protocol.get_bundles(args)
+
+    waiters = []
+    for condition in args.conditions:
+        bundle_id = resolve_bundle_id(bundles, condition.bundle)
+        if not bundle_id:
+            return False
+
+        waiters.append(create_waiter(bundle_id, condition, args))
+
+    # The snapshot used to resolve the bundles seeds the state shared by every condition.
+    bundle_state = BundleState(args)
+    bundle_state.update(bundles)
+
+    failed_waiters = bundle_event_bus.wait_for_all(waiters, args, bundle_state)
+
+    display_conditions(args.conditions, waiters)
+
+    if failed_waiters:
+        log.error('{} of {} conditions have not been met'.format(len(failed_waiters), len(waiters)))
+        return False
+    else:
+        return True
+
+
+def resolve_bundle_id(bundles, bundle_id_or_name):
+    """
+    Resolves the bundle id or name given to a full bundle id. A bundle which is not loaded yet can only be waited on
+    by its full bundle id, which is returned as is.
+    :return: the full bundle id, or `None` if the bundle id or name is ambiguous
+    """
+    log = logging.getLogger(__name__)
+
+    matching_bundles = conduct_info_inspect.filter_bundles_by_id_or_name(bundles, bundle_id_or_name)
+    if len(matching_bundles) == 1:
+        return matching_bundles[0]['bundleId']
+    elif len(matching_bundles) > 1:
+        found_bundle_ids = [bundle['bundleId'] for bundle in matching_bundles]
+        log.error('Specified Bundle ID/name: {} resulted in multiple Bundle IDs: {}'.format(bundle_id_or_name,
+                                                                                            found_bundle_ids))
+        return None
+    else:
+        return bundle_id_or_name
+
+
+def create_waiter(bundle_id, condition, args):
+    # The waiters display the events and logs of the bundle when it fails to scale, which requires args.bundle.
+    waiter_args = copy.copy(args)
+    waiter_args.bundle = bundle_id
+
+    if condition.is_scale():
+        return bundle_scale.ScaleWaiter(bundle_id, condition.condition, True, waiter_args)
+    elif condition.condition == CONDITION_INSTALLED:
+        return bundle_installation.InstallationWaiter(bundle_id, bundle_installation.is_installed,
+                                                      CONDITION_INSTALLED, waiter_args)
+    else:
+        return bundle_installation.InstallationWaiter(bundle_id, bundle_installation.is_uninstalled,
+                                                      CONDITION_UNINSTALLED, waiter_args)
+
+
+def display_conditions(conditions, waiters):
+    log = logging.getLogger(__name__)
+
+    data = [
+        {
+            'condition': str(condition),
+            'status': bundle_batch.display_error(waiter.error) if waiter.error else 'Met'
+        } for condition, waiter in zip(conditions, waiters)
+    ]
+    data.insert(0, {'condition': 'CONDITION', 'status': 'STATUS'})
+
+    column_widths = dict(screen_utils.calc_column_widths(data), **{'padding': ' ' * DISPLAY_PADDING})
+    for row in data:
+        log.screen('''\
+{condition: <{condition_width}}{padding}\
+{status: <{status_width}}'''.format(**dict(row, **column_widths)).rstrip())
@@ -10,7 +10,7 @@ from shutil import rmtree
 import requests
 from requests_toolbelt import MultipartDecoder
 
-from conductr_cli import conduct_url, conduct_request, validation, control_protocol
+from conductr_cli import conduct_url, conduct_request, validation, control_protocol, control_protocol_async
 from conductr_cli.bndl_utils import file_write_bytes, file_write_string
 from conductr_cli.bundle_core_info import BundleCoreInfo
 from conductr_cli.conduct_info_inspect import filter_bundles_by_id_or_name
@@ -33,17 +33,7 @@ def backup(args):
         initial_bundle_core_info = BundleCoreInfo.from_bundles(initial_bundles_json)
 
         if not bundle_id_or_name:
-
-            for info in initial_bundle_core_info:
-                backup_bundle(args, backup_directory, info)
-
-            final_bundles_json = control_protocol.get_bundles(args)
-            final_bundle_core_info = BundleCoreInfo.from_bundles(final_bundles_json)
-
-            process_removed_bundles(backup_directory, initial_bundle_core_info, final_bundle_core_info)
-            process_added_bundles(args, backup_directory, initial_bundle_core_info, final_bundle_core_info)
-            backup_bundle_json(backup_directory, json.dumps(final_bundles_json))
-
+            backup_bundles = (backup_all_bundles, args, backup_directory, initial_bundle_core_info)
         else:
             bundle_info = BundleCoreInfo.filter_by_bundle_id(initial_bundle_core_info, bundle_id_or_name)
 
@@ -51,11 +41,12 @@ def backup(args):
                 raise ConductBackupError('Bundle {} was not found.'.format(bundle_id_or_name))
 
             filtered_bundle = filter_bundles_by_id_or_name(initial_bundles_json, bundle_id_or_name)
-            backup_bundle_json(backup_directory, json.dumps(filtered_bundle))
-            backup_bundle(args, backup_directory, bundle_info)
+            backup_bundles = (backup_single_bundle, args, backup_directory, filtered_bundle, bundle_info)
 
-        backup_members(args, backup_directory)
-        backup_agents(args, backup_directory)
+        # Members and agents do not depend on the bundles, so they are backed up while the bundles are downloaded.
+        control_protocol_async.fan_out(lambda client: client.request(*backup_bundles),
+                                       lambda client: client.request(backup_members, args, backup_directory),
+                                       lambda client: client.request(backup_agents, args, backup_directory))
 
         compress_backup(args.output_path, backup_directory)
 
@@ -64,6 +55,23 @@ def backup(args):
     return True
 
 
+def backup_all_bundles(args, backup_directory, initial_bundle_core_info):
+    for info in initial_bundle_core_info:
+        backup_bundle(args, backup_directory, info)
+
+    final_bundles_json = control_protocol.get_bundles(args)
+    final_bundle_core_info = BundleCoreInfo.from_bundles(final_bundles_json)
+
+    process_removed_bundles(backup_directory, initial_bundle_core_info, final_bundle_core_info)
+    process_added_bundles(args, backup_directory, initial_bundle_core_info, final_bundle_core_info)
+    backup_bundle_json(backup_directory, json.dumps(final_bundles_json))
+
+
+def backup_single_bundle(args, backup_directory, filtered_bundle, bundle_info):
+    backup_bundle_json(backup_directory, json.dumps(filtered_bundle))
+    backup_bundle(args, backup_directory, bundle_info)
+
+
 def compress_backup(output_path, backup_directory):
     log = logging.getLogger(__name__)
 
@@ -11,7 +11,7 @@ import sys
 
 from io import BytesIO
 
-from conductr_cli import control_protocol, bundle_utils, validation, conduct_load, bundle_scale
+from conductr_cli import control_protocol, bundle_event_bus, bundle_utils, validation, conduct_load, bundle_scale
 from conductr_cli.bundle_core_info import BundleCoreInfo
 from conductr_cli.exceptions import ConductRestoreError
 
@@ -38,6 +38,7 @@ def restore(args):
     bundles_info = sorted(BundleCoreInfo.from_bundles(json.loads(bundles_json)), key=lambda b: b.start_time)
 
     restore_errors = []
+    scaled_bundles = []
     for bundle_info in bundles_info:
         new_bundle_id = None
         log.info('Restoring bundle : {}.'.format(bundle_info.bundle_name))
@@ -55,11 +56,19 @@ def restore(args):
                 if affinity == new_bundle_id:
                     affinity = None
 
-                scale_bundle(args, new_bundle_id, bundle_info.scale, affinity)
-                log.info('Scaled {} to : {}.'.format(new_bundle_id, bundle_info.scale))
+                scale_waiter = scale_bundle(args, new_bundle_id, bundle_info.scale, affinity)
+                scaled_bundles.append((bundle_info, scale_waiter))
         except:
             restore_errors.append('{} could not be scaled.'.format(bundle_info.bundle_name))
 
+    # Wait for all the bundles to be scaled at once rather than one after another.
+    bundle_event_bus.wait_for_all([scale_waiter for bundle_info, scale_waiter in scaled_bundles], args)
+    for bundle_info, scale_waiter in scaled_bundles:
+        if scale_waiter.error:
+            restore_errors.append('{} could not be scaled.'.format(bundle_info.bundle_name))
+        else:
+            log.info('Scaled {} to : {}.'.format(scale_waiter.bundle_id, bundle_info.scale))
+
     for error in restore_errors:
         log.error(error)
 
@@ -124,7 +133,7 @@ def scale_bundle(args, bundle_id, scale, affinity):
 
     response_json = control_protocol.run_bundle(modified_args)
 
-    bundle_scale.wait_for_scale(response_json['bundleId'], scale, wait_for_is_active=True, args=modified_args)
+    return bundle_scale.ScaleWaiter(response_json['bundleId'], scale, wait_for_is_active=True, args=modified_args)
 
 
 def compatible_bundle(bundle_infos, bundle_name, compatibility_version):
@@ -45,6 +45,8 @@ DEFAULT_SANDBOX_PROXY_DIR = os.path.abspath(os.getenv('CONDUCTR_SANDBOX_PROXY_DI
 DEFAULT_SANDBOX_PROXY_CONTAINER_NAME = os.getenv('CONDUCTR_SANDBOX_PROXY_CONTAINER_NAME', 'sandbox-haproxy')
 DEFAULT_ERROR_LOG_FILE = os.path.abspath(os.getenv('CONDUCTR_CLI_ERROR_LOG',
                                                    '{}/errors.log'.format(DEFAULT_CLI_SETTINGS_DIR)))
+DEFAULT_DOCKER_TOKEN_CACHE_FILE = os.path.abspath(os.getenv('CONDUCTR_DOCKER_TOKEN_CACHE_FILE',
+                                                            '{}/docker-tokens.json'.format(DEFAULT_CLI_SETTINGS_DIR)))
 DEFAULT_LICENSE_DOWNLOAD_URL = os.getenv('CONDUCTR_LICENSE_DOWNLOAD_URL',
                                          'https://www.lightbend.com/product/conductr/license')
 DEFAULT_LICENSE_FILE = os.path.abspath(os.getenv('CONDUCTR_LICENSE_FILE',
@@ -75,6 +77,86 @@ try:
 except ValueError:
     pass
 
+# Shortest time between log requests (in follow mode) when lines arrive faster than the poll period can keep up with
+LOGS_FOLLOW_MIN_POLL_PERIOD_SECONDS = 0.1
+
+# Maximum number of lines requested at a time (in follow mode) when lines arrive faster than they are requested
+LOGS_FOLLOW_MAX_LINES = 1000
+
+# Time after which the local copy of the bundles kept while waiting is refreshed, even if no bundle event is received
+DEFAULT_BUNDLE_STATE_RECONCILE_INTERVAL_SECONDS = 10.0
+BUNDLE_STATE_RECONCILE_INTERVAL_SECONDS = DEFAULT_BUNDLE_STATE_RECONCILE_INTERVAL_SECONDS
+try:
+    BUNDLE_STATE_RECONCILE_INTERVAL_SECONDS = float(os.getenv('CONDUCTR_BUNDLE_STATE_RECONCILE_INTERVAL',
+                                                              DEFAULT_BUNDLE_STATE_RECONCILE_INTERVAL_SECONDS))
+except ValueError:
+    pass
+
+# Maximum number of connections kept open per ConductR host
+DEFAULT_HTTP_POOL_SIZE = 10
+HTTP_POOL_SIZE = DEFAULT_HTTP_POOL_SIZE
+try:
+    HTTP_POOL_SIZE = int(os.getenv('CONDUCTR_HTTP_POOL_SIZE', DEFAULT_HTTP_POOL_SIZE))
+except ValueError:
+    pass
+
+# Set to `false` to close the connection to ConductR after each request
+HTTP_KEEP_ALIVE = os.getenv('CONDUCTR_HTTP_KEEP_ALIVE', 'true').lower() != 'false'
+
+# Maximum number of concurrent requests sent when a command operates on a batch of bundles
+DEFAULT_BATCH_WORKERS = 8
+BATCH_WORKERS = DEFAULT_BATCH_WORKERS
+try:
+    BATCH_WORKERS = int(os.getenv('CONDUCTR_BATCH_WORKERS', DEFAULT_BATCH_WORKERS))
+except ValueError:
+    pass
+
+# Maximum total size of the Docker image blobs kept in the bundle cache, in megabytes. The least recently used blobs
+# which no image references are evicted beyond this size, then the least recently used images.
+DEFAULT_DOCKER_BLOB_CACHE_MAX_SIZE_MB = 4096
+DOCKER_BLOB_CACHE_MAX_SIZE_MB = DEFAULT_DOCKER_BLOB_CACHE_MAX_SIZE_MB
+try:
+    DOCKER_BLOB_CACHE_MAX_SIZE_MB = int(os.getenv('CONDUCTR_DOCKER_BLOB_CACHE_MAX_SIZE_MB',
+                                                  DEFAULT_DOCKER_BLOB_CACHE_MAX_SIZE_MB))
+except ValueError:
+    pass
+
+# Maximum number of Docker image blobs downloaded and decompressed concurrently
+DEFAULT_DOCKER_FETCH_WORKERS = 4
+DOCKER_FETCH_WORKERS = DEFAULT_DOCKER_FETCH_WORKERS
+try:
+    DOCKER_FETCH_WORKERS = int(os.getenv('CONDUCTR_DOCKER_FETCH_WORKERS', DEFAULT_DOCKER_FETCH_WORKERS))
+except ValueError:
+    pass
+
+# Number of byte ranges of a large HTTP download fetched concurrently. Downloads use a single stream by default, and
+# whenever the server does not support range requests.
+DEFAULT_DOWNLOAD_SEGMENTS = 1
+DOWNLOAD_SEGMENTS = DEFAULT_DOWNLOAD_SEGMENTS
+try:
+    DOWNLOAD_SEGMENTS = int(os.getenv('CONDUCTR_DOWNLOAD_SEGMENTS', DEFAULT_DOWNLOAD_SEGMENTS))
+except ValueError:
+    pass
+
+# Time for which a version resolved from Bintray by its tag, or as the latest version, is reused, in seconds. A version
+# pinned by its digest never changes, so it is reused however old it is. Set to 0 to resolve versions every time.
+DEFAULT_BINTRAY_VERSION_CACHE_TTL_SECONDS = 300
+BINTRAY_VERSION_CACHE_TTL_SECONDS = DEFAULT_BINTRAY_VERSION_CACHE_TTL_SECONDS
+try:
+    BINTRAY_VERSION_CACHE_TTL_SECONDS = int(os.getenv('CONDUCTR_BINTRAY_VERSION_CACHE_TTL',
+                                                      DEFAULT_BINTRAY_VERSION_CACHE_TTL_SECONDS))
+except ValueError:
+    pass
+
+# Maximum total size of the files kept in each of the bundle and configuration caches, in megabytes. The least
+# recently used files are evicted beyond this size.
+DEFAULT_BUNDLE_CACHE_MAX_SIZE_MB = 2048
+BUNDLE_CACHE_MAX_SIZE_MB = DEFAULT_BUNDLE_CACHE_MAX_SIZE_MB
+try:
+    BUNDLE_CACHE_MAX_SIZE_MB = int(os.getenv('CONDUCTR_BUNDLE_CACHE_MAX_SIZE_MB', DEFAULT_BUNDLE_CACHE_MAX_SIZE_MB))
+except ValueError:
+    pass
+
 # ZIP has a minimum date for timestamps - 315705599 is 01/02/1980 @ 11:59pm (UTC)
 SHAZAR_TIMESTAMP_MIN = 315705599
 
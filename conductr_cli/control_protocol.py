@@ -2,7 +2,7 @@ import json
 import logging
 from urllib.parse import quote_plus
 
-from conductr_cli import conduct_url, conduct_request, validation
+from conductr_cli import conduct_url, conduct_request, record_stream, validation
 from conductr_cli.conduct_url import conductr_host
 from conductr_cli.http import DEFAULT_HTTP_TIMEOUT
 
@@ -122,3 +122,38 @@ def get_bundle_events(args, count):
                                    verify=args.server_verification_file, timeout=DEFAULT_HTTP_TIMEOUT)
     validation.raise_for_status_inc_3xx(response)
     return json.loads(response.text)
+
+
+def stream_bundle_events(args, count):
+    """
+    Like `get_bundle_events`, although the events are decoded one at a time as the response arrives.
+    :return: an iterator over the events
+    """
+    path = 'bundles/{}/events?count={}'.format(quote_plus(args.bundle), count)
+    return stream_array(args, path)
+
+
+def get_bundle_logs(args, count):
+    path = 'bundles/{}/logs?count={}'.format(quote_plus(args.bundle), count)
+    request_url = conduct_url.url(path, args)
+    response = conduct_request.get(args.dcos_mode, conductr_host(args), request_url, auth=args.conductr_auth,
+                                   verify=args.server_verification_file, timeout=DEFAULT_HTTP_TIMEOUT)
+    validation.raise_for_status_inc_3xx(response)
+    return json.loads(response.text)
+
+
+def stream_bundle_logs(args, count):
+    """
+    Like `get_bundle_logs`, although the log lines are decoded one at a time as the response arrives.
+    :return: an iterator over the log lines
+    """
+    path = 'bundles/{}/logs?count={}'.format(quote_plus(args.bundle), count)
+    return stream_array(args, path)
+
+
+def stream_array(args, path):
+    request_url = conduct_url.url(path, args)
+    response = conduct_request.get(args.dcos_mode, conductr_host(args), request_url, auth=args.conductr_auth,
+                                   verify=args.server_verification_file, timeout=DEFAULT_HTTP_TIMEOUT, stream=True)
+    validation.raise_for_status_inc_3xx(response)
+    return record_stream.decode_array(record_stream.iter_response(response))
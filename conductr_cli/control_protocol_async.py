@@ -0,0 +1,134 @@
+from conductr_cli import control_protocol, license, sse_client
+from conductr_cli.constants import HTTP_POOL_SIZE
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+
+
+class Client:
+    """
+    asyncio client of the ConductR control protocol, providing the operations of `control_protocol` as futures.
+
+    The requests are sent by `control_protocol` itself, so they go through the pooled sessions and `enrich_args` of
+    `conduct_request`: authentication, TLS verification and the Host header are handled exactly as they are for the
+    synchronous commands. Each request runs on a worker thread of the client, so that requests overlap while the event
+    loop stays free. The futures can be awaited from a coroutine, e.g. `bundles = await client.get_bundles(args)`.
+
+    The futures are plain asyncio futures rather than coroutines, as the CLI still supports Python 3.4.
+    """
+    def __init__(self, loop=None, max_workers=HTTP_POOL_SIZE):
+        """
+        :param loop: the event loop of the futures, defaulting to the loop running the caller. A client created
+                     outside of a running loop must be given its loop, as `fan_out` does.
+        """
+        self.loop = loop if loop else running_loop()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def request(self, func, *func_args, **func_kwargs):
+        return self.loop.run_in_executor(self.executor, functools.partial(func, *func_args, **func_kwargs))
+
+    def load_bundle(self, args, multipart_files):
+        return self.request(control_protocol.load_bundle, args, multipart_files)
+
+    def run_bundle(self, args):
+        return self.request(control_protocol.run_bundle, args)
+
+    def stop_bundle(self, args):
+        return self.request(control_protocol.stop_bundle, args)
+
+    def unload_bundle(self, args):
+        return self.request(control_protocol.unload_bundle, args)
+
+    def get_bundles(self, args):
+        return self.request(control_protocol.get_bundles, args)
+
+    def get_members(self, args):
+        return self.request(control_protocol.get_members, args)
+
+    def get_agents(self, args):
+        return self.request(control_protocol.get_agents, args)
+
+    def get_bundle_events(self, args, count):
+        return self.request(control_protocol.get_bundle_events, args, count)
+
+    def get_bundle_logs(self, args, count):
+        return self.request(control_protocol.get_bundle_logs, args, count)
+
+    def get_license(self, args):
+        return self.request(license.get_license, args)
+
+    def get_events(self, dcos_mode, host, url, **kwargs):
+        """
+        Subscribes to a server-sent events stream. The stream is connected when its first event is requested.
+        :return: the `EventStream`
+        """
+        return EventStream(self, dcos_mode, host, url, **kwargs)
+
+
+class EventStream:
+    """
+    Server-sent events received by an `sse_client.Client` on a worker thread of the `Client`, e.g.
+
+        event = await stream.next_event()
+        while event:
+            ...
+            event = await stream.next_event()
+    """
+    def __init__(self, client, dcos_mode, host, url, **kwargs):
+        self.client = client
+        self.dcos_mode = dcos_mode
+        self.host = host
+        self.url = url
+        self.kwargs = kwargs
+        self.sse_events = None
+
+    def next_event(self):
+        """
+        :return: a future of the next `sse_client.Event`, which is `None` once the stream has ended
+        """
+        return self.client.request(self.read_event)
+
+    def read_event(self):
+        if self.sse_events is None:
+            self.sse_events = sse_client.get_events(self.dcos_mode, self.host, self.url, **self.kwargs)
+
+        return next(self.sse_events, None)
+
+
+def running_loop():
+    """
+    :return: the event loop running in the current thread
+    :raises RuntimeError: if no event loop is running
+    """
+    # `asyncio.get_running_loop` is only available from Python 3.7
+    if hasattr(asyncio, 'get_running_loop'):
+        return asyncio.get_running_loop()
+
+    loop = asyncio.get_event_loop()
+    if not loop.is_running():
+        raise RuntimeError('no running event loop')
+
+    return loop
+
+
+def fan_out(*requests, max_workers=HTTP_POOL_SIZE):
+    """
+    Sends requests concurrently from a synchronous command, e.g.
+
+        bundles, members = fan_out(lambda client: client.get_bundles(args),
+                                   lambda client: client.get_members(args))
+
+    :param requests: functions returning the future of a request given the `Client`
+    :return: the results of the requests, in the order of the requests. The first error raised by a request is raised
+             instead.
+    """
+    loop = asyncio.new_event_loop()
+    client = Client(loop, max_workers)
+    try:
+        return loop.run_until_complete(asyncio.gather(*[request(client) for request in requests]))
+    finally:
+        client.close()
+        loop.close()
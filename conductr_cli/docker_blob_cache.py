@@ -0,0 +1,308 @@
+from conductr_cli import bundle_cache, constants
+from contextlib import contextmanager
+import hashlib
+import os
+import re
+import tempfile
+import time
+import uuid
+
+
+INDEX_FILE_NAME = 'index.json'
+INDEX_VERSION = 1
+LOCK_FILE_NAME = 'index.lock'
+BLOBS_DIR_NAME = 'blobs'
+MANIFESTS_DIR_NAME = 'manifests'
+LEASES_DIR_NAME = 'leases'
+
+# Earlier releases stored the blobs and manifests as flat files of the bundle cache directory, e.g.
+# `docker-blob-sha256_<digest>` and `docker-manifest-<sha256 of the manifest URL>`
+LEGACY_BLOB_PREFIX = 'docker-blob-'
+LEGACY_MANIFEST_PREFIX = 'docker-manifest-'
+
+# The blobs of a lease are kept for this time at most, in seconds, in case the command holding it has exited without
+# releasing it
+LEASE_STALE_SECONDS = 24 * 60 * 60
+
+# A temporary file of a download is considered abandoned after this time, in seconds
+DOWNLOAD_STALE_SECONDS = 60 * 60
+
+
+class DockerBlobCache:
+    """
+    Cache of the manifests and blobs fetched from Docker registries, stored under `<cache_dir>/docker`.
+
+    Blobs are stored once by their digest, however many images share them. The index holds the size and time of last
+    use of every blob, and the blobs referenced by every manifest. A blob is referenced as long as one of the manifests
+    referencing it is kept. Once the total size of the blobs exceeds `max_size`, the least recently used unreferenced
+    blobs are evicted first, then the least recently used manifests along with the blobs they alone referenced.
+
+    Commands share the cache: the index is only updated while holding `index.lock`, and the blobs of a resolution in
+    progress are leased, so a concurrent eviction or `conduct cache gc` never removes them.
+
+    `max_size` defaults to `DOCKER_BLOB_CACHE_MAX_SIZE_MB`. The blobs and manifests stored by earlier releases in
+    `cache_dir` are moved into the cache the first time it is used, and by `gc`.
+    """
+    def __init__(self, cache_dir, max_size=None):
+        self.legacy_dir = cache_dir
+        self.cache_dir = os.path.join(cache_dir, bundle_cache.DOCKER_CACHE_DIR_NAME)
+        self.max_size = constants.DOCKER_BLOB_CACHE_MAX_SIZE_MB * 1024 * 1024 if max_size is None else max_size
+        self.blobs_dir = os.path.join(self.cache_dir, BLOBS_DIR_NAME)
+        self.manifests_dir = os.path.join(self.cache_dir, MANIFESTS_DIR_NAME)
+        self.leases_dir = os.path.join(self.cache_dir, LEASES_DIR_NAME)
+
+    def blob_path(self, digest):
+        return os.path.join(self.blobs_dir, re.sub('\\W', '_', digest))
+
+    def has_blob(self, digest):
+        return os.path.isfile(self.blob_path(digest))
+
+    def create_temp_file(self, digest):
+        """
+        :return: the file descriptor and path of a new temporary file to download the blob into, to be added with
+                 `add_blob`. Concurrent downloads of the same blob each use their own file.
+        """
+        os.makedirs(self.blobs_dir, mode=0o700, exist_ok=True)
+        return tempfile.mkstemp(prefix='{}.'.format(os.path.basename(self.blob_path(digest))), suffix='.tmp',
+                                dir=self.blobs_dir)
+
+    def add_blob(self, digest, temp_path):
+        """
+        Moves a downloaded blob into the cache.
+        """
+        with self.locked() as index:
+            os.replace(temp_path, self.blob_path(digest))
+            index['blobs'][digest] = {'size': os.path.getsize(self.blob_path(digest)), 'last_used': time.time()}
+
+    def read_manifest(self, url):
+        """
+        :return: the contents of the manifest cached for the URL, or None
+        """
+        try:
+            with open(self.manifest_path(url), 'r', encoding='utf-8') as manifest_file:
+                return manifest_file.read()
+        except OSError:
+            return None
+
+    def add_manifest(self, url, contents):
+        os.makedirs(self.manifests_dir, mode=0o700, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.manifests_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as manifest_file:
+            manifest_file.write(contents)
+
+        with self.locked() as index:
+            os.replace(temp_path, self.manifest_path(url))
+            manifest = index['manifests'].setdefault(url, {'blobs': []})
+            manifest['last_used'] = time.time()
+
+    def manifest_path(self, url):
+        return os.path.join(self.manifests_dir, hashlib.sha256(url.encode('UTF-8')).hexdigest())
+
+    def use(self, url, digests):
+        """
+        Records the blobs referenced by the manifest of the URL as used, then evicts the cache down to its maximum size,
+        keeping this manifest and its blobs.
+        :return: the digests of the blobs evicted
+        """
+        with self.locked() as index:
+            now = time.time()
+            index['manifests'][url] = {'blobs': sorted(set(digests)), 'last_used': now}
+            for digest in digests:
+                if digest in index['blobs']:
+                    index['blobs'][digest]['last_used'] = now
+
+            return self.evict(index, self.max_size, excluded_url=url)
+
+    @contextmanager
+    def lease(self, digests):
+        """
+        Protects the blobs from eviction while they are being fetched and used.
+        """
+        os.makedirs(self.leases_dir, mode=0o700, exist_ok=True)
+        lease_path = os.path.join(self.leases_dir, uuid.uuid4().hex)
+        bundle_cache.write_json(lease_path, sorted(set(digests)))
+        try:
+            yield
+        finally:
+            os.remove(lease_path)
+
+    def leased_digests(self):
+        leased = set()
+
+        if os.path.isdir(self.leases_dir):
+            now = time.time()
+            for file_name in os.listdir(self.leases_dir):
+                lease_path = os.path.join(self.leases_dir, file_name)
+                try:
+                    if now - os.path.getmtime(lease_path) > LEASE_STALE_SECONDS:
+                        os.remove(lease_path)
+                    else:
+                        leased.update(bundle_cache.read_json(lease_path, []))
+                except OSError:
+                    pass
+
+        return leased
+
+    def evict(self, index, max_size, excluded_url=None):
+        """
+        Removes unreferenced blobs, least recently used first, until the blobs fit in `max_size`. When they still do
+        not, removes the least recently used manifest other than `excluded_url` and starts over.
+        :return: the digests of the blobs removed
+        """
+        leased = self.leased_digests()
+        removed = []
+
+        while True:
+            total_size = sum(blob['size'] for blob in index['blobs'].values())
+            if total_size <= max_size:
+                break
+
+            referenced = set(digest for manifest in index['manifests'].values() for digest in manifest['blobs'])
+            unreferenced = sorted((digest for digest in index['blobs'] if digest not in referenced | leased),
+                                  key=lambda digest: index['blobs'][digest]['last_used'])
+            if unreferenced:
+                digest = unreferenced[0]
+                self.remove_blob(index, digest)
+                removed.append(digest)
+                continue
+
+            manifests = sorted((url for url in index['manifests'] if url != excluded_url),
+                               key=lambda url: index['manifests'][url]['last_used'])
+            if not manifests:
+                break
+
+            self.remove_manifest(index, manifests[0])
+
+        return removed
+
+    def gc(self, max_size=None):
+        """
+        Removes the blobs no kept manifest references, the files missing from the index and the abandoned temporary
+        files, then evicts the cache down to `max_size`. Blobs leased by a command in progress are kept.
+        :param max_size: the maximum size of the blobs kept, defaulting to the maximum size of the cache
+        :return: the number of files removed, and their total size
+        """
+        max_size = self.max_size if max_size is None else max_size
+
+        with self.locked() as index:
+            self.import_legacy_files(index)
+            leased = self.leased_digests()
+            removed_count = 0
+            removed_size = 0
+
+            for digest in list(index['blobs']):
+                if not self.has_blob(digest):
+                    del index['blobs'][digest]
+
+            if os.path.isdir(self.blobs_dir):
+                indexed_files = set(os.path.basename(self.blob_path(digest)) for digest in index['blobs'])
+                leased_files = set(os.path.basename(self.blob_path(digest)) for digest in leased)
+                now = time.time()
+                for file_name in os.listdir(self.blobs_dir):
+                    path = os.path.join(self.blobs_dir, file_name)
+                    if file_name in indexed_files or file_name in leased_files:
+                        continue
+                    if file_name.endswith('.tmp') and now - os.path.getmtime(path) < DOWNLOAD_STALE_SECONDS:
+                        continue
+
+                    removed_count += 1
+                    removed_size += os.path.getsize(path)
+                    os.remove(path)
+
+            for url in list(index['manifests']):
+                if not os.path.isfile(self.manifest_path(url)):
+                    self.remove_manifest(index, url)
+
+            if os.path.isdir(self.manifests_dir):
+                indexed_files = set(os.path.basename(self.manifest_path(url)) for url in index['manifests'])
+                now = time.time()
+                for file_name in os.listdir(self.manifests_dir):
+                    path = os.path.join(self.manifests_dir, file_name)
+                    if file_name in indexed_files:
+                        continue
+                    if file_name.endswith('.tmp') and now - os.path.getmtime(path) < DOWNLOAD_STALE_SECONDS:
+                        continue
+
+                    removed_count += 1
+                    removed_size += os.path.getsize(path)
+                    os.remove(path)
+
+            referenced = set(digest for manifest in index['manifests'].values() for digest in manifest['blobs'])
+            for digest in list(index['blobs']):
+                if digest not in referenced and digest not in leased:
+                    removed_count += 1
+                    removed_size += self.remove_blob(index, digest)
+
+            blob_sizes = dict((digest, blob['size']) for digest, blob in index['blobs'].items())
+            for digest in self.evict(index, max_size):
+                removed_count += 1
+                removed_size += blob_sizes[digest]
+
+            return removed_count, removed_size
+
+    def remove_blob(self, index, digest):
+        """
+        :return: the size of the blob removed
+        """
+        blob = index['blobs'].pop(digest)
+        if self.has_blob(digest):
+            os.remove(self.blob_path(digest))
+        return blob['size']
+
+    def remove_manifest(self, index, url):
+        del index['manifests'][url]
+        if os.path.isfile(self.manifest_path(url)):
+            os.remove(self.manifest_path(url))
+
+    def import_legacy_files(self, index):
+        """
+        Moves the blobs and manifests stored by earlier releases into the cache. The blobs are indexed as unreferenced,
+        last used when they were written, so they are the first evicted unless an image resolved again references
+        them. A manifest is kept under the digest of its URL, as before, and indexed once it is used again. Abandoned
+        downloads are removed.
+        """
+        if not os.path.isdir(self.legacy_dir):
+            return
+
+        for file_name in os.listdir(self.legacy_dir):
+            path = os.path.join(self.legacy_dir, file_name)
+
+            if not file_name.startswith((LEGACY_BLOB_PREFIX, LEGACY_MANIFEST_PREFIX)) or not os.path.isfile(path):
+                continue
+
+            try:
+                if file_name.endswith('.tmp'):
+                    os.remove(path)
+                elif file_name.startswith(LEGACY_BLOB_PREFIX):
+                    # The digest was stored with its `:` replaced, e.g. `sha256_<digest>`
+                    digest = file_name[len(LEGACY_BLOB_PREFIX):].replace('_', ':', 1)
+                    os.makedirs(self.blobs_dir, mode=0o700, exist_ok=True)
+                    index['blobs'].setdefault(digest, {'size': os.path.getsize(path),
+                                                       'last_used': os.path.getmtime(path)})
+                    os.replace(path, self.blob_path(digest))
+                else:
+                    os.makedirs(self.manifests_dir, mode=0o700, exist_ok=True)
+                    os.replace(path, os.path.join(self.manifests_dir, file_name[len(LEGACY_MANIFEST_PREFIX):]))
+            except OSError:
+                pass
+
+    @contextmanager
+    def locked(self):
+        """
+        Holds the lock of the cache, yielding its index to be updated. The index is saved before the lock is released.
+        The lock is refreshed while held, as the lock of the bundle cache is.
+        """
+        with bundle_cache.lock_file(os.path.join(self.cache_dir, LOCK_FILE_NAME)):
+            is_first_use = not os.path.isfile(os.path.join(self.cache_dir, INDEX_FILE_NAME))
+            index = read_index(self.cache_dir)
+            if is_first_use:
+                self.import_legacy_files(index)
+            yield index
+            bundle_cache.write_json(os.path.join(self.cache_dir, INDEX_FILE_NAME), index)
+
+
+def read_index(cache_dir):
+    index = bundle_cache.read_json(os.path.join(cache_dir, INDEX_FILE_NAME), None)
+    if not isinstance(index, dict) or index.get('version') != INDEX_VERSION:
+        index = {'version': INDEX_VERSION, 'blobs': {}, 'manifests': {}}
+    return index
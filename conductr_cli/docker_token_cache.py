@@ -0,0 +1,91 @@
+from conductr_cli import bundle_cache
+import threading
+import time
+
+
+CACHE_VERSION = 1
+
+# Lifetime of a token issued without `expires_in`, in seconds, as defined by the Docker registry token specification
+DEFAULT_TOKEN_EXPIRES_IN = 60
+
+# A token is no longer used this long before it expires, in seconds, so it does not expire during the request. Short
+# lived tokens are used for half their lifetime at least.
+TOKEN_EXPIRY_MARGIN_SECONDS = 10
+
+
+class DockerTokenCache:
+    """
+    Cache of the bearer tokens issued by Docker registry token services, keyed by the realm, service and scope of the
+    token. The challenge each registry has answered for a repository is remembered too, so the matching token is sent
+    with the first request rather than after a 401.
+
+    The cache is held in memory and persisted in `path` along with the expiry of every token, so later commands reuse
+    the tokens still valid. A cache which cannot be read or written is ignored.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = None
+
+    def find(self, registry, repository):
+        """
+        :return: the token valid for the repository of the registry, or None
+        """
+        with self.lock:
+            entries = self.load()
+            challenge = entries['challenges'].get(challenge_key(registry, repository))
+            token = entries['tokens'].get(token_key(**challenge)) if challenge is not None else None
+
+            if token is not None and is_valid(token, time.time()):
+                return token['token']
+            else:
+                return None
+
+    def add(self, registry, repository, realm, service, scope, token, expires_in=DEFAULT_TOKEN_EXPIRES_IN):
+        """
+        Records the token issued for the challenge answered by the registry for the repository.
+        """
+        with self.lock:
+            # Tokens added by concurrent commands are kept
+            self.entries = None
+            entries = self.load()
+
+            now = time.time()
+            expires_in = expires_in or DEFAULT_TOKEN_EXPIRES_IN
+            entries['challenges'][challenge_key(registry, repository)] = {
+                'realm': realm,
+                'service': service,
+                'scope': scope
+            }
+            entries['tokens'][token_key(realm, service, scope)] = {
+                'token': token,
+                'expires_at': now + expires_in,
+                'valid_until': now + expires_in - min(TOKEN_EXPIRY_MARGIN_SECONDS, expires_in / 2)
+            }
+            entries['tokens'] = dict((key, value) for key, value in entries['tokens'].items() if is_valid(value, now))
+
+            try:
+                bundle_cache.write_json(self.path, entries)
+            except OSError:
+                pass
+
+    def load(self):
+        if self.entries is None:
+            entries = bundle_cache.read_json(self.path, None)
+            if not isinstance(entries, dict) or entries.get('version') != CACHE_VERSION:
+                entries = {'version': CACHE_VERSION, 'challenges': {}, 'tokens': {}}
+            self.entries = entries
+
+        return self.entries
+
+
+def challenge_key(registry, repository):
+    return '{} {}'.format(registry, repository or '')
+
+
+def token_key(realm, service, scope):
+    return '{} {} {}'.format(realm, service or '', scope or '')
+
+
+def is_valid(token, now):
+    return now < token['valid_until']
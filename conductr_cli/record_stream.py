@@ -0,0 +1,145 @@
+from conductr_cli.constants import IO_CHUNK_SIZE
+import codecs
+import gzip
+import json
+import sys
+
+
+OUTPUT_FORMATS = ['ndjson', 'json', 'tsv']
+
+
+def decode_array(chunks):
+    """
+    Decodes a JSON array from the chunks of a response as they arrive, yielding every element as soon as it is complete,
+    so neither the response nor the array is held in memory.
+    A response which is not an array, e.g. the `{}` returned for a bundle without logs, is decoded once complete, and
+    yields the elements of the array it turns out to be, if any.
+    :param chunks: the chunks of the UTF-8 encoded response, e.g. `response.iter_content(IO_CHUNK_SIZE)`
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+
+    buffer = ''
+    is_array = None
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+
+        if is_array is None:
+            buffer = buffer.lstrip()
+            if not buffer:
+                continue
+            is_array = buffer.startswith('[')
+            if is_array:
+                buffer = buffer[1:]
+
+        if not is_array:
+            continue
+
+        position = 0
+        while True:
+            position = skip_whitespace(buffer, position)
+            if position == len(buffer):
+                break
+            elif buffer[position] == ']':
+                return
+            elif buffer[position] == ',':
+                position += 1
+                continue
+
+            try:
+                value, position = decoder.raw_decode(buffer, position)
+            except ValueError:
+                # The element is not complete yet
+                break
+
+            yield value
+
+        buffer = buffer[position:]
+
+    buffer += text_decoder.decode(b'', final=True)
+    if buffer.strip():
+        # Either the response is not an array, or it has been cut short: decoding the remainder raises the error.
+        value = json.loads(buffer if not is_array else '[' + buffer)
+        if isinstance(value, list):
+            for element in value:
+                yield element
+
+
+def skip_whitespace(text, position):
+    while position < len(text) and text[position] in ' \t\r\n':
+        position += 1
+    return position
+
+
+def iter_response(response):
+    return response.iter_content(chunk_size=IO_CHUNK_SIZE)
+
+
+class RecordWriter:
+    """
+    Writes records one at a time to a binary output, as:
+    - `ndjson`: one JSON object per line;
+    - `json`: a JSON array, closed by `close()`;
+    - `tsv`: a header line with the fields, then one line of tab separated values per record. Tabs, newlines and
+      backslashes within the values are escaped.
+    """
+    def __init__(self, output_format, fields, output):
+        self.output_format = output_format
+        self.fields = fields
+        self.output = output
+        self.records_written = 0
+
+        if output_format == 'tsv':
+            self.write_line('\t'.join(fields))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, record):
+        if self.output_format == 'ndjson':
+            self.write_line(json.dumps(record))
+        elif self.output_format == 'json':
+            self.output.write('{}\n  {}'.format('[' if self.records_written == 0 else ',',
+                                                json.dumps(record)).encode('utf-8'))
+        else:
+            self.write_line('\t'.join(tsv_escape(record.get(field)) for field in self.fields))
+
+        self.records_written += 1
+
+    def write_line(self, line):
+        self.output.write('{}\n'.format(line).encode('utf-8'))
+
+    def flush(self):
+        self.output.flush()
+
+    def close(self):
+        if self.output_format == 'json':
+            self.write_line('[]' if self.records_written == 0 else '\n]')
+
+        if isinstance(self.output, gzip.GzipFile):
+            # Closing the gzip stream writes its trailer, but leaves the underlying output open.
+            underlying_output = self.output.fileobj
+            self.output.close()
+            underlying_output.flush()
+        else:
+            self.output.flush()
+
+
+def tsv_escape(value):
+    text = '' if value is None else str(value)
+    return text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def open_writer(args, fields):
+    """
+    :return: the `RecordWriter` writing the records in the format of `--output` to stdout, compressed if `--gzip` is
+             specified
+    """
+    output = sys.stdout.buffer
+    if vars(args).get('gzip'):
+        output = gzip.GzipFile(fileobj=output, mode='wb')
+
+    return RecordWriter(args.output_format, fields, output)
@@ -3,13 +3,15 @@ from conductr_cli.exceptions import MalformedBundleUriError, BintrayResolutionEr
 from conductr_cli.resolvers import uri_resolver
 from conductr_cli.resolvers.resolvers_util import is_local_file
 from conductr_cli.resolvers.schemes import SCHEME_BUNDLE
-from conductr_cli import bundle_shorthand
+from conductr_cli import bundle_cache, bundle_shorthand
+from conductr_cli.constants import BINTRAY_VERSION_CACHE_TTL_SECONDS
 from requests.exceptions import HTTPError, ConnectionError
 import json
 import logging
 import os
 import re
 import requests
+import time
 
 BINTRAY_API_BASE_URL = 'https://api.bintray.com'
 BINTRAY_DOWNLOAD_BASE_URL = 'https://dl.bintray.com'
@@ -21,6 +23,7 @@ BINTRAY_CONDUCTR_COMMERCIAL_REPO = 'commercial-releases'
 BINTRAY_CONDUCTR_GENERIC_REPO = 'generic'
 BINTRAY_CONDUCTR_CORE_PACKAGE_NAME = 'ConductR-Universal'
 BINTRAY_CONDUCTR_AGENT_PACKAGE_NAME = 'ConductR-Agent-Universal'
+BINTRAY_VERSION_CACHE_FILE_NAME = 'bintray-versions.json'
 
 
 def supported_schemes():
@@ -35,8 +38,9 @@ def resolve_bundle(cache_dir, uri):
         log.info(log_message('Resolving bundle', org, repo, package_name, tag, digest))
 
         bintray_auth = load_bintray_credentials(raise_error=False)
-        resolved_version = bintray_resolve_version(bintray_auth, org, repo, package_name, tag, digest)
-        return bintray_download_artefact(cache_dir, resolved_version, bintray_auth)
+        resolved_version = bintray_resolve_version_cached(cache_dir, bintray_auth, org, repo, package_name, tag,
+                                                          digest)
+        return bintray_download_cached_artefact(cache_dir, resolved_version, bintray_auth)
     except MalformedBundleUriError as e:
         return False, None, None, e
     except HTTPError as e:
@@ -55,7 +59,8 @@ def load_bundle_from_cache(cache_dir, uri):
             urn, org, repo, package_name, tag, digest = bundle_shorthand.parse_bundle(uri)
             log.info(log_message('Loading bundle from cache', org, repo, package_name, tag, digest))
             bintray_auth = load_bintray_credentials(raise_error=False)
-            resolved_version = bintray_resolve_version(bintray_auth, org, repo, package_name, tag, digest)
+            resolved_version = bintray_resolve_version_cached(cache_dir, bintray_auth, org, repo, package_name, tag,
+                                                              digest)
             if resolved_version:
                 return uri_resolver.load_bundle_from_cache(cache_dir, resolved_version['download_url'])
             else:
@@ -75,8 +80,9 @@ def resolve_bundle_configuration(cache_dir, uri):
         urn, org, repo, package_name, tag, digest = bundle_shorthand.parse_bundle_configuration(uri)
         log.info(log_message('Resolving bundle configuration', org, repo, package_name, tag, digest))
         bintray_auth = load_bintray_credentials(raise_error=False)
-        resolved_version = bintray_resolve_version(bintray_auth, org, repo, package_name, tag, digest)
-        return bintray_download_artefact(cache_dir, resolved_version, bintray_auth)
+        resolved_version = bintray_resolve_version_cached(cache_dir, bintray_auth, org, repo, package_name, tag,
+                                                          digest)
+        return bintray_download_cached_artefact(cache_dir, resolved_version, bintray_auth)
     except MalformedBundleUriError as e:
         return False, None, None, e
     except HTTPError as e:
@@ -95,9 +101,9 @@ def load_bundle_configuration_from_cache(cache_dir, uri):
             urn, org, repo, package_name, tag, digest = bundle_shorthand.parse_bundle_configuration(uri)
             log.info(log_message('Loading bundle configuration from cache', org, repo, package_name, tag, digest))
             bintray_auth = load_bintray_credentials(raise_error=False)
-            resolved_version = bintray_resolve_version(bintray_auth,
-                                                       org, repo, package_name,
-                                                       tag, digest)
+            resolved_version = bintray_resolve_version_cached(cache_dir, bintray_auth,
+                                                              org, repo, package_name,
+                                                              tag, digest)
             if resolved_version:
                 return uri_resolver.load_bundle_from_cache(cache_dir, resolved_version['download_url'])
             else:
@@ -151,8 +157,24 @@ def continuous_delivery_uri(resolved_version):
 
 
 def bintray_download_artefact(cache_dir, artefact, auth, raise_error=False):
+    """
+    :param raise_error: if `True`, the `URLError` of a failed download is raised rather than returned, e.g. for
+                        `sandbox run` to report it as `SandboxImageFetchError`
+    """
     if artefact:
-        return uri_resolver.resolve_file(cache_dir, artefact['download_url'], auth, raise_error)
+        return uri_resolver.resolve_file(cache_dir, artefact['download_url'], auth, raise_error=raise_error,
+                                         digest=artefact.get('sha256'))
+    else:
+        return False, None, None, None
+
+
+def bintray_download_cached_artefact(cache_dir, artefact, auth):
+    """
+    Downloads the artefact into the bundle cache of `cache_dir`, indexed by its download URL.
+    """
+    if artefact:
+        return uri_resolver.cache_resolved_file(cache_dir, artefact['download_url'],
+                                                bintray_download_artefact(cache_dir, artefact, auth))
     else:
         return False, None, None, None
 
@@ -192,6 +214,47 @@ def load_bintray_credentials(raise_error=True, disable_instructions=False):
             return BINTRAY_DOWNLOAD_REALM, data['user'], data['password']
 
 
+def bintray_resolve_version_cached(cache_dir, bintray_auth, org, repo, package_name, tag=None, digest=None):
+    """
+    Resolves the version as `bintray_resolve_version` does, reusing the version resolved for the same org, repo,
+    package and tag within the last `BINTRAY_VERSION_CACHE_TTL_SECONDS`. The resolved versions are kept in the metadata
+    of `cache_dir`, so looking a bundle up in the cache and then resolving it on a miss costs a single resolution, and
+    loading a cached bundle again costs none.
+    A version pinned by its digest never changes, so it is reused however old it is.
+    """
+    if BINTRAY_VERSION_CACHE_TTL_SECONDS <= 0:
+        return bintray_resolve_version(bintray_auth, org, repo, package_name, tag, digest)
+
+    log = logging.getLogger(__name__)
+
+    version_cache_path = bundle_cache.metadata_path(cache_dir, BINTRAY_VERSION_CACHE_FILE_NAME)
+    key = '{}/{}/{}:{}:{}'.format(org, repo, package_name, tag or '', digest or '')
+    now = time.time()
+
+    cached_version = bundle_cache.read_json(version_cache_path, {}).get(key)
+    if cached_version and is_fresh(cached_version, now):
+        log.verbose('Using the version of {} resolved at {}'.format(key, time.ctime(cached_version['resolved_at'])))
+        return cached_version['version']
+
+    resolved_version = bintray_resolve_version(bintray_auth, org, repo, package_name, tag, digest)
+
+    if resolved_version:
+        # Expired versions are dropped, so the file only grows with the number of pinned versions resolved.
+        cached_versions = {
+            cached_key: cached_version
+            for cached_key, cached_version in bundle_cache.read_json(version_cache_path, {}).items()
+            if is_fresh(cached_version, now)
+        }
+        cached_versions[key] = {'resolved_at': now, 'pinned': digest is not None, 'version': resolved_version}
+        bundle_cache.write_json(version_cache_path, cached_versions)
+
+    return resolved_version
+
+
+def is_fresh(cached_version, now):
+    return cached_version['pinned'] or now - cached_version['resolved_at'] < BINTRAY_VERSION_CACHE_TTL_SECONDS
+
+
 def bintray_resolve_version(bintray_auth, org, repo, package_name,
                             tag=None, digest=None):
     if tag is None and digest is None:
@@ -278,6 +341,7 @@ def bintray_artefacts_by_version(bintray_auth, org, repo, package_name, bintray_
             'version': bintray_version,
             'path': f['path'],
             'download_url': '{}/{}/{}/{}'.format(BINTRAY_DOWNLOAD_BASE_URL, org, repo, f['path']),
+            'sha256': f.get('sha256'),
             'resolver': __name__
         }
         for f in files
@@ -1,7 +1,10 @@
 import time
 from collections import OrderedDict
-from conductr_cli import screen_utils
-from conductr_cli.constants import IO_CHUNK_SIZE
+from concurrent.futures import ThreadPoolExecutor
+from conductr_cli import conduct_request, docker_blob_cache, docker_token_cache, screen_utils
+from conductr_cli.bndl_docker import docker_config_to_oci_image
+from conductr_cli.bndl_utils import file_write_bytes, link_or_copy
+from conductr_cli.constants import DEFAULT_DOCKER_TOKEN_CACHE_FILE, DOCKER_FETCH_WORKERS, IO_CHUNK_SIZE
 from conductr_cli.exceptions import DockerImageMalformedError
 from conductr_cli.resolvers.schemes import SCHEME_BUNDLE
 from functools import partial
@@ -16,28 +19,43 @@ import re
 import requests
 import shutil
 import tempfile
+import threading
 import www_authenticate
 
 
 DOCKER_CREDENTIAL_FILE_PATH = '{}/.lightbend/docker.credentials'.format(os.path.expanduser('~'))
 DOCKER_PROPERTIES_RE = re.compile('^(\S+)\s*=\s*([\S]+)$')
+MANIFEST_MEDIA_TYPE = 'application/vnd.docker.distribution.manifest.v2+json'
+REPOSITORY_URL_RE = re.compile('^https?://[^/]+/v2/(.+)/(?:manifests|blobs)/[^/]+$')
+
+# Registry tokens are shared by all the requests of the command, and kept for the next commands
+token_cache = docker_token_cache.DockerTokenCache(DEFAULT_DOCKER_TOKEN_CACHE_FILE)
 
 
 def supported_schemes():
     return [SCHEME_BUNDLE]
 
 
-def get_with_token(ns, url, headers=None, raw=False, try_new_token=True):
-    if not hasattr(get_with_token, 'latest_token'):
-        get_with_token.latest_token = None
+def get_with_token(ns, url, headers=None, raw=False):
+    return request_with_token('GET', ns, url, headers, raw)
+
+
+def head_with_token(ns, url, headers=None):
+    return request_with_token('HEAD', ns, url, headers)
+
+
+def request_with_token(method, ns, url, headers=None, raw=False, try_new_token=True):
+    repository = url_repository(url)
 
     try:
         new_headers = headers.copy() if headers is not None else {}
+        token = token_cache.find(ns, repository)
 
-        if get_with_token.latest_token is not None:
-            new_headers['Authorization'] = 'Bearer {}'.format(get_with_token.latest_token)
+        if token is not None:
+            new_headers['Authorization'] = 'Bearer {}'.format(token)
 
-        response = requests.get(url, stream=raw, headers=new_headers)
+        # Requests to the same registry share a pool of keep-alive connections
+        response = conduct_request.session(ns).request(method, url, stream=raw, headers=new_headers)
         response.raise_for_status()
 
         if raw:
@@ -67,87 +85,188 @@ def get_with_token(ns, url, headers=None, raw=False, try_new_token=True):
             token_response.raise_for_status()
             token_content = json.loads(token_response.text)
 
-            get_with_token.latest_token = token_content['token']
+            token_cache.add(ns, repository, auth_info['bearer']['realm'], auth_info['bearer']['service'],
+                            auth_info['bearer']['scope'], token_content['token'], token_content.get('expires_in'))
 
-            return get_with_token(ns, url, headers, raw, try_new_token=False)
+            return request_with_token(method, ns, url, headers, raw, try_new_token=False)
         else:
             raise error
 
 
-def fetch_blobs(cache_dir, url, ns, image, blobs, offline_mode):
-    log = logging.getLogger(__name__)
-    files = {}
-    needs_retrieving = []
-    downloaded_size = 0
-    total_size = 0
+def url_repository(url):
+    """
+    :return: the repository of a registry API URL, e.g. `library/alpine`, or None
+    """
+    match = REPOSITORY_URL_RE.match(url)
+    return match.group(1) if match else None
+
 
-    for blob in blobs:
-        blob['cache_file'] = os.path.join(cache_dir, 'docker-blob-{}'.format(re.sub('\\W', '_', blob['digest'])))
-        blob['cache_file_temp'] = '{}.tmp'.format(blob['cache_file'])
+def fetch_blobs(blob_cache, url, ns, image, blobs, offline_mode, on_fetched=None):
+    """
+    Fetches the blobs missing from the cache through a bounded pool of workers, with a single progress bar for all of
+    them. Each blob is checked against its digest before it is added to the cache.
+    :param on_fetched: called by the worker with the blob and its cache file once the blob is present, e.g. to
+                       decompress a layer while other blobs are still being downloaded
+    :return: the cache file of every blob by digest, or None if a blob is missing in offline mode
+    """
+    log = logging.getLogger(__name__)
 
-        if not os.path.isfile(blob['cache_file']):
-            needs_retrieving.append(strip_digest(blob['digest']))
-            total_size += blob['size']
+    unique_blobs = list(OrderedDict((blob['digest'], blob) for blob in blobs).values())
+    files = OrderedDict((blob['digest'], blob_cache.blob_path(blob['digest'])) for blob in unique_blobs)
+    needs_retrieving = [blob for blob in unique_blobs if not os.path.isfile(files[blob['digest']])]
+    needs_retrieving_digests = set(blob['digest'] for blob in needs_retrieving)
 
     if len(needs_retrieving) > 0:
+        if offline_mode:
+            return None
+
         log.info('Retrieving Docker layers:')
-        for layer in needs_retrieving:
-            log.info('    {}'.format(layer))
+        for blob in needs_retrieving:
+            log.info('    {}'.format(strip_digest(blob['digest'])))
 
-    for blob in blobs:
-        cache_file = os.path.join(cache_dir, 'docker-blob-{}'.format(re.sub('\\W', '_', blob['digest'])))
-        cache_file_temp = '{}.tmp'.format(cache_file)
+    progress = BlobProgress(log, sum(blob['size'] for blob in needs_retrieving))
 
-        if not os.path.isfile(cache_file):
-            if offline_mode:
-                return None
+    def fetch(blob):
+        cache_file = files[blob['digest']]
 
-            prev_time = 0.0
+        if blob['digest'] in needs_retrieving_digests:
+            fetch_blob(blob_cache, url, ns, image, blob, progress)
 
-            full_url = 'https://{}/v2/{}/{}/blobs/{}'.format(url, ns, image, blob['digest'])
-            response = get_with_token(url, full_url, raw=True)
-            with open(cache_file_temp, 'wb') as cache_fileobj:
-                for chunk in iter(partial(response.raw.read, IO_CHUNK_SIZE), b''):
-                    cache_fileobj.write(chunk)
+        if on_fetched is not None:
+            on_fetched(blob, cache_file)
 
-                    if log.is_progress_enabled():
-                        downloaded_size += len(chunk)
-                        percent = (downloaded_size * 1.0) / total_size
-                        download_complete = percent >= 1.0
-                        now_time = time.time()
-                        if download_complete or now_time - prev_time >= 0.1:
-                            progress_bar_text = screen_utils.progress_bar(percent)
-                            log.progress(progress_bar_text, flush=download_complete)
-                            prev_time = now_time
+    if len(unique_blobs) > 0:
+        with ThreadPoolExecutor(max_workers=max(1, min(DOCKER_FETCH_WORKERS, len(unique_blobs)))) as executor:
+            for result in [executor.submit(fetch, blob) for blob in unique_blobs]:
+                result.result()
 
-            os.rename(cache_file_temp, cache_file)
+    return dict(files)
 
-        files[blob['digest']] = cache_file
 
-    return files
+def fetch_blob(blob_cache, url, ns, image, blob, progress):
+    full_url = 'https://{}/v2/{}/{}/blobs/{}'.format(url, ns, image, blob['digest'])
+    response = get_with_token(url, full_url, raw=True)
 
+    fd, cache_file_temp = blob_cache.create_temp_file(blob['digest'])
+    try:
+        digest = hashlib.sha256()
+        with os.fdopen(fd, 'wb') as cache_fileobj:
+            for chunk in iter(partial(response.raw.read, IO_CHUNK_SIZE), b''):
+                cache_fileobj.write(chunk)
+                digest.update(chunk)
+                progress.update(len(chunk))
+
+        if blob['digest'].startswith('sha256:') and strip_digest(blob['digest']) != digest.hexdigest():
+            raise DockerImageMalformedError('{}/{}/{} - blob {} does not match its digest'.format(
+                url, ns, image, blob['digest']))
+
+        blob_cache.add_blob(blob['digest'], cache_file_temp)
+    finally:
+        response.close()
+        if os.path.exists(cache_file_temp):
+            os.remove(cache_file_temp)
+
+
+class BlobProgress:
+    """
+    The progress bar of the blobs downloaded concurrently, updated by every worker.
+    """
+    def __init__(self, log, total_size):
+        self.log = log
+        self.total_size = total_size
+        self.downloaded_size = 0
+        self.prev_time = 0.0
+        self.lock = threading.Lock()
+
+    def update(self, size):
+        if not self.log.is_progress_enabled() or self.total_size <= 0:
+            return
+
+        with self.lock:
+            self.downloaded_size += size
+            percent = (self.downloaded_size * 1.0) / self.total_size
+            download_complete = percent >= 1.0
+            now_time = time.time()
+            if download_complete or now_time - self.prev_time >= 0.1:
+                progress_bar_text = screen_utils.progress_bar(percent)
+                self.log.progress(progress_bar_text, flush=download_complete)
+                self.prev_time = now_time
+
+
+def extract_layer(temp_dir, layer, layer_file):
+    """
+    Writes the uncompressed layer into the `docker save` style directory.
+    :return: the path of the layer within the directory, and the digest of its uncompressed contents
+    """
+    digest = hashlib.sha256()
+    base_layer_name = os.path.join(strip_digest(layer['digest']), 'layer.tar')
+    file_name = os.path.join(temp_dir, base_layer_name)
+    os.makedirs(os.path.dirname(file_name))
+
+    with open(file_name, 'wb') as layer_out_file, open(layer_file, 'rb') as layer_in_file:
+        if is_gzip_layer(layer):
+            with gzip.GzipFile(fileobj=layer_in_file.raw, mode='rb') as gzip_file:
+                for chunk in iter(partial(gzip_file.read, IO_CHUNK_SIZE), b''):
+                    layer_out_file.write(chunk)
+                    digest.update(chunk)
+        else:
+            for chunk in iter(partial(layer_in_file.read, IO_CHUNK_SIZE), b''):
+                layer_out_file.write(chunk)
+                digest.update(chunk)
 
-def fetch_manifest(cache_dir, url, ns, image, manifest, offline_mode):
-    full_url = 'https://{}/v2/{}/{}/manifests/{}'.format(url, ns, image, manifest)
-    full_url_digest = hashlib.sha256(full_url.encode('UTF-8')).hexdigest()
-    cache_file = os.path.join(cache_dir, 'docker-manifest-{}'.format(full_url_digest))
+    return base_layer_name, 'sha256:{}'.format(digest.hexdigest())
 
-    if offline_mode:
-        if os.path.isfile(cache_file):
-            with open(cache_file, 'r') as cache_fileobj:
-                return json.load(cache_fileobj)
-        else:
-            return None
-    else:
-        response = get_with_token(url,
-                                  full_url,
-                                  headers={'Accept': 'application/vnd.docker.distribution.manifest.v2+json'})
-        response.raise_for_status()
 
-        with open(cache_file, 'w', encoding="utf-8") as cache_fileobj:
-            cache_fileobj.write(response.text)
+def manifest_url(url, ns, image, reference):
+    return 'https://{}/v2/{}/{}/manifests/{}'.format(url, ns, image, reference)
+
+
+def fetch_manifest(blob_cache, url, ns, image, manifest, offline_mode):
+    """
+    Fetches the manifest of the image by tag or by digest. A manifest fetched by digest is content addressed, so its
+    cached copy is used as it is. A manifest fetched by tag is revalidated with a HEAD request, and its cached copy is
+    used as long as the registry reports the same digest. It is fetched with GET if the HEAD request fails.
+    :return: the manifest, or None if it is missing from the cache in offline mode
+    """
+    full_url = manifest_url(url, ns, image, manifest)
+    cached_manifest = blob_cache.read_manifest(full_url)
+
+    if cached_manifest is not None and is_digest(manifest) and manifest_digest(cached_manifest) != manifest:
+        cached_manifest = None
+
+    if offline_mode or (cached_manifest is not None and is_digest(manifest)):
+        return json.loads(cached_manifest) if cached_manifest is not None else None
+
+    headers = {'Accept': MANIFEST_MEDIA_TYPE}
+
+    if cached_manifest is not None:
+        # A registry which does not support HEAD, e.g. answering 404 or 405, is revalidated against with GET instead
+        try:
+            response = head_with_token(url, full_url, headers=headers)
+        except requests.exceptions.HTTPError:
+            response = None
+
+        if response is not None and response.headers.get('Docker-Content-Digest') == manifest_digest(cached_manifest):
+            return json.loads(cached_manifest)
+
+    response = get_with_token(url, full_url, headers=headers)
+    response.raise_for_status()
+    contents = response.content.decode('UTF-8')
+
+    if is_digest(manifest) and manifest_digest(contents) != manifest:
+        raise DockerImageMalformedError('{} - manifest does not match its digest {}'.format(full_url, manifest))
+
+    blob_cache.add_manifest(full_url, contents)
 
-        return json.loads(response.text)
+    return json.loads(contents)
+
+
+def manifest_digest(contents):
+    return 'sha256:{}'.format(hashlib.sha256(contents.encode('UTF-8')).hexdigest())
+
+
+def is_digest(reference):
+    return reference.startswith('sha256:')
 
 
 def strip_digest(value):
@@ -157,6 +276,41 @@ def strip_digest(value):
         return value
 
 
+def is_gzip_layer(layer):
+    return layer['mediaType'].endswith('.gzip') or layer['mediaType'].endswith('+gzip')
+
+
+def write_oci_image(destination, image, tag, manifest, files):
+    """
+    Lays out the image fetched from the registry as an OCI image, keeping its compressed layers and their digests as
+    they are. The layers are linked from the blob cache, so only the config, manifest and ref are written.
+    """
+    blobs_dir = os.path.join(destination, 'blobs', 'sha256')
+    os.makedirs(blobs_dir)
+    os.makedirs(os.path.join(destination, 'refs'))
+
+    file_write_bytes(os.path.join(destination, 'oci-layout'), '{"imageLayoutVersion": "1.0.0"}'.encode('UTF-8'))
+
+    for layer in manifest['layers']:
+        layer_path = os.path.join(blobs_dir, strip_digest(layer['digest']))
+        if not os.path.exists(layer_path):
+            link_or_copy(files[layer['digest']], layer_path)
+
+    with open(files[manifest['config']['digest']], 'r', encoding='utf-8') as config_fileobj:
+        config = json.load(config_fileobj)
+
+    layer_digests = [strip_digest(layer['digest']) for layer in manifest['layers']]
+    oci_spec = docker_config_to_oci_image({'Layers': layer_digests},
+                                          config,
+                                          {strip_digest(layer['digest']): layer['size'] for layer in manifest['layers']},
+                                          {layer_digest: layer_digest for layer_digest in layer_digests},
+                                          image_name=image)
+
+    file_write_bytes(os.path.join(blobs_dir, oci_spec['config_digest']), oci_spec['config'])
+    file_write_bytes(os.path.join(blobs_dir, oci_spec['manifest_digest']), oci_spec['manifest'])
+    file_write_bytes(os.path.join(destination, 'refs', tag), oci_spec['refs'])
+
+
 def parse_uri(uri):
     parts = uri.split('/', 2)
     num_parts = len(parts)
@@ -167,10 +321,13 @@ def parse_uri(uri):
     provided_ns = parts[1] if num_parts > 2 else parts[0] if num_parts > 1 else None
     ns = provided_ns if provided_ns is not None else 'library'
 
-    image_parts = (parts[2] if num_parts > 2 else parts[1] if num_parts > 1 else parts[0]).split(':', 1)
+    # An image pinned by digest, e.g. `alpine@sha256:...`, is resolved by its digest rather than by its tag
+    image_parts = (parts[2] if num_parts > 2 else parts[1] if num_parts > 1 else parts[0]).split('@', 1)
+    image_digest = image_parts[1] if len(image_parts) > 1 else None
+    image_parts = image_parts[0].split(':', 1)
     image = image_parts[0]
 
-    provided_tag = image_parts[1] if len(image_parts) > 1 else None
+    provided_tag = image_digest if image_digest is not None else image_parts[1] if len(image_parts) > 1 else None
     tag = provided_tag if provided_tag is not None else 'latest'
 
     return (provided_url, url), (provided_ns, ns), (image, image), (provided_tag, tag)
@@ -181,52 +338,71 @@ def resolve_bundle(cache_dir, uri, auth=None):
 
 
 def do_resolve_bundle(cache_dir, uri, auth, offline_mode):
-    (provided_url, url), (provided_ns, ns), (provided_image, image), (provided_tag, tag) = parse_uri(uri)
+    (provided_url, url), (provided_ns, ns), (provided_image, image), (provided_tag, reference) = parse_uri(uri)
+
+    # Docker tags cannot hold a digest, so an image pinned by digest is tagged with the digest value
+    tag = strip_digest(reference)
 
     temp_dir = tempfile.mkdtemp()
 
     try:
-        manifest = fetch_manifest(cache_dir, url, ns, image, tag, offline_mode)
+        # The manifest and blobs of the resolution share the cache, sized by `DOCKER_BLOB_CACHE_MAX_SIZE_MB`
+        blob_cache = docker_blob_cache.DockerBlobCache(cache_dir)
+        manifest = fetch_manifest(blob_cache, url, ns, image, reference, offline_mode)
 
         if manifest is None:
             return False, None, None, DockerImageMalformedError('{} - unable to find manifest'.format(uri))
         elif 'config' not in manifest or 'layers' not in manifest:
             return False, None, None, DockerImageMalformedError('{} - 1.0 manifests are not supported'.format(uri))
 
-        files = fetch_blobs(cache_dir, url, ns, image, [manifest['config']] + manifest['layers'], offline_mode)
-
-        if files is None:
-            return False, None, None, None
-
-        shutil.copyfile(
-            files[manifest['config']['digest']],
-            os.path.join(temp_dir, strip_digest(manifest['config']['digest']) + '.json')
-        )
-
-        layers = []
-        layer_digests = []
-
-        for layer in manifest['layers']:
-            layer_file = files[layer['digest']]
-            digest = hashlib.sha256()
-            base_layer_digest = strip_digest(layer['digest'])
-            layer_digests.append(base_layer_digest)
-            base_layer_name = os.path.join(base_layer_digest, 'layer.tar')
-            file_name = os.path.join(temp_dir, base_layer_name)
-            os.makedirs(os.path.dirname(file_name))
-
-            with open(file_name, 'wb') as layer_out_file, open(layer_file, 'rb') as layer_in_file:
-                if layer['mediaType'].endswith('.gzip'):
-                    with gzip.GzipFile(fileobj=layer_in_file.raw, mode='rb') as gzip_file:
-                        for chunk in iter(partial(gzip_file.read, IO_CHUNK_SIZE), b''):
-                            layer_out_file.write(chunk)
-                            digest.update(chunk)
-                else:
-                    for chunk in iter(partial(layer_in_file.read, IO_CHUNK_SIZE), b''):
-                        layer_out_file.write(chunk)
-                        digest.update(chunk)
-
-            layers.append(base_layer_name)
+        blobs = [manifest['config']] + manifest['layers']
+        digests = [blob['digest'] for blob in blobs]
+
+        # The blobs are leased until they are linked or decompressed into the image directory, then recorded as
+        # referenced by the manifest
+        with blob_cache.lease(digests):
+
+            # Gzip layers are passed through as OCI blobs. Others are decompressed into a `docker save` style
+            # directory, to be converted by `bndl`.
+            if all(is_gzip_layer(layer) for layer in manifest['layers']):
+                files = fetch_blobs(blob_cache, url, ns, image, blobs, offline_mode)
+
+                if files is None:
+                    return False, None, None, None
+
+                write_oci_image(temp_dir, image, tag, manifest, files)
+                blob_cache.use(manifest_url(url, ns, image, reference), digests)
+
+                return True, None, temp_dir, None
+
+            layer_digests = [layer['digest'] for layer in manifest['layers']]
+            diff_ids = {}
+
+            def on_fetched(blob, cache_file):
+                if blob['digest'] in layer_digests:
+                    diff_ids[blob['digest']] = extract_layer(temp_dir, blob, cache_file)[1]
+
+            files = fetch_blobs(blob_cache, url, ns, image, blobs, offline_mode, on_fetched)
+
+            if files is None:
+                return False, None, None, None
+
+            config_file = os.path.join(temp_dir, strip_digest(manifest['config']['digest']) + '.json')
+            shutil.copyfile(files[manifest['config']['digest']], config_file)
+
+            # The layers are verified once all of them are present, against the digests of their uncompressed contents
+            with open(config_file, 'r', encoding='utf-8') as config_fileobj:
+                config_diff_ids = json.load(config_fileobj).get('rootfs', {}).get('diff_ids', [])
+
+            if len(config_diff_ids) == len(layer_digests):
+                for layer_digest, diff_id in zip(layer_digests, config_diff_ids):
+                    if diff_ids[layer_digest] != diff_id:
+                        return False, None, None, DockerImageMalformedError(
+                            '{} - layer {} does not match its digest {}'.format(uri, layer_digest, diff_id))
+
+            layers = [os.path.join(strip_digest(layer_digest), 'layer.tar') for layer_digest in layer_digests]
+            layer_digests = [strip_digest(layer_digest) for layer_digest in layer_digests]
+            blob_cache.use(manifest_url(url, ns, image, reference), digests)
 
         manifests_tag = []
         repositories = {}
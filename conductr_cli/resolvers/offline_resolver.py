@@ -1,6 +1,6 @@
+from conductr_cli import bundle_cache
 from conductr_cli.resolvers.schemes import SCHEME_BUNDLE, SCHEME_FILE
 import os
-import glob
 import logging
 
 
@@ -27,20 +27,19 @@ def load_bundle_from_cache(cache_dir, uri):
     """
     Tries to load a bundle from the cache directory.
     If offline mode is enabled and the given uri equals a bundle name without slashes, e.g. 'visualizer'
-    then it tries to resolve the last modified bundle from the cache directory by the given uri.
+    then it tries to resolve the bundle of that name most recently added to the cache directory.
     Otherwise, when the supplied uri is a local filesystem, the file is not loaded from cache so that the
     local file can be loaded directly.
     :param cache_dir: the cache directory
-    :param uri: the bundle uri. Can be either a bundle name, e.g. 'visualizer, an http or file uri
+    :param uri: the bundle uri. Can be either a bundle name, e.g. 'visualizer', an http or file uri
     :return: a tuple of (is_cached, bundle_name, bundle_uri)
     """
     # When the supplied uri is a local filesystem, don't load from cache so file can be used as is
     if is_bundle_name(uri):
-        cached_bundles = glob.glob('{}/{}*'.format(cache_dir, uri))
-        if cached_bundles:
+        cached = bundle_cache.BundleCache(cache_dir).find_name(uri)
+        if cached:
             log = logging.getLogger(__name__)
-            latest_bundle_file = max(cached_bundles, key=os.path.getctime)
-            bundle_name = os.path.basename(latest_bundle_file)
+            bundle_name, latest_bundle_file = cached
             log.info('Retrieving from cache {}'.format(latest_bundle_file))
             return True, bundle_name, latest_bundle_file, None
 
@@ -1,5 +1,6 @@
 from unittest import TestCase
 from conductr_cli.test.cli_test_case import strip_margin
+from conductr_cli import logging_setup
 from conductr_cli.resolvers import bintray_resolver
 from conductr_cli.resolvers.schemes import SCHEME_BUNDLE
 from conductr_cli.exceptions import MalformedBundleUriError, BintrayResolutionError, MalformedBintrayCredentialsError, \
@@ -7,6 +8,8 @@ from conductr_cli.exceptions import MalformedBundleUriError, BintrayResolutionEr
 from requests.exceptions import HTTPError, ConnectionError
 import io
 import os
+import shutil
+import tempfile
 from unittest.mock import call, patch, MagicMock, Mock
 
 
@@ -31,17 +34,18 @@ class TestResolveBundle(TestCase):
 
         with patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle', parse_bundle_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock), \
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.uri_resolver.resolve_file', resolve_bundle_mock):
             result = bintray_resolver.resolve_bundle('/cache-dir', 'bundle-name:v1')
             self.assertEqual((True, 'bundle-name', 'mock bundle file', None), result)
 
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle', 'bundle-name',
-                                                        'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe', 'bundle',
+                                                        'bundle-name', 'v1', 'digest')
         resolve_bundle_mock.assert_called_with('/cache-dir', 'https://dl.bintray.com/typesafe/bundle/download.zip',
-                                               self.bintray_auth, False)
+                                               self.bintray_auth, raise_error=False, digest=None)
 
     def test_bintray_version_not_found(self):
         load_bintray_credentials_mock = MagicMock(return_value=self.bintray_auth)
@@ -50,14 +54,15 @@ class TestResolveBundle(TestCase):
 
         with patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle', parse_bundle_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             result = bintray_resolver.resolve_bundle('/cache-dir', 'bundle-name:v1')
             self.assertEqual((False, None, None, None), result)
 
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle', 'bundle-name',
-                                                        'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe', 'bundle',
+                                                        'bundle-name', 'v1', 'digest')
 
     def test_failure_malformed_bundle_uri(self):
         error = MalformedBundleUriError('test only')
@@ -78,13 +83,14 @@ class TestResolveBundle(TestCase):
 
         with patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle', parse_bundle_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             self.assertEqual(bintray_resolver.resolve_bundle('/cache-dir', 'bundle-name:v1'),
                              (False, None, None, error))
 
         exists_mock.assert_not_called()
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
-        bintray_resolve_version_mock.assert_called_with(self.bintray_no_auth, 'typesafe', 'bundle',
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_no_auth, 'typesafe', 'bundle',
                                                         'bundle-name', 'v1', 'digest')
 
     def test_failure_http_error(self):
@@ -95,14 +101,15 @@ class TestResolveBundle(TestCase):
 
         with patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle', parse_bundle_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             result = bintray_resolver.resolve_bundle('/cache-dir', 'bundle-name:v1')
             self.assertEqual((False, None, None, error), result)
 
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle', 'bundle-name',
-                                                        'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe', 'bundle',
+                                                        'bundle-name', 'v1', 'digest')
 
     def test_connection_error(self):
         load_bintray_credentials_mock = MagicMock(return_value=self.bintray_auth)
@@ -112,14 +119,15 @@ class TestResolveBundle(TestCase):
 
         with patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle', parse_bundle_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             result = bintray_resolver.resolve_bundle('/cache-dir', 'bundle-name:v1')
             self.assertEqual((False, None, None, error), result)
 
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle', 'bundle-name',
-                                                        'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe', 'bundle',
+                                                        'bundle-name', 'v1', 'digest')
 
 
 class TestResolveBundleConfiguration(TestCase):
@@ -143,19 +151,21 @@ class TestResolveBundleConfiguration(TestCase):
 
         with patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle_configuration', parse_bundle_configuration_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock), \
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.uri_resolver.resolve_file', resolve_bundle_mock):
             result = bintray_resolver.resolve_bundle_configuration('/cache-dir', 'bundle-name:v1')
             self.assertEqual((True, 'bundle-name', 'mock bundle file', None), result)
 
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_configuration_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle-configuration',
-                                                        'bundle-name', 'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe',
+                                                        'bundle-configuration', 'bundle-name', 'v1', 'digest')
         resolve_bundle_mock.assert_called_with('/cache-dir',
                                                'https://dl.bintray.com/typesafe/bundle-configuration/download.zip',
                                                self.bintray_auth,
-                                               False)
+                                               raise_error=False,
+                                               digest=None)
 
     def test_bintray_version_not_found(self):
         load_bintray_credentials_mock = MagicMock(return_value=self.bintray_auth)
@@ -165,14 +175,15 @@ class TestResolveBundleConfiguration(TestCase):
 
         with patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle_configuration', parse_bundle_configuration_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             result = bintray_resolver.resolve_bundle_configuration('/cache-dir', 'bundle-name:v1')
             self.assertEqual((False, None, None, None), result)
 
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_configuration_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle-configuration',
-                                                        'bundle-name', 'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe',
+                                                        'bundle-configuration', 'bundle-name', 'v1', 'digest')
 
     def test_failure_malformed_bundle_uri(self):
         error = MalformedBundleUriError('test only')
@@ -193,14 +204,15 @@ class TestResolveBundleConfiguration(TestCase):
 
         with patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle_configuration', parse_bundle_configuration_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             self.assertEqual(bintray_resolver.resolve_bundle_configuration('/cache-dir', 'bundle-name:v1'),
                              (False, None, None, error))
 
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_configuration_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_no_auth, 'typesafe', 'bundle-configuration',
-                                                        'bundle-name', 'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_no_auth, 'typesafe',
+                                                        'bundle-configuration', 'bundle-name', 'v1', 'digest')
 
     def test_failure_http_error(self):
         load_bintray_credentials_mock = MagicMock(return_value=self.bintray_auth)
@@ -211,14 +223,15 @@ class TestResolveBundleConfiguration(TestCase):
 
         with patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle_configuration', parse_bundle_configuration_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             result = bintray_resolver.resolve_bundle_configuration('/cache-dir', 'bundle-name:v1')
             self.assertEqual((False, None, None, error), result)
 
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_configuration_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle-configuration',
-                                                        'bundle-name', 'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe',
+                                                        'bundle-configuration', 'bundle-name', 'v1', 'digest')
 
     def test_failure_connection_error(self):
         load_bintray_credentials_mock = MagicMock(return_value=self.bintray_auth)
@@ -229,14 +242,15 @@ class TestResolveBundleConfiguration(TestCase):
 
         with patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle_configuration', parse_bundle_configuration_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             result = bintray_resolver.resolve_bundle_configuration('/cache-dir', 'bundle-name:v1')
             self.assertEqual((False, None, None, error), result)
 
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_configuration_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle-configuration',
-                                                        'bundle-name', 'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe',
+                                                        'bundle-configuration', 'bundle-name', 'v1', 'digest')
 
 
 class TestLoadBundleFromCache(TestCase):
@@ -268,7 +282,8 @@ class TestLoadBundleFromCache(TestCase):
                 patch('os.path.isfile', isfile_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle', parse_bundle_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', credentials_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             result = bintray_resolver.resolve_bundle('/cache-dir', 'bundle')
             self.assertEqual((False, None, None, None), result)
 
@@ -281,7 +296,8 @@ class TestLoadBundleFromCache(TestCase):
 
         with patch('os.path.exists', exists_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             bintray_resolver.load_bundle_from_cache(
                 '/cache-dir', '/tmp/bundle')
 
@@ -305,7 +321,8 @@ class TestLoadBundleFromCache(TestCase):
         with patch('os.path.exists', exists_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle', parse_bundle_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock), \
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.uri_resolver.load_bundle_from_cache',
                       load_bundle_from_cache_mock):
             result = bintray_resolver.load_bundle_from_cache('/cache-dir', 'bundle-name:v1')
@@ -314,8 +331,8 @@ class TestLoadBundleFromCache(TestCase):
         exists_mock.assert_not_called()
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle', 'bundle-name',
-                                                        'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe', 'bundle',
+                                                        'bundle-name', 'v1', 'digest')
         load_bundle_from_cache_mock.assert_called_with('/cache-dir',
                                                        'https://dl.bintray.com/typesafe/bundle/download.zip')
 
@@ -328,15 +345,16 @@ class TestLoadBundleFromCache(TestCase):
         with patch('os.path.exists', exists_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle', parse_bundle_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             result = bintray_resolver.load_bundle_from_cache('/cache-dir', 'bundle-name:v1')
             self.assertEqual((False, None, None, None), result)
 
         exists_mock.assert_not_called()
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle', 'bundle-name',
-                                                        'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe', 'bundle',
+                                                        'bundle-name', 'v1', 'digest')
 
     def test_failure_malformed_bundle_uri(self):
         exists_mock = MagicMock(return_value=False)
@@ -361,14 +379,15 @@ class TestLoadBundleFromCache(TestCase):
         with patch('os.path.exists', exists_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle', parse_bundle_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             self.assertEqual(bintray_resolver.load_bundle_from_cache('/cache-dir', 'bundle-name:v1'),
                              (False, None, None, error))
 
         exists_mock.assert_not_called()
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_no_auth, 'typesafe', 'bundle',
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_no_auth, 'typesafe', 'bundle',
                                                         'bundle-name', 'v1', 'digest')
 
     def test_failure_http_error(self):
@@ -381,15 +400,16 @@ class TestLoadBundleFromCache(TestCase):
         with patch('os.path.exists', exists_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle', parse_bundle_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             result = bintray_resolver.load_bundle_from_cache('/cache-dir', 'bundle-name:v1')
             self.assertEqual((False, None, None, error), result)
 
         exists_mock.assert_not_called()
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle', 'bundle-name',
-                                                        'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe', 'bundle',
+                                                        'bundle-name', 'v1', 'digest')
 
     def test_failure_connection_error(self):
         exists_mock = MagicMock(return_value=False)
@@ -401,15 +421,16 @@ class TestLoadBundleFromCache(TestCase):
         with patch('os.path.exists', exists_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle', parse_bundle_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             result = bintray_resolver.load_bundle_from_cache('/cache-dir', 'bundle-name:v1')
             self.assertEqual((False, None, None, error), result)
 
         exists_mock.assert_not_called()
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle', 'bundle-name',
-                                                        'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe', 'bundle',
+                                                        'bundle-name', 'v1', 'digest')
 
 
 class TestLoadBundleConfigurationFromCache(TestCase):
@@ -449,7 +470,8 @@ class TestLoadBundleConfigurationFromCache(TestCase):
         with patch('os.path.exists', exists_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle_configuration', parse_bundle_configuration_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock), \
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.uri_resolver.load_bundle_from_cache',
                       load_bundle_from_cache_mock):
             result = bintray_resolver.load_bundle_configuration_from_cache('/cache-dir', 'bundle-name:v1')
@@ -458,8 +480,8 @@ class TestLoadBundleConfigurationFromCache(TestCase):
         exists_mock.assert_not_called()
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_configuration_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle-configuration',
-                                                        'bundle-name', 'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe',
+                                                        'bundle-configuration', 'bundle-name', 'v1', 'digest')
         load_bundle_from_cache_mock.assert_called_with('/cache-dir',
                                                        'https://dl.bintray.com/typesafe/bundle-configuration/download.zip')
 
@@ -473,15 +495,16 @@ class TestLoadBundleConfigurationFromCache(TestCase):
         with patch('os.path.exists', exists_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle_configuration', parse_bundle_configuration_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             result = bintray_resolver.load_bundle_configuration_from_cache('/cache-dir', 'bundle-name:v1')
             self.assertEqual((False, None, None, None), result)
 
         exists_mock.assert_not_called()
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_configuration_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle-configuration',
-                                                        'bundle-name', 'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe',
+                                                        'bundle-configuration', 'bundle-name', 'v1', 'digest')
 
     def test_failure_malformed_bundle_uri(self):
         exists_mock = MagicMock(return_value=False)
@@ -507,7 +530,8 @@ class TestLoadBundleConfigurationFromCache(TestCase):
         with patch('os.path.exists', exists_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle_configuration', parse_bundle_configuration_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             self.assertEqual(
                 bintray_resolver.load_bundle_configuration_from_cache('/cache-dir', 'bundle-name:v1'),
                 (False, None, None, error)
@@ -516,8 +540,8 @@ class TestLoadBundleConfigurationFromCache(TestCase):
         exists_mock.assert_not_called()
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_configuration_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_no_auth, 'typesafe', 'bundle-configuration',
-                                                        'bundle-name', 'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_no_auth, 'typesafe',
+                                                        'bundle-configuration', 'bundle-name', 'v1', 'digest')
 
     def test_failure_http_error(self):
         exists_mock = MagicMock(return_value=False)
@@ -530,15 +554,16 @@ class TestLoadBundleConfigurationFromCache(TestCase):
         with patch('os.path.exists', exists_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle_configuration', parse_bundle_configuration_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             result = bintray_resolver.load_bundle_configuration_from_cache('/cache-dir', 'bundle-name:v1')
             self.assertEqual((False, None, None, error), result)
 
         exists_mock.assert_not_called()
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_configuration_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle-configuration',
-                                                        'bundle-name', 'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe',
+                                                        'bundle-configuration', 'bundle-name', 'v1', 'digest')
 
     def test_failure_connection_error(self):
         exists_mock = MagicMock(return_value=False)
@@ -551,15 +576,16 @@ class TestLoadBundleConfigurationFromCache(TestCase):
         with patch('os.path.exists', exists_mock), \
                 patch('conductr_cli.resolvers.bintray_resolver.load_bintray_credentials', load_bintray_credentials_mock), \
                 patch('conductr_cli.bundle_shorthand.parse_bundle_configuration', parse_bundle_configuration_mock), \
-                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock):
+                patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version_cached',
+                      bintray_resolve_version_mock):
             result = bintray_resolver.load_bundle_configuration_from_cache('/cache-dir', 'bundle-name:v1')
             self.assertEqual((False, None, None, error), result)
 
         exists_mock.assert_not_called()
         load_bintray_credentials_mock.assert_called_with(raise_error=False)
         parse_bundle_configuration_mock.assert_called_with('bundle-name:v1')
-        bintray_resolve_version_mock.assert_called_with(self.bintray_auth, 'typesafe', 'bundle-configuration',
-                                                        'bundle-name', 'v1', 'digest')
+        bintray_resolve_version_mock.assert_called_with('/cache-dir', self.bintray_auth, 'typesafe',
+                                                        'bundle-configuration', 'bundle-name', 'v1', 'digest')
 
 
 class TestBintrayResolveVersion(TestCase):
@@ -572,7 +598,8 @@ class TestBintrayResolveVersion(TestCase):
                 'repo': 'bundle',
                 'package': 'reactive-maps-frontend',
                 'version': 'v1-023f9da22',
-                'path': 'download/path.zip'
+                'path': 'download/path.zip',
+                'sha256': 'c2d6b7a3e3b6fd3e3bd1b0d8e0f6c9b1e8c0e2f5a7c4f6e5d7b9a8c6e4f2d1a3'
             }
         ]
         get_json_mock = MagicMock(return_value=bintray_files_endpoint_response)
@@ -590,6 +617,7 @@ class TestBintrayResolveVersion(TestCase):
                 'version': 'v1-023f9da22',
                 'path': 'download/path.zip',
                 'download_url': 'https://dl.bintray.com/typesafe/bundle/download/path.zip',
+                'sha256': 'c2d6b7a3e3b6fd3e3bd1b0d8e0f6c9b1e8c0e2f5a7c4f6e5d7b9a8c6e4f2d1a3',
                 'resolver': bintray_resolver.__name__
             })
 
@@ -676,6 +704,7 @@ class TestBintrayResolveVersionLatest(TestCase):
                 'version': 'v1-023f9da22',
                 'path': 'download/path.zip',
                 'download_url': 'https://dl.bintray.com/typesafe/bundle/download/path.zip',
+                'sha256': None,
                 'resolver': bintray_resolver.__name__
             })
 
@@ -731,6 +760,7 @@ class TestBintrayResolveVersionLatest(TestCase):
                 'version': 'v10-023f9da22',
                 'path': 'download/path.zip',
                 'download_url': 'https://dl.bintray.com/typesafe/bundle/download/path.zip',
+                'sha256': None,
                 'resolver': bintray_resolver.__name__
             })
 
@@ -812,6 +842,7 @@ class TestBintrayResolveVersionLatestCompatibilityVersion(TestCase):
                 'version': 'v1-023f9da22',
                 'path': 'download/path.zip',
                 'download_url': 'https://dl.bintray.com/typesafe/bundle/download/path.zip',
+                'sha256': None,
                 'resolver': bintray_resolver.__name__
             })
 
@@ -840,6 +871,89 @@ class TestBintrayResolveVersionLatestCompatibilityVersion(TestCase):
             'https://api.bintray.com/packages/typesafe/bundle/reactive-maps-frontend/attributes?names=latest-v1')
 
 
+class TestBintrayResolveVersionCached(TestCase):
+    bintray_auth = ('realm', 'username', 'password')
+
+    resolved_version = {
+        'org': 'typesafe',
+        'repo': 'bundle',
+        'package_name': 'bundle-name',
+        'tag': 'v1',
+        'digest': 'digest',
+        'version': 'v1-digest',
+        'path': 'download.zip',
+        'download_url': 'https://dl.bintray.com/typesafe/bundle/download.zip'
+    }
+
+    def setUp(self):  # noqa
+        self.cache_dir = tempfile.mkdtemp()
+        logging_setup.configure_logging(MagicMock(**{}), MagicMock())
+
+    def tearDown(self):  # noqa
+        shutil.rmtree(self.cache_dir)
+
+    def resolve(self, bintray_resolve_version_mock, now, tag='v1', digest=None):
+        with patch('conductr_cli.resolvers.bintray_resolver.bintray_resolve_version', bintray_resolve_version_mock), \
+                patch('time.time', MagicMock(return_value=now)):
+            return bintray_resolver.bintray_resolve_version_cached(self.cache_dir, self.bintray_auth, 'typesafe',
+                                                                   'bundle', 'bundle-name', tag, digest)
+
+    def test_reused_within_ttl(self):
+        bintray_resolve_version_mock = MagicMock(return_value=self.resolved_version)
+
+        self.assertEqual(self.resolved_version, self.resolve(bintray_resolve_version_mock, 1000))
+        self.assertEqual(self.resolved_version, self.resolve(bintray_resolve_version_mock, 1299))
+
+        bintray_resolve_version_mock.assert_called_once_with(self.bintray_auth, 'typesafe', 'bundle', 'bundle-name',
+                                                             'v1', None)
+
+    def test_resolved_again_once_expired(self):
+        bintray_resolve_version_mock = MagicMock(return_value=self.resolved_version)
+
+        self.resolve(bintray_resolve_version_mock, 1000)
+        self.resolve(bintray_resolve_version_mock, 1300)
+
+        self.assertEqual(2, bintray_resolve_version_mock.call_count)
+
+    def test_pinned_version_never_expires(self):
+        bintray_resolve_version_mock = MagicMock(return_value=self.resolved_version)
+
+        self.resolve(bintray_resolve_version_mock, 1000, digest='digest')
+        self.resolve(bintray_resolve_version_mock, 100000, digest='digest')
+
+        bintray_resolve_version_mock.assert_called_once_with(self.bintray_auth, 'typesafe', 'bundle', 'bundle-name',
+                                                             'v1', 'digest')
+
+    def test_keyed_by_tag(self):
+        bintray_resolve_version_mock = MagicMock(return_value=self.resolved_version)
+
+        self.resolve(bintray_resolve_version_mock, 1000, tag='v1')
+        self.resolve(bintray_resolve_version_mock, 1000, tag='v2')
+
+        self.assertEqual([
+            call(self.bintray_auth, 'typesafe', 'bundle', 'bundle-name', 'v1', None),
+            call(self.bintray_auth, 'typesafe', 'bundle', 'bundle-name', 'v2', None)
+        ], bintray_resolve_version_mock.call_args_list)
+
+    def test_not_found_not_cached(self):
+        bintray_resolve_version_mock = MagicMock(return_value=None)
+
+        self.assertIsNone(self.resolve(bintray_resolve_version_mock, 1000))
+        self.assertIsNone(self.resolve(bintray_resolve_version_mock, 1000))
+
+        self.assertEqual(2, bintray_resolve_version_mock.call_count)
+
+    def test_disabled(self):
+        bintray_resolve_version_mock = MagicMock(return_value=self.resolved_version)
+
+        with patch('conductr_cli.resolvers.bintray_resolver.BINTRAY_VERSION_CACHE_TTL_SECONDS', 0):
+            self.resolve(bintray_resolve_version_mock, 1000)
+            self.resolve(bintray_resolve_version_mock, 1000)
+
+        self.assertEqual(2, bintray_resolve_version_mock.call_count)
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, 'metadata')))
+
+
 class TestResolveBundleVersion(TestCase):
     bintray_auth = ('realm', 'username', 'password')
 
@@ -1,10 +1,40 @@
+from conductr_cli.bndl_oci import oci_image_extract_manifest_config, oci_image_title
+from conductr_cli.bndl_utils import BndlFormat, detect_format_dir
+from conductr_cli.docker_blob_cache import DockerBlobCache, read_index
+from conductr_cli.docker_token_cache import DockerTokenCache
+from conductr_cli.exceptions import DockerImageMalformedError
 from conductr_cli.resolvers import docker_resolver
 from conductr_cli.resolvers.schemes import SCHEME_BUNDLE
+from conductr_cli.test.cli_test_case import create_mock_logger
 from unittest import TestCase
 from unittest.mock import call, patch, MagicMock
+import gzip
+import hashlib
+import io
+import json
+import os
+import requests
+import shutil
 import tempfile
 
 
+def create_blob(contents, media_type='application/vnd.docker.image.rootfs.diff.tar.gzip'):
+    return {
+        'mediaType': media_type,
+        'size': len(contents),
+        'digest': 'sha256:{}'.format(hashlib.sha256(contents).hexdigest())
+    }
+
+
+def serve_blobs(contents_by_digest):
+    def get_with_token(ns, url, headers=None, raw=False):
+        response = MagicMock()
+        response.raw = io.BytesIO(contents_by_digest[url[url.rindex('/') + 1:]])
+        return response
+
+    return MagicMock(side_effect=get_with_token)
+
+
 class TestParseUri(TestCase):
     def test_success(self):
         self.assertEqual(docker_resolver.parse_uri('alpine'), (
@@ -35,6 +65,14 @@ class TestParseUri(TestCase):
             ('0.1', '0.1')
         ))
 
+        digest = 'sha256:{}'.format('a' * 64)
+        self.assertEqual(docker_resolver.parse_uri('alpine:3.5@{}'.format(digest)), (
+            (None, 'registry.hub.docker.com'),
+            (None, 'library'),
+            ('alpine', 'alpine'),
+            (digest, digest)
+        ))
+
 
 class TestLoadCredentials(TestCase):
     def test_load_docker_credentials(self):
@@ -83,24 +121,363 @@ class TestLoadCredentials(TestCase):
                 ])
 
 
+class TestRequestWithToken(TestCase):
+    url = 'https://registry.hub.docker.com/v2/library/alpine/manifests/3.5'
+
+    def setUp(self):  # noqa
+        self.settings_dir = tempfile.mkdtemp()
+        self.token_cache = DockerTokenCache(os.path.join(self.settings_dir, 'docker-tokens.json'))
+
+    def tearDown(self):  # noqa
+        shutil.rmtree(self.settings_dir)
+
+    def request(self, session_mock, token_response_mock):
+        with patch('conductr_cli.conduct_request.session', MagicMock(return_value=session_mock)), \
+                patch('conductr_cli.resolvers.docker_resolver.token_cache', self.token_cache), \
+                patch('conductr_cli.resolvers.docker_resolver.load_docker_credentials', MagicMock(return_value=None)), \
+                patch('requests.get', token_response_mock):
+            return docker_resolver.get_with_token('registry.hub.docker.com', self.url)
+
+    def test_token_cached(self):
+        unauthorized_response = MagicMock(status_code=401, headers={
+            'Www-Authenticate': 'Bearer realm="https://auth.docker.io/token",service="registry.docker.io",'
+                                'scope="repository:library/alpine:pull"'
+        })
+        unauthorized_response.raise_for_status.side_effect = \
+            requests.exceptions.HTTPError(response=unauthorized_response)
+        response = MagicMock()
+        session_mock = MagicMock()
+        session_mock.request.side_effect = [unauthorized_response, response, response]
+        token_response_mock = MagicMock(return_value=MagicMock(text='{"token": "token-a", "expires_in": 300}'))
+
+        self.assertEqual(response, self.request(session_mock, token_response_mock))
+        self.assertEqual(response, self.request(session_mock, token_response_mock))
+
+        token_response_mock.assert_called_once_with(
+            'https://auth.docker.io/token?service=registry.docker.io&scope=repository%3Alibrary%2Falpine%3Apull'
+            '&client_id=Lightbend+ConductR', auth=None)
+        self.assertEqual([
+            call('GET', self.url, stream=False, headers={}),
+            call('GET', self.url, stream=False, headers={'Authorization': 'Bearer token-a'}),
+            call('GET', self.url, stream=False, headers={'Authorization': 'Bearer token-a'})
+        ], session_mock.request.call_args_list)
+        self.assertEqual('token-a',
+                         DockerTokenCache(self.token_cache.path).find('registry.hub.docker.com', 'library/alpine'))
+
+    def test_url_repository(self):
+        self.assertEqual('library/alpine', docker_resolver.url_repository(self.url))
+        self.assertEqual('conductr/oci-in-docker', docker_resolver.url_repository(
+            'https://lightbend-docker.registry.bintray.io/v2/conductr/oci-in-docker/blobs/sha256:abc'))
+        self.assertIsNone(docker_resolver.url_repository('https://registry.hub.docker.com/v2/'))
+
+
 class TestFetchManifest(TestCase):
+    def setUp(self):  # noqa
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):  # noqa
+        shutil.rmtree(self.cache_dir)
+
+    manifest_url = 'https://registry.hub.docker.com/v2/library/alpine/manifests/3.5'
+
+    def fetch_manifest(self, reference, get_with_token_mock=None, head_with_token_mock=None):
+        with patch('conductr_cli.resolvers.docker_resolver.get_with_token', get_with_token_mock or MagicMock()), \
+                patch('conductr_cli.resolvers.docker_resolver.head_with_token', head_with_token_mock or MagicMock()):
+            return docker_resolver.fetch_manifest(DockerBlobCache(self.cache_dir), 'registry.hub.docker.com', 'library',
+                                                  'alpine', reference, False)
+
+    def test_online_mode(self):
+        get_with_token_mock = MagicMock(return_value=MagicMock(content=b'{"schemaVersion": 2}'))
+        head_with_token_mock = MagicMock()
+
+        self.assertEqual({'schemaVersion': 2}, self.fetch_manifest('3.5', get_with_token_mock, head_with_token_mock))
+
+        get_with_token_mock.assert_called_once_with(
+            'registry.hub.docker.com',
+            self.manifest_url,
+            headers={'Accept': 'application/vnd.docker.distribution.manifest.v2+json'})
+        head_with_token_mock.assert_not_called()
+        self.assertEqual('{"schemaVersion": 2}', DockerBlobCache(self.cache_dir).read_manifest(self.manifest_url))
+
+    def test_revalidate_unchanged(self):
+        DockerBlobCache(self.cache_dir).add_manifest(self.manifest_url, '{"schemaVersion": 2}')
+        get_with_token_mock = MagicMock()
+        head_with_token_mock = MagicMock(return_value=MagicMock(headers={
+            'Docker-Content-Digest': docker_resolver.manifest_digest('{"schemaVersion": 2}')
+        }))
+
+        self.assertEqual({'schemaVersion': 2}, self.fetch_manifest('3.5', get_with_token_mock, head_with_token_mock))
+
+        head_with_token_mock.assert_called_once_with(
+            'registry.hub.docker.com',
+            self.manifest_url,
+            headers={'Accept': 'application/vnd.docker.distribution.manifest.v2+json'})
+        get_with_token_mock.assert_not_called()
+
+    def test_revalidate_changed(self):
+        DockerBlobCache(self.cache_dir).add_manifest(self.manifest_url, '{"schemaVersion": 1}')
+        get_with_token_mock = MagicMock(return_value=MagicMock(content=b'{"schemaVersion": 2}'))
+        head_with_token_mock = MagicMock(return_value=MagicMock(headers={
+            'Docker-Content-Digest': docker_resolver.manifest_digest('{"schemaVersion": 2}')
+        }))
+
+        self.assertEqual({'schemaVersion': 2}, self.fetch_manifest('3.5', get_with_token_mock, head_with_token_mock))
+
+        get_with_token_mock.assert_called_once_with(
+            'registry.hub.docker.com',
+            self.manifest_url,
+            headers={'Accept': 'application/vnd.docker.distribution.manifest.v2+json'})
+        self.assertEqual('{"schemaVersion": 2}', DockerBlobCache(self.cache_dir).read_manifest(self.manifest_url))
+
+    def test_revalidate_head_not_supported(self):
+        DockerBlobCache(self.cache_dir).add_manifest(self.manifest_url, '{"schemaVersion": 2}')
+        get_with_token_mock = MagicMock(return_value=MagicMock(content=b'{"schemaVersion": 2}'))
+        head_with_token_mock = MagicMock(side_effect=requests.exceptions.HTTPError(response=MagicMock(status_code=405)))
+
+        self.assertEqual({'schemaVersion': 2}, self.fetch_manifest('3.5', get_with_token_mock, head_with_token_mock))
+
+        head_with_token_mock.assert_called_once_with(
+            'registry.hub.docker.com',
+            self.manifest_url,
+            headers={'Accept': 'application/vnd.docker.distribution.manifest.v2+json'})
+        get_with_token_mock.assert_called_once_with(
+            'registry.hub.docker.com',
+            self.manifest_url,
+            headers={'Accept': 'application/vnd.docker.distribution.manifest.v2+json'})
+
+    def test_digest_cached(self):
+        digest = docker_resolver.manifest_digest('{"schemaVersion": 2}')
+        DockerBlobCache(self.cache_dir).add_manifest(
+            'https://registry.hub.docker.com/v2/library/alpine/manifests/{}'.format(digest), '{"schemaVersion": 2}')
+        get_with_token_mock = MagicMock()
+        head_with_token_mock = MagicMock()
+
+        self.assertEqual({'schemaVersion': 2}, self.fetch_manifest(digest, get_with_token_mock, head_with_token_mock))
+
+        get_with_token_mock.assert_not_called()
+        head_with_token_mock.assert_not_called()
+
+    def test_digest_mismatch(self):
+        digest = docker_resolver.manifest_digest('{"schemaVersion": 2}')
+        get_with_token_mock = MagicMock(return_value=MagicMock(content=b'{"schemaVersion": 1}'))
+
+        with self.assertRaises(DockerImageMalformedError):
+            self.fetch_manifest(digest, get_with_token_mock)
+
+        self.assertIsNone(DockerBlobCache(self.cache_dir).read_manifest(
+            'https://registry.hub.docker.com/v2/library/alpine/manifests/{}'.format(digest)))
 
     def test_offline_mode(self):
-        mock_is_file = MagicMock(return_value=True)
-        mock_json_load = MagicMock(return_value='1234')
-        mock_open = MagicMock(return_value=MagicMock())
-
-        with \
-                patch('os.path.isfile', mock_is_file), \
-                patch('json.load', mock_json_load), \
-                patch('builtins.open', mock_open):
-            self.assertEqual(
-                docker_resolver.fetch_manifest('/tmp', 'registry.hub.docker.com', 'library', 'alpine', '3.5', True),
-                '1234'
-            )
-
-        mock_is_file.assert_called_once_with('/tmp/docker-manifest-624ab327c0f6bb1039ca62'
-                                             '9a2c1ec806514b9194c30491c02e9800254c73d998')
+        blob_cache = DockerBlobCache(self.cache_dir)
+        blob_cache.add_manifest('https://registry.hub.docker.com/v2/library/alpine/manifests/3.5',
+                                '{"schemaVersion": 2}')
+
+        self.assertEqual(
+            docker_resolver.fetch_manifest(blob_cache, 'registry.hub.docker.com', 'library', 'alpine', '3.5', True),
+            {'schemaVersion': 2}
+        )
+        self.assertIsNone(
+            docker_resolver.fetch_manifest(blob_cache, 'registry.hub.docker.com', 'library', 'alpine', '3.6', True)
+        )
+
+
+class TestFetchBlobs(TestCase):
+    def setUp(self):  # noqa
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):  # noqa
+        shutil.rmtree(self.cache_dir)
+
+    def test_fetch_missing_blobs(self):
+        blob_a, blob_b = create_blob(b'a' * 10), create_blob(b'b' * 10)
+        blob_cache = DockerBlobCache(self.cache_dir)
+        os.makedirs(blob_cache.blobs_dir)
+        with open(blob_cache.blob_path(blob_a['digest']), 'wb') as file:
+            file.write(b'a' * 10)
+
+        get_with_token_mock = serve_blobs({blob_b['digest']: b'b' * 10})
+        on_fetched_mock = MagicMock()
+        get_logger_mock, log_mock = create_mock_logger()
+
+        with patch('conductr_cli.resolvers.docker_resolver.get_with_token', get_with_token_mock), \
+                patch('logging.getLogger', get_logger_mock):
+            files = docker_resolver.fetch_blobs(blob_cache, 'registry.hub.docker.com', 'library', 'alpine',
+                                                [blob_a, blob_b, blob_b], False, on_fetched_mock)
+
+        self.assertEqual({
+            blob_a['digest']: blob_cache.blob_path(blob_a['digest']),
+            blob_b['digest']: blob_cache.blob_path(blob_b['digest'])
+        }, files)
+        get_with_token_mock.assert_called_once_with(
+            'registry.hub.docker.com',
+            'https://registry.hub.docker.com/v2/library/alpine/blobs/{}'.format(blob_b['digest']),
+            raw=True)
+        self.assertEqual(2, on_fetched_mock.call_count)
+        self.assertEqual(sorted(os.path.basename(path) for path in files.values()),
+                         sorted(os.listdir(blob_cache.blobs_dir)))
+        self.assertEqual([blob_b['digest']], list(read_index(blob_cache.cache_dir)['blobs']))
+        log_mock.progress.assert_called_with('[##################################################] 100%', flush=True)
+
+    def test_digest_mismatch(self):
+        blob = create_blob(b'a' * 10)
+        get_logger_mock, log_mock = create_mock_logger()
+
+        with patch('conductr_cli.resolvers.docker_resolver.get_with_token',
+                   serve_blobs({blob['digest']: b'corrupted'})), \
+                patch('logging.getLogger', get_logger_mock):
+            self.assertRaises(DockerImageMalformedError, docker_resolver.fetch_blobs,
+                              DockerBlobCache(self.cache_dir),
+                              'registry.hub.docker.com', 'library', 'alpine', [blob], False)
+
+        self.assertEqual([], os.listdir(DockerBlobCache(self.cache_dir).blobs_dir))
+
+    def test_offline_mode(self):
+        get_logger_mock, log_mock = create_mock_logger()
+
+        with patch('logging.getLogger', get_logger_mock):
+            self.assertIsNone(docker_resolver.fetch_blobs(DockerBlobCache(self.cache_dir), 'registry.hub.docker.com',
+                                                          'library', 'alpine', [create_blob(b'a' * 10)], True))
+
+
+class TestExtractLayer(TestCase):
+    def setUp(self):  # noqa
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):  # noqa
+        shutil.rmtree(self.temp_dir)
+
+    def test_decompress_gzip_layers(self):
+        for media_type in ['application/vnd.docker.image.rootfs.diff.tar.gzip',
+                           'application/vnd.oci.image.layer.v1.tar+gzip']:
+            compressed = gzip.compress(media_type.encode('UTF-8'))
+            layer = create_blob(compressed, media_type)
+            layer_file = os.path.join(self.temp_dir, docker_resolver.strip_digest(layer['digest']) + '.blob')
+            with open(layer_file, 'wb') as file:
+                file.write(compressed)
+
+            layer_name, diff_id = docker_resolver.extract_layer(self.temp_dir, layer, layer_file)
+
+            with open(os.path.join(self.temp_dir, layer_name), 'rb') as file:
+                self.assertEqual(media_type.encode('UTF-8'), file.read())
+            self.assertEqual('sha256:{}'.format(hashlib.sha256(media_type.encode('UTF-8')).hexdigest()), diff_id)
+
+
+class TestDoResolveBundle(TestCase):
+    def setUp(self):  # noqa
+        self.cache_dir = tempfile.mkdtemp()
+        self.layers = [b'layer one', b'layer two']
+        self.diff_ids = ['sha256:{}'.format(hashlib.sha256(layer).hexdigest()) for layer in self.layers]
+
+    def tearDown(self):  # noqa
+        shutil.rmtree(self.cache_dir)
+
+    def resolve(self, layers, layer_media_type, diff_ids, uri='alpine:3.5'):
+        config = json.dumps({
+            'created': '2017-06-01T00:00:00Z',
+            'architecture': 'amd64',
+            'os': 'linux',
+            'config': {'Cmd': ['/bin/sh'], 'Labels': {'maintainer': 'lightbend'}},
+            'rootfs': {'type': 'layers', 'diff_ids': diff_ids},
+            'history': []
+        }).encode('UTF-8')
+        config_blob = create_blob(config, 'application/vnd.docker.container.image.v1+json')
+        layer_blobs = [create_blob(layer, layer_media_type) for layer in layers]
+        manifest = {'config': config_blob, 'layers': layer_blobs}
+
+        contents_by_digest = dict(zip([blob['digest'] for blob in layer_blobs], layers))
+        contents_by_digest[config_blob['digest']] = config
+        get_logger_mock, log_mock = create_mock_logger()
+
+        with patch('conductr_cli.resolvers.docker_resolver.fetch_manifest', MagicMock(return_value=manifest)), \
+                patch('conductr_cli.resolvers.docker_resolver.get_with_token', serve_blobs(contents_by_digest)), \
+                patch('logging.getLogger', get_logger_mock):
+            return docker_resolver.do_resolve_bundle(self.cache_dir, uri, None, offline_mode=False), \
+                config_blob, layer_blobs
+
+    def test_oci_image(self):
+        compressed_layers = [gzip.compress(layer) for layer in self.layers]
+        (is_resolved, bundle_name, temp_dir, error), config_blob, layer_blobs = \
+            self.resolve(compressed_layers, 'application/vnd.docker.image.rootfs.diff.tar.gzip', self.diff_ids)
+        self.assertTrue(is_resolved)
+        self.assertIsNone(error)
+
+        try:
+            self.assertEqual(BndlFormat.OCI_IMAGE, detect_format_dir(temp_dir))
+            self.assertEqual('alpine', oci_image_title(temp_dir, '3.5'))
+
+            oci_manifest, oci_config = oci_image_extract_manifest_config(temp_dir, '3.5')
+            self.assertEqual([{
+                'mediaType': 'application/vnd.oci.image.layer.v1.tar+gzip',
+                'size': blob['size'],
+                'digest': blob['digest']
+            } for blob in layer_blobs], oci_manifest['layers'])
+            self.assertEqual({'maintainer': 'lightbend'}, oci_manifest['annotations'])
+            self.assertEqual(self.diff_ids, oci_config['rootfs']['diff_ids'])
+
+            for blob in layer_blobs:
+                layer_path = os.path.join(temp_dir, 'blobs', 'sha256', docker_resolver.strip_digest(blob['digest']))
+                cache_file = DockerBlobCache(self.cache_dir).blob_path(blob['digest'])
+                self.assertTrue(os.path.samefile(cache_file, layer_path))
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_docker_image(self):
+        (is_resolved, bundle_name, temp_dir, error), config_blob, layer_blobs = \
+            self.resolve(self.layers, 'application/vnd.docker.image.rootfs.diff.tar', self.diff_ids)
+        self.assertTrue(is_resolved)
+        self.assertIsNone(error)
+
+        try:
+            self.assertEqual(BndlFormat.DOCKER, detect_format_dir(temp_dir))
+
+            layer_names = [os.path.join(docker_resolver.strip_digest(blob['digest']), 'layer.tar')
+                           for blob in layer_blobs]
+            with open(os.path.join(temp_dir, 'manifest.json'), 'r') as manifest_file:
+                self.assertEqual([{
+                    'Config': '{}.json'.format(docker_resolver.strip_digest(config_blob['digest'])),
+                    'RepoTags': ['alpine:3.5'],
+                    'Layers': layer_names
+                }], json.load(manifest_file))
+
+            for layer_name, layer in zip(layer_names, self.layers):
+                with open(os.path.join(temp_dir, layer_name), 'rb') as layer_file:
+                    self.assertEqual(layer, layer_file.read())
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_docker_image_layer_digest_mismatch(self):
+        (is_resolved, bundle_name, temp_dir, error), config_blob, layer_blobs = \
+            self.resolve(self.layers, 'application/vnd.docker.image.rootfs.diff.tar', list(reversed(self.diff_ids)))
+        self.assertFalse(is_resolved)
+        self.assertIsInstance(error, DockerImageMalformedError)
+
+    def test_blobs_referenced_by_manifest(self):
+        (is_resolved, bundle_name, temp_dir, error), config_blob, layer_blobs = \
+            self.resolve(self.layers, 'application/vnd.docker.image.rootfs.diff.tar', self.diff_ids)
+        shutil.rmtree(temp_dir)
+
+        blob_cache = DockerBlobCache(self.cache_dir)
+        index = read_index(blob_cache.cache_dir)
+        self.assertEqual(sorted([config_blob['digest']] + [blob['digest'] for blob in layer_blobs]),
+                         index['manifests']['https://registry.hub.docker.com/v2/library/alpine/manifests/3.5']['blobs'])
+        self.assertEqual([], os.listdir(blob_cache.leases_dir))
+
+    def test_image_pinned_by_digest(self):
+        digest = 'sha256:{}'.format('a' * 64)
+        (is_resolved, bundle_name, temp_dir, error), config_blob, layer_blobs = \
+            self.resolve(self.layers, 'application/vnd.docker.image.rootfs.diff.tar', self.diff_ids,
+                         uri='alpine@{}'.format(digest))
+        self.assertTrue(is_resolved)
+
+        try:
+            with open(os.path.join(temp_dir, 'manifest.json'), 'r') as manifest_file:
+                self.assertEqual(['alpine:{}'.format('a' * 64)], json.load(manifest_file)[0]['RepoTags'])
+
+            index = read_index(DockerBlobCache(self.cache_dir).cache_dir)
+            self.assertEqual(['https://registry.hub.docker.com/v2/library/alpine/manifests/{}'.format(digest)],
+                             list(index['manifests']))
+        finally:
+            shutil.rmtree(temp_dir)
 
 
 class TestSupportedSchemes(TestCase):
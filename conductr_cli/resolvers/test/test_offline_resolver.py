@@ -2,7 +2,7 @@ from conductr_cli.test.cli_test_case import CliTestCase, strip_margin
 from conductr_cli import logging_setup
 from conductr_cli.resolvers import offline_resolver
 from conductr_cli.resolvers.schemes import SCHEME_BUNDLE, SCHEME_FILE
-from unittest.mock import call, patch, MagicMock
+from unittest.mock import patch, MagicMock
 
 
 class TestResolveBundle(CliTestCase):
@@ -94,50 +94,37 @@ class TestResolveBundleConfiguration(CliTestCase):
 class TestLoadBundleFromCache(CliTestCase):
     cache_dir = '~/.conductr/cache'
 
-    paths = [
-        '{}/path-1.zip'.format(cache_dir),
-        '{}/path-2.zip'.format(cache_dir),
-        '{}/path-3.zip'.format(cache_dir)
-    ]
-
     def test_cached_bundle_found(self):
         stdout = MagicMock()
 
-        mock_glob = MagicMock(return_value=self.paths)
-        mock_getctime = MagicMock(side_effect=[9, 10, 3])
+        mock_find_name = MagicMock(return_value=('path-2.zip', '~/.conductr/cache/digest/path-2.zip'))
 
         args = MagicMock(**{})
 
-        with patch('glob.glob', mock_glob), \
-                patch('os.path.getctime', mock_getctime):
+        with patch('conductr_cli.bundle_cache.BundleCache.find_name', mock_find_name):
             logging_setup.configure_logging(args, stdout)
-            self.assertEqual((True, 'path-2.zip', '~/.conductr/cache/path-2.zip', None),
+            self.assertEqual((True, 'path-2.zip', '~/.conductr/cache/digest/path-2.zip', None),
                              offline_resolver.load_bundle_from_cache(self.cache_dir, 'visualizer'))
 
-        mock_glob.assert_called_once_with('~/.conductr/cache/visualizer*')
-        self.assertEqual([
-            call('~/.conductr/cache/path-1.zip'),
-            call('~/.conductr/cache/path-2.zip'),
-            call('~/.conductr/cache/path-3.zip')
-        ], mock_getctime.call_args_list)
+        mock_find_name.assert_called_once_with('visualizer')
 
-        expected_output = strip_margin("""|Retrieving from cache ~/.conductr/cache/path-2.zip
+        expected_output = strip_margin("""|Retrieving from cache ~/.conductr/cache/digest/path-2.zip
                                           |""")
         self.assertEqual(expected_output, self.output(stdout))
 
     def test_cached_bundle_not_found(self):
         stdout = MagicMock()
 
-        mock_glob = MagicMock(return_value=[])
+        mock_find_name = MagicMock(return_value=None)
 
         args = MagicMock(**{})
 
-        with patch('glob.glob', mock_glob):
+        with patch('conductr_cli.bundle_cache.BundleCache.find_name', mock_find_name):
             logging_setup.configure_logging(args, stdout)
             self.assertEqual((False, None, None, None),
                              offline_resolver.load_bundle_from_cache(self.cache_dir, 'visualizer'))
 
-        mock_glob.assert_called_once_with('~/.conductr/cache/visualizer*')
+        mock_find_name.assert_called_once_with('visualizer')
 
         self.assertEqual('', self.output(stdout))
 
@@ -151,52 +138,39 @@ class TestLoadBundleFromCache(CliTestCase):
 class TestLoadBundleConfigurationFromCache(CliTestCase):
     cache_dir = '~/.conductr/cache'
 
-    paths = [
-        '{}/path-1.zip'.format(cache_dir),
-        '{}/path-2.zip'.format(cache_dir),
-        '{}/path-3.zip'.format(cache_dir)
-    ]
-
     def test_cached_bundle_found(self):
         stdout = MagicMock()
 
-        mock_glob = MagicMock(return_value=self.paths)
-        mock_getctime = MagicMock(side_effect=[9, 10, 3])
+        mock_find_name = MagicMock(return_value=('path-2.zip', '~/.conductr/cache/digest/path-2.zip'))
 
         args = MagicMock(**{})
 
-        with patch('glob.glob', mock_glob), \
-                patch('os.path.getctime', mock_getctime):
+        with patch('conductr_cli.bundle_cache.BundleCache.find_name', mock_find_name):
             logging_setup.configure_logging(args, stdout)
-            self.assertEqual((True, 'path-2.zip', '~/.conductr/cache/path-2.zip', None),
+            self.assertEqual((True, 'path-2.zip', '~/.conductr/cache/digest/path-2.zip', None),
                              offline_resolver.load_bundle_configuration_from_cache(self.cache_dir,
                                                                                    'conductr-haproxy-dev-mode'))
 
-        mock_glob.assert_called_once_with('~/.conductr/cache/conductr-haproxy-dev-mode*')
-        self.assertEqual([
-            call('~/.conductr/cache/path-1.zip'),
-            call('~/.conductr/cache/path-2.zip'),
-            call('~/.conductr/cache/path-3.zip')
-        ], mock_getctime.call_args_list)
+        mock_find_name.assert_called_once_with('conductr-haproxy-dev-mode')
 
-        expected_output = strip_margin("""|Retrieving from cache ~/.conductr/cache/path-2.zip
+        expected_output = strip_margin("""|Retrieving from cache ~/.conductr/cache/digest/path-2.zip
                                           |""")
         self.assertEqual(expected_output, self.output(stdout))
 
     def test_cached_bundle_not_found(self):
         stdout = MagicMock()
 
-        mock_glob = MagicMock(return_value=[])
+        mock_find_name = MagicMock(return_value=None)
 
         args = MagicMock(**{})
 
-        with patch('glob.glob', mock_glob):
+        with patch('conductr_cli.bundle_cache.BundleCache.find_name', mock_find_name):
             logging_setup.configure_logging(args, stdout)
             self.assertEqual((False, None, None, None),
                              offline_resolver.load_bundle_configuration_from_cache(self.cache_dir,
                                                                                    'conductr-haproxy-dev-mode'))
 
-        mock_glob.assert_called_once_with('~/.conductr/cache/conductr-haproxy-dev-mode*')
+        mock_find_name.assert_called_once_with('conductr-haproxy-dev-mode')
 
         self.assertEqual('', self.output(stdout))
 
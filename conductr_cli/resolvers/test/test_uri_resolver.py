@@ -1,9 +1,14 @@
 from unittest import TestCase
-from urllib.error import URLError
+from urllib.error import HTTPError, URLError
+from conductr_cli import bundle_cache
 from conductr_cli.resolvers import uri_resolver
 from conductr_cli.resolvers.schemes import SCHEME_FILE, SCHEME_HTTP, SCHEME_HTTPS
 from conductr_cli.test.cli_test_case import create_mock_logger
+import hashlib
+import io
 import os
+import shutil
+import tempfile
 
 from unittest.mock import call, patch, MagicMock
 
@@ -17,6 +22,7 @@ class TestResolveBundle(TestCase):
         cache_path_mock = MagicMock(return_value='/bundle-cached-path')
         get_url_mock = MagicMock(return_value=('bundle-name', '/bundle-url-resolved'))
         urlretrieve_mock = MagicMock()
+        add_mock = MagicMock(return_value='/cache-dir/digest/bundle-name')
 
         get_logger_mock, log_mock = create_mock_logger()
 
@@ -27,9 +33,10 @@ class TestResolveBundle(TestCase):
                 patch('conductr_cli.resolvers.uri_resolver.cache_path', cache_path_mock), \
                 patch('conductr_cli.resolvers.uri_resolver.get_url', get_url_mock), \
                 patch('conductr_cli.resolvers.uri_resolver.urlretrieve', urlretrieve_mock), \
+                patch('conductr_cli.bundle_cache.BundleCache.add', add_mock), \
                 patch('logging.getLogger', get_logger_mock):
             result = uri_resolver.resolve_bundle('/cache-dir', '/bundle-url')
-            self.assertEqual((True, 'bundle-name', '/bundle-cached-path', None), result)
+            self.assertEqual((True, 'bundle-name', '/cache-dir/digest/bundle-name', None), result)
 
         self.assertEqual([
             call('/cache-dir'),
@@ -40,6 +47,7 @@ class TestResolveBundle(TestCase):
         os_remove_mock.assert_called_with('/bundle-cached-path.tmp')
         urlretrieve_mock.assert_called_with('/bundle-url-resolved', '/bundle-cached-path.tmp')
         file_move_mock.assert_called_with('/bundle-cached-path.tmp', '/bundle-cached-path')
+        add_mock.assert_called_with('/bundle-cached-path', 'bundle-name', '/bundle-url')
 
         get_logger_mock.assert_called_with('conductr_cli.resolvers.uri_resolver')
         log_mock.info.assert_called_with('Retrieving /bundle-url-resolved')
@@ -52,6 +60,7 @@ class TestResolveBundle(TestCase):
         cache_path_mock = MagicMock(return_value='/bundle-cached-path')
         get_url_mock = MagicMock(return_value=('bundle-name', '/bundle-url-resolved'))
         urlretrieve_mock = MagicMock()
+        add_mock = MagicMock(return_value='/cache-dir/digest/bundle-name')
 
         get_logger_mock, log_mock = create_mock_logger()
 
@@ -62,9 +71,10 @@ class TestResolveBundle(TestCase):
                 patch('conductr_cli.resolvers.uri_resolver.cache_path', cache_path_mock), \
                 patch('conductr_cli.resolvers.uri_resolver.get_url', get_url_mock), \
                 patch('conductr_cli.resolvers.uri_resolver.urlretrieve', urlretrieve_mock), \
+                patch('conductr_cli.bundle_cache.BundleCache.add', add_mock), \
                 patch('logging.getLogger', get_logger_mock):
             result = uri_resolver.resolve_bundle('/cache-dir', '/bundle-url')
-            self.assertEqual((True, 'bundle-name', '/bundle-cached-path', None), result)
+            self.assertEqual((True, 'bundle-name', '/cache-dir/digest/bundle-name', None), result)
 
         self.assertEqual([
             call('/cache-dir'),
@@ -75,6 +85,7 @@ class TestResolveBundle(TestCase):
         get_url_mock.assert_called_with('/bundle-url')
         urlretrieve_mock.assert_called_with('/bundle-url-resolved', '/bundle-cached-path.tmp')
         file_move_mock.assert_called_with('/bundle-cached-path.tmp', '/bundle-cached-path')
+        add_mock.assert_called_with('/bundle-cached-path', 'bundle-name', '/bundle-url')
 
         get_logger_mock.assert_called_with('conductr_cli.resolvers.uri_resolver')
         log_mock.info.assert_called_with('Retrieving /bundle-url-resolved')
@@ -117,6 +128,7 @@ class TestResolveBundleConfiguration(TestCase):
         cache_path_mock = MagicMock(return_value='/bundle-cached-path')
         get_url_mock = MagicMock(return_value=('bundle-name', '/bundle-url-resolved'))
         urlretrieve_mock = MagicMock()
+        add_mock = MagicMock(return_value='/cache-dir/digest/bundle-name')
 
         get_logger_mock, log_mock = create_mock_logger()
 
@@ -127,9 +139,10 @@ class TestResolveBundleConfiguration(TestCase):
                 patch('conductr_cli.resolvers.uri_resolver.cache_path', cache_path_mock), \
                 patch('conductr_cli.resolvers.uri_resolver.get_url', get_url_mock), \
                 patch('conductr_cli.resolvers.uri_resolver.urlretrieve', urlretrieve_mock), \
+                patch('conductr_cli.bundle_cache.BundleCache.add', add_mock), \
                 patch('logging.getLogger', get_logger_mock):
             result = uri_resolver.resolve_bundle_configuration('/cache-dir', '/bundle-url')
-            self.assertEqual((True, 'bundle-name', '/bundle-cached-path', None), result)
+            self.assertEqual((True, 'bundle-name', '/cache-dir/digest/bundle-name', None), result)
 
         self.assertEqual([
             call('/cache-dir'),
@@ -140,6 +153,7 @@ class TestResolveBundleConfiguration(TestCase):
         os_remove_mock.assert_called_with('/bundle-cached-path.tmp')
         urlretrieve_mock.assert_called_with('/bundle-url-resolved', '/bundle-cached-path.tmp')
         file_move_mock.assert_called_with('/bundle-cached-path.tmp', '/bundle-cached-path')
+        add_mock.assert_called_with('/bundle-cached-path', 'bundle-name', '/bundle-url')
 
         get_logger_mock.assert_called_with('conductr_cli.resolvers.uri_resolver')
         log_mock.info.assert_called_with('Retrieving /bundle-url-resolved')
@@ -152,6 +166,7 @@ class TestResolveBundleConfiguration(TestCase):
         cache_path_mock = MagicMock(return_value='/bundle-cached-path')
         get_url_mock = MagicMock(return_value=('bundle-name', '/bundle-url-resolved'))
         urlretrieve_mock = MagicMock()
+        add_mock = MagicMock(return_value='/cache-dir/digest/bundle-name')
 
         get_logger_mock, log_mock = create_mock_logger()
 
@@ -162,9 +177,10 @@ class TestResolveBundleConfiguration(TestCase):
                 patch('conductr_cli.resolvers.uri_resolver.cache_path', cache_path_mock), \
                 patch('conductr_cli.resolvers.uri_resolver.get_url', get_url_mock), \
                 patch('conductr_cli.resolvers.uri_resolver.urlretrieve', urlretrieve_mock), \
+                patch('conductr_cli.bundle_cache.BundleCache.add', add_mock), \
                 patch('logging.getLogger', get_logger_mock):
             result = uri_resolver.resolve_bundle_configuration('/cache-dir', '/bundle-url')
-            self.assertEqual((True, 'bundle-name', '/bundle-cached-path', None), result)
+            self.assertEqual((True, 'bundle-name', '/cache-dir/digest/bundle-name', None), result)
 
         self.assertEqual([
             call('/cache-dir'),
@@ -175,6 +191,7 @@ class TestResolveBundleConfiguration(TestCase):
         get_url_mock.assert_called_with('/bundle-url')
         urlretrieve_mock.assert_called_with('/bundle-url-resolved', '/bundle-cached-path.tmp')
         file_move_mock.assert_called_with('/bundle-cached-path.tmp', '/bundle-cached-path')
+        add_mock.assert_called_with('/bundle-cached-path', 'bundle-name', '/bundle-url')
 
         get_logger_mock.assert_called_with('conductr_cli.resolvers.uri_resolver')
         log_mock.info.assert_called_with('Retrieving /bundle-url-resolved')
@@ -318,6 +335,39 @@ class TestResolveConductrBinary(TestCase):
         log_mock.info.assert_called_with('Retrieving conductr-binary-uri')
 
 
+class TestCacheResolvedFile(TestCase):
+    def test_downloaded_file(self):
+        add_mock = MagicMock(return_value='/cache-dir/digest/bundle.zip')
+
+        with patch('conductr_cli.bundle_cache.BundleCache.add', add_mock):
+            result = uri_resolver.cache_resolved_file('/cache-dir', 'http://site.com/path/bundle.zip',
+                                                      (True, 'bundle.zip', '/cache-dir/bundle.zip', None))
+            self.assertEqual((True, 'bundle.zip', '/cache-dir/digest/bundle.zip', None), result)
+
+        add_mock.assert_called_with('/cache-dir/bundle.zip', 'bundle.zip', 'http://site.com/path/bundle.zip')
+
+    def test_local_file(self):
+        add_mock = MagicMock()
+
+        with patch('conductr_cli.bundle_cache.BundleCache.add', add_mock):
+            result = uri_resolver.cache_resolved_file('/cache-dir', '/tmp/bundle.zip',
+                                                      (True, 'bundle.zip', '/tmp/bundle.zip', None))
+            self.assertEqual((True, 'bundle.zip', '/tmp/bundle.zip', None), result)
+
+        add_mock.assert_not_called()
+
+    def test_not_resolved(self):
+        add_mock = MagicMock()
+        error = URLError('no_such.bundle')
+
+        with patch('conductr_cli.bundle_cache.BundleCache.add', add_mock):
+            result = uri_resolver.cache_resolved_file('/cache-dir', 'http://site.com/path/bundle.zip',
+                                                      (False, None, None, error))
+            self.assertEqual((False, None, None, error), result)
+
+        add_mock.assert_not_called()
+
+
 class TestLoadBundleFromCache(TestCase):
     def test_file(self):
         exists_mock = MagicMock()
@@ -329,28 +379,28 @@ class TestLoadBundleFromCache(TestCase):
         exists_mock.assert_not_called()
 
     def test_uri_found(self):
-        exists_mock = MagicMock(return_value=True)
+        find_uri_mock = MagicMock(return_value=('bundle-file.zip', '/cache-dir/digest/bundle-file.zip'))
 
         get_logger_mock, log_mock = create_mock_logger()
 
-        with patch('os.path.exists', exists_mock), \
+        with patch('conductr_cli.bundle_cache.BundleCache.find_uri', find_uri_mock), \
                 patch('logging.getLogger', get_logger_mock):
             result = uri_resolver.load_bundle_from_cache('/cache-dir', 'http://site.com/path/bundle-file.zip')
-            self.assertEqual((True, 'bundle-file.zip', '/cache-dir/bundle-file.zip', None), result)
+            self.assertEqual((True, 'bundle-file.zip', '/cache-dir/digest/bundle-file.zip', None), result)
 
-        exists_mock.assert_called_with('/cache-dir/bundle-file.zip')
+        find_uri_mock.assert_called_with('http://site.com/path/bundle-file.zip')
 
         get_logger_mock.assert_called_with('conductr_cli.resolvers.uri_resolver')
-        log_mock.info.assert_called_with('Retrieving from cache /cache-dir/bundle-file.zip')
+        log_mock.info.assert_called_with('Retrieving from cache /cache-dir/digest/bundle-file.zip')
 
     def test_uri_not_found(self):
-        exists_mock = MagicMock(return_value=False)
+        find_uri_mock = MagicMock(return_value=None)
 
-        with patch('os.path.exists', exists_mock):
+        with patch('conductr_cli.bundle_cache.BundleCache.find_uri', find_uri_mock):
             result = uri_resolver.load_bundle_from_cache('/cache-dir', 'http://site.com/path/bundle-file.zip')
             self.assertEqual((False, None, None, None), result)
 
-        exists_mock.assert_called_with('/cache-dir/bundle-file.zip')
+        find_uri_mock.assert_called_with('http://site.com/path/bundle-file.zip')
 
 
 class TestLoadBundleConfigurationFromCache(TestCase):
@@ -364,30 +414,30 @@ class TestLoadBundleConfigurationFromCache(TestCase):
         exists_mock.assert_not_called()
 
     def test_uri_found(self):
-        exists_mock = MagicMock(return_value=True)
+        find_uri_mock = MagicMock(return_value=('bundle-file.zip', '/cache-dir/digest/bundle-file.zip'))
 
         get_logger_mock, log_mock = create_mock_logger()
 
-        with patch('os.path.exists', exists_mock), \
+        with patch('conductr_cli.bundle_cache.BundleCache.find_uri', find_uri_mock), \
                 patch('logging.getLogger', get_logger_mock):
             result = uri_resolver.load_bundle_configuration_from_cache('/cache-dir',
                                                                        'http://site.com/path/bundle-file.zip')
-            self.assertEqual((True, 'bundle-file.zip', '/cache-dir/bundle-file.zip', None), result)
+            self.assertEqual((True, 'bundle-file.zip', '/cache-dir/digest/bundle-file.zip', None), result)
 
-        exists_mock.assert_called_with('/cache-dir/bundle-file.zip')
+        find_uri_mock.assert_called_with('http://site.com/path/bundle-file.zip')
 
         get_logger_mock.assert_called_with('conductr_cli.resolvers.uri_resolver')
-        log_mock.info.assert_called_with('Retrieving from cache /cache-dir/bundle-file.zip')
+        log_mock.info.assert_called_with('Retrieving from cache /cache-dir/digest/bundle-file.zip')
 
     def test_uri_not_found(self):
-        exists_mock = MagicMock(return_value=False)
+        find_uri_mock = MagicMock(return_value=None)
 
-        with patch('os.path.exists', exists_mock):
+        with patch('conductr_cli.bundle_cache.BundleCache.find_uri', find_uri_mock):
             result = uri_resolver.load_bundle_configuration_from_cache('/cache-dir',
                                                                        'http://site.com/path/bundle-file.zip')
             self.assertEqual((False, None, None, None), result)
 
-        exists_mock.assert_called_with('/cache-dir/bundle-file.zip')
+        find_uri_mock.assert_called_with('http://site.com/path/bundle-file.zip')
 
 
 class TestContinuousDeliveryUri(TestCase):
@@ -443,7 +493,7 @@ class TestProgressBar(TestCase):
         file_move_mock = MagicMock()
         cache_path_mock = MagicMock(return_value='/bundle-cached-path')
         get_url_mock = MagicMock(return_value=('bundle-name', 'http://site.com/bundle-url-resolved'))
-        urlretrieve_mock = MagicMock()
+        download_http_mock = MagicMock()
         report_hook_mock = MagicMock()
         show_progress_mock = MagicMock(return_value=report_hook_mock)
 
@@ -455,21 +505,20 @@ class TestProgressBar(TestCase):
                 patch('shutil.move', file_move_mock), \
                 patch('conductr_cli.resolvers.uri_resolver.cache_path', cache_path_mock), \
                 patch('conductr_cli.resolvers.uri_resolver.get_url', get_url_mock), \
-                patch('conductr_cli.resolvers.uri_resolver.urlretrieve', urlretrieve_mock), \
+                patch('conductr_cli.resolvers.uri_resolver.download_http', download_http_mock), \
                 patch('conductr_cli.resolvers.uri_resolver.show_progress', show_progress_mock), \
                 patch('logging.getLogger', get_logger_mock):
-            result = uri_resolver.resolve_bundle('/cache-dir', 'http://site.com/bundle-url')
+            result = uri_resolver.resolve_file('/cache-dir', 'http://site.com/bundle-url')
             self.assertEqual((True, 'bundle-name', '/bundle-cached-path', None), result)
 
         self.assertEqual([
-            call('/cache-dir'),
-            call('/bundle-cached-path.tmp')
+            call('/cache-dir')
         ], os_path_exists_mock.call_args_list)
         cache_path_mock.assert_called_with('/cache-dir', 'http://site.com/bundle-url')
         get_url_mock.assert_called_with('http://site.com/bundle-url')
-        os_remove_mock.assert_called_with('/bundle-cached-path.tmp')
-        urlretrieve_mock.assert_called_with('http://site.com/bundle-url-resolved',
-                                            '/bundle-cached-path.tmp', reporthook=report_hook_mock)
+        os_remove_mock.assert_not_called()
+        download_http_mock.assert_called_with('http://site.com/bundle-url-resolved', '/bundle-cached-path.tmp',
+                                              report_hook_mock, None)
         file_move_mock.assert_called_with('/bundle-cached-path.tmp', '/bundle-cached-path')
 
         get_logger_mock.assert_called_with('conductr_cli.resolvers.uri_resolver')
@@ -482,7 +531,7 @@ class TestProgressBar(TestCase):
         file_move_mock = MagicMock()
         cache_path_mock = MagicMock(return_value='/bundle-cached-path')
         get_url_mock = MagicMock(return_value=('bundle-name', 'http://site.com/bundle-url-resolved'))
-        urlretrieve_mock = MagicMock()
+        download_http_mock = MagicMock()
 
         get_logger_mock, log_mock = create_mock_logger()
         log_mock.is_progress_enabled = MagicMock(return_value=False)
@@ -493,25 +542,219 @@ class TestProgressBar(TestCase):
                 patch('shutil.move', file_move_mock), \
                 patch('conductr_cli.resolvers.uri_resolver.cache_path', cache_path_mock), \
                 patch('conductr_cli.resolvers.uri_resolver.get_url', get_url_mock), \
-                patch('conductr_cli.resolvers.uri_resolver.urlretrieve', urlretrieve_mock), \
+                patch('conductr_cli.resolvers.uri_resolver.download_http', download_http_mock), \
                 patch('logging.getLogger', get_logger_mock):
-            result = uri_resolver.resolve_bundle('/cache-dir', 'http://site.com/bundle-url')
+            result = uri_resolver.resolve_file('/cache-dir', 'http://site.com/bundle-url')
             self.assertEqual((True, 'bundle-name', '/bundle-cached-path', None), result)
 
         self.assertEqual([
-            call('/cache-dir'),
-            call('/bundle-cached-path.tmp')
+            call('/cache-dir')
         ], os_path_exists_mock.call_args_list)
         cache_path_mock.assert_called_with('/cache-dir', 'http://site.com/bundle-url')
         get_url_mock.assert_called_with('http://site.com/bundle-url')
-        os_remove_mock.assert_called_with('/bundle-cached-path.tmp')
-        urlretrieve_mock.assert_called_with('http://site.com/bundle-url-resolved', '/bundle-cached-path.tmp')
+        os_remove_mock.assert_not_called()
+        download_http_mock.assert_called_with('http://site.com/bundle-url-resolved', '/bundle-cached-path.tmp',
+                                              None, None)
         file_move_mock.assert_called_with('/bundle-cached-path.tmp', '/bundle-cached-path')
 
         get_logger_mock.assert_called_with('conductr_cli.resolvers.uri_resolver')
         log_mock.info.assert_called_with('Retrieving http://site.com/bundle-url-resolved')
 
 
+def create_response(status, body, headers):
+    response = MagicMock(headers=headers)
+    response.getcode.return_value = status
+    response.read = io.BytesIO(body).read
+    response.__enter__.return_value = response
+    return response
+
+
+class TestDownloadHttp(TestCase):
+    url = 'http://site.com/bundle.zip'
+
+    def setUp(self):  # noqa
+        self.tmpdir = tempfile.mkdtemp()
+        self.download_path = os.path.join(self.tmpdir, 'bundle.zip.tmp')
+        self.state_path = '{}{}'.format(self.download_path, uri_resolver.DOWNLOAD_STATE_SUFFIX)
+
+    def tearDown(self):  # noqa
+        shutil.rmtree(self.tmpdir)
+
+    def write_partial_download(self, contents, etag):
+        with open(self.download_path, 'wb') as file:
+            file.write(contents)
+        bundle_cache.write_json(self.state_path, {'url': self.url, 'etag': etag, 'last_modified': None, 'size': 10})
+
+    def read_download(self):
+        with open(self.download_path, 'rb') as file:
+            return file.read()
+
+    def test_download(self):
+        response = create_response(200, b'0123456789', {'Content-Length': '10', 'ETag': '"v1"'})
+        urlopen_mock = MagicMock(return_value=response)
+        reporthook_mock = MagicMock()
+
+        with patch('urllib.request.urlopen', urlopen_mock):
+            uri_resolver.download_http(self.url, self.download_path, reporthook_mock,
+                                       hashlib.sha256(b'0123456789').hexdigest())
+
+        self.assertEqual({}, urlopen_mock.call_args[0][0].headers)
+        self.assertEqual(b'0123456789', self.read_download())
+        self.assertFalse(os.path.exists(self.state_path))
+        reporthook_mock.assert_called_with(10, 1, 10)
+
+    def test_resume(self):
+        self.write_partial_download(b'01234', '"v1"')
+        response = create_response(206, b'56789', {'Content-Range': 'bytes 5-9/10', 'ETag': '"v1"'})
+        urlopen_mock = MagicMock(return_value=response)
+
+        with patch('urllib.request.urlopen', urlopen_mock):
+            uri_resolver.download_http(self.url, self.download_path)
+
+        request = urlopen_mock.call_args[0][0]
+        self.assertEqual('bytes=5-', request.get_header('Range'))
+        self.assertEqual('"v1"', request.get_header('If-range'))
+        self.assertEqual(b'0123456789', self.read_download())
+
+    def test_resume_changed_file(self):
+        self.write_partial_download(b'01234', '"v1"')
+        response = create_response(200, b'abcdefghij', {'Content-Length': '10', 'ETag': '"v2"'})
+
+        with patch('urllib.request.urlopen', MagicMock(return_value=response)):
+            uri_resolver.download_http(self.url, self.download_path)
+
+        self.assertEqual(b'abcdefghij', self.read_download())
+
+    def test_resume_range_not_satisfiable(self):
+        self.write_partial_download(b'0123456789abc', '"v1"')
+        error = HTTPError(self.url, 416, 'Requested Range Not Satisfiable', {}, None)
+        response = create_response(200, b'0123456789', {'Content-Length': '10', 'ETag': '"v1"'})
+
+        with patch('urllib.request.urlopen', MagicMock(side_effect=[error, response])):
+            uri_resolver.download_http(self.url, self.download_path)
+
+        self.assertEqual(b'0123456789', self.read_download())
+
+    def test_interrupted(self):
+        response = create_response(200, b'', {'Content-Length': '10', 'ETag': '"v1"'})
+        response.read = MagicMock(side_effect=[b'01234', ConnectionResetError('reset')])
+
+        with patch('urllib.request.urlopen', MagicMock(return_value=response)):
+            self.assertRaises(URLError, uri_resolver.download_http, self.url, self.download_path)
+
+        self.assertEqual(b'01234', self.read_download())
+        self.assertEqual({'url': self.url, 'etag': '"v1"', 'last_modified': None, 'size': 10},
+                         bundle_cache.read_json(self.state_path, None))
+
+    def test_incomplete(self):
+        response = create_response(200, b'01234', {'Content-Length': '10', 'ETag': '"v1"'})
+
+        with patch('urllib.request.urlopen', MagicMock(return_value=response)):
+            self.assertRaises(URLError, uri_resolver.download_http, self.url, self.download_path)
+
+        self.assertEqual(b'01234', self.read_download())
+
+    def test_digest_mismatch(self):
+        response = create_response(200, b'0123456789', {
+            'Content-Length': '10',
+            'X-Checksum-Sha256': hashlib.sha256(b'abcdefghij').hexdigest()
+        })
+
+        with patch('urllib.request.urlopen', MagicMock(return_value=response)):
+            self.assertRaises(URLError, uri_resolver.download_http, self.url, self.download_path)
+
+        self.assertEqual([], os.listdir(self.tmpdir))
+
+
+class TestDownloadSegmented(TestCase):
+    url = 'http://site.com/bundle.zip'
+    body = bytes(range(256)) * 40
+
+    def setUp(self):  # noqa
+        self.tmpdir = tempfile.mkdtemp()
+        self.download_path = os.path.join(self.tmpdir, 'bundle.zip.tmp')
+
+    def tearDown(self):  # noqa
+        shutil.rmtree(self.tmpdir)
+
+    def respond_to_ranges(self, request):
+        start, end = [int(value) for value in request.get_header('Range')[len('bytes='):].split('-')]
+        response = create_response(206, self.body[start:end + 1], {
+            'Content-Range': 'bytes {}-{}/{}'.format(start, end, len(self.body)),
+            'ETag': '"v1"'
+        })
+        response.geturl.return_value = request.full_url
+        return response
+
+    def test_download(self):
+        urlopen_mock = MagicMock(side_effect=self.respond_to_ranges)
+        reporthook_mock = MagicMock()
+
+        with patch('urllib.request.urlopen', urlopen_mock), \
+                patch('conductr_cli.resolvers.uri_resolver.MIN_SEGMENT_SIZE', 1000):
+            self.assertTrue(uri_resolver.download_segmented(self.url, self.download_path, 4, reporthook_mock,
+                                                            hashlib.sha256(self.body).hexdigest()))
+
+        with open(self.download_path, 'rb') as file:
+            self.assertEqual(self.body, file.read())
+
+        ranges = sorted(args[0].get_header('Range') for args, _ in urlopen_mock.call_args_list)
+        self.assertEqual(['bytes=0-0', 'bytes=0-2559', 'bytes=2560-5119', 'bytes=5120-7679', 'bytes=7680-10239'],
+                         ranges)
+        self.assertEqual('"v1"', urlopen_mock.call_args[0][0].get_header('If-range'))
+        reporthook_mock.assert_called_with(len(self.body), 1, len(self.body))
+
+    def test_ranges_not_supported(self):
+        response = create_response(200, self.body, {'Content-Length': str(len(self.body))})
+
+        with patch('urllib.request.urlopen', MagicMock(return_value=response)), \
+                patch('conductr_cli.resolvers.uri_resolver.MIN_SEGMENT_SIZE', 1000):
+            self.assertFalse(uri_resolver.download_segmented(self.url, self.download_path, 4))
+
+        self.assertFalse(os.path.exists(self.download_path))
+
+    def test_file_too_small(self):
+        with patch('urllib.request.urlopen', MagicMock(side_effect=self.respond_to_ranges)):
+            self.assertFalse(uri_resolver.download_segmented(self.url, self.download_path, 4))
+
+    def test_file_changed(self):
+        def respond(request):
+            if request.get_header('Range') == 'bytes=0-0':
+                return self.respond_to_ranges(request)
+            else:
+                return create_response(200, self.body, {'Content-Length': str(len(self.body)), 'ETag': '"v2"'})
+
+        with patch('urllib.request.urlopen', MagicMock(side_effect=respond)), \
+                patch('conductr_cli.resolvers.uri_resolver.MIN_SEGMENT_SIZE', 1000):
+            self.assertRaises(URLError, uri_resolver.download_segmented, self.url, self.download_path, 4)
+
+        self.assertEqual([], os.listdir(self.tmpdir))
+
+    def test_fall_back_to_single_stream(self):
+        get_logger_mock, log_mock = create_mock_logger()
+        log_mock.is_progress_enabled = MagicMock(return_value=False)
+        download_segmented_mock = MagicMock(return_value=False)
+        download_http_mock = MagicMock()
+
+        with patch('conductr_cli.resolvers.uri_resolver.DOWNLOAD_SEGMENTS', 4), \
+                patch('conductr_cli.resolvers.uri_resolver.download_segmented', download_segmented_mock), \
+                patch('conductr_cli.resolvers.uri_resolver.download_http', download_http_mock):
+            uri_resolver.download_bundle(log_mock, self.url, self.download_path, None)
+
+        download_segmented_mock.assert_called_with(self.url, self.download_path, 4, None, None)
+        download_http_mock.assert_called_with(self.url, self.download_path, None, None)
+
+
+class TestResponseDigest(TestCase):
+    def test_digest_header(self):
+        response = MagicMock(headers={'Digest': 'md5=HUXZLQLMuI/KZ5KDcJPcOA==, SHA-256=ungWv48Bz+pBQUDeXa4iI7ADYaOWF3qctBD/YfIAFa0='})
+        self.assertEqual('ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad',
+                         uri_resolver.response_digest(response))
+
+    def test_no_digest(self):
+        self.assertIsNone(uri_resolver.response_digest(MagicMock(headers={})))
+
+
 class TestResolveBundleVersion(TestCase):
     def test_return_none(self):
         self.assertIsNone(uri_resolver.resolve_bundle_version("bundle"))
@@ -1,28 +1,50 @@
+from conductr_cli.constants import DOWNLOAD_SEGMENTS, IO_CHUNK_SIZE
 from conductr_cli.resolvers.schemes import SCHEME_FILE, SCHEME_HTTP, SCHEME_HTTPS
 from urllib.request import urlretrieve
 from urllib.parse import ParseResult, urlparse, urlunparse
-from urllib.error import URLError
+from urllib.error import HTTPError, URLError
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 import time
 
-from conductr_cli import screen_utils
+from conductr_cli import bundle_cache, screen_utils
 from conductr_cli.resolvers.resolvers_util import is_local_file
+import base64
+import binascii
+import http.client
 import os
 import logging
+import re
 import shutil
+import threading
 import urllib
 
 
+# The validators of a partial download are kept next to it, so an interrupted download is resumed
+# only when the remote file has not changed since.
+DOWNLOAD_STATE_SUFFIX = '.json'
+
+CONTENT_RANGE_PATTERN = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
+
+# Smallest byte range fetched by a segmented download, so small files are downloaded over a single stream
+MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+
+
 def supported_schemes():
     return [SCHEME_FILE, SCHEME_HTTP, SCHEME_HTTPS]
 
 
 def resolve_bundle(cache_dir, uri, auth=None):
-    return resolve_file(cache_dir, uri, auth)
+    return cache_resolved_file(cache_dir, uri, resolve_file(cache_dir, uri, auth))
 
 
-def resolve_file(cache_dir, uri, auth=None, require_bundle_conf=True, raise_error=False):
+def resolve_file(cache_dir, uri, auth=None, require_bundle_conf=True, raise_error=False, digest=None):
+    """
+    Downloads the file of `uri` into `cache_dir`, unless it is a local file.
+    A partial HTTP download left by a previous attempt is resumed.
+    :param digest: the expected SHA-256 digest of the file, if known
+    """
     log = logging.getLogger(__name__)
 
     if not os.path.exists(cache_dir):
@@ -41,10 +63,10 @@ def resolve_file(cache_dir, uri, auth=None, require_bundle_conf=True, raise_erro
         cached_file = cache_path(cache_dir, uri)
         tmp_download_path = '{}.tmp'.format(cached_file)
 
-        if os.path.exists(tmp_download_path):
+        if not is_http_url(file_url) and os.path.exists(tmp_download_path):
             os.remove(tmp_download_path)
 
-        download_bundle(log, file_url, tmp_download_path, auth)
+        download_bundle(log, file_url, tmp_download_path, auth, digest)
 
         os.chmod(tmp_download_path, 0o600)
         shutil.move(tmp_download_path, cached_file)
@@ -64,9 +86,9 @@ def load_bundle_from_cache(cache_dir, uri):
     else:
         log = logging.getLogger(__name__)
 
-        cached_file = cache_path(cache_dir, uri)
-        if os.path.exists(cached_file):
-            bundle_name = os.path.basename(cached_file)
+        cached = bundle_cache.BundleCache(cache_dir).find_uri(uri)
+        if cached:
+            bundle_name, cached_file = cached
             log.info('Retrieving from cache {}'.format(cached_file))
             return True, bundle_name, cached_file, None
         else:
@@ -74,7 +96,21 @@ def load_bundle_from_cache(cache_dir, uri):
 
 
 def resolve_bundle_configuration(cache_dir, uri, auth=None):
-    return resolve_file(cache_dir, uri, auth, require_bundle_conf=False)
+    return cache_resolved_file(cache_dir, uri, resolve_file(cache_dir, uri, auth, require_bundle_conf=False))
+
+
+def cache_resolved_file(cache_dir, uri, resolved_file):
+    """
+    Adds a file downloaded by `resolve_file` to the bundle cache of `cache_dir`, so it is found by
+    `load_bundle_from_cache` afterwards. A local file is used as is, and not cached.
+    :param resolved_file: the result of `resolve_file`
+    :return: the result of `resolve_file`, with the path of the cached file
+    """
+    is_resolved, file_name, file_path, error = resolved_file
+    if is_resolved and bundle_cache.is_same_path(file_path, cache_path(cache_dir, uri)):
+        file_path = bundle_cache.BundleCache(cache_dir).add(file_path, file_name, uri)
+
+    return is_resolved, file_name, file_path, error
 
 
 def load_bundle_configuration_from_cache(cache_dir, uri):
@@ -106,9 +142,13 @@ def cache_path(cache_dir, uri):
     return '{}/{}'.format(cache_dir, basename)
 
 
-def download_bundle(log, bundle_url, tmp_download_path, auth):
-    parsed = urlparse(bundle_url, scheme='file')
-    is_http_download = parsed.scheme == 'http' or parsed.scheme == 'https'
+def is_http_url(url):
+    parsed = urlparse(url, scheme='file')
+    return parsed.scheme == 'http' or parsed.scheme == 'https'
+
+
+def download_bundle(log, bundle_url, tmp_download_path, auth, digest=None):
+    is_http_download = is_http_url(bundle_url)
 
     if is_http_download and auth:
         realm, username, password = auth
@@ -120,14 +160,197 @@ def download_bundle(log, bundle_url, tmp_download_path, auth):
         opener = urllib.request.build_opener(authinfo)
         urllib.request.install_opener(opener)
 
-    if log.is_progress_enabled() and is_http_download:
-        urlretrieve(bundle_url, tmp_download_path, reporthook=show_progress(log, bundle_url))
+    if is_http_download:
+        if log.is_progress_enabled():
+            reporthook = show_progress(log, bundle_url)
+        else:
+            log.info('Retrieving {}'.format(bundle_url))
+            reporthook = None
+        if DOWNLOAD_SEGMENTS <= 1 or \
+                not download_segmented(bundle_url, tmp_download_path, DOWNLOAD_SEGMENTS, reporthook, digest):
+            download_http(bundle_url, tmp_download_path, reporthook, digest)
     else:
         log.info('Retrieving {}'.format(bundle_url))
         # File based download, no need to show progress bar
         urlretrieve(bundle_url, tmp_download_path)
 
 
+def download_http(url, download_path, reporthook=None, digest=None):
+    """
+    Downloads `url` into `download_path`. When `download_path` holds a partial download of the same file, only its
+    remaining bytes are requested with a `Range` request. The `If-Range` validator makes the server send the whole
+    file instead if it has changed since. The downloaded file is checked against the size announced by the server,
+    and against `digest` or the digest announced by the server.
+    An interrupted download raises an `URLError`, leaving the partial download to be resumed by the next attempt.
+    :param reporthook: called with the number of bytes downloaded, a block size of 1 and the total size, if known
+    :param digest: the expected SHA-256 digest of the file, if known
+    """
+    state_path = '{}{}'.format(download_path, DOWNLOAD_STATE_SUFFIX)
+    state = bundle_cache.read_json(state_path, {})
+    validator = state.get('etag') or state.get('last_modified')
+    offset = os.path.getsize(download_path) if os.path.exists(download_path) else 0
+
+    headers = {}
+    if offset > 0 and state.get('url') == url and validator:
+        headers = {'Range': 'bytes={}-'.format(offset), 'If-Range': validator}
+
+    try:
+        response = urllib.request.urlopen(urllib.request.Request(url, headers=headers))
+    except HTTPError as e:
+        if e.code == 416 and headers:
+            # The partial download does not fit the remote file anymore, start over
+            remove_download(download_path)
+            return download_http(url, download_path, reporthook, digest)
+        else:
+            raise e
+
+    with response:
+        content_range = CONTENT_RANGE_PATTERN.match(response.headers.get('Content-Range', ''))
+        if response.getcode() == 206 and content_range and int(content_range.group(1)) == offset:
+            mode = 'ab'
+            total_size = None if content_range.group(3) == '*' else int(content_range.group(3))
+        else:
+            mode = 'wb'
+            offset = 0
+            content_length = response.headers.get('Content-Length')
+            total_size = int(content_length) if content_length else None
+
+        bundle_cache.write_json(state_path, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'size': total_size
+        })
+
+        downloaded_size = offset
+        with open(download_path, mode) as download_file:
+            try:
+                for chunk in iter(lambda: response.read(IO_CHUNK_SIZE), b''):
+                    download_file.write(chunk)
+                    downloaded_size += len(chunk)
+                    if reporthook and total_size:
+                        reporthook(downloaded_size, 1, total_size)
+            except (OSError, http.client.HTTPException) as e:
+                raise URLError('Download of {} interrupted after {} bytes, retry to resume it: {}'
+                               .format(url, downloaded_size, e))
+
+        expected_digest = digest or response_digest(response)
+
+    if total_size is not None and downloaded_size != total_size:
+        raise URLError('Download of {} is incomplete, received {} of {} bytes, retry to resume it'
+                       .format(url, downloaded_size, total_size))
+
+    if expected_digest and bundle_cache.file_digest(download_path) != expected_digest.lower():
+        remove_download(download_path)
+        raise URLError('Download of {} does not match its SHA-256 digest {}'.format(url, expected_digest))
+
+    os.remove(state_path)
+
+
+def download_segmented(url, download_path, segments, reporthook=None, digest=None):
+    """
+    Downloads `url` into `download_path` by fetching up to `segments` byte ranges concurrently, each written in place
+    into a file preallocated to the size of the remote file.
+    Nothing is downloaded if the server does not support range requests, if the file is too small to be split, or if
+    a partial download is to be resumed by `download_http` instead.
+    :param reporthook: called with the number of bytes downloaded by all the ranges, a block size of 1 and the total size
+    :param digest: the expected SHA-256 digest of the file, if known
+    :return: `True` if the file has been downloaded, `False` if it is to be downloaded over a single stream instead
+    """
+    if os.path.exists('{}{}'.format(download_path, DOWNLOAD_STATE_SUFFIX)):
+        return False
+
+    with urllib.request.urlopen(urllib.request.Request(url, headers={'Range': 'bytes=0-0'})) as probe:
+        content_range = CONTENT_RANGE_PATTERN.match(probe.headers.get('Content-Range', ''))
+        if probe.getcode() != 206 or not content_range or content_range.group(3) == '*':
+            return False
+
+        total_size = int(content_range.group(3))
+        if total_size < 2 * MIN_SEGMENT_SIZE:
+            return False
+
+        # Ranges are requested from the URL redirected to, and only if the file has not changed in the meantime
+        segment_url = probe.geturl()
+        validator = probe.headers.get('ETag') or probe.headers.get('Last-Modified')
+        expected_digest = digest or response_digest(probe)
+
+    segment_count = min(segments, total_size // MIN_SEGMENT_SIZE)
+    segment_size = -(-total_size // segment_count)
+    ranges = [(start, min(start + segment_size, total_size) - 1) for start in range(0, total_size, segment_size)]
+
+    with open(download_path, 'wb') as download_file:
+        download_file.truncate(total_size)
+
+    progress_lock = threading.Lock()
+    downloaded_size = 0
+
+    def download_range(byte_range):
+        nonlocal downloaded_size
+        start, end = byte_range
+        headers = {'Range': 'bytes={}-{}'.format(start, end)}
+        if validator:
+            headers['If-Range'] = validator
+
+        with urllib.request.urlopen(urllib.request.Request(segment_url, headers=headers)) as response, \
+                open(download_path, 'r+b') as download_file:
+            content_range = CONTENT_RANGE_PATTERN.match(response.headers.get('Content-Range', ''))
+            if response.getcode() != 206 or not content_range or int(content_range.group(1)) != start:
+                raise URLError('Download of {} has changed during its download'.format(url))
+
+            download_file.seek(start)
+            remaining_size = end - start + 1
+            for chunk in iter(lambda: response.read(min(IO_CHUNK_SIZE, remaining_size)), b''):
+                download_file.write(chunk)
+                remaining_size -= len(chunk)
+                with progress_lock:
+                    downloaded_size += len(chunk)
+                    if reporthook:
+                        reporthook(downloaded_size, 1, total_size)
+
+        if remaining_size != 0:
+            raise URLError('Download of {} is incomplete, bytes {}-{} have not been received'.format(url, start, end))
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            for result in [executor.submit(download_range, byte_range) for byte_range in ranges]:
+                result.result()
+    except (OSError, http.client.HTTPException) as e:
+        remove_download(download_path)
+        raise e if isinstance(e, URLError) else URLError('Download of {} failed: {}'.format(url, e))
+
+    if expected_digest and bundle_cache.file_digest(download_path) != expected_digest.lower():
+        remove_download(download_path)
+        raise URLError('Download of {} does not match its SHA-256 digest {}'.format(url, expected_digest))
+
+    return True
+
+
+def remove_download(download_path):
+    for path in [download_path, '{}{}'.format(download_path, DOWNLOAD_STATE_SUFFIX)]:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def response_digest(response):
+    """
+    :return: the hex encoded SHA-256 digest of the response body announced by either the `Digest` header of RFC 3230,
+             or the `X-Checksum-Sha256` header of artefact repositories, or None
+    """
+    checksum = response.headers.get('X-Checksum-Sha256')
+    if checksum:
+        return checksum
+
+    for instance_digest in response.headers.get('Digest', '').split(','):
+        algorithm, _, value = instance_digest.strip().partition('=')
+        if algorithm.lower() == 'sha-256' and value:
+            try:
+                return binascii.hexlify(base64.b64decode(value)).decode('ascii')
+            except (binascii.Error, ValueError):
+                return None
+
+    return None
+
+
 def show_progress(log, bundle_url):
     prev_time = 0.0
     download_message_shown = False
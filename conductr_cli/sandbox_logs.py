@@ -1,112 +1,312 @@
-import fcntl
+import ctypes
+import ctypes.util
+import heapq
+import itertools
 import os
+import re
+import select
 import sys
 import time
 
 READ_SIZE_KB = 8
 FOLLOW_SLEEP_SECONDS = 0.25
 
+# When inotify is available, the log files are read as soon as their directory changes. They are also read at least
+# once every few seconds, in case a change has been missed, e.g. a log directory created after following has started.
+INOTIFY_MAX_WAIT_SECONDS = 5.0
+
+ISO_TIMESTAMP = re.compile(rb'\[?(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2}(?:[.,]\d+)?)')
+AKKA_TIMESTAMP = re.compile(rb'\[\w+\] \[(\d{2})/(\d{2})/(\d{4}) (\d{2}:\d{2}:\d{2}(?:\.\d+)?)\]')
+
+# inotify(7) flags
+IN_NONBLOCK = os.O_NONBLOCK
+IN_MODIFY = 0x00000002
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+
 
 def logs(args):
-    return tail(log_files(args), args.follow, sys.stdout, READ_SIZE_KB, FOLLOW_SLEEP_SECONDS)
+    files = log_files(args)
+    return tail([path for _, path in files], args.follow, sys.stdout, READ_SIZE_KB, FOLLOW_SLEEP_SECONDS,
+                vars(args).get('lines'), names=[name for name, _ in files])
 
 
 def log_files(args):
-    core_log = os.path.abspath('{}/core/logs/conductr.log'.format(args.image_dir))
-    agent_log = os.path.abspath('{}/agent/logs/conductr-agent.log'.format(args.image_dir))
-
-    return [core_log, agent_log]
+    """
+    The log files of the sandbox. Every core instance is started from the same extracted core directory, without an
+    instance specific log configuration, so all of them write to `core/logs/conductr.log`; likewise the agent
+    instances write to `agent/logs/conductr-agent.log`. Rotated files, e.g. `conductr.2017-01-01.log`, are not read.
+    :return: the name and path of every log file, e.g. `('core', '/image/dir/core/logs/conductr.log')`
+    """
+    return [(role, os.path.abspath('{}/{}/logs/{}.log'.format(args.image_dir, role, log_name)))
+            for role, log_name in [('core', 'conductr'), ('agent', 'conductr-agent')]]
 
 
-def tail(paths, follow, print_file, read_size_kb, follow_sleep_seconds):
+def tail(paths, follow, print_file, read_size_kb, follow_sleep_seconds, lines=None, names=None):
     """
     Reads an array of paths, line-by-line, and sends their contents
-    to `print_file`. If `follow` is enabled, emulates UNIX `tail -F`
-    (follow-by-name) behavior.
+    to `print_file`, interleaved by the timestamps of their lines.
+    If `follow` is enabled, emulates UNIX `tail -F` (follow-by-name) behavior.
 
     :param paths: array filesystem paths
     :param follow: boolean whether to follow or not (analogous to tail -F)
     :param print_file: supplied to print() - must have write(string) method
     :param read_size_kb: buffer size for read operations
-    :param follow_sleep_seconds: time to wait between polling
+    :param follow_sleep_seconds: time to wait between polling, if the files can't be watched with inotify
+    :param lines: the number of lines to output from the end of each file, or `None` for the entire files
+    :param names: the optional names of the files, each line being prefixed with the name of its file
     """
 
-    def empty_file(path):
-        return {'path': p, 'file': False, 'size': 0, 'buffer': ''}
+    log_files = [LogFile(path, read_size_kb * 1024) for path in paths]
+    prefixes = ['[{}] '.format(name).encode('utf-8') for name in names] if names else [b''] * len(paths)
 
-    # opens a path and sets non-blocking flags on it
-    def do_open(path):
-        try:
-            file = open(p, 'r')
-            fd = file.fileno()
-            flag = fcntl.fcntl(fd, fcntl.F_GETFL)
-            fcntl.fcntl(fd, fcntl.F_SETFL, flag | os.O_NONBLOCK)
+    for log_file in log_files:
+        log_file.open(lines)
 
-            return {'path': path, 'file': file, 'size': os.path.getsize(path), 'buffer': ''}
-        except:
-            return empty_file(path)
+    output(merge_lines(log_files, prefixes, is_final=not follow), print_file)
 
-    def do_read(files):
-        done = True
+    if follow:
+        # once the existing lines are output, the lines appended to the files are interleaved every time they change
+        with FileWatcher([os.path.dirname(path) for path in paths], follow_sleep_seconds) as watcher:
+            # by using itertools.count(), we can control the number of executions for testing via mocks
+            for _ in itertools.count():
+                watcher.wait()
 
-        for i, f in enumerate(files):
-            try:
-                if not f['file'] or os.path.getsize(f['path']) < f['size']:
-                    f = do_open(f['path'])
+                output(merge_lines(log_files, prefixes), print_file)
 
-                if f['file']:
-                    data = f['file'].read(read_size_kb * 1024)
 
-                    if len(data) > 0:
-                        f['buffer'] += data
-                        done = False
+def merge_lines(log_files, prefixes, is_final=False):
+    """
+    Merges the lines read from the log files by timestamp. Each file is time ordered already, so the files are read
+    lazily through a heap holding a single line per file, and memory is bounded however large the files are.
+    :param is_final: if `True`, the last line of each file is output even if it is not terminated by a line ending
+    :return: an iterator over the lines, prefixed by the prefix of their file
+    """
+    def read_lines(log_file):
+        yield from log_file.read_lines()
+        if is_final:
+            yield from log_file.read_partial_line()
+
+    def timestamped_lines(index, log_file):
+        for sequence, line in enumerate(read_lines(log_file)):
+            timestamp = parse_timestamp(line)
+            if timestamp is not None:
+                log_file.timestamp = timestamp
 
-                files[i] = f
-            except:
-                files[i] = empty_file(f['path'])
+            # Lines without a timestamp, e.g. stack traces, stay with the line preceding them.
+            yield log_file.timestamp, index, sequence, prefixes[index] + line
 
-        return done, files
+    for _, _, _, line in heapq.merge(*[timestamped_lines(index, log_file)
+                                       for index, log_file in enumerate(log_files)]):
+        yield line
 
-    def do_output(files):
-        for f in files:
-            if len(f['buffer']) > 0:
-                ends_on_line = f['buffer'][-1] == '\n'
 
-                lines = f['buffer'].splitlines()
-                num_lines = len(lines)
+def parse_timestamp(line):
+    """
+    Parses the timestamp at the start of a log line, either ISO 8601, e.g. `2017-05-04T02:16:09.392Z INFO ...`, or as
+    logged by Akka, e.g. `[INFO] [05/04/2017 02:16:09.392] ...`.
+    :return: the timestamp as `YYYY-MM-DDTHH:MM:SS.fff` bytes, which sort in time order, or `None` if there is none
+    """
+    match = ISO_TIMESTAMP.match(line)
+    if match:
+        date, time_of_day = match.groups()
+        return date + b'T' + time_of_day.replace(b',', b'.')
 
-                for i, line in enumerate(lines):
-                    if ends_on_line or i < num_lines - 1:
-                        print(line, file=print_file)
+    match = AKKA_TIMESTAMP.match(line)
+    if match:
+        month, day, year, time_of_day = match.groups()
+        return year + b'-' + month + b'-' + day + b'T' + time_of_day
 
-                if ends_on_line:
-                    f['buffer'] = ''
-                else:
-                    f['buffer'] = lines[-1]
+    return None
 
-    # we pass through the entire log files one by one (i.e. not interleaved).
-    # once completed, if following is enabled, interleave files as data is appended
 
-    files = []
+def output(lines, print_file):
+    for line in lines:
+        print(line.decode('utf-8', errors='replace'), file=print_file)
 
-    for p in paths:
-        f = do_open(p)
 
-        full_done = False
+class LogFile:
+    """
+    A log file followed by name. The file is read as bytes in chunks of `read_size`, and only complete lines are
+    decoded. The file is reopened from its beginning when it has been replaced, e.g. rotated, or truncated.
+    """
+    def __init__(self, path, read_size):
+        self.path = path
+        self.read_size = read_size
+        self.file = None
+        self.inode = None
+        self.partial_line = b''
+        # The timestamp of the last line read with a timestamp
+        self.timestamp = b''
+
+    def open(self, lines=None):
+        """
+        Opens the file, positioned at its beginning, or at the start of its last `lines` lines.
+        """
+        self.close()
 
-        while not full_done:
-            full_done, fs = do_read([f])
+        try:
+            self.file = open(self.path, 'rb')
+            self.inode = os.fstat(self.file.fileno()).st_ino
+        except OSError:
+            self.file = None
+            return
+
+        if lines is not None:
+            seek_last_lines(self.file, lines, self.read_size)
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+        self.file = None
+        self.inode = None
+        self.partial_line = b''
+
+    def read_lines(self):
+        """
+        Reads the data appended since the last read, one chunk at a time.
+        :return: an iterator over the complete lines read, without their line endings
+        """
+        if self.is_replaced():
+            self.open()
+
+        if not self.file:
+            return
 
-            f = fs[0]
+        while True:
+            try:
+                chunk = self.file.read(self.read_size)
+            except OSError:
+                self.close()
+                return
+
+            if not chunk:
+                return
+
+            lines = (self.partial_line + chunk).split(b'\n')
+            self.partial_line = lines.pop()
+            for line in lines:
+                yield line.rstrip(b'\r')
+
+    def read_partial_line(self):
+        """
+        :return: the last line read if it is not terminated by a line ending, e.g. once the end of the file is reached
+        """
+        partial_line = self.partial_line
+        self.partial_line = b''
+        return [partial_line] if partial_line else []
+
+    def is_replaced(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return self.file is not None
 
-            do_output([f])
+        return not self.file or stat.st_ino != self.inode or stat.st_size < self.file.tell()
 
-        files.append(f)
 
-    if follow:
+def seek_last_lines(file, lines, read_size):
+    """
+    Positions the file at the start of its last `lines` lines by reading blocks backwards from its end, so the cost
+    depends on the number of lines rather than on the size of the file.
+    """
+    end = file.seek(0, os.SEEK_END)
+    if lines <= 0 or end == 0:
+        return
+
+    # The line ending of the last line does not start another line
+    file.seek(end - 1)
+    newlines = -1 if file.read(1) == b'\n' else 0
+
+    position = end
+    while position > 0:
+        size = min(read_size, position)
+        position -= size
+        file.seek(position)
+        block = file.read(size)
+
+        index = len(block)
         while True:
-            _, files = do_read(files)
+            index = block.rfind(b'\n', 0, index)
+            if index < 0:
+                break
+
+            newlines += 1
+            if newlines >= lines:
+                file.seek(position + index + 1)
+                return
+
+    file.seek(0)
+
+
+class FileWatcher:
+    """
+    Waits for changes to the given directories. On Linux the directories are watched with inotify, so the wait ends
+    as soon as a file within them is written, created or removed. Elsewhere, or if any of the directories can't be
+    watched, the wait is for the poll period.
+    """
+    def __init__(self, directories, poll_period):
+        self.poll_period = poll_period
+        self.inotify_fd = inotify_watch(directories)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def is_inotify(self):
+        return self.inotify_fd is not None
+
+    def wait(self):
+        """
+        :return: `True` if a change has been notified, `False` if the wait has timed out
+        """
+        if not self.is_inotify():
+            time.sleep(self.poll_period)
+            return False
+
+        readable, _, _ = select.select([self.inotify_fd], [], [], INOTIFY_MAX_WAIT_SECONDS)
+        if not readable:
+            return False
+
+        # Which files have changed doesn't matter as all of them are read: the pending events are discarded.
+        try:
+            while os.read(self.inotify_fd, 64 * 1024):
+                pass
+        except BlockingIOError:
+            pass
+
+        return True
+
+    def close(self):
+        if self.inotify_fd is not None:
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+
+
+def inotify_watch(directories):
+    """
+    :return: the inotify file descriptor watching the directories, or `None` if inotify is not available
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK)
+    except (AttributeError, OSError):
+        return None
+
+    if fd < 0:
+        return None
 
-            do_output(files)
+    mask = IN_MODIFY | IN_CREATE | IN_DELETE | IN_MOVED_TO
+    for directory in set(directories):
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
 
-            time.sleep(follow_sleep_seconds)
+    return fd
@@ -216,7 +216,7 @@ def build_parser():
 
     # Sub-parser for `logs` sub-command
     logs_parser = subparsers.add_parser('logs',
-                                        help='Fetches the logs of ConductR core and agent processes',
+                                        help='Fetches the logs of ConductR core and agent processes, interleaved by time',
                                         formatter_class=argparse.RawTextHelpFormatter)
     add_image_dir(logs_parser)
     add_default_arguments(logs_parser)
@@ -225,6 +225,11 @@ def build_parser():
                              default=False,
                              dest='follow',
                              action='store_true')
+    logs_parser.add_argument('-n', '--lines',
+                             type=int,
+                             default=None,
+                             help='The number of lines to output from the end of each log file\n'
+                                  'Defaults to the entire log files')
     logs_parser.set_defaults(func=sandbox_logs.logs)
 
     return parser
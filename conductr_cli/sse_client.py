@@ -1,5 +1,10 @@
+from collections import deque
 from conductr_cli import conduct_request
+from dcos.errors import DCOSConnectionError
+from requests.exceptions import RequestException
+import logging
 import re
+import time
 
 
 SSE_REQUEST_INPUT = {
@@ -10,30 +15,36 @@ SSE_REQUEST_INPUT = {
 }
 
 
-SSE_END_OF_FIELD = re.compile(r'\r\n\r\n|\r\r|\n\n')
+# Number of bytes requested from the response at a time. With chunked transfer encoding the response yields each
+# chunk as soon as it arrives, so a large value does not delay events on a quiet stream.
+SSE_CHUNK_SIZE = 8192
 
+SSE_END_OF_LINE = re.compile(rb'\r\n|\r|\n')
 
-def is_event_complete(buf):
-    return re.search(SSE_END_OF_FIELD, buf) is not None
+# Delay before the first attempt to reconnect a dropped stream, unless the server has sent a `retry` field. The delay
+# doubles with every consecutive failed attempt, up to the maximum.
+SSE_RECONNECT_DELAY_SECONDS = 1.0
+SSE_MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+# Number of consecutive reconnection attempts before giving up on the stream.
+SSE_MAX_RECONNECT_ATTEMPTS = 5
+
+# Errors of a dropped stream. In DC/OS mode, a refused connection is raised by `conduct_request` as a DC/OS error.
+SSE_CONNECTION_ERRORS = (RequestException, DCOSConnectionError)
 
 
 def parse_event(raw_sse_string):
-    event, data = None, None
-    lines = raw_sse_string.split('\n')
-    for line in lines:
-        if line.rstrip():
-            key, value = line.split(':')
-            if key == 'event':
-                event = value
-            elif key == 'data':
-                data = value
-    return Event(event, data)
+    parser = EventParser()
+    events = parser.feed('{}\n\n'.format(raw_sse_string).encode('utf-8'))
+    return events[0] if events else Event(None, None)
 
 
 class Event:
-    def __init__(self, event, data):
+    def __init__(self, event, data, id=None, retry=None):
         self.event = event
         self.data = data
+        self.id = id
+        self.retry = retry
 
     def __eq__(self, other):
         if type(other) is type(self):
@@ -45,6 +56,100 @@ class Event:
         return not self.__eq__(other)
 
 
+class EventParser:
+    """
+    Incremental parser of a `text/event-stream`.
+
+    Bytes are fed as they are received from the response. Only the newly received bytes are scanned for line endings;
+    an incomplete trailing line is kept until the rest of it arrives. Each line is decoded and applied to the event
+    being built, which is dispatched once an empty line is received.
+
+    Blocks containing comments only are dispatched as an event without `event` and `data`, since ConductR uses them to
+    send heartbeats and the waiting functions count heartbeats.
+    """
+    def __init__(self):
+        self.partial_line = b''
+        self.skip_line_feed = False
+        self.last_event_id = None
+        self.retry = None
+        self.reset()
+
+    def restart(self):
+        """
+        Discards the partially received event when the stream is reconnected.
+        The last event id and the retry delay are kept.
+        """
+        self.partial_line = b''
+        self.skip_line_feed = False
+        self.reset()
+
+    def reset(self):
+        self.event = None
+        self.data = []
+        self.id = None
+        self.retry_field = None
+        self.has_fields = False
+
+    def feed(self, chunk):
+        if self.skip_line_feed and chunk.startswith(b'\n'):
+            chunk = chunk[1:]
+        self.skip_line_feed = False
+
+        events = []
+        buf = self.partial_line + chunk
+        pos = 0
+        for match in SSE_END_OF_LINE.finditer(buf, len(self.partial_line)):
+            event = self.process_line(buf[pos:match.start()])
+            if event:
+                events.append(event)
+            pos = match.end()
+
+        self.partial_line = buf[pos:]
+        # A carriage return at the end of the chunk may be followed by the line feed of the same line ending.
+        self.skip_line_feed = pos > 0 and pos == len(buf) and buf.endswith(b'\r')
+
+        return events
+
+    def process_line(self, raw_line):
+        if not raw_line:
+            return self.dispatch()
+
+        self.has_fields = True
+        line = raw_line.decode('utf-8', errors='replace')
+        if line.startswith(':'):
+            return None
+
+        key, sep, value = line.partition(':')
+        if value.startswith(' '):
+            value = value[1:]
+
+        if key == 'event':
+            self.event = value
+        elif key == 'data':
+            self.data.append(value)
+        elif key == 'id':
+            if '\0' not in value:
+                self.id = value
+        elif key == 'retry':
+            if value.isdigit():
+                self.retry_field = int(value)
+
+        return None
+
+    def dispatch(self):
+        if not self.has_fields:
+            return None
+
+        if self.id is not None:
+            self.last_event_id = self.id
+        if self.retry_field is not None:
+            self.retry = self.retry_field
+
+        event = Event(self.event, '\n'.join(self.data) if self.data else None, self.id, self.retry_field)
+        self.reset()
+        return event
+
+
 class Client:
     """
     The following SSE Client has been backported, cut down version of https://bitbucket.org/btubbs/sseclient -
@@ -56,42 +161,84 @@ class Client:
 
     Changes introduced as part of the backport:
     - Support for Python 3.2 (i.e. do not use u'')
-    - Parse only for event and data string within SSE
-    - No support for retries and last event id
+    - Events are parsed incrementally from byte chunks by `EventParser`
+    - A dropped stream is reconnected with exponential backoff, sending the last event id as `Last-Event-ID`
     """
-    def __init__(self, dcos_mode, host, url, headers=None, **kwargs):
+    def __init__(self, dcos_mode, host, url, headers=None, max_reconnect_attempts=SSE_MAX_RECONNECT_ATTEMPTS,
+                 **kwargs):
         self.dcos_mode = dcos_mode
         self.host = host
         self.url = url
         self.headers = headers
-        self.responseIter = None
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.reconnect_attempts = 0
         self.kwargs = kwargs
+        self.response_iter = None
+        self.parser = EventParser()
+        self.events = deque()
 
     def connect(self):
-        sse_request_input = dict(SSE_REQUEST_INPUT)
+        headers = dict(SSE_REQUEST_INPUT['headers'])
         if self.headers:
-            sse_request_input['headers'].update(self.headers)
+            headers.update(self.headers)
+        if self.parser.last_event_id is not None:
+            headers['Last-Event-ID'] = self.parser.last_event_id
 
         kwargs_all = {}
         kwargs_all.update(self.kwargs)
-        kwargs_all.update(sse_request_input)
+        kwargs_all.update({'headers': headers})
 
         response = conduct_request.get(self.dcos_mode, self.host, self.url, stream=True, **kwargs_all)
         response.raise_for_status()
-        self.responseIter = response.iter_content(decode_unicode=True)
+        self.response_iter = response.iter_content(chunk_size=SSE_CHUNK_SIZE)
+
+    def reconnect(self, error):
+        log = logging.getLogger(__name__)
+
+        while self.reconnect_attempts < self.max_reconnect_attempts:
+            self.reconnect_attempts += 1
+
+            delay = self.reconnect_delay(self.reconnect_attempts)
+            log.debug('Connection to {} lost, reconnecting in {:.1f}s'.format(self.url, delay))
+            time.sleep(delay)
+
+            try:
+                self.parser.restart()
+                self.connect()
+                return
+            except SSE_CONNECTION_ERRORS as e:
+                error = e
+
+        if error:
+            raise error
+        else:
+            raise StopIteration
+
+    def reconnect_delay(self, attempt):
+        initial_delay = self.parser.retry / 1000 if self.parser.retry is not None else SSE_RECONNECT_DELAY_SECONDS
+        return min(initial_delay * 2 ** (attempt - 1), max(initial_delay, SSE_MAX_RECONNECT_DELAY_SECONDS))
 
     def __iter__(self):
         return self
 
     def __next__(self):
-        buf = ''
-        while not is_event_complete(buf):
-            next_char = next(self.responseIter)
-            buf += next_char
-
-        split = re.split(SSE_END_OF_FIELD, buf)
-        raw_sse = split[0]
-        return parse_event(raw_sse)
+        while not self.events:
+            try:
+                chunk = next(self.response_iter)
+            except StopIteration:
+                self.reconnect(None)
+                continue
+            except SSE_CONNECTION_ERRORS as e:
+                self.reconnect(e)
+                continue
+
+            events = self.parser.feed(chunk)
+            if events:
+                # The stream is healthy again, so the next drop gets a fresh set of attempts.
+                self.reconnect_attempts = 0
+                self.events.extend(events)
+
+        return self.events.popleft()
 
 
 def get_events(dcos_mode, host, url, headers=None, **kwargs):
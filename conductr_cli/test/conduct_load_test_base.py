@@ -63,13 +63,11 @@ class ConductLoadTestBase(CliTestCase):
         stdout = MagicMock()
         bundle_open_mock = MagicMock(side_effect=lambda p1, p2, p3: (p1, 1))
         wait_for_installation_mock = MagicMock()
-        cleanup_old_bundles_mock = MagicMock()
 
         input_args = MagicMock(**self.default_args)
         with patch('conductr_cli.resolver.resolve_bundle', resolve_bundle_mock), \
                 patch('conductr_cli.conduct_load.create_multipart', create_multipart_mock), \
-                patch('conductr_cli.conduct_load.cleanup_old_bundles', cleanup_old_bundles_mock), \
-                patch('requests.post', http_method), \
+                patch('requests.Session.post', http_method), \
                 patch('conductr_cli.conduct_load.open_bundle', bundle_open_mock), \
                 patch('conductr_cli.bundle_installation.wait_for_installation', wait_for_installation_mock):
             logging_setup.configure_logging(input_args, stdout)
@@ -88,8 +86,6 @@ class ConductLoadTestBase(CliTestCase):
                                        verify=self.server_verification_file,
                                        headers={'Content-Type': self.multipart_content_type, 'Host': '127.0.0.1'})
         wait_for_installation_mock.assert_called_with(self.bundle_id, input_args)
-        cleanup_old_bundles_mock.assert_called_with(self.bundle_resolve_cache_dir, self.bundle_file_name,
-                                                    excluded=self.bundle_file)
 
         self.assertEqual(self.default_output(), self.output(stdout))
 
@@ -104,13 +100,11 @@ class ConductLoadTestBase(CliTestCase):
         bundle_open_mock = MagicMock(side_effect=lambda p1, p2, p3: (p1, 1))
 
         wait_for_installation_mock = MagicMock()
-        cleanup_old_bundles_mock = MagicMock()
 
         input_args = MagicMock(**self.default_args)
         with patch('conductr_cli.resolver.resolve_bundle', resolve_bundle_mock), \
                 patch('conductr_cli.conduct_load.create_multipart', create_multipart_mock), \
-                patch('conductr_cli.conduct_load.cleanup_old_bundles', cleanup_old_bundles_mock), \
-                patch('dcos.http.post', http_method), \
+                patch('conductr_cli.conduct_request.dcos_request', http_method), \
                 patch('conductr_cli.conduct_load.open_bundle', bundle_open_mock), \
                 patch('conductr_cli.bundle_installation.wait_for_installation', wait_for_installation_mock):
             logging_setup.configure_logging(input_args, stdout)
@@ -123,14 +117,12 @@ class ConductLoadTestBase(CliTestCase):
         resolve_bundle_mock.assert_called_with(self.custom_settings, self.bundle_resolve_cache_dir,
                                                self.bundle_file, self.offline_mode)
         create_multipart_mock.assert_called_with(self.conduct_load_logger, self.default_files)
-        http_method.assert_called_with(self.default_url,
+        http_method.assert_called_with('post', '127.0.0.1', self.default_url,
                                        data=self.multipart_mock,
                                        auth=self.conductr_auth,
                                        verify=self.server_verification_file,
                                        headers={'Content-Type': self.multipart_content_type, 'Host': '127.0.0.1'})
         wait_for_installation_mock.assert_called_with(self.bundle_id, input_args)
-        cleanup_old_bundles_mock.assert_called_with(self.bundle_resolve_cache_dir, self.bundle_file_name,
-                                                    excluded=self.bundle_file)
 
         self.assertEqual(self.default_output(command=self.default_args['command']), self.output(stdout))
 
@@ -141,7 +133,6 @@ class ConductLoadTestBase(CliTestCase):
         stdout = MagicMock()
         bundle_open_mock = MagicMock(side_effect=lambda p1, p2, p3: (p1, 1))
         wait_for_installation_mock = MagicMock()
-        cleanup_old_bundles_mock = MagicMock()
 
         args = self.default_args.copy()
         args.update({'verbose': True})
@@ -150,8 +141,7 @@ class ConductLoadTestBase(CliTestCase):
         with \
                 patch('conductr_cli.resolver.resolve_bundle', resolve_bundle_mock), \
                 patch('conductr_cli.conduct_load.create_multipart', create_multipart_mock), \
-                patch('conductr_cli.conduct_load.cleanup_old_bundles', cleanup_old_bundles_mock), \
-                patch('requests.post', http_method), \
+                patch('requests.Session.post', http_method), \
                 patch('conductr_cli.conduct_load.open_bundle', bundle_open_mock), \
                 patch('conductr_cli.bundle_installation.wait_for_installation', wait_for_installation_mock):
             logging_setup.configure_logging(input_args, stdout)
@@ -170,8 +160,6 @@ class ConductLoadTestBase(CliTestCase):
                                        verify=self.server_verification_file,
                                        headers={'Content-Type': self.multipart_content_type, 'Host': '127.0.0.1'})
         wait_for_installation_mock.assert_called_with(self.bundle_id, input_args)
-        cleanup_old_bundles_mock.assert_called_with(self.bundle_resolve_cache_dir, self.bundle_file_name,
-                                                    excluded=self.bundle_file)
 
         self.assertEqual(self.default_output(verbose=self.default_response), self.output(stdout))
 
@@ -182,7 +170,6 @@ class ConductLoadTestBase(CliTestCase):
         stdout = MagicMock()
         bundle_open_mock = MagicMock(side_effect=lambda p1, p2, p3: (p1, 1))
         wait_for_installation_mock = MagicMock()
-        cleanup_old_bundles_mock = MagicMock()
 
         args = self.default_args.copy()
         args.update({'quiet': True})
@@ -190,8 +177,7 @@ class ConductLoadTestBase(CliTestCase):
 
         with patch('conductr_cli.resolver.resolve_bundle', resolve_bundle_mock), \
                 patch('conductr_cli.conduct_load.create_multipart', create_multipart_mock), \
-                patch('conductr_cli.conduct_load.cleanup_old_bundles', cleanup_old_bundles_mock), \
-                patch('requests.post', http_method), \
+                patch('requests.Session.post', http_method), \
                 patch('conductr_cli.conduct_load.open_bundle', bundle_open_mock), \
                 patch('conductr_cli.bundle_installation.wait_for_installation', wait_for_installation_mock):
             logging_setup.configure_logging(input_args, stdout)
@@ -210,8 +196,6 @@ class ConductLoadTestBase(CliTestCase):
                                        verify=self.server_verification_file,
                                        headers={'Content-Type': self.multipart_content_type, 'Host': '127.0.0.1'})
         wait_for_installation_mock.assert_called_with(self.bundle_id, input_args)
-        cleanup_old_bundles_mock.assert_called_with(self.bundle_resolve_cache_dir, self.bundle_file_name,
-                                                    excluded=self.bundle_file)
 
         self.assertEqual('45e0c477d3e5ea92aa8d85c0d8f3e25c\n', self.output(stdout))
 
@@ -222,7 +206,6 @@ class ConductLoadTestBase(CliTestCase):
         stdout = MagicMock()
         bundle_open_mock = MagicMock(side_effect=lambda p1, p2, p3: (p1, 1))
         wait_for_installation_mock = MagicMock()
-        cleanup_old_bundles_mock = MagicMock()
 
         args = self.default_args.copy()
         args.update({'long_ids': True})
@@ -230,8 +213,7 @@ class ConductLoadTestBase(CliTestCase):
 
         with patch('conductr_cli.resolver.resolve_bundle', resolve_bundle_mock), \
                 patch('conductr_cli.conduct_load.create_multipart', create_multipart_mock), \
-                patch('conductr_cli.conduct_load.cleanup_old_bundles', cleanup_old_bundles_mock), \
-                patch('requests.post', http_method), \
+                patch('requests.Session.post', http_method), \
                 patch('conductr_cli.conduct_load.open_bundle', bundle_open_mock), \
                 patch('conductr_cli.bundle_installation.wait_for_installation', wait_for_installation_mock):
             logging_setup.configure_logging(input_args, stdout)
@@ -250,8 +232,6 @@ class ConductLoadTestBase(CliTestCase):
                                        verify=self.server_verification_file,
                                        headers={'Content-Type': self.multipart_content_type, 'Host': '127.0.0.1'})
         wait_for_installation_mock.assert_called_with(self.bundle_id, input_args)
-        cleanup_old_bundles_mock.assert_called_with(self.bundle_resolve_cache_dir, self.bundle_file_name,
-                                                    excluded=self.bundle_file)
 
         self.assertEqual(self.default_output(bundle_id='45e0c477d3e5ea92aa8d85c0d8f3e25c'), self.output(stdout))
 
@@ -262,7 +242,6 @@ class ConductLoadTestBase(CliTestCase):
         stdout = MagicMock()
         bundle_open_mock = MagicMock(side_effect=lambda p1, p2, p3: (p1, 1))
         wait_for_installation_mock = MagicMock()
-        cleanup_old_bundles_mock = MagicMock()
 
         cli_parameters = ' --ip 127.0.1.1 --port 9006'
         args = self.default_args.copy()
@@ -271,8 +250,7 @@ class ConductLoadTestBase(CliTestCase):
 
         with patch('conductr_cli.resolver.resolve_bundle', resolve_bundle_mock), \
                 patch('conductr_cli.conduct_load.create_multipart', create_multipart_mock), \
-                patch('conductr_cli.conduct_load.cleanup_old_bundles', cleanup_old_bundles_mock), \
-                patch('requests.post', http_method), \
+                patch('requests.Session.post', http_method), \
                 patch('conductr_cli.conduct_load.open_bundle', bundle_open_mock), \
                 patch('conductr_cli.bundle_installation.wait_for_installation', wait_for_installation_mock):
             logging_setup.configure_logging(input_args, stdout)
@@ -291,8 +269,6 @@ class ConductLoadTestBase(CliTestCase):
                                        verify=self.server_verification_file,
                                        headers={'Content-Type': self.multipart_content_type, 'Host': '127.0.0.1'})
         wait_for_installation_mock.assert_called_with(self.bundle_id, input_args)
-        cleanup_old_bundles_mock.assert_called_with(self.bundle_resolve_cache_dir, self.bundle_file_name,
-                                                    excluded=self.bundle_file)
 
         self.assertEqual(
             self.default_output(params=cli_parameters),
@@ -305,7 +281,6 @@ class ConductLoadTestBase(CliTestCase):
         stdout = MagicMock()
         bundle_open_mock = MagicMock(side_effect=lambda p1, p2, p3: (p1, 1))
         wait_for_installation_mock = MagicMock()
-        cleanup_old_bundles_mock = MagicMock()
 
         cli_parameters = ' --host 127.0.1.1 --port 9006'
         args = self.default_args.copy()
@@ -314,8 +289,7 @@ class ConductLoadTestBase(CliTestCase):
 
         with patch('conductr_cli.resolver.resolve_bundle', resolve_bundle_mock), \
                 patch('conductr_cli.conduct_load.create_multipart', create_multipart_mock), \
-                patch('conductr_cli.conduct_load.cleanup_old_bundles', cleanup_old_bundles_mock), \
-                patch('requests.post', http_method), \
+                patch('requests.Session.post', http_method), \
                 patch('conductr_cli.conduct_load.open_bundle', bundle_open_mock), \
                 patch('conductr_cli.bundle_installation.wait_for_installation', wait_for_installation_mock):
             logging_setup.configure_logging(input_args, stdout)
@@ -334,8 +308,6 @@ class ConductLoadTestBase(CliTestCase):
                                        verify=self.server_verification_file,
                                        headers={'Content-Type': self.multipart_content_type, 'Host': '127.0.0.1'})
         wait_for_installation_mock.assert_called_with(self.bundle_id, input_args)
-        cleanup_old_bundles_mock.assert_called_with(self.bundle_resolve_cache_dir, self.bundle_file_name,
-                                                    excluded=self.bundle_file)
 
         self.assertEqual(
             self.default_output(params=cli_parameters),
@@ -353,13 +325,11 @@ class ConductLoadTestBase(CliTestCase):
         stdout = MagicMock()
         bundle_open_mock = MagicMock(side_effect=lambda p1, p2, p3: (p1, 1))
         wait_for_installation_mock = MagicMock()
-        cleanup_old_bundles_mock = MagicMock()
 
         input_args = MagicMock(**args)
         with patch('conductr_cli.resolver.resolve_bundle', resolve_bundle_mock), \
                 patch('conductr_cli.conduct_load.create_multipart', create_multipart_mock), \
-                patch('conductr_cli.conduct_load.cleanup_old_bundles', cleanup_old_bundles_mock), \
-                patch('requests.post', http_method), \
+                patch('requests.Session.post', http_method), \
                 patch('conductr_cli.conduct_load.open_bundle', bundle_open_mock), \
                 patch('conductr_cli.bundle_installation.wait_for_installation', wait_for_installation_mock):
             logging_setup.configure_logging(input_args, stdout)
@@ -378,8 +348,6 @@ class ConductLoadTestBase(CliTestCase):
                                        verify=self.server_verification_file,
                                        headers={'Content-Type': self.multipart_content_type, 'Host': '127.0.0.1'})
         wait_for_installation_mock.assert_called_with(self.bundle_id, input_args)
-        cleanup_old_bundles_mock.assert_called_with(self.bundle_resolve_cache_dir, self.bundle_file_name,
-                                                    excluded=self.bundle_file)
 
         self.assertEqual(self.default_output(), self.output(stdout))
 
@@ -389,7 +357,6 @@ class ConductLoadTestBase(CliTestCase):
         http_method = self.respond_with(200, self.default_response)
         stdout = MagicMock()
         bundle_open_mock = MagicMock(side_effect=lambda p1, p2, p3: (p1, 1))
-        cleanup_old_bundles_mock = MagicMock()
 
         args = self.default_args.copy()
         args.update({'no_wait': True})
@@ -397,8 +364,7 @@ class ConductLoadTestBase(CliTestCase):
 
         with patch('conductr_cli.resolver.resolve_bundle', resolve_bundle_mock), \
                 patch('conductr_cli.conduct_load.create_multipart', create_multipart_mock), \
-                patch('conductr_cli.conduct_load.cleanup_old_bundles', cleanup_old_bundles_mock), \
-                patch('requests.post', http_method), \
+                patch('requests.Session.post', http_method), \
                 patch('conductr_cli.conduct_load.open_bundle', bundle_open_mock):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_load.load(input_args)
@@ -415,8 +381,6 @@ class ConductLoadTestBase(CliTestCase):
                                        auth=self.conductr_auth,
                                        verify=self.server_verification_file,
                                        headers={'Content-Type': self.multipart_content_type, 'Host': '127.0.0.1'})
-        cleanup_old_bundles_mock.assert_called_with(self.bundle_resolve_cache_dir, self.bundle_file_name,
-                                                    excluded=self.bundle_file)
 
         self.assertEqual(self.default_output(), self.output(stdout))
 
@@ -426,7 +390,6 @@ class ConductLoadTestBase(CliTestCase):
         http_method = self.respond_with(200, self.default_response)
         stdout = MagicMock()
         bundle_open_mock = MagicMock(side_effect=lambda p1, p2, p3: (p1, 1))
-        cleanup_old_bundles_mock = MagicMock()
         wait_for_installation_mock = MagicMock()
 
         args = self.default_args.copy()
@@ -435,8 +398,7 @@ class ConductLoadTestBase(CliTestCase):
 
         with patch('conductr_cli.resolver.resolve_bundle', resolve_bundle_mock), \
                 patch('conductr_cli.conduct_load.create_multipart', create_multipart_mock), \
-                patch('conductr_cli.conduct_load.cleanup_old_bundles', cleanup_old_bundles_mock), \
-                patch('requests.post', http_method), \
+                patch('requests.Session.post', http_method), \
                 patch('conductr_cli.conduct_load.open_bundle', bundle_open_mock), \
                 patch('conductr_cli.bundle_installation.wait_for_installation', wait_for_installation_mock):
             logging_setup.configure_logging(input_args, stdout)
@@ -454,8 +416,6 @@ class ConductLoadTestBase(CliTestCase):
                                        auth=self.conductr_auth,
                                        verify=self.server_verification_file,
                                        headers={'Content-Type': self.multipart_content_type, 'Host': '127.0.0.1'})
-        cleanup_old_bundles_mock.assert_called_with(self.bundle_resolve_cache_dir, self.bundle_file_name,
-                                                    excluded=self.bundle_file)
 
         self.assertEqual(self.default_output(), self.output(stdout))
 
@@ -470,7 +430,7 @@ class ConductLoadTestBase(CliTestCase):
         input_args = MagicMock(**self.default_args)
         with patch('conductr_cli.resolver.resolve_bundle', resolve_bundle_mock), \
                 patch('conductr_cli.conduct_load.create_multipart', create_multipart_mock), \
-                patch('requests.post', http_method), \
+                patch('requests.Session.post', http_method), \
                 patch('conductr_cli.conduct_load.open_bundle', bundle_open_mock):
             logging_setup.configure_logging(input_args, stdout, stderr)
             result = conduct_load.load(input_args)
@@ -504,7 +464,7 @@ class ConductLoadTestBase(CliTestCase):
         input_args = MagicMock(**self.default_args)
         with patch('conductr_cli.resolver.resolve_bundle', resolve_bundle_mock), \
                 patch('conductr_cli.conduct_load.create_multipart', create_multipart_mock), \
-                patch('requests.post', http_method), \
+                patch('requests.Session.post', http_method), \
                 patch('conductr_cli.conduct_load.open_bundle', bundle_open_mock):
             logging_setup.configure_logging(input_args, stdout, stderr)
             result = conduct_load.load(input_args)
@@ -537,7 +497,7 @@ class ConductLoadTestBase(CliTestCase):
         input_args = MagicMock(**self.default_args)
         with patch('conductr_cli.resolver.resolve_bundle', resolve_bundle_mock), \
                 patch('conductr_cli.conduct_load.create_multipart', create_multipart_mock), \
-                patch('requests.post', http_method), \
+                patch('requests.Session.post', http_method), \
                 patch('conductr_cli.conduct_load.open_bundle', bundle_open_mock):
             logging_setup.configure_logging(input_args, stdout, stderr)
             result = conduct_load.load(input_args)
@@ -680,7 +640,7 @@ class ConductLoadTestBase(CliTestCase):
         input_args = MagicMock(**self.default_args)
         with patch('conductr_cli.resolver.resolve_bundle', resolve_bundle_mock), \
                 patch('conductr_cli.conduct_load.create_multipart', create_multipart_mock), \
-                patch('requests.post', http_method), \
+                patch('requests.Session.post', http_method), \
                 patch('conductr_cli.conduct_load.open_bundle', bundle_open_mock), \
                 patch('conductr_cli.bundle_installation.wait_for_installation', wait_for_installation_mock):
             logging_setup.configure_logging(input_args, err_output=stderr)
@@ -179,6 +179,45 @@ class TestBndlCreate(CliTestCase):
         finally:
             shutil.rmtree(tmpdir)
 
+    def test_name_from_oci_image_title(self):
+        stdout_mock = MagicMock()
+        tmpdir = tempfile.mkdtemp()
+        tmpfile = os.path.join(tmpdir, 'output')
+
+        try:
+            attributes = create_attributes_object({
+                'name': None,
+                'source': tmpdir,
+                'format': BndlFormat.OCI_IMAGE,
+                'image_tag': None,
+                'output': tmpfile,
+                'use_shazar': False,
+                'use_default_endpoints': True,
+                'annotations': [],
+                'validation_excludes': [],
+                'use_default_volumes': True,
+                'with_defaults': None
+            })
+
+            os.mkdir(os.path.join(tmpdir, 'refs'))
+            open(os.path.join(tmpdir, 'oci-layout'), 'w').close()
+            with open(os.path.join(tmpdir, 'refs/3.5'), 'w') as refs:
+                refs.write('{"annotations": {"org.opencontainers.image.title": "alpine"}}')
+
+            with \
+                    patch('conductr_cli.bndl_oci.oci_image_extract_manifest_config', lambda a, b: ({}, {})), \
+                    patch('sys.stdin', MagicMock(**{'buffer': BytesIO(b'')})), \
+                    patch('sys.stdout.buffer.write', stdout_mock):
+                self.assertEqual(bndl_create.bndl_create(attributes), 0)
+
+            with tarfile.TarFile.open(tmpfile) as tar:
+                self.assertIn('alpine/alpine/oci-layout', tar.getnames())
+                bundle_conf = tar.extractfile('alpine/bundle.conf').read().decode('UTF-8')
+                self.assertIn('name = "alpine"', bundle_conf)
+                self.assertIn('components {\n  alpine {', bundle_conf)
+        finally:
+            shutil.rmtree(tmpdir)
+
     def test_deterministic_with_shazar(self):
         stdout_mock = MagicMock()
         tmpdir = tempfile.mkdtemp()
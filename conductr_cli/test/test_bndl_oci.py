@@ -37,6 +37,23 @@ class TestBndlOci(CliTestCase):
             shutil.rmtree(tmpdir)
             shutil.rmtree(dest_tmpdir)
 
+    def test_oci_image_title(self):
+        tmpdir = tempfile.mkdtemp()
+
+        try:
+            os.mkdir(os.path.join(tmpdir, 'refs'))
+
+            self.assertIsNone(bndl_oci.oci_image_title(tmpdir))
+
+            with open(os.path.join(tmpdir, 'refs', 'latest'), 'w') as file:
+                file.write('{"annotations": {"org.opencontainers.image.title": "alpine"}}')
+
+            self.assertEqual('alpine', bndl_oci.oci_image_title(tmpdir))
+            self.assertEqual('alpine', bndl_oci.oci_image_title(tmpdir, 'latest'))
+            self.assertIsNone(bndl_oci.oci_image_title(tmpdir, '3.5'))
+        finally:
+            shutil.rmtree(tmpdir)
+
     def test_oci_image_unpack_toplevel_tar(self):
         file = tempfile.NamedTemporaryFile()
         dest_tmpdir = tempfile.mkdtemp()
@@ -4,6 +4,7 @@ from conductr_cli.endpoint import Endpoint
 from conductr_cli.test.cli_test_case import CliTestCase, create_attributes_object, strip_margin
 from io import BytesIO
 from pyhocon import ConfigFactory
+from unittest.mock import patch, MagicMock
 import os
 import shutil
 import tempfile
@@ -124,6 +125,25 @@ class TestBndlUtils(CliTestCase):
         finally:
             shutil.rmtree(tmpdir)
 
+    def test_link_or_copy(self):
+        tmpdir = tempfile.mkdtemp()
+
+        try:
+            with open(os.path.join(tmpdir, 'one'), 'w') as file:
+                file.write('hello')
+
+            bndl_utils.link_or_copy(os.path.join(tmpdir, 'one'), os.path.join(tmpdir, 'two'))
+            self.assertTrue(os.path.samefile(os.path.join(tmpdir, 'one'), os.path.join(tmpdir, 'two')))
+
+            with patch('os.link', MagicMock(side_effect=OSError('Invalid cross-device link'))):
+                bndl_utils.link_or_copy(os.path.join(tmpdir, 'one'), os.path.join(tmpdir, 'three'))
+
+            self.assertFalse(os.path.samefile(os.path.join(tmpdir, 'one'), os.path.join(tmpdir, 'three')))
+            with open(os.path.join(tmpdir, 'three'), 'r') as file:
+                self.assertEqual('hello', file.read())
+        finally:
+            shutil.rmtree(tmpdir)
+
     def test_load_bundle_args_into_conf_with_empty_lists(self):
         simple_config = ConfigFactory.parse_string('')
         args = create_attributes_object({
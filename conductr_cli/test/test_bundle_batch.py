@@ -0,0 +1,177 @@
+from conductr_cli.test.cli_test_case import CliTestCase, strip_margin
+from conductr_cli import bundle_batch, logging_setup
+from conductr_cli.exceptions import WaitTimeoutError
+from requests.exceptions import HTTPError, Timeout
+from unittest.mock import patch, MagicMock
+
+
+class TestIsBatch(CliTestCase):
+    def test_single_bundle(self):
+        self.assertFalse(bundle_batch.is_batch(MagicMock(bundle='visualizer', additional_bundles=[],
+                                                         role=None, system=None)))
+
+    def test_multiple_bundles(self):
+        self.assertTrue(bundle_batch.is_batch(MagicMock(bundle='visualizer', additional_bundles=['eslite'],
+                                                        role=None, system=None)))
+
+    def test_selector(self):
+        self.assertTrue(bundle_batch.is_batch(MagicMock(bundle=None, additional_bundles=[],
+                                                        role='web', system=None)))
+        self.assertTrue(bundle_batch.is_batch(MagicMock(bundle=None, additional_bundles=[],
+                                                        role=None, system='monitoring')))
+
+
+class TestSelectBundles(CliTestCase):
+    bundles = [
+        {'bundleId': 'a101', 'attributes': {'roles': ['web'], 'system': 'frontend'}},
+        {'bundleId': 'b202', 'attributes': {'roles': ['web', 'elasticsearch'], 'system': 'monitoring'}},
+        {'bundleId': 'c303', 'attributes': {'roles': ['elasticsearch'], 'system': 'monitoring'}}
+    ]
+
+    def test_bundles_given(self):
+        args = MagicMock(bundle='visualizer', additional_bundles=['eslite'], role=None, system=None)
+        get_bundles_mock = MagicMock()
+
+        with patch('conductr_cli.control_protocol.get_bundles', get_bundles_mock):
+            self.assertEqual(['visualizer', 'eslite'], bundle_batch.select_bundles(args))
+
+        get_bundles_mock.assert_not_called()
+
+    def test_role(self):
+        args = MagicMock(bundle='a101', additional_bundles=[], role='web', system=None)
+
+        with patch('conductr_cli.control_protocol.get_bundles', MagicMock(return_value=self.bundles)):
+            self.assertEqual(['a101', 'b202'], bundle_batch.select_bundles(args))
+
+    def test_role_and_system(self):
+        args = MagicMock(bundle=None, additional_bundles=[], role='elasticsearch', system='monitoring')
+
+        with patch('conductr_cli.control_protocol.get_bundles', MagicMock(return_value=self.bundles)):
+            self.assertEqual(['b202', 'c303'], bundle_batch.select_bundles(args))
+
+
+class TestRunBatch(CliTestCase):
+    def default_args(self, bundles, no_wait=False):
+        return MagicMock(**{
+            'bundle': bundles[0],
+            'additional_bundles': bundles[1:],
+            'role': None,
+            'system': None,
+            'no_wait': no_wait,
+            'long_ids': True
+        })
+
+    def create_waiter(self, error=None):
+        waiter = MagicMock()
+        waiter.error = error
+        return waiter
+
+    def test_success(self):
+        request_mock = MagicMock(side_effect=lambda args: {'bundleId': '{}-id'.format(args.bundle)})
+        waiters = {}
+
+        def create_waiter(bundle_id, args):
+            waiters[bundle_id] = self.create_waiter()
+            self.assertEqual(bundle_id, args.bundle)
+            return waiters[bundle_id]
+
+        wait_for_all_mock = MagicMock(return_value=[])
+        stdout = MagicMock()
+
+        input_args = self.default_args(['visualizer', 'eslite'])
+        with patch('conductr_cli.bundle_event_bus.wait_for_all', wait_for_all_mock):
+            logging_setup.configure_logging(input_args, stdout)
+            result = bundle_batch.run_batch(input_args, 'run', request_mock, create_waiter, 'Running')
+            self.assertTrue(result)
+
+        self.assertEqual(['visualizer', 'eslite'], sorted([call[0][0].bundle for call in request_mock.call_args_list],
+                                                          reverse=True))
+        wait_for_all_mock.assert_called_once_with([waiters['visualizer-id'], waiters['eslite-id']], input_args)
+
+        self.assertEqual(strip_margin("""|Bundle run requests sent: 2 of 2.
+                                         |BUNDLE      ID             STATUS
+                                         |visualizer  visualizer-id  Running
+                                         |eslite      eslite-id      Running
+                                         |"""),
+                         self.output(stdout))
+
+    def test_failure(self):
+        def request(args):
+            if args.bundle == 'eslite':
+                raise HTTPError(response=MagicMock(status_code=404, reason='Not Found'))
+            else:
+                return {'bundleId': '{}-id'.format(args.bundle)}
+
+        def create_waiter(bundle_id, args):
+            return self.create_waiter(WaitTimeoutError('test only') if bundle_id == 'visualizer-id' else None)
+
+        wait_for_all_mock = MagicMock()
+        stdout = MagicMock()
+
+        input_args = self.default_args(['visualizer', 'eslite', 'cassandra'])
+        with patch('conductr_cli.bundle_event_bus.wait_for_all', wait_for_all_mock):
+            logging_setup.configure_logging(input_args, stdout)
+            result = bundle_batch.run_batch(input_args, 'stop', request, create_waiter, 'Stopped')
+            self.assertFalse(result)
+
+        self.assertEqual(strip_margin("""|Bundle stop requests sent: 2 of 3.
+                                         |BUNDLE      ID             STATUS
+                                         |visualizer  visualizer-id  Timed out
+                                         |eslite                     Failed: 404 Not Found
+                                         |cassandra   cassandra-id   Stopped
+                                         |"""),
+                         self.output(stdout))
+
+    def test_unexpected_request_failure(self):
+        def request(args):
+            if args.bundle == 'eslite':
+                raise Timeout('read timed out')
+            elif args.bundle == 'cassandra':
+                raise ValueError('malformed response')
+            else:
+                return {'bundleId': '{}-id'.format(args.bundle)}
+
+        wait_for_all_mock = MagicMock()
+        stdout = MagicMock()
+
+        input_args = self.default_args(['visualizer', 'eslite', 'cassandra'])
+        with patch('conductr_cli.bundle_event_bus.wait_for_all', wait_for_all_mock):
+            logging_setup.configure_logging(input_args, stdout)
+            result = bundle_batch.run_batch(input_args, 'stop', request,
+                                            lambda bundle_id, args: self.create_waiter(None), 'Stopped')
+            self.assertFalse(result)
+
+        self.assertEqual(strip_margin("""|Bundle stop requests sent: 1 of 3.
+                                         |BUNDLE      ID             STATUS
+                                         |visualizer  visualizer-id  Stopped
+                                         |eslite                     Failed: read timed out
+                                         |cassandra                  Failed: malformed response
+                                         |"""),
+                         self.output(stdout))
+
+    def test_no_wait(self):
+        request_mock = MagicMock(return_value={'bundleId': 'visualizer-id'})
+        create_waiter_mock = MagicMock()
+        wait_for_all_mock = MagicMock()
+        stdout = MagicMock()
+
+        input_args = self.default_args(['visualizer', 'visualizer-v2'], no_wait=True)
+        with patch('conductr_cli.bundle_event_bus.wait_for_all', wait_for_all_mock):
+            logging_setup.configure_logging(input_args, stdout)
+            result = bundle_batch.run_batch(input_args, 'unload', request_mock, create_waiter_mock, 'Unloaded')
+            self.assertTrue(result)
+
+        create_waiter_mock.assert_not_called()
+        wait_for_all_mock.assert_not_called()
+
+    def test_no_bundles(self):
+        stdout = MagicMock()
+        stderr = MagicMock()
+
+        input_args = MagicMock(bundle=None, additional_bundles=[], role='web', system=None)
+        with patch('conductr_cli.control_protocol.get_bundles', MagicMock(return_value=[])):
+            logging_setup.configure_logging(input_args, stdout, stderr)
+            result = bundle_batch.run_batch(input_args, 'run', MagicMock(), MagicMock(), 'Running')
+            self.assertFalse(result)
+
+        self.assertIn('No bundles to run', self.output(stderr))
@@ -0,0 +1,214 @@
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+from conductr_cli import bundle_cache
+from conductr_cli.test.cli_test_case import create_temp_bundle_with_contents
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+
+class TestBundleCache(TestCase):
+    def setUp(self):  # noqa
+        self.cache_dir = tempfile.mkdtemp()
+        self.tmpdir, self.bundle_path = create_temp_bundle_with_contents({
+            'bundle.conf': 'name = "visualizer"\ncompatibilityVersion = "2"\ntags = ["2.0.0"]'
+        })
+        with open(self.bundle_path, 'rb') as bundle_file:
+            self.digest = hashlib.sha256(bundle_file.read()).hexdigest()
+
+    def tearDown(self):  # noqa
+        shutil.rmtree(self.cache_dir)
+        shutil.rmtree(self.tmpdir)
+
+    def download(self, file_name, contents=None):
+        path = os.path.join(self.cache_dir, file_name)
+        if contents is None:
+            shutil.copy(self.bundle_path, path)
+        else:
+            with open(path, 'wb') as file:
+                file.write(contents)
+        return path
+
+    def test_add(self):
+        cache = bundle_cache.BundleCache(self.cache_dir)
+        cached_path = cache.add(self.download('visualizer-v2.zip'), 'visualizer-v2.zip', 'http://site/visualizer-v2.zip')
+
+        self.assertEqual(os.path.join(self.cache_dir, self.digest, 'visualizer-v2.zip'), cached_path)
+        self.assertTrue(os.path.exists(cached_path))
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, 'visualizer-v2.zip')))
+
+        index = bundle_cache.read_index(self.cache_dir)
+        self.assertEqual({'http://site/visualizer-v2.zip': self.digest}, index['uris'])
+        self.assertEqual({
+            'visualizer': self.digest,
+            'visualizer:2.0.0': self.digest,
+            'visualizer:v2': self.digest
+        }, index['names'])
+        self.assertEqual('visualizer', index['entries'][self.digest]['name'])
+
+    def test_add_same_contents_from_another_uri(self):
+        cache = bundle_cache.BundleCache(self.cache_dir)
+        cache.add(self.download('visualizer-v2.zip'), 'visualizer-v2.zip', 'http://site/visualizer-v2.zip')
+        cached_path = cache.add(self.download('visualizer-v2.zip'), 'visualizer-v2.zip', 'http://mirror/visualizer-v2.zip')
+
+        self.assertEqual(os.path.join(self.cache_dir, self.digest, 'visualizer-v2.zip'), cached_path)
+        self.assertEqual(['http://site/visualizer-v2.zip', 'http://mirror/visualizer-v2.zip'],
+                         cache.index['entries'][self.digest]['uris'])
+        self.assertEqual(sorted([self.digest, bundle_cache.INDEX_FILE_NAME]), sorted(os.listdir(self.cache_dir)))
+
+    def test_add_configuration(self):
+        cache = bundle_cache.BundleCache(self.cache_dir)
+        digest = hashlib.sha256(b'not a zip').hexdigest()
+        file_name = 'frontend-config-{}.zip'.format(digest)
+        cache.add(self.download(file_name, b'not a zip'), file_name, 'http://site/{}'.format(file_name))
+
+        self.assertEqual({'frontend-config': digest}, cache.index['names'])
+
+    def test_find_uri(self):
+        bundle_cache.BundleCache(self.cache_dir).add(self.download('visualizer-v2.zip'), 'visualizer-v2.zip',
+                                                     'http://site/visualizer-v2.zip')
+
+        cache = bundle_cache.BundleCache(self.cache_dir)
+        self.assertEqual(('visualizer-v2.zip', os.path.join(self.cache_dir, self.digest, 'visualizer-v2.zip')),
+                         cache.find_uri('http://site/visualizer-v2.zip'))
+        self.assertIsNone(cache.find_uri('http://site/eslite.zip'))
+
+    def test_find_uri_file_removed(self):
+        cache = bundle_cache.BundleCache(self.cache_dir)
+        cached_path = cache.add(self.download('visualizer-v2.zip'), 'visualizer-v2.zip',
+                                'http://site/visualizer-v2.zip')
+        os.remove(cached_path)
+
+        self.assertIsNone(cache.find_uri('http://site/visualizer-v2.zip'))
+        self.assertEqual({}, bundle_cache.read_index(self.cache_dir)['entries'])
+
+    def test_find_name(self):
+        cache = bundle_cache.BundleCache(self.cache_dir)
+        cache.add(self.download('visualizer-v2.zip'), 'visualizer-v2.zip', 'http://site/visualizer-v2.zip')
+
+        expected_result = ('visualizer-v2.zip', os.path.join(self.cache_dir, self.digest, 'visualizer-v2.zip'))
+        self.assertEqual(expected_result, cache.find_name('visualizer'))
+        self.assertEqual(expected_result, cache.find_name('visualizer:v2'))
+        self.assertEqual(expected_result, cache.find_name('visualizer-v'))
+        self.assertIsNone(cache.find_name('eslite'))
+
+    def test_find_name_flat_file(self):
+        legacy_file_name = 'visualizer-v2-{}.zip'.format(self.digest)
+        legacy_path = self.download(legacy_file_name)
+        self.download('visualizer-v3.zip.tmp', b'downloading')
+
+        cache = bundle_cache.BundleCache(self.cache_dir)
+        self.assertEqual((legacy_file_name, legacy_path), cache.find_name('visualizer'))
+        self.assertIsNone(cache.find_name('eslite'))
+
+        cache.add(self.download('visualizer-v2.zip'), 'visualizer-v2.zip', 'http://site/visualizer-v2.zip')
+        self.assertEqual(('visualizer-v2.zip', os.path.join(self.cache_dir, self.digest, 'visualizer-v2.zip')),
+                         cache.find_name('visualizer'))
+
+    def test_evict_least_recently_used(self):
+        time_mock = MagicMock(side_effect=[1, 1, 2, 2, 3, 3])
+
+        with patch('time.time', time_mock):
+            cache = bundle_cache.BundleCache(self.cache_dir, max_size=20)
+            cache.add(self.download('a.zip', b'a' * 10), 'a.zip', 'http://site/a.zip')
+            cache.add(self.download('b.zip', b'b' * 10), 'b.zip', 'http://site/b.zip')
+            cache.add(self.download('c.zip', b'c' * 10), 'c.zip', 'http://site/c.zip')
+
+        self.assertEqual(['c.zip', 'b.zip'], [entry['file_name'] for entry in cache.entries()])
+        self.assertIsNone(cache.find_uri('http://site/a.zip'))
+        self.assertEqual(20, cache.total_size())
+
+    def test_evict_excluded(self):
+        cache = bundle_cache.BundleCache(self.cache_dir, max_size=5)
+        cache.add(self.download('a.zip', b'a' * 10), 'a.zip', 'http://site/a.zip')
+
+        self.assertEqual(['a.zip'], [entry['file_name'] for entry in cache.entries()])
+
+        removed_entries = cache.evict(0)
+        self.assertEqual(['a.zip'], [entry['file_name'] for entry in removed_entries])
+        self.assertEqual([bundle_cache.INDEX_FILE_NAME], os.listdir(self.cache_dir))
+
+    def test_remove_orphans(self):
+        cache = bundle_cache.BundleCache(self.cache_dir)
+        cache.add(self.download('a.zip', b'a' * 10), 'a.zip', 'http://site/a.zip')
+        orphan_dir = os.path.join(self.cache_dir, hashlib.sha256(b'orphan').hexdigest())
+        os.makedirs(orphan_dir)
+        with open(os.path.join(orphan_dir, 'orphan.zip'), 'wb') as file:
+            file.write(b'orphan')
+        stale_paths = [self.download('b.zip.tmp', b'partial'), self.download('b.zip.tmp.json', b'{}')]
+        for path in stale_paths:
+            os.utime(path, (1, 1))
+        self.download('c.zip.tmp', b'downloading')
+        self.download('s3-bundle.zip', b's3')
+        legacy_path = self.download('visualizer-v2-{}.zip'.format(self.digest), b'legacy')
+        bundle_cache.write_json(bundle_cache.metadata_path(self.cache_dir, 'versions.json'), {})
+
+        removed_paths, removed_size = cache.remove_orphans()
+
+        self.assertEqual(sorted([orphan_dir, legacy_path] + stale_paths), sorted(removed_paths))
+        self.assertEqual(21, removed_size)
+        self.assertIsNotNone(cache.find_uri('http://site/a.zip'))
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, 'c.zip.tmp')))
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, 's3-bundle.zip')))
+        self.assertEqual({}, bundle_cache.read_json(bundle_cache.metadata_path(self.cache_dir, 'versions.json'), None))
+
+    def test_concurrent_add(self):
+        cache_one = bundle_cache.BundleCache(self.cache_dir)
+        cache_two = bundle_cache.BundleCache(self.cache_dir)
+        cache_one.add(self.download('a.zip', b'a' * 10), 'a.zip', 'http://site/a.zip')
+        cache_two.add(self.download('b.zip', b'b' * 10), 'b.zip', 'http://site/b.zip')
+
+        self.assertEqual(['b.zip', 'a.zip'],
+                         [entry['file_name'] for entry in bundle_cache.BundleCache(self.cache_dir).entries()])
+
+    def test_lock_file(self):
+        lock_path = os.path.join(self.cache_dir, bundle_cache.LOCK_FILE_NAME)
+
+        with patch('conductr_cli.bundle_cache.LOCK_REFRESH_SECONDS', 0.01):
+            with bundle_cache.lock_file(lock_path):
+                os.utime(lock_path, (1, 1))
+                for _ in range(100):
+                    if os.path.getmtime(lock_path) > 1:
+                        break
+                    time.sleep(0.01)
+
+                self.assertGreater(os.path.getmtime(lock_path), 1)
+
+        self.assertFalse(os.path.exists(lock_path))
+
+    def test_stale_lock_file(self):
+        lock_path = os.path.join(self.cache_dir, bundle_cache.LOCK_FILE_NAME)
+        open(lock_path, 'w').close()
+        os.utime(lock_path, (1, 1))
+
+        bundle_cache.BundleCache(self.cache_dir).add(self.download('a.zip', b'a' * 10), 'a.zip', 'http://site/a.zip')
+
+        self.assertFalse(os.path.exists(lock_path))
+
+    def test_verify(self):
+        cache = bundle_cache.BundleCache(self.cache_dir)
+        cache.add(self.download('a.zip', b'a' * 10), 'a.zip', 'http://site/a.zip')
+        corrupted_path = cache.add(self.download('b.zip', b'b' * 10), 'b.zip', 'http://site/b.zip')
+        with open(corrupted_path, 'wb') as file:
+            file.write(b'corrupted')
+
+        removed_entries = cache.verify()
+
+        self.assertEqual(['b.zip'], [entry['file_name'] for entry in removed_entries])
+        self.assertEqual(['a.zip'], [entry['file_name'] for entry in cache.entries()])
+        self.assertFalse(os.path.exists(corrupted_path))
+
+    def test_read_index_invalid(self):
+        with open(os.path.join(self.cache_dir, bundle_cache.INDEX_FILE_NAME), 'w') as index_file:
+            index_file.write('{ invalid')
+
+        self.assertEqual({'version': bundle_cache.INDEX_VERSION, 'entries': {}, 'uris': {}, 'names': {}},
+                         bundle_cache.read_index(self.cache_dir))
+
+
+class TestIsSamePath(TestCase):
+    def test_is_same_path(self):
+        self.assertTrue(bundle_cache.is_same_path('/cache-dir/bundle.zip', '/cache-dir/../cache-dir/bundle.zip'))
+        self.assertFalse(bundle_cache.is_same_path('/cache-dir/bundle.zip', '/cache-dir/other.zip'))
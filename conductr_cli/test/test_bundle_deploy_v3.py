@@ -982,6 +982,73 @@ class TestWaitForDeployment(CliTestCase):
         return self.deployment_event(self.deployment_2_id, self.deployment_2_target_bundle, event_type, data)
 
 
+class TestDeploymentEventStore(CliTestCase):
+    def test_ingest_new_events_only(self):
+        scheduled_1 = self.event('deployment-1', 0, 'deploymentScheduled', 0)
+        scheduled_2 = self.event('deployment-2', 0, 'deploymentScheduled', 1)
+        started_1 = self.event('deployment-1', 1, 'deploymentStarted', 2)
+
+        store = bundle_deploy_v3.DeploymentEventStore()
+
+        self.assertEqual([scheduled_1, scheduled_2],
+                         store.ingest([self.deployment([scheduled_1]), self.deployment([scheduled_2])]))
+        self.assertEqual([],
+                         store.ingest([self.deployment([scheduled_1]), self.deployment([scheduled_2])]))
+        self.assertEqual([started_1],
+                         store.ingest([self.deployment([started_1, scheduled_1]), self.deployment([scheduled_2])]))
+
+        self.assertEqual({'deployment-1': started_1, 'deployment-2': scheduled_2}, store.latest_events)
+        self.assertFalse(store.is_completed())
+
+    def test_ignore_events_older_than_latest(self):
+        scheduled_1 = self.event('deployment-1', 0, 'deploymentScheduled', 0)
+        started_1 = self.event('deployment-1', 1, 'deploymentStarted', 1)
+
+        store = bundle_deploy_v3.DeploymentEventStore()
+
+        self.assertEqual([started_1], store.ingest([self.deployment([started_1])]))
+        self.assertEqual([], store.ingest([self.deployment([scheduled_1, started_1])]))
+        self.assertEqual({'deployment-1': started_1}, store.latest_events)
+
+    def test_completed_with_success(self):
+        success_1 = self.event('deployment-1', 0, 'deploymentSuccess', 0)
+        scheduled_2 = self.event('deployment-2', 0, 'deploymentScheduled', 1)
+        success_2 = self.event('deployment-2', 1, 'deploymentSuccess', 2)
+
+        store = bundle_deploy_v3.DeploymentEventStore()
+
+        store.ingest([self.deployment([success_1]), self.deployment([scheduled_2])])
+        self.assertFalse(store.is_completed_with_success())
+
+        store.ingest([self.deployment([success_1]), self.deployment([scheduled_2, success_2])])
+        self.assertTrue(store.is_completed_with_success())
+        self.assertFalse(store.has_deployment_failure())
+
+    def test_deployment_failure(self):
+        failure_1 = self.event('deployment-1', 0, 'deploymentFailure', 0)
+        scheduled_2 = self.event('deployment-2', 0, 'deploymentScheduled', 1)
+
+        store = bundle_deploy_v3.DeploymentEventStore()
+
+        store.ingest([self.deployment([failure_1]), self.deployment([scheduled_2])])
+        self.assertTrue(store.has_deployment_failure())
+        self.assertFalse(store.is_completed_with_success())
+
+    def deployment(self, events):
+        return {'events': events}
+
+    def event(self, deployment_id, sequence, event_type, timestamp):
+        return {
+            'eventType': event_type,
+            'deploymentKey': {
+                'deploymentBatchId': 'batch-id',
+                'deploymentId': deployment_id
+            },
+            'deploymentSequence': sequence,
+            'timestamp': timestamp
+        }
+
+
 class TestDisplayBatchEvent(CliTestCase):
     def test_display(self):
         self.assertEqual('Deployment request accepted',
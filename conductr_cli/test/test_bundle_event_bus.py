@@ -0,0 +1,111 @@
+from conductr_cli import bundle_event_bus
+from conductr_cli.exceptions import BundleScaleError, WaitTimeoutError
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+
+
+def create_test_event(event_name):
+    sse_mock = MagicMock()
+    sse_mock.event = event_name
+    return sse_mock
+
+
+class StubWaiter:
+    def __init__(self, name, events_to_wait, error=None):
+        self.name = name
+        self.events_to_wait = events_to_wait
+        self.error_to_raise = error
+        self.received_events = []
+        self.shared = False
+        self.error = None
+
+    def start(self):
+        return self.events_to_wait == 0
+
+    def on_event(self, event):
+        self.received_events.append(event)
+        if self.error_to_raise:
+            raise self.error_to_raise
+        return len(self.received_events) >= self.events_to_wait
+
+    def timeout_error(self):
+        return WaitTimeoutError(self.name)
+
+
+class TestBundleEventBus(TestCase):
+    conductr_auth = ('username', 'password')
+    server_verification_file = MagicMock(name='server_verification_file')
+
+    args = MagicMock(**{
+        'dcos_mode': False,
+        'conductr_auth': conductr_auth,
+        'server_verification_file': server_verification_file
+    })
+
+    events = [
+        create_test_event(None),
+        create_test_event('bundleInstallationAdded'),
+        create_test_event('bundleExecutionAdded')
+    ]
+
+    def test_wait_for_all_over_single_stream(self):
+        url_mock = MagicMock(return_value='/bundle-events/endpoint')
+        conductr_host_mock = MagicMock(return_value='10.0.0.1')
+        get_events_mock = MagicMock(return_value=self.events)
+
+        waiter_1 = StubWaiter('waiter-1', 1)
+        waiter_2 = StubWaiter('waiter-2', 3)
+
+        with patch('conductr_cli.conduct_url.url', url_mock), \
+                patch('conductr_cli.conduct_url.conductr_host', conductr_host_mock), \
+                patch('conductr_cli.sse_client.get_events', get_events_mock):
+            result = bundle_event_bus.wait_for_all([waiter_1, waiter_2], self.args)
+
+        self.assertEqual([], result)
+        self.assertEqual(self.events[:1], waiter_1.received_events)
+        self.assertEqual(self.events, waiter_2.received_events)
+        self.assertTrue(waiter_1.shared)
+        self.assertTrue(waiter_2.shared)
+
+        url_mock.assert_called_once_with('bundles/events', self.args)
+        get_events_mock.assert_called_once_with(False, '10.0.0.1', '/bundle-events/endpoint',
+                                                auth=self.conductr_auth, verify=self.server_verification_file)
+
+    def test_wait_for_all_records_errors(self):
+        get_events_mock = MagicMock(return_value=self.events)
+
+        waiter_ok = StubWaiter('waiter-ok', 2)
+        waiter_failed = StubWaiter('waiter-failed', 2, BundleScaleError('abc'))
+        waiter_timeout = StubWaiter('waiter-timeout', 10)
+
+        with patch('conductr_cli.conduct_url.url', MagicMock()), \
+                patch('conductr_cli.conduct_url.conductr_host', MagicMock()), \
+                patch('conductr_cli.sse_client.get_events', get_events_mock):
+            result = bundle_event_bus.wait_for_all([waiter_ok, waiter_failed, waiter_timeout], self.args)
+
+        self.assertEqual([waiter_failed, waiter_timeout], result)
+        self.assertIsNone(waiter_ok.error)
+        self.assertIsInstance(waiter_failed.error, BundleScaleError)
+        self.assertEqual(self.events[:1], waiter_failed.received_events)
+        self.assertIsInstance(waiter_timeout.error, WaitTimeoutError)
+
+    def test_no_stream_when_conditions_met(self):
+        get_events_mock = MagicMock()
+
+        waiter = StubWaiter('waiter', 0)
+
+        with patch('conductr_cli.sse_client.get_events', get_events_mock):
+            bundle_event_bus.wait_for(waiter, self.args)
+
+        self.assertFalse(waiter.shared)
+        get_events_mock.assert_not_called()
+
+    def test_wait_for_raises_error(self):
+        get_events_mock = MagicMock(return_value=self.events)
+
+        waiter = StubWaiter('waiter', 10)
+
+        with patch('conductr_cli.conduct_url.url', MagicMock()), \
+                patch('conductr_cli.conduct_url.conductr_host', MagicMock()), \
+                patch('conductr_cli.sse_client.get_events', get_events_mock):
+            self.assertRaises(WaitTimeoutError, bundle_event_bus.wait_for, waiter, self.args)
@@ -3,7 +3,7 @@ import json
 from conductr_cli.test.cli_test_case import CliTestCase, strip_margin
 from conductr_cli import bundle_installation, logging_setup
 from conductr_cli.exceptions import WaitTimeoutError
-from unittest.mock import call, patch, MagicMock
+from unittest.mock import ANY, call, patch, MagicMock
 
 
 def create_test_event(event_name):
@@ -290,9 +290,9 @@ class TestWaitForInstallation(CliTestCase):
             bundle_installation.wait_for_installation(bundle_id, args)
 
         self.assertEqual(count_installations_mock.call_args_list, [
-            call(bundle_id, args),
-            call(bundle_id, args),
-            call(bundle_id, args)
+            call(bundle_id, args, bundle_state=ANY),
+            call(bundle_id, args, bundle_state=ANY),
+            call(bundle_id, args, bundle_state=ANY)
         ])
 
         url_mock.assert_called_with('bundles/events', args)
@@ -351,9 +351,9 @@ class TestWaitForInstallation(CliTestCase):
             bundle_installation.wait_for_installation(bundle_id, args)
 
         self.assertEqual(count_installations_mock.call_args_list, [
-            call(bundle_id, args),
-            call(bundle_id, args),
-            call(bundle_id, args)
+            call(bundle_id, args, bundle_state=ANY),
+            call(bundle_id, args, bundle_state=ANY),
+            call(bundle_id, args, bundle_state=ANY)
         ])
 
         url_mock.assert_called_with('bundles/events', args)
@@ -412,9 +412,9 @@ class TestWaitForInstallation(CliTestCase):
             self.assertRaises(WaitTimeoutError, bundle_installation.wait_for_installation, bundle_id, args)
 
         self.assertEqual(count_installations_mock.call_args_list, [
-            call(bundle_id, args),
-            call(bundle_id, args),
-            call(bundle_id, args)
+            call(bundle_id, args, bundle_state=ANY),
+            call(bundle_id, args, bundle_state=ANY),
+            call(bundle_id, args, bundle_state=ANY)
         ])
 
         url_mock.assert_called_with('bundles/events', args)
@@ -456,7 +456,7 @@ class TestWaitForInstallation(CliTestCase):
             bundle_installation.wait_for_installation(bundle_id, args)
 
         self.assertEqual(count_installations_mock.call_args_list, [
-            call(bundle_id, args)
+            call(bundle_id, args, bundle_state=ANY)
         ])
 
         conductr_host_mock.assert_not_called()
@@ -495,7 +495,7 @@ class TestWaitForInstallation(CliTestCase):
             self.assertRaises(WaitTimeoutError, bundle_installation.wait_for_installation, bundle_id, args)
 
         self.assertEqual(count_installations_mock.call_args_list, [
-            call(bundle_id, args)
+            call(bundle_id, args, bundle_state=ANY)
         ])
 
         url_mock.assert_called_with('bundles/events', args)
@@ -539,10 +539,10 @@ class TestWaitForInstallation(CliTestCase):
             self.assertRaises(WaitTimeoutError, bundle_installation.wait_for_installation, bundle_id, args)
 
         self.assertEqual(count_installations_mock.call_args_list, [
-            call(bundle_id, args),
-            call(bundle_id, args),
-            call(bundle_id, args),
-            call(bundle_id, args)
+            call(bundle_id, args, bundle_state=ANY),
+            call(bundle_id, args, bundle_state=ANY),
+            call(bundle_id, args, bundle_state=ANY),
+            call(bundle_id, args, bundle_state=ANY)
         ])
 
         url_mock.assert_called_with('bundles/events', args)
@@ -601,8 +601,8 @@ class TestWaitForUninstallation(CliTestCase):
             bundle_installation.wait_for_uninstallation(bundle_id, args)
 
         self.assertEqual(count_installations_mock.call_args_list, [
-            call(bundle_id, args),
-            call(bundle_id, args)
+            call(bundle_id, args, bundle_state=ANY),
+            call(bundle_id, args, bundle_state=ANY)
         ])
 
         url_mock.assert_called_with('bundles/events', args)
@@ -639,7 +639,7 @@ class TestWaitForUninstallation(CliTestCase):
             bundle_installation.wait_for_uninstallation(bundle_id, args)
 
         self.assertEqual(count_installations_mock.call_args_list, [
-            call(bundle_id, args)
+            call(bundle_id, args, bundle_state=ANY)
         ])
 
         conductr_host_mock.assert_not_called()
@@ -679,7 +679,7 @@ class TestWaitForUninstallation(CliTestCase):
             self.assertRaises(WaitTimeoutError, bundle_installation.wait_for_uninstallation, bundle_id, args)
 
         self.assertEqual(count_installations_mock.call_args_list, [
-            call(bundle_id, args)
+            call(bundle_id, args, bundle_state=ANY)
         ])
 
         url_mock.assert_called_with('bundles/events', args)
@@ -723,10 +723,10 @@ class TestWaitForUninstallation(CliTestCase):
             self.assertRaises(WaitTimeoutError, bundle_installation.wait_for_uninstallation, bundle_id, args)
 
         self.assertEqual(count_installations_mock.call_args_list, [
-            call(bundle_id, args),
-            call(bundle_id, args),
-            call(bundle_id, args),
-            call(bundle_id, args)
+            call(bundle_id, args, bundle_state=ANY),
+            call(bundle_id, args, bundle_state=ANY),
+            call(bundle_id, args, bundle_state=ANY),
+            call(bundle_id, args, bundle_state=ANY)
         ])
 
         url_mock.assert_called_with('bundles/events', args)
@@ -1,8 +1,9 @@
 from conductr_cli.test.cli_test_case import CliTestCase, as_error, as_warn, strip_margin
-from conductr_cli import bundle_scale, logging_setup
+from conductr_cli import bundle_scale, conduct_main, logging_setup
 from conductr_cli.exceptions import BundleScaleError, WaitTimeoutError
 from requests.exceptions import HTTPError
-from unittest.mock import call, patch, MagicMock
+from unittest.mock import ANY, call, patch, MagicMock
+from argparse import Namespace
 
 
 class TestGetScaleIp(CliTestCase):
@@ -53,7 +54,7 @@ class TestGetScaleIp(CliTestCase):
             'server_verification_file': self.server_verification_file
         }
         input_args = MagicMock(**args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             scale, has_error = bundle_scale.get_scale(bundle_id, True, input_args)
             self.assertEqual(1, scale)
             self.assertFalse(has_error)
@@ -104,7 +105,7 @@ class TestGetScaleIp(CliTestCase):
             'server_verification_file': self.server_verification_file
         }
         input_args = MagicMock(**args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             scale, has_error = bundle_scale.get_scale(bundle_id, True, input_args)
             self.assertEqual(1, scale)
             self.assertFalse(has_error)
@@ -128,7 +129,7 @@ class TestGetScaleIp(CliTestCase):
             'server_verification_file': self.server_verification_file
         }
         input_args = MagicMock(**args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             scale, has_error = bundle_scale.get_scale(bundle_id, True, input_args)
             self.assertEqual(0, scale)
             self.assertFalse(has_error)
@@ -152,7 +153,7 @@ class TestGetScaleIp(CliTestCase):
             'server_verification_file': self.server_verification_file
         }
         input_args = MagicMock(**args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             scale, has_error = bundle_scale.get_scale(bundle_id, True, input_args)
             self.assertEqual(0, scale)
             self.assertFalse(has_error)
@@ -209,7 +210,7 @@ class TestGetScaleHost(CliTestCase):
             'server_verification_file': self.server_verification_file
         }
         input_args = MagicMock(**args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             scale, has_error = bundle_scale.get_scale(bundle_id, True, input_args)
             self.assertEqual(1, scale)
             self.assertFalse(has_error)
@@ -260,7 +261,7 @@ class TestGetScaleHost(CliTestCase):
             'server_verification_file': self.server_verification_file
         }
         input_args = MagicMock(**args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             scale, has_error = bundle_scale.get_scale(bundle_id, True, input_args)
             self.assertEqual(1, scale)
             self.assertFalse(has_error)
@@ -284,7 +285,7 @@ class TestGetScaleHost(CliTestCase):
             'server_verification_file': self.server_verification_file
         }
         input_args = MagicMock(**args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             scale, has_error = bundle_scale.get_scale(bundle_id, True, input_args)
             self.assertEqual(0, scale)
             self.assertFalse(has_error)
@@ -308,7 +309,7 @@ class TestGetScaleHost(CliTestCase):
             'server_verification_file': self.server_verification_file
         }
         input_args = MagicMock(**args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             scale, has_error = bundle_scale.get_scale(bundle_id, True, input_args)
             self.assertEqual(0, scale)
             self.assertFalse(has_error)
@@ -365,11 +366,11 @@ class TestWaitForScale(CliTestCase):
             bundle_scale.wait_for_scale(bundle_id, 3, wait_for_is_active=True, args=args)
 
         self.assertEqual(get_scale_mock.call_args_list, [
-            call(bundle_id, True, args),
-            call(bundle_id, True, args),
-            call(bundle_id, True, args),
-            call(bundle_id, True, args),
-            call(bundle_id, True, args)
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY)
         ])
 
         url_mock.assert_called_with('bundles/events', args)
@@ -451,12 +452,12 @@ class TestWaitForScale(CliTestCase):
             bundle_scale.wait_for_scale(bundle_id, 3, wait_for_is_active=True, args=args)
 
         self.assertEqual(get_scale_mock.call_args_list, [
-            call(bundle_id, True, args),
-            call(bundle_id, True, args),
-            call(bundle_id, True, args),
-            call(bundle_id, True, args),
-            call(bundle_id, True, args),
-            call(bundle_id, True, args)
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY)
         ])
 
         url_mock.assert_called_with('bundles/events', args)
@@ -536,9 +537,9 @@ class TestWaitForScale(CliTestCase):
             self.assertRaises(WaitTimeoutError, bundle_scale.wait_for_scale, bundle_id, 3, wait_for_is_active=True, args=args)
 
         self.assertEqual(get_scale_mock.call_args_list, [
-            call(bundle_id, True, args),
-            call(bundle_id, True, args),
-            call(bundle_id, True, args)
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY)
         ])
 
         url_mock.assert_called_with('bundles/events', args)
@@ -588,7 +589,7 @@ class TestWaitForScale(CliTestCase):
             bundle_scale.wait_for_scale(bundle_id, 3, wait_for_is_active=True, args=args)
 
         self.assertEqual(get_scale_mock.call_args_list, [
-            call(bundle_id, True, args)
+            call(bundle_id, True, args, bundle_state=ANY)
         ])
 
         conductr_host_mock.assert_not_called()
@@ -633,7 +634,7 @@ class TestWaitForScale(CliTestCase):
             bundle_scale.wait_for_scale(bundle_id, 3, wait_for_is_active=True, args=args)
             self.assertEqual(e.cause.bundle_id, bundle_id)
 
-        get_scale_mock.assert_called_with(bundle_id, True, args)
+        get_scale_mock.assert_called_with(bundle_id, True, args, bundle_state=ANY)
         conductr_host_mock.assert_called_with(args)
         get_events_mock.assert_called_with(dcos_mode, conductr_host, '/bundle-events/endpoint',
                                            auth=self.conductr_auth,
@@ -679,7 +680,7 @@ class TestWaitForScale(CliTestCase):
             self.assertRaises(WaitTimeoutError, bundle_scale.wait_for_scale, bundle_id, 3, wait_for_is_active=True, args=args)
 
         self.assertEqual(get_scale_mock.call_args_list, [
-            call(bundle_id, True, args)
+            call(bundle_id, True, args, bundle_state=ANY)
         ])
 
         url_mock.assert_called_with('bundles/events', args)
@@ -734,10 +735,10 @@ class TestWaitForScale(CliTestCase):
             self.assertEqual(e.cause.bundle_id, bundle_id)
 
         self.assertEqual(get_scale_mock.call_args_list, [
-            call(bundle_id, True, args),
-            call(bundle_id, True, args),
-            call(bundle_id, True, args),
-            call(bundle_id, True, args)
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY)
         ])
 
         url_mock.assert_called_with('bundles/events', args)
@@ -783,10 +784,10 @@ class TestWaitForScale(CliTestCase):
             self.assertRaises(WaitTimeoutError, bundle_scale.wait_for_scale, bundle_id, 3, wait_for_is_active=True, args=args)
 
         self.assertEqual(get_scale_mock.call_args_list, [
-            call(bundle_id, True, args),
-            call(bundle_id, True, args),
-            call(bundle_id, True, args),
-            call(bundle_id, True, args)
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY),
+            call(bundle_id, True, args, bundle_state=ANY)
         ])
 
         url_mock.assert_called_with('bundles/events', args)
@@ -826,7 +827,7 @@ class TestDisplayBundleScaleErrorMessage(CliTestCase):
 
         log_output = MagicMock()
 
-        args = MagicMock(**{})
+        args = Namespace(follow=False)
 
         bundle_id = 'a101449418187d92c789d1adc240b6d6'
 
@@ -858,6 +859,26 @@ class TestDisplayBundleScaleErrorMessage(CliTestCase):
                                                    |"""))
         self.assertEqual(expected_output, self.output(log_output))
 
+    def test_consolidated_logging_enabled_with_follow(self):
+        args = conduct_main.build_parser(False).parse_args(['run', '-f', 'visualizer'])
+        calls = []
+        follow_events_mock = MagicMock(side_effect=lambda a: calls.append('follow events'))
+        get_bundle_events_mock = MagicMock(side_effect=lambda a, lines: calls.append('events') or [])
+        logs_mock = MagicMock(side_effect=lambda a: calls.append('logs'))
+
+        log_output = MagicMock()
+
+        with patch('conductr_cli.bundle_scale.is_consolidated_logging_enabled', MagicMock(return_value=True)), \
+                patch('conductr_cli.conduct_events.follow_events', follow_events_mock), \
+                patch('conductr_cli.control_protocol.get_bundle_events', get_bundle_events_mock), \
+                patch('conductr_cli.conduct_logs.logs', logs_mock):
+            logging_setup.configure_logging(args, log_output, log_output)
+            bundle_scale.display_bundle_scale_error_message('visualizer', args)
+
+        self.assertEqual(['events', 'logs'], calls)
+        logs_mock.assert_called_once_with(args)
+        self.assertTrue(args.follow)
+
     def test_consolidated_logging_not_enabled(self):
         is_consolidated_logging_enabled_mock = MagicMock(return_value=False)
         conduct_events_mock = MagicMock()
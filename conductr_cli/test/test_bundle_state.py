@@ -0,0 +1,61 @@
+from conductr_cli.bundle_state import BundleState
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+import datetime
+
+
+def create_test_event(event_name):
+    sse_mock = MagicMock()
+    sse_mock.event = event_name
+    return sse_mock
+
+
+class TestBundleState(TestCase):
+    args = MagicMock()
+
+    bundle_a = {'bundleId': 'a', 'bundleInstallations': []}
+    bundle_b = {'bundleId': 'b', 'bundleInstallations': [{}]}
+    bundle_b_modified = {'bundleId': 'b', 'bundleInstallations': [{}, {}]}
+
+    def test_seed_once(self):
+        get_bundles_mock = MagicMock(return_value=[self.bundle_a, self.bundle_b])
+
+        with patch('conductr_cli.control_protocol.get_bundles', get_bundles_mock):
+            bundle_state = BundleState(self.args)
+            self.assertEqual(self.bundle_a, bundle_state.get('a'))
+            self.assertEqual(self.bundle_b, bundle_state.get('b'))
+            self.assertIsNone(bundle_state.get('c'))
+
+        get_bundles_mock.assert_called_once_with(self.args)
+
+    def test_apply_events(self):
+        get_bundles_mock = MagicMock(side_effect=[[self.bundle_a, self.bundle_b], [self.bundle_b_modified]])
+
+        with patch('conductr_cli.control_protocol.get_bundles', get_bundles_mock):
+            bundle_state = BundleState(self.args)
+            self.assertEqual(self.bundle_b, bundle_state.get('b'))
+
+            bundle_state.apply(create_test_event(None))
+            self.assertEqual(self.bundle_b, bundle_state.get('b'))
+            self.assertEqual(1, get_bundles_mock.call_count)
+
+            bundle_state.apply(create_test_event('bundleInstallationAdded'))
+            bundle_state.apply(create_test_event('bundleInstallationAdded'))
+            self.assertEqual(self.bundle_b_modified, bundle_state.get('b'))
+            self.assertIsNone(bundle_state.get('a'))
+            self.assertEqual(2, get_bundles_mock.call_count)
+
+    def test_reconcile_interval(self):
+        get_bundles_mock = MagicMock(side_effect=[[self.bundle_b], [self.bundle_b_modified]])
+
+        with patch('conductr_cli.control_protocol.get_bundles', get_bundles_mock):
+            bundle_state = BundleState(self.args, reconcile_interval=5)
+            self.assertEqual(self.bundle_b, bundle_state.get('b'))
+
+            bundle_state.last_reconciled -= datetime.timedelta(seconds=4)
+            self.assertEqual(self.bundle_b, bundle_state.get('b'))
+
+            bundle_state.last_reconciled -= datetime.timedelta(seconds=1)
+            self.assertEqual(self.bundle_b_modified, bundle_state.get('b'))
+
+        self.assertEqual(2, get_bundles_mock.call_count)
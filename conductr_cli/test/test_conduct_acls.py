@@ -24,7 +24,7 @@ class TestConductAclsCommandForHttp(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_acls.acls(input_args)
             self.assertTrue(result)
@@ -45,7 +45,7 @@ class TestConductAclsCommandForHttp(CliTestCase):
         args.update({'long_ids': True})
 
         input_args = MagicMock(**args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_acls.acls(input_args)
             self.assertTrue(result)
@@ -64,7 +64,7 @@ class TestConductAclsCommandForHttp(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_acls.acls(input_args)
             self.assertTrue(result)
@@ -82,7 +82,7 @@ class TestConductAclsCommandForHttp(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_acls.acls(input_args)
             self.assertTrue(result)
@@ -103,7 +103,7 @@ class TestConductAclsCommandForHttp(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_acls.acls(input_args)
             self.assertTrue(result)
@@ -120,7 +120,7 @@ class TestConductAclsCommandForHttp(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_acls.acls(input_args)
             self.assertTrue(result)
@@ -143,7 +143,7 @@ class TestConductAclsCommandForHttp(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_acls.acls(input_args)
             self.assertTrue(result)
@@ -177,7 +177,7 @@ class TestConductAclsCommandForTcp(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_acls.acls(input_args)
             self.assertTrue(result)
@@ -199,7 +199,7 @@ class TestConductAclsCommandForTcp(CliTestCase):
 
         input_args = MagicMock(**args)
 
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_acls.acls(input_args)
             self.assertTrue(result)
@@ -217,7 +217,7 @@ class TestConductAclsCommandForTcp(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_acls.acls(input_args)
             self.assertTrue(result)
@@ -236,7 +236,7 @@ class TestConductAclsCommandForTcp(CliTestCase):
 
         input_args = MagicMock(**self.default_args)
 
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_acls.acls(input_args)
             self.assertTrue(result)
@@ -256,7 +256,7 @@ class TestConductAclsCommandForTcp(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_acls.acls(input_args)
             self.assertTrue(result)
@@ -273,7 +273,7 @@ class TestConductAclsCommandForTcp(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_acls.acls(input_args)
             self.assertTrue(result)
@@ -297,7 +297,7 @@ class TestConductAclsCommandForTcp(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_acls.acls(input_args)
             self.assertTrue(result)
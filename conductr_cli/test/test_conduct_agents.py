@@ -205,7 +205,7 @@ class TestConductAgentsCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_agents.agents(input_args)
             self.assertTrue(result)
@@ -229,7 +229,7 @@ class TestConductAgentsCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_agents.agents(input_args)
             self.assertTrue(result)
@@ -253,7 +253,7 @@ class TestConductAgentsCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_agents.agents(input_args)
             self.assertTrue(result)
@@ -279,7 +279,7 @@ class TestConductAgentsCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**filtered_by_role_asdf_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_agents.agents(input_args)
             self.assertTrue(result)
@@ -302,7 +302,7 @@ class TestConductAgentsCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**filtered_by_role_web_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_agents.agents(input_args)
             self.assertTrue(result)
@@ -328,7 +328,7 @@ class TestConductAgentsCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**filtered_by_role_web_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_agents.agents(input_args)
             self.assertTrue(result)
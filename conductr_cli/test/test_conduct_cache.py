@@ -0,0 +1,102 @@
+from conductr_cli.test.cli_test_case import CliTestCase, as_warn, strip_margin
+from conductr_cli import bundle_cache, conduct_cache, docker_blob_cache, logging_setup
+from unittest.mock import MagicMock
+import hashlib
+import os
+import shutil
+import tempfile
+
+
+class TestConductCacheCommand(CliTestCase):
+    def setUp(self):  # noqa
+        self.bundle_cache_dir = tempfile.mkdtemp()
+        self.configuration_cache_dir = tempfile.mkdtemp()
+
+        self.default_args = {
+            'verbose': False,
+            'quiet': False,
+            'long_ids': False,
+            'bundle_resolve_cache_dir': self.bundle_cache_dir,
+            'configuration_resolve_cache_dir': self.configuration_cache_dir
+        }
+
+    def tearDown(self):  # noqa
+        shutil.rmtree(self.bundle_cache_dir)
+        shutil.rmtree(self.configuration_cache_dir)
+
+    def add(self, cache_dir, file_name, contents):
+        path = os.path.join(cache_dir, file_name)
+        with open(path, 'wb') as file:
+            file.write(contents)
+
+        cache = bundle_cache.BundleCache(cache_dir)
+        return cache.add(path, file_name, 'http://site/{}'.format(file_name))
+
+    def test_ls(self):
+        self.add(self.bundle_cache_dir, 'visualizer-v2.zip', b'a' * 1500)
+        self.add(self.configuration_cache_dir, 'visualizer-config.zip', b'b' * 10)
+        digest_a = hashlib.sha256(b'a' * 1500).hexdigest()
+        digest_b = hashlib.sha256(b'b' * 10).hexdigest()
+
+        stdout = MagicMock()
+        input_args = MagicMock(**self.default_args)
+        logging_setup.configure_logging(input_args, stdout)
+        self.assertTrue(conduct_cache.cache_ls(input_args))
+
+        self.assertEqual(
+            strip_margin("""|CACHE          NAME               TAGS  DIGEST       SIZE  LAST USED
+                            |bundle         visualizer-v2            {}    1.5 kB  just now
+                            |configuration  visualizer-config        {}  10 Bytes  just now
+                            |""".format(digest_a[:7], digest_b[:7])),
+            self.output(stdout))
+
+    def test_prune(self):
+        self.add(self.bundle_cache_dir, 'a.zip', b'a' * 10)
+        self.add(self.bundle_cache_dir, 'b.zip', b'b' * 10)
+        with open(os.path.join(self.bundle_cache_dir, 'c.zip.tmp'), 'wb') as file:
+            file.write(b'c' * 10)
+        os.utime(os.path.join(self.bundle_cache_dir, 'c.zip.tmp'), (1, 1))
+
+        stdout = MagicMock()
+        input_args = MagicMock(**dict(self.default_args, max_size=0, all=True))
+        logging_setup.configure_logging(input_args, stdout)
+        self.assertTrue(conduct_cache.cache_prune(input_args))
+
+        self.assertEqual([bundle_cache.INDEX_FILE_NAME], os.listdir(self.bundle_cache_dir))
+        self.assertEqual(
+            strip_margin("""|Removed 3 files of the bundle cache, freeing 30 Bytes
+                            |Removed 0 files of the configuration cache, freeing 0 Bytes
+                            |"""),
+            self.output(stdout))
+
+    def test_verify(self):
+        self.add(self.bundle_cache_dir, 'a.zip', b'a' * 10)
+        corrupted_path = self.add(self.configuration_cache_dir, 'b.zip', b'b' * 10)
+        with open(corrupted_path, 'wb') as file:
+            file.write(b'corrupted')
+
+        stdout = MagicMock()
+        input_args = MagicMock(**self.default_args)
+        logging_setup.configure_logging(input_args, stdout)
+        self.assertFalse(conduct_cache.cache_verify(input_args))
+
+        self.assertEqual(
+            as_warn(strip_margin("""|Verified 1 files of the bundle cache
+                                    |Warning: Removed b.zip from the configuration cache: its file is missing or does not match its digest {}
+                                    |""".format(hashlib.sha256(b'b' * 10).hexdigest()))),
+            self.output(stdout))
+
+    def test_gc(self):
+        blob_cache = docker_blob_cache.DockerBlobCache(self.bundle_cache_dir)
+        fd, temp_path = blob_cache.create_temp_file('sha256:unreferenced')
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(b'a' * 10)
+        blob_cache.add_blob('sha256:unreferenced', temp_path)
+
+        stdout = MagicMock()
+        input_args = MagicMock(**dict(self.default_args, max_size=1024))
+        logging_setup.configure_logging(input_args, stdout)
+        self.assertTrue(conduct_cache.cache_gc(input_args))
+
+        self.assertEqual([], os.listdir(blob_cache.blobs_dir))
+        self.assertEqual('Removed 1 files of the Docker cache, freeing 10 Bytes\n', self.output(stdout))
@@ -1,7 +1,8 @@
 from conductr_cli.test.cli_test_case import CliTestCase, strip_margin
 from conductr_cli import conduct_events, logging_setup
 from conductr_cli.http import DEFAULT_HTTP_TIMEOUT
-from unittest.mock import patch, MagicMock
+from conductr_cli.sse_client import Event
+from unittest.mock import call, patch, MagicMock
 
 
 class TestConductEventsCommand(CliTestCase):
@@ -35,7 +36,7 @@ class TestConductEventsCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method), \
+        with patch('requests.Session.get', http_method), \
                 patch('urllib.parse.quote', quote_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_events.events(input_args)
@@ -66,7 +67,7 @@ class TestConductEventsCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method), \
+        with patch('requests.Session.get', http_method), \
                 patch('urllib.parse.quote', quote_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_events.events(input_args)
@@ -87,7 +88,7 @@ class TestConductEventsCommand(CliTestCase):
         stderr = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method), \
+        with patch('requests.Session.get', http_method), \
                 patch('urllib.parse.quote', quote_method):
             logging_setup.configure_logging(input_args, err_output=stderr)
             result = conduct_events.events(input_args)
@@ -112,7 +113,7 @@ class TestConductEventsCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**args)
-        with patch('requests.get', http_method), \
+        with patch('requests.Session.get', http_method), \
                 patch('urllib.parse.quote', quote_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_events.events(input_args)
@@ -124,3 +125,65 @@ class TestConductEventsCommand(CliTestCase):
             strip_margin("""|TIME  EVENT  DESC
                             |"""),
             self.output(stdout))
+
+    def test_output_ndjson(self):
+        http_method = self.respond_with(text='')
+        http_method.return_value.iter_content.return_value = [
+            b'[{"timestamp":"2015-08-24T01:16:22.327Z","event":"conductr.loadScheduler.loadBundleRequested",',
+            b'"description":"Load bundle requested"},',
+            b'{"timestamp":"2015-08-24T01:16:25.327Z","event":"conductr.loadExecutor.bundleWritten",'
+            b'"description":"Bundle written"}]'
+        ]
+        quote_method = MagicMock(return_value=self.bundle_id_urlencoded)
+        stdout_mock = MagicMock()
+
+        args = dict(self.default_args, output_format='ndjson', gzip=False)
+        input_args = MagicMock(**args)
+        with patch('requests.Session.get', http_method), \
+                patch('urllib.parse.quote', quote_method), \
+                patch('sys.stdout.buffer.write', stdout_mock):
+            self.assertTrue(conduct_events.events(input_args))
+
+        http_method.assert_called_with(self.default_url, auth=self.conductr_auth, verify=self.server_verification_file,
+                                       timeout=DEFAULT_HTTP_TIMEOUT, headers={'Host': '127.0.0.1'}, stream=True)
+        self.assertEqual(
+            strip_margin("""|{"timestamp": "2015-08-24T01:16:22.327Z", "event": "conductr.loadScheduler.loadBundleRequested", "description": "Load bundle requested"}
+                            |{"timestamp": "2015-08-24T01:16:25.327Z", "event": "conductr.loadExecutor.bundleWritten", "description": "Bundle written"}
+                            |"""),
+            b''.join(write_args[0] for write_args, _ in stdout_mock.call_args_list).decode('utf-8'))
+
+    def test_follow(self):
+        def bundle_event(second, event):
+            return {'timestamp': '2015-08-24T01:16:0{}.327Z'.format(second), 'event': event, 'description': event}
+
+        get_bundle_events_mock = MagicMock(side_effect=[
+            [bundle_event(1, 'loadBundleRequested')],
+            [bundle_event(1, 'loadBundleRequested'), bundle_event(2, 'bundleWritten')],
+            [bundle_event(2, 'bundleWritten'), bundle_event(3, 'bundleExecutionAdded')]
+        ])
+        get_events_mock = MagicMock(return_value=[
+            Event(None, None),
+            Event('bundleInstallationAdded', ''),
+            Event(None, None),
+            Event('bundleExecutionAdded', '')
+        ])
+        stdout = MagicMock()
+
+        args = dict(self.default_args, follow=True, dcos_mode=False)
+        input_args = MagicMock(**args)
+        with patch('conductr_cli.control_protocol.get_bundle_events', get_bundle_events_mock), \
+                patch('conductr_cli.sse_client.get_events', get_events_mock):
+            logging_setup.configure_logging(input_args, stdout)
+            self.assertTrue(conduct_events.events(input_args))
+
+        get_events_mock.assert_called_once_with(False, '127.0.0.1', 'http://127.0.0.1:9005/bundles/events',
+                                                auth=self.conductr_auth, verify=self.server_verification_file)
+        # Heartbeats do not cause the events of the bundle to be requested
+        self.assertEqual([call(input_args, 1), call(input_args, 1), call(input_args, 1)],
+                         get_bundle_events_mock.call_args_list)
+        self.assertEqual(
+            strip_margin("""|Mon 2015-08-24T01:16:01Z loadBundleRequested loadBundleRequested
+                            |Mon 2015-08-24T01:16:02Z bundleWritten bundleWritten
+                            |Mon 2015-08-24T01:16:03Z bundleExecutionAdded bundleExecutionAdded
+                            |"""),
+            self.output(stdout))
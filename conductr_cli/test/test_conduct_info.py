@@ -4,6 +4,7 @@ from conductr_cli.test.cli_test_case import CliTestCase, as_error, strip_margin,
 from conductr_cli import conduct_info, logging_setup
 from unittest.mock import patch, MagicMock
 import arrow
+import threading
 
 
 class TestConductInfoShowAllBundlesCommand(CliTestCase):
@@ -43,6 +44,31 @@ class TestConductInfoShowAllBundlesCommand(CliTestCase):
         'isLicensed': False
     }
 
+    def test_bundles_and_license_requested_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get_bundles(args):
+            # Both requests must be in flight at the same time to get past the barrier.
+            barrier.wait()
+            return []
+
+        def get_license(args):
+            barrier.wait()
+            return False, None
+
+        stdout = MagicMock()
+
+        input_args = MagicMock(**self.default_args)
+        with patch('conductr_cli.control_protocol.get_bundles', get_bundles), \
+                patch('conductr_cli.license.get_license', get_license):
+            logging_setup.configure_logging(input_args, stdout)
+            result = conduct_info.info(input_args)
+            self.assertTrue(result)
+
+        self.assertEqual(strip_margin("""|ID  NAME  TAG  #REP  #STR  #RUN  ROLES
+                                         |"""),
+                         self.output(stdout))
+
     def test_no_bundles(self):
         mock_get_license = MagicMock(return_value=(True, self.license))
         bundles_mock = MagicMock()
@@ -333,7 +359,7 @@ class TestConductInfoShowAllBundlesCommand(CliTestCase):
         args.update({'verbose': True})
         input_args = MagicMock(**args)
 
-        with patch('requests.get', http_method), \
+        with patch('requests.Session.get', http_method), \
                 patch('conductr_cli.license.get_license', mock_get_license):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_info.info(input_args)
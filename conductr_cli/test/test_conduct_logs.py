@@ -1,4 +1,4 @@
-from conductr_cli.test.cli_test_case import as_warn, CliTestCase, strip_margin
+from conductr_cli.test.cli_test_case import CliTestCase, as_error, as_warn, strip_margin
 from conductr_cli import conduct_logs, logging_setup
 from conductr_cli.constants import LOGS_POLL_PERIOD_SECONDS
 from conductr_cli.http import DEFAULT_HTTP_TIMEOUT
@@ -37,7 +37,7 @@ class TestConductLogsCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method), \
+        with patch('requests.Session.get', http_method), \
                 patch('urllib.parse.quote', quote_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_logs.logs(input_args)
@@ -68,7 +68,7 @@ class TestConductLogsCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method), \
+        with patch('requests.Session.get', http_method), \
                 patch('urllib.parse.quote', quote_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_logs.logs(input_args)
@@ -89,7 +89,7 @@ class TestConductLogsCommand(CliTestCase):
         stderr = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method), \
+        with patch('requests.Session.get', http_method), \
                 patch('urllib.parse.quote', quote_method):
             logging_setup.configure_logging(input_args, err_output=stderr)
             result = conduct_logs.logs(input_args)
@@ -114,7 +114,7 @@ class TestConductLogsCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**args)
-        with patch('requests.get', http_method), \
+        with patch('requests.Session.get', http_method), \
                 patch('urllib.parse.quote', quote_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_logs.logs(input_args)
@@ -127,13 +127,30 @@ class TestConductLogsCommand(CliTestCase):
                             |"""),
             self.output(stdout))
 
-    def test_new_lines(self):
-        self.assertEqual(conduct_logs.new_lines([], ['hello']), (['hello'], False))
-        self.assertEqual(conduct_logs.new_lines(['hello'], []), ([], False))
-        self.assertEqual(conduct_logs.new_lines(['hello'], ['hello']), ([], False))
-        self.assertEqual(conduct_logs.new_lines(['good bye'], ['hello']), (['hello'], True))
-        self.assertEqual(conduct_logs.new_lines(['one', 'two', 'three', 'four'], ['two', 'three', 'four', 'five', 'six']), (['five', 'six'], False))
-        self.assertEqual(conduct_logs.new_lines(['dup', 'dup'], ['dup', 'dup']), ([], False))
+    def test_output_tsv(self):
+        http_method = self.respond_with(text='')
+        http_method.return_value.iter_content.return_value = [
+            b'[{"timestamp":"2015-08-24T01:16:22.327Z","host":"10.0.1.232","message":"Association',
+            b' with remote system has failed."},{"timestamp":"2015-08-24T01:16:25.327Z","host":"10.0.1.232",',
+            b'"message":"Association\\twith remote system has failed.\\n"}]'
+        ]
+        quote_method = MagicMock(return_value=self.bundle_id_urlencoded)
+        stdout_mock = MagicMock()
+
+        args = dict(self.default_args, output_format='tsv', gzip=False)
+        input_args = MagicMock(**args)
+        with patch('requests.Session.get', http_method), \
+                patch('urllib.parse.quote', quote_method), \
+                patch('sys.stdout.buffer.write', stdout_mock):
+            self.assertTrue(conduct_logs.logs(input_args))
+
+        http_method.assert_called_with(self.default_url, auth=self.conductr_auth, verify=self.server_verification_file,
+                                       timeout=DEFAULT_HTTP_TIMEOUT, headers={'Host': '127.0.0.1'}, stream=True)
+        self.assertEqual(
+            'timestamp\thost\tmessage\n'
+            '2015-08-24T01:16:22.327Z\t10.0.1.232\tAssociation with remote system has failed.\n'
+            '2015-08-24T01:16:25.327Z\t10.0.1.232\tAssociation\\twith remote system has failed.\\n\n',
+            b''.join(write_args[0] for write_args, _ in stdout_mock.call_args_list).decode('utf-8'))
 
     def test_follow(self):
         args = {}
@@ -142,16 +159,16 @@ class TestConductLogsCommand(CliTestCase):
         input_args = MagicMock(**args)
         fetch_log_data_mock = MagicMock(side_effect=[
             [
-                {'time': 1, 'host': 'one', 'log': 'test one'}
+                {'timestamp': 1, 'time': 1, 'host': 'one', 'log': 'test one'}
             ],
             [
-                {'time': 1, 'host': 'one', 'log': 'test one'},
-                {'time': 2, 'host': 'two', 'log': 'test two'}
+                {'timestamp': 1, 'time': 1, 'host': 'one', 'log': 'test one'},
+                {'timestamp': 2, 'time': 2, 'host': 'two', 'log': 'test two'}
             ],
             [
-                {'time': 2, 'host': 'two', 'log': 'test two'},
-                {'time': 3, 'host': 'three', 'log': 'test three'},
-                {'time': 4, 'host': 'four', 'log': 'test four'}
+                {'timestamp': 2, 'time': 2, 'host': 'two', 'log': 'test two'},
+                {'timestamp': 3, 'time': 3, 'host': 'three', 'log': 'test three'},
+                {'timestamp': 4, 'time': 4, 'host': 'four', 'log': 'test four'}
             ],
             []
         ])
@@ -167,8 +184,9 @@ class TestConductLogsCommand(CliTestCase):
 
         self.assertEqual(
             time_sleep_mock.call_args_list,
-            [call(LOGS_POLL_PERIOD_SECONDS), call(LOGS_POLL_PERIOD_SECONDS), call(LOGS_POLL_PERIOD_SECONDS)]
+            [call(LOGS_POLL_PERIOD_SECONDS), call(LOGS_POLL_PERIOD_SECONDS / 2), call(LOGS_POLL_PERIOD_SECONDS / 4)]
         )
+        self.assertEqual(fetch_log_data_mock.call_args_list, [call(input_args, 1), call(input_args, 1), call(input_args, 1)])
 
         self.assertEqual(
             strip_margin("""|1 one test one
@@ -187,16 +205,16 @@ class TestConductLogsCommand(CliTestCase):
         input_args = MagicMock(**args)
         fetch_log_data_mock = MagicMock(side_effect=[
             [
-                {'time': 1, 'host': 'one', 'log': 'test one'}
+                {'timestamp': 1, 'time': 1, 'host': 'one', 'log': 'test one'}
             ],
             [
-                {'time': 1, 'host': 'one', 'log': 'test one'},
-                {'time': 2, 'host': 'two', 'log': 'test two'}
+                {'timestamp': 1, 'time': 1, 'host': 'one', 'log': 'test one'},
+                {'timestamp': 2, 'time': 2, 'host': 'two', 'log': 'test two'}
             ],
             [
-                {'time': 2, 'host': 'two', 'log': 'test two'},
-                {'time': 3, 'host': 'three', 'log': 'test three'},
-                {'time': 4, 'host': 'four', 'log': 'test four'}
+                {'timestamp': 2, 'time': 2, 'host': 'two', 'log': 'test two'},
+                {'timestamp': 3, 'time': 3, 'host': 'three', 'log': 'test three'},
+                {'timestamp': 4, 'time': 4, 'host': 'four', 'log': 'test four'}
             ],
             []
         ])
@@ -212,7 +230,7 @@ class TestConductLogsCommand(CliTestCase):
 
         self.assertEqual(
             time_sleep_mock.call_args_list,
-            [call(poll_period), call(poll_period), call(poll_period)]
+            [call(poll_period), call(poll_period / 2), call(poll_period / 4)]
         )
 
         self.assertEqual(
@@ -223,22 +241,22 @@ class TestConductLogsCommand(CliTestCase):
                             |"""),
             self.output(stdout))
 
-    def test_follow_truncated(self):
+    def test_follow_lines_missed(self):
         args = {}
         args.update(self.default_args)
         args.update({'follow': True})
         input_args = MagicMock(**args)
         fetch_log_data_mock = MagicMock(side_effect=[
             [
-                {'time': 1, 'host': 'one', 'log': 'test one'}
+                {'timestamp': 1, 'time': 1, 'host': 'one', 'log': 'test one'}
             ],
             [
-                {'time': 2, 'host': 'two', 'log': 'test two'}
+                {'timestamp': 2, 'time': 2, 'host': 'two', 'log': 'test two'}
             ],
             [
-                {'time': 2, 'host': 'two', 'log': 'test two'},
-                {'time': 3, 'host': 'three', 'log': 'test three'},
-                {'time': 4, 'host': 'four', 'log': 'test four'}
+                {'timestamp': 2, 'time': 2, 'host': 'two', 'log': 'test two'},
+                {'timestamp': 3, 'time': 3, 'host': 'three', 'log': 'test three'},
+                {'timestamp': 4, 'time': 4, 'host': 'four', 'log': 'test four'}
             ],
             []
         ])
@@ -254,14 +272,244 @@ class TestConductLogsCommand(CliTestCase):
 
         self.assertEqual(
             time_sleep_mock.call_args_list,
-            [call(LOGS_POLL_PERIOD_SECONDS), call(LOGS_POLL_PERIOD_SECONDS), call(LOGS_POLL_PERIOD_SECONDS)]
+            [call(LOGS_POLL_PERIOD_SECONDS), call(LOGS_POLL_PERIOD_SECONDS / 2), call(LOGS_POLL_PERIOD_SECONDS / 4)]
         )
+        # More lines are requested once lines may have been missed.
+        self.assertEqual(fetch_log_data_mock.call_args_list, [call(input_args, 1), call(input_args, 1), call(input_args, 2)])
 
         self.assertEqual(
-            strip_margin("""|1 one test one
-                            |{}
-                            |2 two test two
-                            |3 three test three
-                            |4 four test four
-                            |""".format(as_warn('Warning: Unable to reconcile logs; some lines may not be shown'))),
+            as_warn(strip_margin("""|1 one test one
+                                    |Warning: Unable to reconcile logs; some lines may not be shown
+                                    |2 two test two
+                                    |3 three test three
+                                    |4 four test four
+                                    |""")),
             self.output(stdout))
+
+
+class TestConductLogsMultipleBundles(CliTestCase):
+
+    bundles = [
+        {'bundleId': 'a101', 'attributes': {'bundleName': 'visualizer', 'roles': ['web']}},
+        {'bundleId': 'b202', 'attributes': {'bundleName': 'eslite', 'roles': ['elasticsearch']}},
+        {'bundleId': 'c303', 'attributes': {'bundleName': 'frontend', 'roles': ['web']}}
+    ]
+
+    default_args = {
+        'dcos_mode': False,
+        'scheme': 'http',
+        'host': '127.0.0.1',
+        'port': '9005',
+        'base_path': '/',
+        'api_version': '1',
+        'bundle': 'visualizer',
+        'additional_bundles': ['eslite'],
+        'role': None,
+        'system': None,
+        'lines': 2,
+        'utc': True,
+        'follow': False
+    }
+
+    def row(self, timestamp, host, log):
+        return {'timestamp': timestamp, 'time': timestamp, 'host': host, 'log': log}
+
+    def fetch_log_data(self, logs_by_bundle):
+        # The logs of the bundles are fetched concurrently, so the responses are chosen by bundle rather than by order.
+        calls = []
+
+        def fetch(args, count=None):
+            calls.append((args.bundle, count))
+            return logs_by_bundle[args.bundle].pop(0)
+
+        return fetch, calls
+
+    def test_merged_by_time(self):
+        fetch, calls = self.fetch_log_data({
+            'visualizer': [[self.row(1, '10.0.0.1', 'started'), self.row(4, '10.0.0.1', 'serving')]],
+            'eslite': [[self.row(2, '10.0.0.2', 'index created'), self.row(3, '10.0.0.2', 'green')]]
+        })
+        stdout = MagicMock()
+
+        input_args = MagicMock(**self.default_args)
+        with patch('conductr_cli.control_protocol.get_bundles', return_value=self.bundles), \
+                patch('conductr_cli.conduct_logs.fetch_log_data', fetch):
+            logging_setup.configure_logging(input_args, stdout)
+            self.assertTrue(conduct_logs.logs(input_args))
+
+        self.assertEqual(sorted(calls), [('eslite', 2), ('visualizer', 2)])
+        self.assertEqual(
+            strip_margin("""|TIME  BUNDLE      HOST      LOG
+                            |1     visualizer  10.0.0.1  started
+                            |2     eslite      10.0.0.2  index created
+                            |3     eslite      10.0.0.2  green
+                            |4     visualizer  10.0.0.1  serving
+                            |"""),
+            self.output(stdout))
+
+    def test_role(self):
+        fetch, calls = self.fetch_log_data({
+            'a101': [[self.row(2, '10.0.0.1', 'visualizer started')]],
+            'c303': [[self.row(1, '10.0.0.3', 'frontend started')]]
+        })
+        stdout = MagicMock()
+
+        args = dict(self.default_args, bundle=None, additional_bundles=[], role='web')
+        input_args = MagicMock(**args)
+        with patch('conductr_cli.control_protocol.get_bundles', return_value=self.bundles), \
+                patch('conductr_cli.conduct_logs.fetch_log_data', fetch):
+            logging_setup.configure_logging(input_args, stdout)
+            self.assertTrue(conduct_logs.logs(input_args))
+
+        self.assertEqual(
+            strip_margin("""|TIME  BUNDLE      HOST      LOG
+                            |1     frontend    10.0.0.3  frontend started
+                            |2     visualizer  10.0.0.1  visualizer started
+                            |"""),
+            self.output(stdout))
+
+    def test_no_bundles(self):
+        stderr = MagicMock()
+
+        args = dict(self.default_args, bundle=None, additional_bundles=[], role='backend')
+        input_args = MagicMock(**args)
+        with patch('conductr_cli.control_protocol.get_bundles', return_value=self.bundles):
+            logging_setup.configure_logging(input_args, err_output=stderr)
+            self.assertFalse(conduct_logs.logs(input_args))
+
+        self.assertEqual(
+            as_error(strip_margin("""|Error: No bundles to show the logs of. Specify the bundles, or select them with --role or --system
+                                     |""")),
+            self.output(stderr))
+
+    def test_follow(self):
+        fetch, calls = self.fetch_log_data({
+            'visualizer': [
+                [self.row(1, '10.0.0.1', 'started')],
+                [self.row(1, '10.0.0.1', 'started'), self.row(4, '10.0.0.1', 'serving')]
+            ],
+            'eslite': [
+                [self.row(2, '10.0.0.2', 'index created')],
+                [self.row(2, '10.0.0.2', 'index created'), self.row(3, '10.0.0.2', 'green')]
+            ]
+        })
+        time_sleep_mock = MagicMock()
+        stdout = MagicMock()
+
+        args = dict(self.default_args, follow=True, follow_poll_period=1.0)
+        input_args = MagicMock(**args)
+        with patch('conductr_cli.control_protocol.get_bundles', return_value=self.bundles), \
+                patch('conductr_cli.conduct_logs.fetch_log_data', fetch), \
+                patch('itertools.count', lambda: [0, 1]), \
+                patch('time.sleep', time_sleep_mock):
+            logging_setup.configure_logging(input_args, stdout)
+            self.assertTrue(conduct_logs.logs(input_args))
+
+        self.assertEqual(time_sleep_mock.call_args_list, [call(1.0), call(1.0)])
+        self.assertEqual(
+            strip_margin("""|1 visualizer 10.0.0.1 started
+                            |2 eslite 10.0.0.2 index created
+                            |3 eslite 10.0.0.2 green
+                            |4 visualizer 10.0.0.1 serving
+                            |"""),
+            self.output(stdout))
+
+    def test_follow_output_ndjson(self):
+        fetch, calls = self.fetch_log_data({
+            'visualizer': [[self.row(1, '10.0.0.1', 'started')], [self.row(3, '10.0.0.1', 'serving')]],
+            'eslite': [[self.row(2, '10.0.0.2', 'green')], False]
+        })
+        stdout_mock = MagicMock()
+
+        args = dict(self.default_args, follow=True, follow_poll_period=1.0, output_format='ndjson', gzip=False)
+        input_args = MagicMock(**args)
+        with patch('conductr_cli.control_protocol.get_bundles', return_value=self.bundles), \
+                patch('conductr_cli.conduct_logs.fetch_log_data', fetch), \
+                patch('itertools.count', lambda: [0, 1]), \
+                patch('time.sleep'), \
+                patch('sys.stdout.buffer.write', stdout_mock):
+            self.assertTrue(conduct_logs.logs(input_args))
+
+        self.assertEqual(
+            strip_margin("""|{"timestamp": 1, "host": "10.0.0.1", "message": "started", "bundle": "visualizer"}
+                            |{"timestamp": 2, "host": "10.0.0.2", "message": "green", "bundle": "eslite"}
+                            |{"timestamp": 3, "host": "10.0.0.1", "message": "serving", "bundle": "visualizer"}
+                            |"""),
+            b''.join(write_args[0] for write_args, _ in stdout_mock.call_args_list).decode('utf-8'))
+
+    def test_bundle_names(self):
+        bundles = self.bundles + [{'bundleId': 'd404', 'attributes': {'bundleName': 'visualizer'}}]
+
+        self.assertEqual(['visualizer:a101', 'eslite', 'visualizer:d404', 'e505'],
+                         conduct_logs.bundle_names(bundles, ['a101', 'eslite', 'd404', 'e505']))
+
+    def test_merge_log_data(self):
+        self.assertEqual(
+            [
+                dict(self.row(1, 'a', 'one'), bundle='first'),
+                dict(self.row(1, 'b', 'one'), bundle='second'),
+                dict(self.row(2, 'a', 'two'), bundle='first'),
+                dict(self.row(3, 'c', 'three'), bundle='third')
+            ],
+            conduct_logs.merge_log_data(['first', 'second', 'third'], [
+                [self.row(1, 'a', 'one'), self.row(2, 'a', 'two')],
+                [self.row(1, 'b', 'one')],
+                [self.row(3, 'c', 'three')]
+            ]))
+
+
+class TestLogFollower(CliTestCase):
+    def row(self, timestamp, log):
+        return {'timestamp': timestamp, 'time': timestamp, 'host': 'host', 'log': log}
+
+    def test_new_lines(self):
+        follower = conduct_logs.LogFollower(3, 1.0)
+
+        self.assertEqual([self.row(1, 'one'), self.row(2, 'two')],
+                         follower.new_lines([self.row(1, 'one'), self.row(2, 'two')]))
+        self.assertEqual([], follower.new_lines([self.row(1, 'one'), self.row(2, 'two')]))
+        self.assertEqual([self.row(2, 'two again'), self.row(3, 'three')],
+                         follower.new_lines([self.row(2, 'two'), self.row(2, 'two again'), self.row(3, 'three')]))
+
+    def test_repeated_lines(self):
+        follower = conduct_logs.LogFollower(3, 1.0)
+
+        self.assertEqual([self.row(1, 'retry'), self.row(1, 'retry')],
+                         follower.new_lines([self.row(1, 'retry'), self.row(1, 'retry')]))
+        self.assertEqual([self.row(1, 'retry')],
+                         follower.new_lines([self.row(1, 'retry'), self.row(1, 'retry'), self.row(1, 'retry')]))
+
+    def test_ignore_lines_older_than_cursor(self):
+        follower = conduct_logs.LogFollower(3, 1.0)
+
+        follower.new_lines([self.row(5, 'five')])
+        self.assertEqual([self.row(6, 'six')], follower.new_lines([self.row(4, 'four'), self.row(6, 'six')]))
+
+    def test_bounded_cursor(self):
+        follower = conduct_logs.LogFollower(1, 1.0)
+        follower.max_seen = 2
+
+        follower.new_lines([self.row(1, 'one'), self.row(2, 'two'), self.row(3, 'three')])
+
+        self.assertEqual(2, len(follower.seen))
+        self.assertEqual(2, follower.oldest_timestamp)
+
+    def test_adapt_to_line_rate(self):
+        follower = conduct_logs.LogFollower(2, 1.0)
+        follower.new_lines([self.row(1, 'one')])
+        self.assertEqual((2, 1.0), (follower.count, follower.poll_period))
+
+        # None of the lines have been seen before, so lines may have been missed
+        follower.new_lines([self.row(2, 'two'), self.row(3, 'three')])
+        self.assertEqual((4, 0.5), (follower.count, follower.poll_period))
+
+        # More than half of the lines requested are new
+        follower.new_lines([self.row(3, 'three'), self.row(4, 'four'), self.row(5, 'five'), self.row(6, 'six')])
+        self.assertEqual((4, 0.25), (follower.count, follower.poll_period))
+
+        # No new lines
+        follower.new_lines([self.row(5, 'five'), self.row(6, 'six')])
+        self.assertEqual((2, 0.5), (follower.count, follower.poll_period))
+        follower.new_lines([self.row(5, 'five'), self.row(6, 'six')])
+        follower.new_lines([self.row(5, 'five'), self.row(6, 'six')])
+        self.assertEqual((2, 1.0), (follower.count, follower.poll_period))
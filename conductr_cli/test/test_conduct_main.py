@@ -184,6 +184,85 @@ class TestConduct(TestCase):
         self.assertEqual(args.utc, False)
         self.assertEqual(args.follow, False)
 
+    def test_parser_wait(self):
+        args = self.parser.parse_args('wait --wait-timeout 120 visualizer:2 eslite:installed'.split())
+
+        self.assertEqual(args.func.__name__, 'wait')
+        self.assertEqual(args.wait_timeout, 120)
+        self.assertEqual(['visualizer:2', 'eslite:installed'], [str(condition) for condition in args.conditions])
+        # These args are for displaying bundle events and logs when error occurs during scale.
+        self.assertEqual(args.lines, 10)
+        self.assertEqual(args.utc, False)
+        self.assertEqual(args.follow, False)
+
+    def test_parser_run_batch(self):
+        args = self.parser.parse_args('run --scale 2 --role web visualizer eslite'.split())
+
+        self.assertEqual(args.func.__name__, 'run')
+        self.assertEqual(args.bundle, 'visualizer')
+        self.assertEqual(args.additional_bundles, ['eslite'])
+        self.assertEqual(args.role, 'web')
+        self.assertEqual(args.system, None)
+
+    def test_parser_unload_selector(self):
+        args = self.parser.parse_args('unload --system monitoring'.split())
+
+        self.assertEqual(args.func.__name__, 'unload')
+        self.assertEqual(args.bundle, None)
+        self.assertEqual(args.additional_bundles, [])
+        self.assertEqual(args.system, 'monitoring')
+
+    def test_parser_logs_multiple_bundles(self):
+        args = self.parser.parse_args('logs --follow visualizer eslite'.split())
+
+        self.assertEqual(args.func.__name__, 'logs')
+        self.assertEqual(args.follow, True)
+        self.assertEqual(args.bundle, 'visualizer')
+        self.assertEqual(args.additional_bundles, ['eslite'])
+        self.assertEqual(args.role, None)
+        self.assertEqual(args.system, None)
+
+    def test_parser_logs_output(self):
+        args = self.parser.parse_args('logs --output ndjson --gzip -n 100000 visualizer'.split())
+
+        self.assertEqual(args.func.__name__, 'logs')
+        self.assertEqual(args.output_format, 'ndjson')
+        self.assertEqual(args.gzip, True)
+        self.assertEqual(args.lines, 100000)
+
+    def test_parser_events_follow(self):
+        args = self.parser.parse_args('events -f visualizer'.split())
+
+        self.assertEqual(args.func.__name__, 'events')
+        self.assertEqual(args.follow, True)
+        self.assertEqual(args.bundle, 'visualizer')
+
+    def test_parser_cache_ls(self):
+        args = self.parser.parse_args('cache ls --bundle-resolve-cache-dir /bundle-cache-dir'.split())
+
+        self.assertEqual(args.func.__name__, 'cache_ls')
+        self.assertEqual(args.bundle_resolve_cache_dir, '/bundle-cache-dir')
+        self.assertEqual(args.long_ids, False)
+
+    def test_parser_cache_prune(self):
+        args = self.parser.parse_args('cache prune --max-size 512'.split())
+
+        self.assertEqual(args.func.__name__, 'cache_prune')
+        self.assertEqual(args.max_size, 512)
+        self.assertEqual(args.all, False)
+
+    def test_parser_cache_verify(self):
+        args = self.parser.parse_args('cache verify -v'.split())
+
+        self.assertEqual(args.func.__name__, 'cache_verify')
+        self.assertEqual(args.verbose, True)
+
+    def test_parser_cache_gc(self):
+        args = self.parser.parse_args('cache gc --max-size 1024'.split())
+
+        self.assertEqual(args.func.__name__, 'cache_gc')
+        self.assertEqual(args.max_size, 1024)
+
     def test_parser_stop(self):
         args = self.parser.parse_args('stop path-to-bundle'.split())
 
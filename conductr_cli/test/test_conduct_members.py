@@ -75,7 +75,7 @@ class TestConductMembersCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**self.default_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_members.members(input_args)
             self.assertTrue(result)
@@ -103,7 +103,7 @@ class TestConductMembersCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**filtered_by_role_asdf_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_members.members(input_args)
             self.assertTrue(result)
@@ -128,7 +128,7 @@ class TestConductMembersCommand(CliTestCase):
         stdout = MagicMock()
 
         input_args = MagicMock(**filtered_by_role_replicator_args)
-        with patch('requests.get', http_method):
+        with patch('requests.Session.get', http_method):
             logging_setup.configure_logging(input_args, stdout)
             result = conduct_members.members(input_args)
             self.assertTrue(result)
@@ -1,6 +1,8 @@
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
 from conductr_cli import conduct_request
+from dcos.errors import DCOSConnectionError, DCOSException, DCOSHTTPException
+import requests
 
 
 class TestRequest(TestCase):
@@ -20,8 +22,8 @@ class TestRequest(TestCase):
         requests_http_mock = MagicMock(return_value=requests_http_response)
 
         with patch('conductr_cli.conduct_request.enrich_args', enrich_args_mock), \
-                patch('dcos.http.get', dcos_http_mock), \
-                patch('requests.get', requests_http_mock):
+                patch('conductr_cli.conduct_request.dcos_request', dcos_http_mock), \
+                patch('requests.Session.get', requests_http_mock):
             result = conduct_request.get(self.dcos_mode, self.host, self.url, **self.kwargs)
             self.assertEqual(requests_http_response, result)
 
@@ -40,8 +42,8 @@ class TestRequest(TestCase):
         requests_http_mock = MagicMock(return_value=requests_http_response)
 
         with patch('conductr_cli.conduct_request.enrich_args', enrich_args_mock), \
-                patch('dcos.http.post', dcos_http_mock), \
-                patch('requests.post', requests_http_mock):
+                patch('conductr_cli.conduct_request.dcos_request', dcos_http_mock), \
+                patch('requests.Session.post', requests_http_mock):
             result = conduct_request.post(self.dcos_mode, self.host, self.url, **self.kwargs)
             self.assertEqual(requests_http_response, result)
 
@@ -60,8 +62,8 @@ class TestRequest(TestCase):
         requests_http_mock = MagicMock(return_value=requests_http_response)
 
         with patch('conductr_cli.conduct_request.enrich_args', enrich_args_mock), \
-                patch('dcos.http.put', dcos_http_mock), \
-                patch('requests.put', requests_http_mock):
+                patch('conductr_cli.conduct_request.dcos_request', dcos_http_mock), \
+                patch('requests.Session.put', requests_http_mock):
             result = conduct_request.put(self.dcos_mode, self.host, self.url, **self.kwargs)
             self.assertEqual(requests_http_response, result)
 
@@ -80,8 +82,8 @@ class TestRequest(TestCase):
         requests_http_mock = MagicMock(return_value=requests_http_response)
 
         with patch('conductr_cli.conduct_request.enrich_args', enrich_args_mock), \
-                patch('dcos.http.delete', dcos_http_mock), \
-                patch('requests.delete', requests_http_mock):
+                patch('conductr_cli.conduct_request.dcos_request', dcos_http_mock), \
+                patch('requests.Session.delete', requests_http_mock):
             result = conduct_request.delete(self.dcos_mode, self.host, self.url, **self.kwargs)
             self.assertEqual(requests_http_response, result)
 
@@ -107,13 +109,13 @@ class TestRequestDcosMode(TestCase):
         requests_http_mock = MagicMock(return_value=requests_http_response)
 
         with patch('conductr_cli.conduct_request.enrich_args', enrich_args_mock), \
-                patch('dcos.http.get', dcos_http_mock), \
-                patch('requests.get', requests_http_mock):
+                patch('conductr_cli.conduct_request.dcos_request', dcos_http_mock), \
+                patch('requests.Session.get', requests_http_mock):
             result = conduct_request.get(self.dcos_mode, self.host, self.url, **self.kwargs)
             self.assertEqual(dcos_http_response, result)
 
         enrich_args_mock.assert_called_with(self.host, **self.kwargs)
-        dcos_http_mock.assert_called_with(self.url, **enriched_args)
+        dcos_http_mock.assert_called_with('get', self.host, self.url, **enriched_args)
         requests_http_mock.assert_not_called()
 
     def test_post(self):
@@ -127,13 +129,13 @@ class TestRequestDcosMode(TestCase):
         requests_http_mock = MagicMock(return_value=requests_http_response)
 
         with patch('conductr_cli.conduct_request.enrich_args', enrich_args_mock), \
-                patch('dcos.http.post', dcos_http_mock), \
-                patch('requests.post', requests_http_mock):
+                patch('conductr_cli.conduct_request.dcos_request', dcos_http_mock), \
+                patch('requests.Session.post', requests_http_mock):
             result = conduct_request.post(self.dcos_mode, self.host, self.url, **self.kwargs)
             self.assertEqual(dcos_http_response, result)
 
         enrich_args_mock.assert_called_with(self.host, **self.kwargs)
-        dcos_http_mock.assert_called_with(self.url, **enriched_args)
+        dcos_http_mock.assert_called_with('post', self.host, self.url, **enriched_args)
         requests_http_mock.assert_not_called()
 
     def test_put(self):
@@ -147,13 +149,13 @@ class TestRequestDcosMode(TestCase):
         requests_http_mock = MagicMock(return_value=requests_http_response)
 
         with patch('conductr_cli.conduct_request.enrich_args', enrich_args_mock), \
-                patch('dcos.http.put', dcos_http_mock), \
-                patch('requests.put', requests_http_mock):
+                patch('conductr_cli.conduct_request.dcos_request', dcos_http_mock), \
+                patch('requests.Session.put', requests_http_mock):
             result = conduct_request.put(self.dcos_mode, self.host, self.url, **self.kwargs)
             self.assertEqual(dcos_http_response, result)
 
         enrich_args_mock.assert_called_with(self.host, **self.kwargs)
-        dcos_http_mock.assert_called_with(self.url, **enriched_args)
+        dcos_http_mock.assert_called_with('put', self.host, self.url, **enriched_args)
         requests_http_mock.assert_not_called()
 
     def test_delete(self):
@@ -167,13 +169,13 @@ class TestRequestDcosMode(TestCase):
         requests_http_mock = MagicMock(return_value=requests_http_response)
 
         with patch('conductr_cli.conduct_request.enrich_args', enrich_args_mock), \
-                patch('dcos.http.delete', dcos_http_mock), \
-                patch('requests.delete', requests_http_mock):
+                patch('conductr_cli.conduct_request.dcos_request', dcos_http_mock), \
+                patch('requests.Session.delete', requests_http_mock):
             result = conduct_request.delete(self.dcos_mode, self.host, self.url, **self.kwargs)
             self.assertEqual(dcos_http_response, result)
 
         enrich_args_mock.assert_called_with(self.host, **self.kwargs)
-        dcos_http_mock.assert_called_with(self.url, **enriched_args)
+        dcos_http_mock.assert_called_with('delete', self.host, self.url, **enriched_args)
         requests_http_mock.assert_not_called()
 
 
@@ -224,3 +226,113 @@ class TestEnrichKwargs(TestCase):
             'auth': self.auth
         }
         self.assertEqual(expected_result, result)
+
+
+class TestSession(TestCase):
+    def tearDown(self):
+        conduct_request.close_sessions()
+
+    def test_reuse_session_per_host(self):
+        session = conduct_request.session('10.0.0.1')
+
+        self.assertIs(session, conduct_request.session('10.0.0.1'))
+        self.assertIsNot(session, conduct_request.session('10.0.0.2'))
+
+    def test_pool_size(self):
+        session = conduct_request.session('10.0.0.1', pool_size=3)
+
+        adapter = session.get_adapter('https://10.0.0.1:9005')
+        self.assertEqual(3, adapter._pool_connections)
+        self.assertEqual(3, adapter._pool_maxsize)
+        self.assertEqual('keep-alive', session.headers['Connection'])
+
+    def test_keep_alive_disabled(self):
+        session = conduct_request.session('10.0.0.1', keep_alive=False)
+
+        self.assertEqual('close', session.headers['Connection'])
+
+    def test_close_sessions(self):
+        session = conduct_request.session('10.0.0.1')
+        conduct_request.close_sessions()
+
+        self.assertIsNot(session, conduct_request.session('10.0.0.1'))
+
+
+class TestDcosRequest(TestCase):
+    host = '10.0.0.1'
+    url = 'https://dcos.example.com/service/conductr/bundles'
+    headers = {'Host': host}
+
+    def tearDown(self):
+        conduct_request.close_sessions()
+
+    def test_success(self):
+        response = MagicMock(status_code=200)
+        request_mock = MagicMock(return_value=response)
+
+        with patch('dcos.config.get_config', MagicMock(return_value='toml')), \
+                patch('dcos.config.get_config_val', MagicMock(return_value='test-token')), \
+                patch('dcos.http._is_request_to_dcos', MagicMock(return_value=True)), \
+                patch('dcos.http._verify_ssl', MagicMock(return_value=None)), \
+                patch('requests.Session.request', request_mock):
+            result = conduct_request.dcos_request('get', self.host, self.url, headers=self.headers)
+
+        self.assertEqual(response, result)
+
+        args, kwargs = request_mock.call_args
+        self.assertEqual(('get', self.url), args)
+        self.assertEqual('test-token', kwargs['auth'].token)
+        self.assertEqual(self.headers, kwargs['headers'])
+        self.assertIsNone(kwargs['verify'])
+
+    def test_unauthorized(self):
+        request_mock = MagicMock(return_value=MagicMock(status_code=401))
+        dcos_response = MagicMock(status_code=200)
+        dcos_request_mock = MagicMock(return_value=dcos_response)
+
+        with patch('dcos.config.get_config', MagicMock(return_value='toml')), \
+                patch('dcos.config.get_config_val', MagicMock(return_value=None)), \
+                patch('dcos.http._is_request_to_dcos', MagicMock(return_value=True)), \
+                patch('dcos.http._verify_ssl', MagicMock(return_value=None)), \
+                patch('dcos.http.request', dcos_request_mock), \
+                patch('requests.Session.request', request_mock):
+            result = conduct_request.dcos_request('get', self.host, self.url, headers=self.headers)
+
+        self.assertEqual(dcos_response, result)
+        dcos_request_mock.assert_called_once_with('get', self.url, headers=self.headers)
+
+    def test_not_found(self):
+        request_mock = MagicMock(return_value=MagicMock(status_code=404))
+
+        with patch('dcos.config.get_config', MagicMock(return_value='toml')), \
+                patch('dcos.config.get_config_val', MagicMock(return_value=None)), \
+                patch('dcos.http._is_request_to_dcos', MagicMock(return_value=True)), \
+                patch('dcos.http._verify_ssl', MagicMock(return_value=None)), \
+                patch('requests.Session.request', request_mock):
+            self.assertRaises(DCOSHTTPException, conduct_request.dcos_request, 'get', self.host, self.url,
+                              headers=self.headers)
+
+    def test_request_errors(self):
+        errors = [
+            (requests.exceptions.SSLError('certificate verify failed'), DCOSException,
+             'An SSL error occurred. To configure your SSL settings, please run: '
+             '`dcos config set core.ssl_verify <value>`\n<value>: Whether to verify SSL certs'),
+            (requests.exceptions.ConnectionError('refused'), DCOSConnectionError, None),
+            (requests.exceptions.ReadTimeout('timed out'), DCOSException,
+             'Request to URL [{}] timed out.'.format(self.url)),
+            (requests.exceptions.TooManyRedirects('redirects'), DCOSException, 'HTTP Exception: redirects')
+        ]
+
+        for error, expected_error, expected_message in errors:
+            with patch('dcos.config.get_config', MagicMock(return_value='toml')), \
+                    patch('dcos.config.get_config_val', MagicMock(return_value=None)), \
+                    patch('dcos.config.get_property_description',
+                          MagicMock(return_value='Whether to verify SSL certs')), \
+                    patch('dcos.http._is_request_to_dcos', MagicMock(return_value=True)), \
+                    patch('dcos.http._verify_ssl', MagicMock(return_value=None)), \
+                    patch('requests.Session.request', MagicMock(side_effect=error)):
+                with self.assertRaises(expected_error) as context:
+                    conduct_request.dcos_request('get', self.host, self.url, headers=self.headers)
+
+            if expected_message is not None:
+                self.assertEqual(expected_message, str(context.exception))
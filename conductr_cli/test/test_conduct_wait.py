@@ -0,0 +1,161 @@
+from conductr_cli.test.cli_test_case import CliTestCase, strip_margin, as_error
+from conductr_cli import conduct_wait, logging_setup
+from unittest.mock import call, patch, MagicMock
+import argparse
+
+
+class TestWaitCondition(CliTestCase):
+    def test_scale(self):
+        condition = conduct_wait.wait_condition('visualizer:2')
+        self.assertEqual('visualizer', condition.bundle)
+        self.assertEqual(2, condition.condition)
+        self.assertTrue(condition.is_scale())
+
+    def test_installed(self):
+        condition = conduct_wait.wait_condition('45e0c47-e0c4777:installed')
+        self.assertEqual('45e0c47-e0c4777', condition.bundle)
+        self.assertEqual('installed', condition.condition)
+        self.assertFalse(condition.is_scale())
+
+    def test_uninstalled(self):
+        condition = conduct_wait.wait_condition('visualizer:uninstalled')
+        self.assertEqual('visualizer', condition.bundle)
+        self.assertEqual('uninstalled', condition.condition)
+        self.assertFalse(condition.is_scale())
+
+    def test_invalid(self):
+        for value in ['visualizer', ':2', 'visualizer:-1', 'visualizer:running']:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                conduct_wait.wait_condition(value)
+
+
+class TestConductWaitCommand(CliTestCase):
+    visualizer_id = '45e0c477d3e5ea92aa8d85c0d8f3e25c'
+    eslite_id = 'f804d644a01a5ab9f679f76939f5c7e2'
+
+    conductr_auth = ('username', 'password')
+    server_verification_file = MagicMock(name='server_verification_file')
+
+    def default_args(self, conditions, wait_timeout=10):
+        return MagicMock(**{
+            'dcos_mode': False,
+            'conductr_auth': self.conductr_auth,
+            'server_verification_file': self.server_verification_file,
+            'wait_timeout': wait_timeout,
+            'conditions': [conduct_wait.wait_condition(condition) for condition in conditions]
+        })
+
+    def bundle(self, bundle_id, bundle_name, installations, started_executions):
+        return {
+            'bundleId': bundle_id,
+            'attributes': {'bundleName': bundle_name},
+            'bundleInstallations': [{}] * installations,
+            'bundleExecutions': [{'isStarted': True}] * started_executions,
+            'hasError': False
+        }
+
+    def sse(self, event_name):
+        sse_mock = MagicMock()
+        sse_mock.event = event_name
+        return sse_mock
+
+    def test_success(self):
+        get_bundles_mock = MagicMock(side_effect=[
+            [self.bundle(self.visualizer_id, 'visualizer', 1, 0), self.bundle(self.eslite_id, 'eslite', 1, 0)],
+            [self.bundle(self.visualizer_id, 'visualizer', 1, 1), self.bundle(self.eslite_id, 'eslite', 1, 0)],
+            [self.bundle(self.visualizer_id, 'visualizer', 1, 2), self.bundle(self.eslite_id, 'eslite', 1, 0)]
+        ])
+        get_events_mock = MagicMock(return_value=[
+            self.sse(None),
+            self.sse('bundleExecutionAdded'),
+            self.sse('bundleExecutionAdded')
+        ])
+        stdout = MagicMock()
+
+        input_args = self.default_args(['visualizer:2', 'eslite:installed'])
+        with patch('conductr_cli.control_protocol.get_bundles', get_bundles_mock), \
+                patch('conductr_cli.sse_client.get_events', get_events_mock):
+            logging_setup.configure_logging(input_args, stdout)
+            result = conduct_wait.wait(input_args)
+            self.assertTrue(result)
+
+        self.assertEqual(3, get_bundles_mock.call_count)
+        get_events_mock.assert_called_once()
+
+        self.assertEqual(strip_margin("""|Bundle {visualizer_id} waiting to reach expected scale 2
+                                         |Bundle {eslite_id} is installed
+                                         |Bundle {visualizer_id} has scale 1, expected 2
+                                         |Bundle {visualizer_id} expected scale 2 is met
+                                         |CONDITION         STATUS
+                                         |visualizer:2      Met
+                                         |eslite:installed  Met
+                                         |""".format(visualizer_id=self.visualizer_id, eslite_id=self.eslite_id)),
+                         self.output(stdout))
+
+    def test_timeout(self):
+        get_bundles_mock = MagicMock(return_value=[
+            self.bundle(self.visualizer_id, 'visualizer', 1, 0)
+        ])
+        get_events_mock = MagicMock(return_value=[
+            self.sse(None)
+        ])
+        stdout = MagicMock()
+        stderr = MagicMock()
+
+        input_args = self.default_args(['visualizer:1', 'visualizer:installed'])
+        with patch('conductr_cli.control_protocol.get_bundles', get_bundles_mock), \
+                patch('conductr_cli.sse_client.get_events', get_events_mock):
+            logging_setup.configure_logging(input_args, stdout, stderr)
+            result = conduct_wait.wait(input_args)
+            self.assertFalse(result)
+
+        self.assertEqual(strip_margin("""|Bundle {visualizer_id} waiting to reach expected scale 1
+                                         |Bundle {visualizer_id} is installed
+                                         |CONDITION             STATUS
+                                         |visualizer:1          Timed out
+                                         |visualizer:installed  Met
+                                         |""".format(visualizer_id=self.visualizer_id)),
+                         self.output(stdout))
+        self.assertEqual(as_error(strip_margin("""|Error: 1 of 2 conditions have not been met
+                                                  |""")),
+                         self.output(stderr))
+
+    def test_bundle_not_loaded_yet(self):
+        get_bundles_mock = MagicMock(side_effect=[
+            [],
+            [self.bundle(self.visualizer_id, 'visualizer', 1, 0)]
+        ])
+        get_events_mock = MagicMock(return_value=[
+            self.sse('bundleInstallationAdded')
+        ])
+        stdout = MagicMock()
+
+        input_args = self.default_args(['{}:installed'.format(self.visualizer_id)])
+        with patch('conductr_cli.control_protocol.get_bundles', get_bundles_mock), \
+                patch('conductr_cli.sse_client.get_events', get_events_mock):
+            logging_setup.configure_logging(input_args, stdout)
+            result = conduct_wait.wait(input_args)
+            self.assertTrue(result)
+
+        self.assertEqual([call(input_args), call(input_args)], get_bundles_mock.call_args_list)
+
+    def test_ambiguous_bundle(self):
+        get_bundles_mock = MagicMock(return_value=[
+            self.bundle(self.visualizer_id, 'visualizer', 1, 0),
+            self.bundle(self.eslite_id, 'visualizer-v2', 1, 0)
+        ])
+        get_events_mock = MagicMock()
+        stdout = MagicMock()
+        stderr = MagicMock()
+
+        input_args = self.default_args(['visualizer:1'])
+        with patch('conductr_cli.control_protocol.get_bundles', get_bundles_mock), \
+                patch('conductr_cli.sse_client.get_events', get_events_mock):
+            logging_setup.configure_logging(input_args, stdout, stderr)
+            result = conduct_wait.wait(input_args)
+            self.assertFalse(result)
+
+        get_events_mock.assert_not_called()
+        self.assertEqual(as_error(strip_margin("""|Error: Specified Bundle ID/name: visualizer resulted in multiple Bundle IDs: ['{}', '{}']
+                                                  |""".format(self.visualizer_id, self.eslite_id))),
+                         self.output(stderr))
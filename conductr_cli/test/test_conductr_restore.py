@@ -98,17 +98,18 @@ class TestConductrRestore(CliTestCase):
         self.assertEqual(None, not_matched)
 
     @patch('copy.deepcopy')
-    @patch('conductr_cli.bundle_scale.wait_for_scale')
     @patch('conductr_cli.control_protocol.run_bundle')
-    def test_should_call_run_with_modified_args(self, mock_run_bundle,
-                                                scale_mock, mock_copy):
+    def test_should_call_run_with_modified_args(self, mock_run_bundle, mock_copy):
         mock_args = MagicMock(**self.args)
         mock_run_bundle.return_value = json.loads('{"bundleId":"abcd"}')
         mock_copy.return_value = MagicMock()
-        scale_bundle(mock_args, 'abcd', 3, 'efgh')
+        scale_waiter = scale_bundle(mock_args, 'abcd', 3, 'efgh')
 
         mock_run_bundle.assert_called_once_with(mock_copy.return_value)
-        scale_mock.assert_called_once_with('abcd', 3, wait_for_is_active=True, args=mock_copy.return_value)
+        self.assertEqual('abcd', scale_waiter.bundle_id)
+        self.assertEqual(3, scale_waiter.expected_scale)
+        self.assertTrue(scale_waiter.wait_for_is_active)
+        self.assertEqual(mock_copy.return_value, scale_waiter.args)
 
     @patch('conductr_cli.control_protocol.get_bundles')
     @patch('conductr_cli.conductr_restore.unpack_backup')
@@ -150,6 +151,7 @@ class TestConductrRestore(CliTestCase):
                                      |""")),
             self.output(stderr))
 
+    @patch('conductr_cli.bundle_event_bus.wait_for_all')
     @patch('conductr_cli.conductr_restore.scale_bundle')
     @patch('conductr_cli.conductr_restore.compatible_bundle')
     @patch('conductr_cli.conductr_restore.process_bundle')
@@ -157,7 +159,7 @@ class TestConductrRestore(CliTestCase):
     @patch('conductr_cli.conductr_restore.unpack_backup')
     def test_restore_should_scale_loaded_bundles(self, mock_unpack,
                                                  mock_bundle, mock_process_bundle,
-                                                 mock_compatible, mock_scale_bundle):
+                                                 mock_compatible, mock_scale_bundle, mock_wait_for_all):
         mock_args = MagicMock(**self.args)
 
         mock_unpack.return_value = 'my/path'
@@ -204,3 +206,5 @@ class TestConductrRestore(CliTestCase):
                        call(mock_args, '1234', 1, 'yolo')]
 
         mock_scale_bundle.assert_has_calls(scale_calls)
+
+        mock_wait_for_all.assert_called_once_with([mock_scale_bundle.return_value] * 6, mock_args)
@@ -0,0 +1,122 @@
+from conductr_cli import control_protocol_async
+from requests.exceptions import HTTPError
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+import asyncio
+import threading
+
+
+class TestClient(TestCase):
+    args = MagicMock()
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.client = control_protocol_async.Client(self.loop, max_workers=2)
+
+    def tearDown(self):
+        self.client.close()
+        self.loop.close()
+
+    def test_requests(self):
+        operations = [
+            ('run_bundle', ()),
+            ('stop_bundle', ()),
+            ('unload_bundle', ()),
+            ('get_bundles', ()),
+            ('get_members', ()),
+            ('get_agents', ()),
+            ('get_bundle_events', (10,)),
+            ('get_bundle_logs', (10,))
+        ]
+
+        for operation, operation_args in operations:
+            operation_mock = MagicMock(return_value=operation)
+            with patch('conductr_cli.control_protocol.{}'.format(operation), operation_mock):
+                future = getattr(self.client, operation)(self.args, *operation_args)
+                self.assertEqual(operation, self.loop.run_until_complete(future))
+
+            operation_mock.assert_called_once_with(self.args, *operation_args)
+
+    def test_running_loop(self):
+        clients = []
+        self.loop.call_soon(lambda: clients.append(control_protocol_async.Client(max_workers=1)))
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+
+        try:
+            self.assertIs(self.loop, clients[0].loop)
+        finally:
+            clients[0].close()
+
+    def test_no_running_loop(self):
+        self.assertRaises(RuntimeError, control_protocol_async.Client)
+
+    def test_load_bundle(self):
+        multipart_files = MagicMock()
+        load_bundle_mock = MagicMock(return_value={'bundleId': 'a101'})
+
+        with patch('conductr_cli.control_protocol.load_bundle', load_bundle_mock):
+            result = self.loop.run_until_complete(self.client.load_bundle(self.args, multipart_files))
+
+        self.assertEqual({'bundleId': 'a101'}, result)
+        load_bundle_mock.assert_called_once_with(self.args, multipart_files)
+
+    def test_requests_run_on_worker_threads(self):
+        threads = []
+
+        def get_bundles(args):
+            threads.append(threading.current_thread())
+            return []
+
+        with patch('conductr_cli.control_protocol.get_bundles', get_bundles):
+            self.loop.run_until_complete(self.client.get_bundles(self.args))
+
+        self.assertNotEqual([threading.current_thread()], threads)
+
+    def test_get_events(self):
+        event_1 = MagicMock()
+        event_2 = MagicMock()
+        get_events_mock = MagicMock(return_value=iter([event_1, event_2]))
+
+        with patch('conductr_cli.sse_client.get_events', get_events_mock):
+            stream = self.client.get_events(False, '10.0.0.1', '/bundles/events', auth=('user', 'pass'))
+            get_events_mock.assert_not_called()
+
+            self.assertEqual(event_1, self.loop.run_until_complete(stream.next_event()))
+            self.assertEqual(event_2, self.loop.run_until_complete(stream.next_event()))
+            self.assertIsNone(self.loop.run_until_complete(stream.next_event()))
+
+        get_events_mock.assert_called_once_with(False, '10.0.0.1', '/bundles/events', auth=('user', 'pass'))
+
+
+class TestFanOut(TestCase):
+    args = MagicMock()
+
+    def test_results_in_order(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get_bundles(args):
+            # Both requests must be in flight at the same time to get past the barrier.
+            barrier.wait()
+            return ['bundle']
+
+        def get_members(args):
+            barrier.wait()
+            return ['member']
+
+        with patch('conductr_cli.control_protocol.get_bundles', get_bundles), \
+                patch('conductr_cli.control_protocol.get_members', get_members):
+            result = control_protocol_async.fan_out(lambda client: client.get_bundles(self.args),
+                                                    lambda client: client.get_members(self.args))
+
+        self.assertEqual([['bundle'], ['member']], result)
+
+    def test_error(self):
+        get_bundles_mock = MagicMock(side_effect=HTTPError('test only'))
+        get_members_mock = MagicMock(return_value=[])
+
+        with patch('conductr_cli.control_protocol.get_bundles', get_bundles_mock), \
+                patch('conductr_cli.control_protocol.get_members', get_members_mock), \
+                self.assertRaises(HTTPError):
+            control_protocol_async.fan_out(lambda client: client.get_bundles(self.args),
+                                           lambda client: client.get_members(self.args))
@@ -0,0 +1,180 @@
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+from conductr_cli import bundle_cache, docker_blob_cache
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+
+class TestDockerBlobCache(TestCase):
+    def setUp(self):  # noqa
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):  # noqa
+        shutil.rmtree(self.cache_dir)
+
+    def add_blob(self, blob_cache, contents):
+        digest = 'sha256:{}'.format(hashlib.sha256(contents).hexdigest())
+        fd, temp_path = blob_cache.create_temp_file(digest)
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(contents)
+        blob_cache.add_blob(digest, temp_path)
+        return digest
+
+    def index(self, blob_cache):
+        return docker_blob_cache.read_index(blob_cache.cache_dir)
+
+    def test_add_blob(self):
+        blob_cache = docker_blob_cache.DockerBlobCache(self.cache_dir)
+        digest = self.add_blob(blob_cache, b'a' * 10)
+
+        self.assertTrue(blob_cache.has_blob(digest))
+        self.assertEqual([os.path.basename(blob_cache.blob_path(digest))], os.listdir(blob_cache.blobs_dir))
+        self.assertEqual(10, self.index(blob_cache)['blobs'][digest]['size'])
+        self.assertFalse(os.path.exists(os.path.join(blob_cache.cache_dir, docker_blob_cache.LOCK_FILE_NAME)))
+
+    def test_manifest(self):
+        blob_cache = docker_blob_cache.DockerBlobCache(self.cache_dir)
+        blob_cache.add_manifest('https://registry/v2/library/alpine/manifests/3.5', '{"schemaVersion": 2}')
+
+        self.assertEqual('{"schemaVersion": 2}',
+                         blob_cache.read_manifest('https://registry/v2/library/alpine/manifests/3.5'))
+        self.assertIsNone(blob_cache.read_manifest('https://registry/v2/library/alpine/manifests/3.6'))
+
+    def test_evict_unreferenced_blobs_first(self):
+        time_mock = MagicMock(side_effect=range(100))
+
+        with patch('time.time', time_mock):
+            blob_cache = docker_blob_cache.DockerBlobCache(self.cache_dir, max_size=20)
+            digest_a = self.add_blob(blob_cache, b'a' * 10)
+            digest_b = self.add_blob(blob_cache, b'b' * 10)
+            blob_cache.use('https://registry/v2/library/alpine/manifests/3.5', [digest_a])
+            digest_c = self.add_blob(blob_cache, b'c' * 10)
+            evicted = blob_cache.use('https://registry/v2/library/busybox/manifests/latest', [digest_c])
+
+        self.assertEqual([digest_b], evicted)
+        self.assertEqual(sorted([digest_a, digest_c]), sorted(self.index(blob_cache)['blobs']))
+
+    def test_evict_least_recently_used_manifest(self):
+        time_mock = MagicMock(side_effect=range(100))
+
+        with patch('time.time', time_mock):
+            blob_cache = docker_blob_cache.DockerBlobCache(self.cache_dir, max_size=20)
+            digest_a = self.add_blob(blob_cache, b'a' * 10)
+            digest_b = self.add_blob(blob_cache, b'b' * 10)
+            blob_cache.use('https://registry/v2/library/alpine/manifests/3.5', [digest_a, digest_b])
+            digest_c = self.add_blob(blob_cache, b'c' * 10)
+            evicted = blob_cache.use('https://registry/v2/library/busybox/manifests/latest', [digest_b, digest_c])
+
+        self.assertEqual([digest_a], evicted)
+        index = self.index(blob_cache)
+        self.assertEqual(['https://registry/v2/library/busybox/manifests/latest'], list(index['manifests']))
+        self.assertEqual(sorted([digest_b, digest_c]), sorted(index['blobs']))
+
+    def test_gc(self):
+        blob_cache = docker_blob_cache.DockerBlobCache(self.cache_dir)
+        digest_a = self.add_blob(blob_cache, b'a' * 10)
+        digest_b = self.add_blob(blob_cache, b'b' * 10)
+        digest_c = self.add_blob(blob_cache, b'c' * 10)
+        blob_cache.add_manifest('https://registry/v2/library/alpine/manifests/3.5', '{}')
+        blob_cache.use('https://registry/v2/library/alpine/manifests/3.5', [digest_a])
+
+        with open(os.path.join(blob_cache.blobs_dir, 'orphan'), 'wb') as orphan_file:
+            orphan_file.write(b'o' * 5)
+        fd, in_progress_path = blob_cache.create_temp_file('sha256:in-progress')
+        os.close(fd)
+
+        with blob_cache.lease([digest_c]):
+            removed_count, removed_size = blob_cache.gc()
+
+        self.assertEqual((2, 15), (removed_count, removed_size))
+        self.assertEqual(sorted([digest_a, digest_c]), sorted(self.index(blob_cache)['blobs']))
+        self.assertFalse(blob_cache.has_blob(digest_b))
+        self.assertTrue(os.path.exists(in_progress_path))
+        self.assertEqual([], os.listdir(blob_cache.leases_dir))
+
+        self.assertEqual((1, 10), blob_cache.gc())
+        self.assertEqual((1, 10), blob_cache.gc(max_size=0))
+        self.assertEqual({}, self.index(blob_cache)['manifests'])
+
+    def test_import_legacy_files(self):
+        blob_digest = 'sha256:{}'.format(hashlib.sha256(b'a' * 10).hexdigest())
+        manifest_url = 'https://registry/v2/library/alpine/manifests/3.5'
+        legacy_files = {
+            'docker-blob-{}'.format(blob_digest.replace(':', '_')): b'a' * 10,
+            'docker-blob-sha256_partial.tmp': b'b',
+            'docker-manifest-{}'.format(hashlib.sha256(manifest_url.encode('UTF-8')).hexdigest()): b'{}',
+            'visualizer-v2-{}.zip'.format('0' * 64): b'zip'
+        }
+        for file_name, contents in legacy_files.items():
+            with open(os.path.join(self.cache_dir, file_name), 'wb') as legacy_file:
+                legacy_file.write(contents)
+
+        blob_cache = docker_blob_cache.DockerBlobCache(self.cache_dir)
+        with blob_cache.locked():
+            pass
+
+        self.assertEqual(sorted([bundle_cache.DOCKER_CACHE_DIR_NAME,
+                                 'visualizer-v2-{}.zip'.format('0' * 64)]),
+                         sorted(os.listdir(self.cache_dir)))
+        self.assertTrue(blob_cache.has_blob(blob_digest))
+        self.assertEqual(10, self.index(blob_cache)['blobs'][blob_digest]['size'])
+        self.assertEqual('{}', blob_cache.read_manifest(manifest_url))
+
+        self.assertEqual((2, 12), blob_cache.gc())
+        self.assertEqual([], os.listdir(blob_cache.blobs_dir))
+        self.assertEqual([], os.listdir(blob_cache.manifests_dir))
+
+    def test_gc_legacy_files(self):
+        blob_cache = docker_blob_cache.DockerBlobCache(self.cache_dir)
+        self.add_blob(blob_cache, b'a' * 10)
+        with open(os.path.join(self.cache_dir, 'docker-blob-sha256_{}'.format('0' * 64)), 'wb') as legacy_file:
+            legacy_file.write(b'b' * 5)
+
+        self.assertEqual((2, 15), blob_cache.gc())
+        self.assertEqual([bundle_cache.DOCKER_CACHE_DIR_NAME], os.listdir(self.cache_dir))
+
+    def test_max_size(self):
+        with patch('conductr_cli.constants.DOCKER_BLOB_CACHE_MAX_SIZE_MB', 2):
+            self.assertEqual(2 * 1024 * 1024, docker_blob_cache.DockerBlobCache(self.cache_dir).max_size)
+
+        time_mock = MagicMock(side_effect=range(100))
+
+        with patch('time.time', time_mock):
+            blob_cache = docker_blob_cache.DockerBlobCache(self.cache_dir)
+            digest_a = self.add_blob(blob_cache, b'a' * 10)
+            digest_b = self.add_blob(blob_cache, b'b' * 10)
+            for url, digest in [('https://registry/v2/library/alpine/manifests/3.5', digest_a),
+                                ('https://registry/v2/library/busybox/manifests/latest', digest_b)]:
+                blob_cache.add_manifest(url, '{}')
+                blob_cache.use(url, [digest])
+
+            self.assertEqual((0, 0), blob_cache.gc())
+            self.assertEqual((1, 10), docker_blob_cache.DockerBlobCache(self.cache_dir, max_size=10).gc())
+
+        self.assertEqual([digest_b], list(self.index(blob_cache)['blobs']))
+
+    def test_lock_refreshed(self):
+        blob_cache = docker_blob_cache.DockerBlobCache(self.cache_dir)
+        lock_path = os.path.join(blob_cache.cache_dir, docker_blob_cache.LOCK_FILE_NAME)
+
+        with patch('conductr_cli.bundle_cache.LOCK_REFRESH_SECONDS', 0.01):
+            with blob_cache.locked():
+                os.utime(lock_path, (1, 1))
+                time.sleep(0.1)
+                self.assertGreater(os.path.getmtime(lock_path), 1)
+
+        self.assertFalse(os.path.exists(lock_path))
+
+    def test_stale_lock(self):
+        blob_cache = docker_blob_cache.DockerBlobCache(self.cache_dir)
+        os.makedirs(blob_cache.cache_dir)
+        lock_path = os.path.join(blob_cache.cache_dir, docker_blob_cache.LOCK_FILE_NAME)
+        open(lock_path, 'w').close()
+        os.utime(lock_path, (1, 1))
+
+        self.add_blob(blob_cache, b'a' * 10)
+
+        self.assertFalse(os.path.exists(lock_path))
@@ -0,0 +1,71 @@
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+from conductr_cli import bundle_cache, docker_token_cache
+import os
+import shutil
+import tempfile
+
+
+class TestDockerTokenCache(TestCase):
+    realm = 'https://auth.docker.io/token'
+    service = 'registry.docker.io'
+    scope = 'repository:library/alpine:pull'
+
+    def setUp(self):  # noqa
+        self.settings_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.settings_dir, 'docker-tokens.json')
+
+    def tearDown(self):  # noqa
+        shutil.rmtree(self.settings_dir)
+
+    def test_find(self):
+        with patch('time.time', MagicMock(return_value=1000)):
+            token_cache = docker_token_cache.DockerTokenCache(self.path)
+            token_cache.add('registry.hub.docker.com', 'library/alpine', self.realm, self.service, self.scope,
+                            'token-a', 300)
+
+            self.assertEqual('token-a', token_cache.find('registry.hub.docker.com', 'library/alpine'))
+            self.assertIsNone(token_cache.find('registry.hub.docker.com', 'library/busybox'))
+            self.assertIsNone(token_cache.find('lightbend-docker.registry.bintray.io', 'library/alpine'))
+
+    def test_persisted(self):
+        with patch('time.time', MagicMock(return_value=1000)):
+            docker_token_cache.DockerTokenCache(self.path).add('registry.hub.docker.com', 'library/alpine', self.realm,
+                                                               self.service, self.scope, 'token-a', 300)
+
+            self.assertEqual('token-a',
+                             docker_token_cache.DockerTokenCache(self.path).find('registry.hub.docker.com',
+                                                                                 'library/alpine'))
+
+        self.assertEqual({'token': 'token-a', 'expires_at': 1300, 'valid_until': 1290},
+                         bundle_cache.read_json(self.path, None)['tokens'][
+                             'https://auth.docker.io/token registry.docker.io repository:library/alpine:pull'])
+
+    def test_expired(self):
+        token_cache = docker_token_cache.DockerTokenCache(self.path)
+
+        with patch('time.time', MagicMock(return_value=1000)):
+            token_cache.add('registry.hub.docker.com', 'library/alpine', self.realm, self.service, self.scope,
+                            'token-a', None)
+
+        with patch('time.time', MagicMock(return_value=1049)):
+            self.assertEqual('token-a', token_cache.find('registry.hub.docker.com', 'library/alpine'))
+
+        with patch('time.time', MagicMock(return_value=1050)):
+            self.assertIsNone(token_cache.find('registry.hub.docker.com', 'library/alpine'))
+
+            token_cache.add('registry.hub.docker.com', 'library/busybox', self.realm, self.service,
+                            'repository:library/busybox:pull', 'token-b', 4)
+
+        self.assertEqual(['https://auth.docker.io/token registry.docker.io repository:library/busybox:pull'],
+                         list(bundle_cache.read_json(self.path, None)['tokens']))
+
+        with patch('time.time', MagicMock(return_value=1051)):
+            self.assertEqual('token-b', token_cache.find('registry.hub.docker.com', 'library/busybox'))
+
+    def test_invalid_file(self):
+        with open(self.path, 'w') as cache_file:
+            cache_file.write('{ invalid')
+
+        self.assertIsNone(docker_token_cache.DockerTokenCache(self.path).find('registry.hub.docker.com',
+                                                                              'library/alpine'))
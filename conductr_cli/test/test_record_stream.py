@@ -0,0 +1,78 @@
+from conductr_cli import record_stream
+from unittest import TestCase
+from unittest.mock import MagicMock
+import gzip
+import io
+
+
+class TestDecodeArray(TestCase):
+    def test_elements_split_across_chunks(self):
+        chunks = [b' [{"a": 1', b', "b": "x"},', b'  {"a": 2}', b' , {"a": "caf\xc3', b'\xa9"}]']
+
+        self.assertEqual([{'a': 1, 'b': 'x'}, {'a': 2}, {'a': 'café'}],
+                         list(record_stream.decode_array(chunks)))
+
+    def test_elements_decoded_as_they_arrive(self):
+        def chunks():
+            yield b'[{"a": 1}, {"a"'
+            raise AssertionError('Only the chunks needed for the first element should be read')
+
+        self.assertEqual({'a': 1}, next(record_stream.decode_array(chunks())))
+
+    def test_empty_array(self):
+        self.assertEqual([], list(record_stream.decode_array([b'[', b' ]'])))
+
+    def test_not_an_array(self):
+        self.assertEqual([], list(record_stream.decode_array([b'{', b'}'])))
+        self.assertEqual([], list(record_stream.decode_array([])))
+
+    def test_truncated(self):
+        self.assertRaises(ValueError, list, record_stream.decode_array([b'[{"a": 1}, {"a": ']))
+
+
+class TestRecordWriter(TestCase):
+    fields = ['timestamp', 'message']
+
+    records = [
+        {'timestamp': '2017-01-01T00:00:00Z', 'message': 'one'},
+        {'timestamp': '2017-01-01T00:00:01Z', 'message': 'two\tcolumns\nand lines'}
+    ]
+
+    def write(self, output_format, records):
+        output = io.BytesIO()
+        output.close = MagicMock()
+
+        with record_stream.RecordWriter(output_format, self.fields, output) as writer:
+            for record in records:
+                writer.write(record)
+
+        return output.getvalue().decode('utf-8')
+
+    def test_ndjson(self):
+        self.assertEqual('{"timestamp": "2017-01-01T00:00:00Z", "message": "one"}\n'
+                         '{"timestamp": "2017-01-01T00:00:01Z", "message": "two\\tcolumns\\nand lines"}\n',
+                         self.write('ndjson', self.records))
+
+    def test_json(self):
+        self.assertEqual('[\n'
+                         '  {"timestamp": "2017-01-01T00:00:00Z", "message": "one"},\n'
+                         '  {"timestamp": "2017-01-01T00:00:01Z", "message": "two\\tcolumns\\nand lines"}\n'
+                         ']\n',
+                         self.write('json', self.records))
+        self.assertEqual('[]\n', self.write('json', []))
+
+    def test_tsv(self):
+        self.assertEqual('timestamp\tmessage\n'
+                         '2017-01-01T00:00:00Z\tone\n'
+                         '2017-01-01T00:00:01Z\ttwo\\tcolumns\\nand lines\n',
+                         self.write('tsv', self.records))
+
+    def test_gzip(self):
+        output = io.BytesIO()
+        writer = record_stream.RecordWriter('ndjson', self.fields, gzip.GzipFile(fileobj=output, mode='wb'))
+        writer.write(self.records[0])
+        writer.close()
+
+        self.assertFalse(output.closed)
+        self.assertEqual(b'{"timestamp": "2017-01-01T00:00:00Z", "message": "one"}\n',
+                         gzip.decompress(output.getvalue()))
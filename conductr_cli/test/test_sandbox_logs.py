@@ -1,19 +1,39 @@
 from conductr_cli.test.cli_test_case import CliTestCase
 from conductr_cli import sandbox_logs
-from unittest.mock import MagicMock
+from unittest.mock import patch, MagicMock
 
 import io
+import os
+import shutil
 import tempfile
 
 
 class TestSandboxLogs(CliTestCase):
     def test_log_files_is_correct(self):
         self.assertEqual(
-            ['/image/dir/core/logs/conductr.log', '/image/dir/agent/logs/conductr-agent.log'],
+            [('core', '/image/dir/core/logs/conductr.log'), ('agent', '/image/dir/agent/logs/conductr-agent.log')],
 
             sandbox_logs.log_files(MagicMock(**{'image_dir': '/image/dir'}))
         )
 
+    def test_log_files_ignores_rotated_files(self):
+        image_dir = tempfile.mkdtemp()
+        for log_path in ['core/logs/conductr.log', 'core/logs/conductr.2017-01-01.log',
+                         'agent/logs/conductr-agent.log', 'agent/logs/gc.txt']:
+            os.makedirs(os.path.dirname(os.path.join(image_dir, log_path)), exist_ok=True)
+            open(os.path.join(image_dir, log_path), 'w').close()
+
+        try:
+            self.assertEqual(
+                [
+                    ('core', '{}/core/logs/conductr.log'.format(image_dir)),
+                    ('agent', '{}/agent/logs/conductr-agent.log'.format(image_dir))
+                ],
+                sandbox_logs.log_files(MagicMock(**{'image_dir': image_dir}))
+            )
+        finally:
+            shutil.rmtree(image_dir)
+
     def test_tail_reads_files(self):
         one_fd, one_path = tempfile.mkstemp()
         two_fd, two_path = tempfile.mkstemp()
@@ -34,3 +54,101 @@ class TestSandboxLogs(CliTestCase):
             "line 1\nline 2\nline 3\nline a\nline b\nline c\n",
             output.getvalue()
         )
+
+    def test_tail_last_lines(self):
+        path = self.write_temp_file(b'line 1\nline 2\nline 3\nline 4\n')
+        output = io.StringIO()
+
+        sandbox_logs.tail([path], False, output, 8, 0.25, lines=2)
+
+        self.assertEqual("line 3\nline 4\n", output.getvalue())
+
+    def test_tail_last_lines_without_line_ending(self):
+        path = self.write_temp_file(b'line 1\nline 2\nline 3')
+        output = io.StringIO()
+
+        sandbox_logs.tail([path], False, output, 8, 0.25, lines=2)
+
+        self.assertEqual("line 2\nline 3\n", output.getvalue())
+
+    def test_tail_follow(self):
+        path = self.write_temp_file(b'line 1\nline 2\npartial')
+        output = io.StringIO()
+
+        def append_lines(poll_period):
+            with open(path, 'ab') as log_file:
+                log_file.write(b' line\nline 3\n')
+
+        with patch('itertools.count', lambda: [0]), \
+                patch('conductr_cli.sandbox_logs.inotify_watch', lambda directories: None), \
+                patch('time.sleep', append_lines):
+            sandbox_logs.tail([path], True, output, 8, 0.25, lines=2)
+
+        self.assertEqual("line 2\npartial line\nline 3\n", output.getvalue())
+
+    def test_tail_interleaves_by_timestamp(self):
+        core_path = self.write_temp_file(b'2017-05-04T02:16:09.100Z INFO core started\n'
+                                         b'2017-05-04T02:16:12.000Z ERROR failure\n'
+                                         b'\tat Failure.scala\n')
+        agent_path = self.write_temp_file(b'[INFO] [05/04/2017 02:16:10.000] agent started\n'
+                                          b'[INFO] [05/04/2017 02:16:13.000] agent stopped\n')
+        output = io.StringIO()
+
+        sandbox_logs.tail([core_path, agent_path], False, output, 8, 0.25, names=['core', 'agent:192.168.10.1'])
+
+        self.assertEqual(
+            '[core] 2017-05-04T02:16:09.100Z INFO core started\n'
+            '[agent:192.168.10.1] [INFO] [05/04/2017 02:16:10.000] agent started\n'
+            '[core] 2017-05-04T02:16:12.000Z ERROR failure\n'
+            '[core] \tat Failure.scala\n'
+            '[agent:192.168.10.1] [INFO] [05/04/2017 02:16:13.000] agent stopped\n',
+            output.getvalue())
+
+    def test_parse_timestamp(self):
+        self.assertEqual(b'2017-05-04T02:16:09.392', sandbox_logs.parse_timestamp(b'2017-05-04T02:16:09.392Z INFO'))
+        self.assertEqual(b'2017-05-04T02:16:09.392', sandbox_logs.parse_timestamp(b'2017-05-04 02:16:09,392 INFO'))
+        self.assertEqual(b'2017-05-04T02:16:09.392',
+                         sandbox_logs.parse_timestamp(b'[WARN] [05/04/2017 02:16:09.392] [akka] Association failed'))
+        self.assertIsNone(sandbox_logs.parse_timestamp(b'\tat Failure.scala'))
+
+    def test_seek_last_lines(self):
+        data = b''.join('line {}\n'.format(number).encode('utf-8') for number in range(1000))
+
+        for lines, expected in [(0, b''), (1, b'line 999\n'), (3, b'line 997\nline 998\nline 999\n'),
+                                (2000, data)]:
+            with io.BytesIO(data) as log_file:
+                # A small read size spreads the lines over several blocks
+                sandbox_logs.seek_last_lines(log_file, lines, 7)
+                self.assertEqual(expected, log_file.read())
+
+    def test_log_file_reopened_when_truncated(self):
+        path = self.write_temp_file(b'line 1\nline 2\n')
+
+        log_file = sandbox_logs.LogFile(path, 8)
+        log_file.open()
+        self.assertEqual([b'line 1', b'line 2'], list(log_file.read_lines()))
+
+        with open(path, 'wb') as truncated_file:
+            truncated_file.write(b'new\n')
+
+        self.assertEqual([b'new'], list(log_file.read_lines()))
+        log_file.close()
+
+    def test_file_watcher_wakes_on_write(self):
+        directory = tempfile.mkdtemp()
+
+        with sandbox_logs.FileWatcher([directory], 0.25) as watcher:
+            if not watcher.is_inotify():
+                self.skipTest('inotify is not available')
+
+            with open(os.path.join(directory, 'conductr.log'), 'wb') as log_file:
+                log_file.write(b'line 1\n')
+
+            self.assertTrue(watcher.wait())
+
+    @staticmethod
+    def write_temp_file(data):
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(data)
+        return path
@@ -108,6 +108,13 @@ class TestSandbox(CliTestCase):
         self.assertEqual(args.is_filter_agent, True)
         self.assertEqual(args.is_quiet, True)
 
+    def test_parser_logs(self):
+        args = self.parser.parse_args('logs -f -n 100'.split())
+        self.assertEqual(args.func.__name__, 'logs')
+        self.assertEqual(args.follow, True)
+        self.assertEqual(args.lines, 100)
+        self.assertEqual(args.image_dir, DEFAULT_SANDBOX_IMAGE_DIR)
+
     def test_parser_version(self):
         args = self.parser.parse_args('version'.split())
         self.assertEqual(args.func.__name__, 'version')
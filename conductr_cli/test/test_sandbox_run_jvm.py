@@ -16,6 +16,8 @@ import json
 import semver
 import subprocess
 import io
+import shutil
+import tempfile
 
 
 class TestRun(CliTestCase):
@@ -2323,6 +2325,29 @@ class TestDownloadSandboxImage(CliTestCase):
                                                                   self.core_package_name,
                                                                   self.image_version)
 
+    def test_artefact_download_error(self):
+        mock_artefact_os_name = MagicMock(return_value='Mac_OS_X')
+        mock_bintray_artefacts_by_version = MagicMock(return_value=[self.core_artefact_mac_os])
+        mock_download_bundle = MagicMock(side_effect=URLError('unreachable'))
+        image_dir = tempfile.mkdtemp()
+
+        try:
+            with patch('conductr_cli.sandbox_run_jvm.artefact_os_name', mock_artefact_os_name), \
+                    patch('conductr_cli.resolvers.bintray_resolver.bintray_artefacts_by_version',
+                          mock_bintray_artefacts_by_version), \
+                    patch('conductr_cli.resolvers.uri_resolver.download_bundle', mock_download_bundle):
+                self.assertRaises(SandboxImageFetchError,
+                                  sandbox_run_jvm.download_sandbox_image,
+                                  self.bintray_auth,
+                                  image_dir,
+                                  self.core_package_name,
+                                  self.core_artefact_type,
+                                  self.image_version)
+        finally:
+            shutil.rmtree(image_dir)
+
+        mock_download_bundle.assert_called_once()
+
 
 class TestArtefactOsName(CliTestCase):
     def test_mac_os(self):
@@ -1,7 +1,9 @@
 from unittest import TestCase
 from conductr_cli.test.cli_test_case import strip_margin
-from conductr_cli import sse_client
-from unittest.mock import patch, MagicMock
+from conductr_cli import logging_setup, sse_client
+from dcos.errors import DCOSConnectionError
+from requests.exceptions import ChunkedEncodingError, ConnectionError
+from unittest.mock import call, patch, MagicMock
 
 
 class TestSSEClient(TestCase):
@@ -14,7 +16,7 @@ class TestSSEClient(TestCase):
                                   |data:
                                   |
                                   |""")
-        raw_sse_iterators = [iter(list(raw_sse))]
+        raw_sse_iterators = [iter([raw_sse[:10].encode('utf-8'), raw_sse[10:].encode('utf-8')])]
         iter_content_mock = MagicMock(side_effect=raw_sse_iterators)
 
         raise_for_status_mock = MagicMock()
@@ -26,8 +28,8 @@ class TestSSEClient(TestCase):
         request_get_mock = MagicMock(return_value=response_mock)
 
         result = []
-        with patch('requests.get', request_get_mock):
-            events = sse_client.get_events(False, '127.0.0.1', 'http://host.com')
+        with patch('requests.Session.get', request_get_mock):
+            events = sse_client.get_events(False, '127.0.0.1', 'http://host.com', max_reconnect_attempts=0)
             for event in events:
                 result.append(event)
 
@@ -37,6 +39,173 @@ class TestSSEClient(TestCase):
             sse_client.Event(event=None, data='')
         ], result)
 
-        request_get_mock.assert_called_with('http://host.com', stream=True, **sse_client.SSE_REQUEST_INPUT)
+        request_get_mock.assert_called_with('http://host.com', stream=True, headers={
+            'Cache-Control': 'no-cache',
+            'Accept': 'text/event-stream',
+            'Host': '127.0.0.1'
+        })
         raise_for_status_mock.assert_called_with()
-        iter_content_mock.assert_called_with(decode_unicode=True)
+        iter_content_mock.assert_called_with(chunk_size=sse_client.SSE_CHUNK_SIZE)
+
+    def test_reconnect_with_last_event_id(self):
+        stdout = MagicMock()
+
+        def dropped_stream():
+            yield b'id:1\nretry:500\nevent:bundleInstallationAdded\ndata:a\n\n'
+            raise ChunkedEncodingError('connection reset')
+
+        first_response = MagicMock()
+        first_response.iter_content.return_value = dropped_stream()
+        second_response = MagicMock()
+        second_response.iter_content.return_value = iter([b'id:2\nevent:bundleExecutionAdded\ndata:b\n\n'])
+
+        request_get_mock = MagicMock(side_effect=[first_response, second_response, ConnectionError('refused')])
+        sleep_mock = MagicMock()
+
+        result = []
+        with patch('requests.Session.get', request_get_mock), \
+                patch('time.sleep', sleep_mock):
+            logging_setup.configure_logging(MagicMock(), stdout)
+            events = sse_client.get_events(False, '127.0.0.1', 'http://host.com', max_reconnect_attempts=1)
+            result.append(next(events))
+            result.append(next(events))
+            self.assertRaises(ConnectionError, next, events)
+
+        self.assertEqual([
+            sse_client.Event(event='bundleInstallationAdded', data='a', id='1', retry=500),
+            sse_client.Event(event='bundleExecutionAdded', data='b', id='2')
+        ], result)
+
+        self.assertNotIn('Last-Event-ID', request_get_mock.call_args_list[0][1]['headers'])
+        self.assertEqual('1', request_get_mock.call_args_list[1][1]['headers']['Last-Event-ID'])
+        self.assertEqual('2', request_get_mock.call_args_list[2][1]['headers']['Last-Event-ID'])
+        self.assertEqual([call(0.5), call(0.5)], sleep_mock.call_args_list)
+
+    def test_reconnect_attempts_exhausted(self):
+        stdout = MagicMock()
+
+        response = MagicMock()
+        response.iter_content.return_value = iter([b'data:\n\n'])
+        request_get_mock = MagicMock(side_effect=[response,
+                                                  ConnectionError('connection refused'),
+                                                  ConnectionError('connection refused')])
+        sleep_mock = MagicMock()
+
+        with patch('requests.Session.get', request_get_mock), \
+                patch('time.sleep', sleep_mock):
+            logging_setup.configure_logging(MagicMock(), stdout)
+            events = sse_client.get_events(False, '127.0.0.1', 'http://host.com', max_reconnect_attempts=2)
+            self.assertEqual(sse_client.Event(event=None, data=''), next(events))
+            self.assertRaises(ConnectionError, next, events)
+
+        self.assertEqual([call(1.0), call(2.0)], sleep_mock.call_args_list)
+
+    def test_reconnect_stream_closed_without_events(self):
+        stdout = MagicMock()
+
+        response = MagicMock()
+        response.iter_content.side_effect = lambda chunk_size: iter([])
+        request_get_mock = MagicMock(return_value=response)
+        sleep_mock = MagicMock()
+
+        with patch('requests.Session.get', request_get_mock), \
+                patch('time.sleep', sleep_mock):
+            logging_setup.configure_logging(MagicMock(), stdout)
+            events = sse_client.get_events(False, '127.0.0.1', 'http://host.com', max_reconnect_attempts=3)
+            self.assertEqual([], list(events))
+
+        self.assertEqual(4, request_get_mock.call_count)
+        self.assertEqual([call(1.0), call(2.0), call(4.0)], sleep_mock.call_args_list)
+
+    def test_reconnect_dcos_connection_error(self):
+        first_response = MagicMock()
+        first_response.iter_content.return_value = iter([b'id:1\ndata:a\n\n'])
+        second_response = MagicMock()
+        second_response.iter_content.return_value = iter([b'id:2\ndata:b\n\n'])
+
+        request_get_mock = MagicMock(side_effect=[first_response,
+                                                  DCOSConnectionError('http://host.com'),
+                                                  second_response])
+        sleep_mock = MagicMock()
+
+        with patch('conductr_cli.conduct_request.get', request_get_mock), \
+                patch('time.sleep', sleep_mock):
+            events = sse_client.get_events(True, '127.0.0.1', 'http://host.com', max_reconnect_attempts=2)
+            self.assertEqual(sse_client.Event(event=None, data='a', id='1'), next(events))
+            self.assertEqual(sse_client.Event(event=None, data='b', id='2'), next(events))
+
+        self.assertEqual([call(1.0), call(2.0)], sleep_mock.call_args_list)
+
+    def test_reconnect_delay(self):
+        client = sse_client.Client(False, '127.0.0.1', 'http://host.com')
+
+        self.assertEqual([1.0, 2.0, 4.0, 8.0, 16.0, 30.0],
+                         [client.reconnect_delay(attempt) for attempt in range(1, 7)])
+
+        client.parser.retry = 5000
+        self.assertEqual([5.0, 10.0, 20.0, 30.0],
+                         [client.reconnect_delay(attempt) for attempt in range(1, 5)])
+
+
+class TestEventParser(TestCase):
+    def test_multi_line_data(self):
+        parser = sse_client.EventParser()
+
+        self.assertEqual([
+            sse_client.Event(event='bundleInstallationAdded', data='line 1\nline 2')
+        ], parser.feed(b'event:bundleInstallationAdded\ndata:line 1\ndata:line 2\n\n'))
+
+    def test_id_and_retry(self):
+        parser = sse_client.EventParser()
+
+        self.assertEqual([
+            sse_client.Event(event=None, data='test', id='42', retry=5000),
+            sse_client.Event(event=None, data='test 2')
+        ], parser.feed(b'id: 42\nretry: 5000\ndata: test\n\ndata: test 2\n\n'))
+        self.assertEqual('42', parser.last_event_id)
+        self.assertEqual(5000, parser.retry)
+
+    def test_invalid_retry(self):
+        parser = sse_client.EventParser()
+
+        self.assertEqual([sse_client.Event(event=None, data='test')], parser.feed(b'retry: soon\ndata:test\n\n'))
+        self.assertIsNone(parser.retry)
+
+    def test_value_with_colon(self):
+        parser = sse_client.EventParser()
+
+        self.assertEqual([sse_client.Event(event=None, data='{"a":1}')], parser.feed(b'data:{"a":1}\n\n'))
+
+    def test_comment(self):
+        parser = sse_client.EventParser()
+
+        self.assertEqual([sse_client.Event(event=None, data=None)], parser.feed(b':heartbeat\n\n'))
+
+    def test_line_endings(self):
+        parser = sse_client.EventParser()
+
+        self.assertEqual([
+            sse_client.Event(event='a', data='1'),
+            sse_client.Event(event='b', data='2'),
+            sse_client.Event(event='c', data='3')
+        ], parser.feed(b'event:a\r\ndata:1\r\n\r\nevent:b\rdata:2\r\revent:c\ndata:3\n\n'))
+
+    def test_chunk_boundaries(self):
+        raw_sse = 'event:a\r\ndata:\u00e9t\u00e9\r\n\r\nevent:b\r\ndata:2\r\n\r\n'.encode('utf-8')
+
+        for chunk_size in range(1, len(raw_sse) + 1):
+            parser = sse_client.EventParser()
+            events = []
+            for start in range(0, len(raw_sse), chunk_size):
+                events.extend(parser.feed(raw_sse[start:start + chunk_size]))
+
+            self.assertEqual([
+                sse_client.Event(event='a', data='\u00e9t\u00e9'),
+                sse_client.Event(event='b', data='2')
+            ], events)
+
+    def test_partial_event(self):
+        parser = sse_client.EventParser()
+
+        self.assertEqual([], parser.feed(b'event:a\ndata:1\n'))
+        self.assertEqual([sse_client.Event(event='a', data='1')], parser.feed(b'\n'))